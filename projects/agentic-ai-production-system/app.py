@@ -4,17 +4,15 @@ Production-ready web interface with comprehensive error handling and monitoring.
 """
 
 import streamlit as st
-import os
 import sys
+import time
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.web.interface import MultiAgentInterface
-from src.core.config import Config
-from src.utils.logger import setup_logger
-from src.core.health import HealthChecker
+from src.web.services import get_services
 
 # Configure page
 st.set_page_config(
@@ -27,26 +25,27 @@ st.set_page_config(
 def main():
     """Main application entry point."""
     
-    # Initialize configuration and logging
-    config = Config()
-    logger = setup_logger()
+    page_start = time.perf_counter()
     
-    # Initialize health checker
-    health_checker = HealthChecker(config)
+    # Configuration, logging, metrics, health checks, agents and the LLM
+    # connection pool are built on the first run in this process and shared
+    # by every session and rerun after it
+    services = get_services()
     
-    # Check system health
-    health_status = health_checker.check_system_health()
+    # Check system health (cached snapshot)
+    health_status = services.health_checker.check_system_health()
     
     if not health_status["healthy"]:
         st.error("⚠️ System Health Issues Detected")
         st.error(f"Issues: {', '.join(health_status['issues'])}")
         st.stop()
     
-    # Initialize the main interface
-    interface = MultiAgentInterface(config, logger)
+    # Per-user state (history) lives in this browser session only
+    session = services.session(st.session_state)
     
     # Render the application
-    interface.render()
+    MultiAgentInterface(services, session).render()
+    services.record_page_load(time.perf_counter() - page_start)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,112 @@
+"""
+Web page latency, cold and warm: building services on every script run versus once per process.
+
+A "page" is what app.py does on a Streamlit script run plus one workflow
+against the stub server. "per run (before)" builds Config, the logging
+pipeline and a CoordinatorAgent with its agents every time and runs the
+workflow on a fresh event loop, so each page opens new connections;
+"shared" gets the process-wide AppServices and runs on its long-lived
+loop and warm connection pool. Each variant runs in its own process so
+both start cold.
+
+Usage:
+    python benchmarks/app_services.py [--pages 20] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+def make_config(base_url: str, log_file: str):
+    from src.core.config import Config
+
+    return Config(
+        openai_api_key="stub_key",
+        openai_base_url=base_url,
+        rate_limit_requests=100000,
+        enable_metrics=False,
+        log_level="WARNING",
+        log_file=log_file
+    )
+
+def page_per_run(base_url: str, log_file: str, task: str):
+    from src.agents.coordinator_agent import CoordinatorAgent
+    from src.core.health import get_health_checker
+    from src.utils.logger import setup_logger
+
+    config = make_config(base_url, log_file)
+    logger = setup_logger(
+        log_level=config.log_level,
+        log_file=config.log_file,
+        enable_file_logging=config.enable_file_logging,
+        sample_rates=config.get_log_sample_rates()
+    )
+    get_health_checker(config).check_system_health()
+    coordinator = CoordinatorAgent(config, logger)
+    asyncio.run(coordinator.process({"task": task}))
+
+def page_shared(base_url: str, log_file: str, task: str, state: dict):
+    from src.web.services import get_services
+
+    services = get_services(make_config(base_url, log_file))
+    services.health_checker.check_system_health()
+    services.session(state).run(task)
+
+def run_variant(variant: str, pages: int, base_url: str) -> dict:
+    """Time every page of one variant; runs in a fresh process."""
+
+    logging.getLogger().setLevel(logging.WARNING)
+    state = {}
+    latencies = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file = str(Path(temp_dir) / "app.log")
+        for i in range(pages):
+            # Distinct tasks so the research cache does not answer them
+            task = f"Explain topic {i} in detail"
+            start = time.perf_counter()
+            if variant == "shared":
+                page_shared(base_url, log_file, task, state)
+            else:
+                page_per_run(base_url, log_file, task)
+            latencies.append(time.perf_counter() - start)
+    return {"cold": latencies[0], "warm": statistics.median(latencies[1:])}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="page loads per variant")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub seconds per completion")
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.pages, args.base_url)))
+        return
+
+    from src.utils.stub_llm_server import StubLLMServer
+
+    print(f"{args.pages} page loads per variant, stub latency {args.latency * 1000:.0f} ms")
+    with StubLLMServer(latency=args.latency) as server:
+        for variant in ("per run", "shared"):
+            connections = server.stats["connections"]
+            output = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--pages", str(args.pages),
+                 "--base-url", server.base_url],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            label = "per run (before)" if variant == "per run" else "shared services"
+            print(f"{label:<18} cold {result['cold'] * 1000:7.1f} ms, warm p50 {result['warm'] * 1000:6.1f} ms, "
+                  f"{server.stats['connections'] - connections} connections opened")
+
+if __name__ == "__main__":
+    main()
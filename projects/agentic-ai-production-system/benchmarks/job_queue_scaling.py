@@ -0,0 +1,63 @@
+"""
+Job throughput with 1, 2 and 4 worker processes on the local stub server.
+
+Usage:
+    python benchmarks/job_queue_scaling.py [--latency 0.2] [--jobs 96] [--concurrency 4] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import Config
+from src.jobs.service import JobService
+from src.utils.stub_llm_server import StubLLMServer
+
+def measure(config: Config, workers: int, concurrency: int, jobs: int) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "jobs.sqlite")
+        with JobService(config, db_path=db_path, workers=workers, concurrency=concurrency) as service:
+            # Warm up the workers (imports, connections) before timing
+            service.wait(service.submit({"task": "Warm up the worker pool"}), timeout=60)
+
+            start = time.perf_counter()
+            job_ids = [service.submit({"task": f"Summarize the history of topic {i}"}) for i in range(jobs)]
+            results = [service.wait(job_id, timeout=300) for job_id in job_ids]
+            elapsed = time.perf_counter() - start
+
+    succeeded = sum(job["status"] == "succeeded" for job in results)
+    return {"seconds": round(elapsed, 2), "jobs_per_sec": round(jobs / elapsed, 2), "succeeded": succeeded}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="stub completion latency in seconds")
+    parser.add_argument("--jobs", type=int, default=96, help="jobs per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs in flight per worker")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    args = parser.parse_args()
+
+    with StubLLMServer(latency=args.latency) as server:
+        config = Config(
+            openai_api_key="stub_key",
+            openai_base_url=server.base_url,
+            # Measure the workers, not the default 60 requests/minute budget
+            rate_limit_requests=100000,
+            enable_file_logging=False,
+            log_level="WARNING"
+        )
+
+        print(f"Stub latency {args.latency * 1000:.0f} ms, {args.jobs} jobs, {args.concurrency} in flight per worker")
+        baseline = None
+        for workers in [int(n) for n in args.workers.split(",")]:
+            result = measure(config, workers, args.concurrency, args.jobs)
+            baseline = baseline or result["jobs_per_sec"] / workers
+            print(f"{workers} workers: {result['seconds']}s, {result['jobs_per_sec']} jobs/s "
+                  f"({result['jobs_per_sec'] / baseline:.2f}x of one worker, {result['succeeded']} succeeded)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+LLM tail latency with and without hedging, and failure latency with and without a circuit breaker.
+
+Tail: the stub answers most requests quickly but a few stall (a slow
+replica), so hedging after the recent p95 should cut p99 for a few
+percent of extra requests. Outage: the stub fails every request, so
+callers either wait out retries each time or fail fast once the circuit
+has opened.
+
+Usage:
+    python benchmarks/llm_resilience.py [--requests 400] [--concurrency 10] [--slow-rate 0.03] [--slow-seconds 2.0] [--outage-requests 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import Config
+from src.core.transport import LLMTransport
+from src.utils.stub_llm_server import StubLLMServer, lognormal_latency
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def make_config(server: StubLLMServer, **overrides) -> Config:
+    return Config(
+        openai_api_key="stub_key",
+        openai_base_url=server.base_url,
+        rate_limit_requests=100000,
+        max_connections=100,
+        max_keepalive_connections=100,
+        **overrides
+    )
+
+async def run_tail(server: StubLLMServer, requests: int, concurrency: int, hedging: bool) -> dict:
+    transport = LLMTransport(make_config(server, enable_hedging=hedging))
+    semaphore = asyncio.Semaphore(concurrency)
+    messages = [{"role": "user", "content": "Summarize the report"}]
+    latencies = []
+    sent_before = server.stats["requests"]
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await transport.chat_completion(messages)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[one() for _ in range(requests)])
+    await transport.aclose()
+    stats = transport.get_stats()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies),
+        "extra_requests": server.stats["requests"] - sent_before - requests,
+        "hedges_won": stats["hedges_won"]
+    }
+
+async def run_outage(server: StubLLMServer, requests: int, breaker: bool) -> dict:
+    # A minimum the window never reaches keeps the circuit closed
+    min_requests = 5 if breaker else 1000000
+    transport = LLMTransport(make_config(server, max_retries=3, circuit_breaker_min_requests=min_requests))
+    messages = [{"role": "user", "content": "Summarize the report"}]
+    latencies = []
+    sent_before = server.stats["errors"]
+
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            await transport.chat_completion(messages)
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - start)
+
+    await transport.aclose()
+    return {
+        "total": sum(latencies),
+        "mean": statistics.mean(latencies),
+        "sent": server.stats["errors"] - sent_before
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400, help="requests in the tail latency run")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="fraction of requests that stall")
+    parser.add_argument("--slow-seconds", type=float, default=2.0, help="how long a stalled request takes")
+    parser.add_argument("--outage-requests", type=int, default=20, help="requests sent during the outage")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    normal = lognormal_latency(0.05, 0.3)
+
+    def latency(rng):
+        return args.slow_seconds if rng.random() < args.slow_rate else normal(rng)
+
+    print(f"Tail: {args.requests} requests, {args.concurrency} in flight, "
+          f"{args.slow_rate:.0%} stall for {args.slow_seconds}s")
+    for hedging in (False, True):
+        with StubLLMServer(latency=latency, seed=7) as server:
+            result = asyncio.run(run_tail(server, args.requests, args.concurrency, hedging))
+        print(f"  hedging {'on ' if hedging else 'off'}  p50 {result['p50'] * 1000:.0f} ms, "
+              f"p95 {result['p95'] * 1000:.0f} ms, p99 {result['p99'] * 1000:.0f} ms, "
+              f"max {result['max'] * 1000:.0f} ms, {result['extra_requests']} extra requests "
+              f"({result['hedges_won']} hedges won)")
+
+    print(f"Outage: {args.outage_requests} requests, every call fails, 3 attempts each")
+    for breaker in (False, True):
+        with StubLLMServer(latency=0.05, error_rate=1.0) as server:
+            result = asyncio.run(run_outage(server, args.outage_requests, breaker))
+        print(f"  breaker {'on ' if breaker else 'off'}  {result['total']:.1f}s total, "
+              f"{result['mean'] * 1000:.0f} ms per failed request, {result['sent']} calls sent")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Load test: drive CoordinatorAgent.process at a target RPS against the local stub server.
+Exits non-zero when a threshold is missed, so it can gate performance regressions offline.
+
+Usage:
+    python benchmarks/load_test.py [--rps 20] [--duration 10] [--latency lognormal:0.1,0.5]
+                                   [--error-rate 0.01] [--throttle-rate 0.0] [--stream]
+                                   [--max-p95-ms 2000] [--min-success-rate 0.95] [--max-loop-lag-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.load_generator import LoadGenerator
+from src.utils.stub_llm_server import StubLLMServer, parse_latency
+
+TASKS = [
+    "Explain how solar panels convert light to electricity",
+    "Summarize the main causes of inflation",
+    "Compare electric cars versus hybrid cars",
+    "Write a short poem about the ocean",
+    "Analyze the impact of remote work on productivity"
+]
+
+async def run(args) -> dict:
+    from src.agents.coordinator_agent import CoordinatorAgent
+    from src.core.config import Config
+
+    coordinator = CoordinatorAgent(Config(), logging.getLogger("benchmark"))
+
+    async def target(i: int):
+        # Unique tasks so the research cache does not hide the LLM path
+        task = {"task": f"{TASKS[i % len(TASKS)]} (request {i})"}
+        if not args.stream:
+            return await coordinator.process(task)
+        result = None
+        async for event in coordinator.process_stream(task):
+            if event["type"] == "result":
+                result = event
+        return result
+
+    generator = LoadGenerator(target, rps=args.rps, duration=args.duration,
+                              max_in_flight=args.max_in_flight, trace_memory=args.trace_memory)
+    report = await generator.run()
+    report["transport"] = coordinator.transport.get_stats()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--latency", default="lognormal:0.1,0.5", help="stub latency, see stub_llm_server")
+    parser.add_argument("--token-interval", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None, help="stub provider completions per second")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--stream", action="store_true", help="use process_stream instead of process")
+    parser.add_argument("--trace-memory", action="store_true", help="also report Python heap growth (slower)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--min-success-rate", type=float, default=None)
+    parser.add_argument("--max-loop-lag-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+
+    with StubLLMServer(latency=parse_latency(args.latency), token_interval=args.token_interval,
+                       error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                       rate_limit_per_second=args.rate_limit, seed=args.seed) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "stub_key")
+        os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000")
+        report = asyncio.run(run(args))
+        report["stub"] = dict(server.stats)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        latency, lag, memory = report["latency"], report["loop_lag"], report["memory"]
+        print(f"Target {report['target_rps']} rps for {args.duration}s, stub latency {args.latency}")
+        print(f"Sent {report['sent']}, completed {report['completed']}, dropped {report['dropped']}: "
+              f"{report['throughput_rps']} rps")
+        print(f"Succeeded {report['succeeded']}, degraded {report['degraded']}, failed {report['failed']}, "
+              f"errors {report['errors']} (success rate {report['success_rate']:.1%})")
+        print(f"Latency ms: p50 {latency['p50_ms']}  p90 {latency['p90_ms']}  p95 {latency['p95_ms']}  "
+              f"p99 {latency['p99_ms']}  max {latency['max_ms']}")
+        print(f"Loop lag ms: p50 {lag['p50_ms']}  p95 {lag['p95_ms']}  max {lag['max_ms']}")
+        print(f"Memory: RSS {memory['rss_start_mb']} MB, growth {memory['rss_growth_mb']} MB")
+        print(f"Stub: {report['stub']['requests']} completions, {report['stub']['errors']} errors, "
+              f"{report['stub']['rate_limited']} 429s; transport retries {report['transport']['retries']}")
+
+    failures = []
+    if args.max_p95_ms is not None and report["latency"]["p95_ms"] > args.max_p95_ms:
+        failures.append(f"p95 {report['latency']['p95_ms']} ms > {args.max_p95_ms} ms")
+    if args.min_success_rate is not None and report["success_rate"] < args.min_success_rate:
+        failures.append(f"success rate {report['success_rate']} < {args.min_success_rate}")
+    if args.max_loop_lag_ms is not None and report["loop_lag"]["p95_ms"] > args.max_loop_lag_ms:
+        failures.append(f"loop lag p95 {report['loop_lag']['p95_ms']} ms > {args.max_loop_lag_ms} ms")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Event-loop lag with the old synchronous handlers versus the queued JSON pipeline.
+
+Usage:
+    python benchmarks/logging_lag.py [--tasks 200] [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.load_generator import LoopLagMonitor
+from src.utils.logger import setup_logger, flush_logger
+
+def synchronous_logger(log_file: str) -> logging.Logger:
+    """The previous setup: formatted and written on the caller's thread, to console and file."""
+
+    logger = logging.getLogger("bench_sync")
+    logger.handlers.clear()
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for handler in (logging.StreamHandler(open(os.devnull, "w")), logging.FileHandler(log_file)):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+async def workload(logger: logging.Logger, tasks: int, iterations: int) -> dict:
+    """Agents logging their hot INFO path while the loop is watched for lag."""
+
+    async def agent(i: int):
+        name = f"Agent{i % 4}"
+        for step in range(iterations):
+            logger.info("%s: Making LLM request", name)
+            logger.info("CoordinatorAgent: Executing step %s - %s: %s", step, name, "analyze")
+            await asyncio.sleep(0)
+            logger.info("%s: LLM request successful", name)
+
+    monitor = LoopLagMonitor(interval=0.005)
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(*[agent(i) for i in range(tasks)])
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+
+    return {"seconds": elapsed, "records_per_sec": tasks * iterations * 3 / elapsed, **monitor.get_stats()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200, help="concurrent logging coroutines")
+    parser.add_argument("--iterations", type=int, default=200, help="log bursts per coroutine")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disabled = logging.getLogger("bench_off")
+        disabled.disabled = True
+        setups = {
+            "logging off": lambda: disabled,
+            "synchronous (before)": lambda: synchronous_logger(f"{tmp}/sync.log"),
+            "queued JSON": lambda: setup_logger("bench_queue", "INFO", f"{tmp}/queue.log", queue_size=1000000),
+            "queued JSON, sampled": lambda: setup_logger(
+                "bench_sampled", "INFO", f"{tmp}/sampled.log",
+                sample_rates={"logging_lag": 0.1}, queue_size=1000000
+            ),
+        }
+
+        print(f"{args.tasks} tasks x {args.iterations} iterations x 3 INFO records")
+        print(f"{'pipeline':<22} {'seconds':>8} {'records/s':>10} {'lag p50':>8} {'lag p99':>8} {'lag max':>8} {'drain':>8}")
+        for label, build in setups.items():
+            logger = build()
+            row = asyncio.run(workload(logger, args.tasks, args.iterations))
+            # Let the writer catch up so it does not compete with the next run
+            start = time.perf_counter()
+            flush_logger(logger.name)
+            drain = time.perf_counter() - start
+            print(f"{label:<22} {row['seconds']:>8.2f} {row['records_per_sec']:>10.0f} "
+                  f"{row['p50_ms']:>6.1f}ms {row['p99_ms']:>6.1f}ms {row['max_ms']:>6.1f}ms {drain:>7.2f}s")
+
+if __name__ == "__main__":
+    main()
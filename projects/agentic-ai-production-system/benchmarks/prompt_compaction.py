@@ -0,0 +1,89 @@
+"""
+Content generation from long research findings: whole findings versus map-reduce compaction.
+
+Two content steps (a summary and an analysis) are grounded in the same
+findings, as in the fan-out workflow plan. The stub server charges prefill
+time per prompt token, so prompt size shows up in latency.
+
+Usage:
+    python benchmarks/prompt_compaction.py [--findings-tokens 6000] [--latency 0.2] [--prefill-ms 0.2]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.content_agent import ContentAgent
+from src.core.config import Config
+from src.utils.stub_llm_server import StubLLMServer
+
+SENTENCE = "Solar capacity grew {i}% in region {i}, driven by falling module prices and new incentives. "
+
+def findings(tokens: int, tokenizer) -> str:
+    """Three research outputs totalling roughly the given number of tokens."""
+    parts, i = [], 0
+    while tokenizer.count("\n\n".join(parts)) < tokens:
+        parts.append("".join(SENTENCE.format(i=i + j) for j in range(40)))
+        i += 40
+    return "\n\n".join(parts)
+
+async def measure(server: StubLLMServer, findings_tokens: int, **config_overrides) -> dict:
+    config = Config(
+        openai_api_key="stub_key",
+        openai_base_url=server.base_url,
+        rate_limit_requests=100000,
+        **config_overrides
+    )
+    agent = ContentAgent(config, logging.getLogger("benchmark"))
+    research = findings(findings_tokens, agent.tokenizer)
+    prompt_tokens_before = server.stats["prompt_tokens"]
+    requests_before = server.stats["requests"]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        agent.process({"task": "Explain the solar market", "content_type": content_type,
+                       "research_findings": research})
+        for content_type in ("summary", "analysis")
+    ])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": round(elapsed, 2),
+        "succeeded": sum(result["success"] for result in results),
+        "requests": server.stats["requests"] - requests_before,
+        "prompt_tokens": server.stats["prompt_tokens"] - prompt_tokens_before,
+        "tokens_saved": agent.metrics["prompt_tokens_saved"]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--findings-tokens", type=int, default=6000, help="size of the research findings")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub time to first token in seconds")
+    parser.add_argument("--prefill-ms", type=float, default=0.2, help="stub prefill milliseconds per prompt token")
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+    # A paragraph-sized reply, so summaries are not unrealistically short
+    content = " ".join(["The findings show steady growth in installed capacity."] * 15)
+
+    with StubLLMServer(latency=args.latency, prompt_token_interval=args.prefill_ms / 1000,
+                       content=content) as server:
+        # Whole findings need a window large enough to hold them
+        whole = asyncio.run(measure(server, args.findings_tokens, model_context_window=128000,
+                                    prompt_content_tokens=1000000))
+        compacted = asyncio.run(measure(server, args.findings_tokens))
+
+    print(f"~{args.findings_tokens}-token findings, {args.latency * 1000:.0f} ms latency, "
+          f"{args.prefill_ms} ms prefill per token, 2 content steps")
+    for name, result in (("whole", whole), ("compacted", compacted)):
+        print(f"{name:10s} {result['seconds']}s, {result['requests']} requests, "
+              f"{result['prompt_tokens']} prompt tokens sent, {result['tokens_saved']} saved, "
+              f"{result['succeeded']}/2 succeeded")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Time-to-first-token for buffered vs streamed workflows against the local stub server.
+
+Usage:
+    python benchmarks/streaming_ttft.py [--latency 0.2] [--token-interval 0.02] [--words 100] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.stub_llm_server import StubLLMServer
+
+async def measure(runs: int) -> dict:
+    from src.agents.coordinator_agent import CoordinatorAgent
+    from src.core.config import Config
+
+    coordinator = CoordinatorAgent(Config(), logging.getLogger("benchmark"))
+    buffered, streamed, streamed_total = [], [], []
+
+    for i in range(runs):
+        # Distinct tasks so neither mode benefits from the research cache
+        start = time.perf_counter()
+        await coordinator.process({"task": f"Explain buffered topic {i} in detail"})
+        buffered.append(time.perf_counter() - start)
+
+        async for event in coordinator.process_stream({"task": f"Explain streamed topic {i} in detail"}):
+            if event["type"] == "result":
+                streamed.append(event["time_to_first_token"])
+                streamed_total.append(event["total_seconds"])
+
+    return {
+        "buffered_ttft": statistics.median(buffered),
+        "streamed_ttft": statistics.median(streamed),
+        "streamed_total": statistics.median(streamed_total)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="stub time to first token in seconds")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="stub seconds between streamed words")
+    parser.add_argument("--words", type=int, default=100, help="words per stub completion")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+    content = " ".join(f"word{i}" for i in range(args.words))
+
+    with StubLLMServer(latency=args.latency, token_interval=args.token_interval, content=content) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "stub_key")
+        os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000")
+
+        row = asyncio.run(measure(args.runs))
+
+    completion = args.latency + args.token_interval * (args.words - 1)
+    print(f"Stub: {args.latency * 1000:.0f} ms to first token, {args.words} words, "
+          f"{completion * 1000:.0f} ms per buffered completion")
+    print(f"Buffered time to first token (whole workflow): {row['buffered_ttft'] * 1000:8.0f} ms")
+    print(f"Streamed time to first token:                  {row['streamed_ttft'] * 1000:8.0f} ms")
+    print(f"Streamed workflow total:                       {row['streamed_total'] * 1000:8.0f} ms")
+    print(f"Speedup in time to first token: {row['buffered_ttft'] / row['streamed_ttft']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Local validation checks on a large document: a separate scan per check versus one TextAnalyzer pass.
+
+The document is generated prose with occasional code blocks and technical
+terms. "before" is the previous implementation of the basic quality,
+readability, terminology and code block checks, each rescanning the text;
+"after" is the agent's checks sharing one analysis, whole and streamed.
+
+Usage:
+    python benchmarks/text_analytics.py [--size-kb 1024] [--runs 10]
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.validation_agent import ValidationAgent
+from src.core.config import Config
+
+CODE = '''```python
+def load(path):
+    with open(path) as f:
+        return {"rows": [parse(line) for line in f], "count": len(f.readlines())}
+```
+'''
+
+def document(size: int, seed: int = 1) -> str:
+    """Prose paragraphs with a code block every tenth paragraph."""
+
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("etaoinshrdlucmfwyp") for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    vocabulary += ["the", "of", "and", "to", "a", "in", "Python", "API", "api", "JavaScript"]
+    paragraphs, total = [], 0
+    while total < size:
+        sentences = []
+        for _ in range(rng.randint(3, 7)):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(4, 28))]
+            sentences.append(" ".join(words).capitalize() + rng.choice(".....!?"))
+        paragraph = " ".join(sentences) + "\n\n"
+        if len(paragraphs) % 10 == 9:
+            paragraph += CODE + "\n"
+        paragraphs.append(paragraph)
+        total += len(paragraph)
+    return "".join(paragraphs)[:size]
+
+def checks_before(content: str) -> tuple:
+    """The checks as they were: each one lowercases, splits or re-splits the content itself."""
+
+    words = content.lower().split()
+    word_freq = {}
+    for word in words:
+        word_freq[word] = word_freq.get(word, 0) + 1
+    repetition = max(word_freq.values()) > len(words) * 0.1
+    sentences = re.split(r'[.!?]+', content)
+    short_sentences = [s for s in sentences if len(s.strip()) < 5]
+    structure = len(short_sentences) > len(sentences) * 0.3
+
+    sentences = re.split(r'[.!?]+', content)
+    avg_sentence_length = len(content.split()) / len(sentences)
+
+    term_variations = {
+        "javascript": ["javascript", "js", "JavaScript", "JS"],
+        "python": ["python", "Python", "PYTHON"],
+        "api": ["api", "API", "Api"]
+    }
+    inconsistent = [base for base, variations in term_variations.items()
+                    if len([var for var in variations if var in content]) > 1]
+
+    brackets = {'(': ')', '[': ']', '{': '}'}
+    unbalanced = 0
+    for code in re.findall(r'```[\w]*\n(.*?)\n```', content, re.DOTALL):
+        stack = []
+        for char in code:
+            if char in brackets:
+                stack.append(char)
+            elif char in brackets.values():
+                if not stack or brackets.get(stack.pop()) != char:
+                    unbalanced += 1
+                    break
+        unbalanced += bool(stack)
+
+    return repetition, structure, round(avg_sentence_length, 6), inconsistent, unbalanced
+
+def checks_after(agent: ValidationAgent, stats) -> tuple:
+    issues = agent._check_basic_quality("", False, stats)
+    unbalanced = sum(len(agent._bracket_issues(mismatched, unclosed, i))
+                     for i, (mismatched, unclosed) in enumerate(stats.code_blocks))
+    return (
+        any(issue["type"] == "repetition" for issue in issues),
+        any(issue["type"] == "structure" for issue in issues),
+        round(stats.words / stats.sentences, 6),
+        [issue["description"].split("'")[1] for issue in agent._check_terminology_consistency("", stats)],
+        unbalanced
+    )
+
+def streamed(agent: ValidationAgent, content: str, delta: int = 4096):
+    stream = agent.text_analyzer.stream()
+    for start in range(0, len(content), delta):
+        stream.feed(content[start:start + delta])
+    return stream.finish()
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=1024, help="document size in KB")
+    parser.add_argument("--runs", type=int, default=10, help="runs per variant; the best is reported")
+    args = parser.parse_args()
+
+    agent = ValidationAgent(Config(openai_api_key="stub_key"), logging.getLogger("benchmark"))
+    content = document(args.size_kb * 1024)
+
+    before = checks_before(content)
+    after = checks_after(agent, agent.text_analyzer.analyze(content))
+    assert before == after, (before, after)
+
+    rows = {
+        "separate scans (before)": best_of(args.runs, lambda: checks_before(content)),
+        "one pass": best_of(args.runs, lambda: checks_after(agent, agent.text_analyzer.analyze(content))),
+        "one pass, 4 KB deltas": best_of(args.runs, lambda: checks_after(agent, streamed(agent, content)))
+    }
+
+    print(f"{len(content) // 1024} KB document, best of {args.runs} runs; results match: {after}")
+    for name, ms in rows.items():
+        speedup = rows["separate scans (before)"] / ms
+        print(f"{name:<26} {ms:8.1f} ms  {speedup:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Workflow throughput against the local stub server at 1, 10 and 100 concurrent workflows.
+
+Usage:
+    python benchmarks/transport_throughput.py [--latency 0.05] [--workflows 100]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.stub_llm_server import StubLLMServer
+
+async def run_workflows(concurrency: int, total: int) -> dict:
+    from src.agents.coordinator_agent import CoordinatorAgent
+    from src.core.config import Config
+
+    logger = logging.getLogger("benchmark")
+    coordinator = CoordinatorAgent(Config(), logger)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            return await coordinator.process({"task": f"Explain topic {i} in a few sentences"})
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(i) for i in range(total)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "workflows": total,
+        "succeeded": sum(1 for r in results if r.get("success")),
+        "seconds": round(elapsed, 2),
+        "workflows_per_sec": round(total / elapsed, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="stub completion latency in seconds")
+    parser.add_argument("--workflows", type=int, default=100, help="workflows per concurrency level")
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+
+    with StubLLMServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "stub_key")
+        # Measure the transport, not the default 60 requests/minute budget
+        os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000")
+
+        print(f"Stub latency {args.latency * 1000:.0f} ms per completion")
+        print(f"{'concurrency':>11} {'workflows':>9} {'ok':>4} {'seconds':>8} {'wf/s':>8}")
+
+        for concurrency in (1, 10, 100):
+            total = max(args.workflows if concurrency > 1 else args.workflows // 10, 1)
+            row = asyncio.run(run_workflows(concurrency, total))
+            print(f"{row['concurrency']:>11} {row['workflows']:>9} {row['succeeded']:>4} "
+                  f"{row['seconds']:>8} {row['workflows_per_sec']:>8}")
+
+        print(f"Stub server: {server.stats['requests']} completions over "
+              f"{server.stats['connections']} connections, peak concurrency {server.stats['peak_concurrency']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Comprehensive validation latency (p50/p95) against the local stub server:
+serial LLM checks (previous behaviour) vs concurrent checks and the strict-mode short-circuit.
+
+Usage:
+    python benchmarks/validation_latency.py [--latency 0.1] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.stub_llm_server import StubLLMServer
+
+CLEAN = "Renewable energy reduces emissions. Solar and wind costs keep falling. Storage is improving quickly."
+SENSITIVE = "Contact me at someone@example.com or on 123-45-6789. " + CLEAN
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+    return pick(0.5), pick(0.95)
+
+async def measure(runs: int) -> dict:
+    from src.agents.validation_agent import ValidationAgent
+    from src.core.config import Config
+
+    agent = ValidationAgent(Config(), logging.getLogger("benchmark"))
+    rows = {}
+
+    async def serial(i):
+        # What _comprehensive_validation did before: one check after the other
+        await agent._safety_validation(f"{CLEAN} ({i})", False)
+        await agent._quality_validation(f"{CLEAN} ({i})", False)
+
+    scenarios = {
+        "serial checks (before)": serial,
+        "concurrent checks": lambda i: agent.process({"content": f"{CLEAN} [{i}]"}),
+        "strict, local failure": lambda i: agent.process({"content": f"{SENSITIVE} {i}", "strict_mode": True}),
+    }
+
+    # Open the pooled connection first so it is not charged to the first scenario
+    await agent._llm_quality_check("warm up")
+
+    for name, run in scenarios.items():
+        samples = []
+        for i in range(runs):
+            start = time.perf_counter()
+            await run(i)
+            samples.append(time.perf_counter() - start)
+        rows[name] = percentiles(samples)
+
+    return rows
+
+def scan_timing(repeat: int = 200) -> tuple:
+    """Local safety scan: per-pattern re.search loop vs one combined scan."""
+
+    from src.agents.validation_agent import ValidationAgent
+    from src.core.config import Config
+
+    agent = ValidationAgent(Config(), logging.getLogger("benchmark"))
+    content = CLEAN * 200
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for patterns in agent.safety_patterns.values():
+            for pattern in patterns:
+                re.search(pattern, content, re.IGNORECASE)
+    before = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        agent._local_safety_issues(content, False)
+    after = (time.perf_counter() - start) / repeat
+
+    return before * 1000, after * 1000, len(content)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.1, help="stub completion latency in seconds")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.WARNING)
+
+    with StubLLMServer(latency=args.latency) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "stub_key")
+        os.environ.setdefault("RATE_LIMIT_REQUESTS", "100000")
+        rows = asyncio.run(measure(args.runs))
+
+    print(f"Stub latency {args.latency * 1000:.0f} ms per completion, {args.runs} validations each")
+    print(f"{'scenario':<24} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, (p50, p95) in rows.items():
+        print(f"{name:<24} {p50:>8.1f} {p95:>8.1f}")
+
+    before, after, size = scan_timing()
+    print(f"Safety pattern scan on {size // 1000} KB: {before:.2f} ms per-pattern, {after:.2f} ms combined")
+
+if __name__ == "__main__":
+    main()
@@ -5,52 +5,107 @@ Includes retry logic, error handling, and monitoring.
 
 import time
 import asyncio
+import contextvars
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
 import logging
+from ..core.transport import get_transport
+from ..core.single_flight import request_fingerprint
+from ..core.output_filter import OutputFilter
+from ..core.tokens import get_tokenizer, context_window, PromptBudget
+from ..core.metrics import LLM_PROMPT_TOKENS_SAVED
+
+# Receives filtered text deltas from LLM requests made inside stream_to()
+_stream_sink = contextvars.ContextVar("llm_stream_sink", default=None)
+
+@contextmanager
+def stream_to(sink: Callable[[str], None]):
+    """Stream LLM requests made inside this block to sink as filtered deltas.
+
+    The requests still return their complete text, so agents that wait for
+    the whole response work unchanged while the caller relays tokens early.
+    """
+    
+    token = _stream_sink.set(sink)
+    try:
+        yield
+    finally:
+        _stream_sink.reset(token)
 
 class BaseAgent(ABC):
     """Base class for all agents with common functionality."""
     
+    COMPACTION_PROMPT = (
+        "Condense the following text. Keep every fact, figure, name and conclusion; "
+        "drop repetition and filler. Reply with the condensed text only."
+    )
+    MAX_COMPACTION_ROUNDS = 3
+    MIN_SUMMARY_TOKENS = 64
+    MAX_MAP_CHUNKS = 16
+    
     def __init__(self, name: str, config, logger: logging.Logger):
         self.name = name
         self.config = config
         self.logger = logger
-        self.client = OpenAI(api_key=config.openai_api_key)
+        self.transport = get_transport(config)
+        self.output_filter = OutputFilter()
+        self.tokenizer = get_tokenizer(config.openai_model)
+        self.prompt_budget = PromptBudget(
+            self.tokenizer, config.model_context_window or context_window(config.openai_model)
+        )
         self.metrics = {
             "requests": 0,
             "successes": 0,
             "failures": 0,
-            "total_time": 0.0
+            "coalesced": 0,
+            "streams": 0,
+            "total_time": 0.0,
+            "time_to_first_token": 0.0,
+            "compactions": 0,
+            "prompt_tokens_saved": 0
         }
     
+    @property
+    def client(self):
+        """Shared, pooled async OpenAI client for the running event loop."""
+        return self.transport.client
+    
     @abstractmethod
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input and return result. Must be implemented by subclasses."""
         pass
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(Exception)
-    )
     async def _make_llm_request(self, messages: List[Dict[str, str]], **kwargs) -> str:
-        """Make LLM request with retry logic and error handling."""
+        """Make LLM request with retry logic and error handling.
+        
+        Transient provider errors are retried by the shared transport; the
+        event loop stays free while the request is in flight. Identical
+        concurrent requests (same model, messages and kwargs) are coalesced
+        into one provider call whose result or error every caller receives.
+        Inside stream_to() the request is streamed instead.
+        """
+        
+        self._fit_output(messages, kwargs)
+        
+        sink = _stream_sink.get()
+        if sink is not None:
+            return await self._relay_stream(messages, sink, **kwargs)
         
         start_time = time.time()
         self.metrics["requests"] += 1
         
         try:
-            self.logger.info(f"{self.name}: Making LLM request")
-            
-            response = self.client.chat.completions.create(
-                model=self.config.openai_model,
-                messages=messages,
-                timeout=self.config.timeout_seconds,
-                **kwargs
-            )
+            if self.config.enable_request_coalescing:
+                key = request_fingerprint(self.config.openai_model, messages, **kwargs)
+                response, shared = await self.transport.single_flight.do(
+                    key, lambda: self._send_llm_request(messages, **kwargs)
+                )
+                if shared:
+                    self.metrics["coalesced"] += 1
+                    self.logger.info("%s: Joined identical in-flight LLM request", self.name)
+            else:
+                response = await self._send_llm_request(messages, **kwargs)
             
             result = response.choices[0].message.content
             
@@ -58,85 +113,258 @@ class BaseAgent(ABC):
             self.metrics["successes"] += 1
             self.metrics["total_time"] += time.time() - start_time
             
-            self.logger.info(f"{self.name}: LLM request successful")
+            self.logger.info("%s: LLM request successful", self.name)
             return result
             
         except Exception as e:
             self.metrics["failures"] += 1
-            self.logger.error(f"{self.name}: LLM request failed: {str(e)}")
+            self.logger.error("%s: LLM request failed: %s", self.name, e)
+            raise
+    
+    async def _send_llm_request(self, messages: List[Dict[str, str]], **kwargs):
+        self.logger.info("%s: Making LLM request", self.name)
+        return await self.transport.chat_completion(
+            messages,
+            model=self.config.openai_model,
+            agent=self.name,
+            **kwargs
+        )
+    
+    async def _stream_llm_request(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """Make LLM request and yield the response text as it is generated.
+        
+        Deltas are unfiltered; use output_filter.stream() to redact them
+        incrementally. Streamed requests are never coalesced.
+        """
+        
+        self._fit_output(messages, kwargs)
+        start_time = time.time()
+        first_token = None
+        self.metrics["requests"] += 1
+        self.metrics["streams"] += 1
+        
+        try:
+            self.logger.info("%s: Streaming LLM request", self.name)
+            
+            async for delta in self.transport.chat_completion_stream(
+                messages,
+                model=self.config.openai_model,
+                agent=self.name,
+                **kwargs
+            ):
+                if first_token is None:
+                    first_token = time.time() - start_time
+                    self.metrics["time_to_first_token"] += first_token
+                yield delta
+            
+            self.metrics["successes"] += 1
+            self.metrics["total_time"] += time.time() - start_time
+            self.logger.info("%s: LLM stream complete", self.name)
+            
+        except Exception as e:
+            self.metrics["failures"] += 1
+            self.logger.error("%s: LLM stream failed: %s", self.name, e)
             raise
     
+    async def _relay_stream(self, messages: List[Dict[str, str]], sink: Callable[[str], None], **kwargs) -> str:
+        """Stream a request to sink with redaction applied, returning the complete raw text."""
+        
+        chunks = []
+        redactor = self.output_filter.stream() if self.config.enable_output_filtering else None
+        
+        async for delta in self._stream_llm_request(messages, **kwargs):
+            chunks.append(delta)
+            text = redactor.feed(delta) if redactor else delta
+            if text:
+                sink(text)
+        
+        if redactor:
+            tail = redactor.flush()
+            if tail:
+                sink(tail)
+            if redactor.redactions:
+                self.logger.warning("%s: Potential sensitive content detected and filtered", self.name)
+        
+        return "".join(chunks)
+    
+    def _fit_output(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]):
+        """Cap max_tokens to what the context window leaves after the prompt."""
+        
+        available = self.prompt_budget.available_output(messages, kwargs.get("max_tokens"))
+        if available <= 0:
+            raise ValueError(f"Prompt does not fit the {self.prompt_budget.window}-token context window")
+        if "max_tokens" in kwargs:
+            kwargs["max_tokens"] = available
+    
+    def _content_budget(self, system_prompt: str, max_output: int) -> int:
+        """Tokens of content that fit in one request next to system_prompt and the output."""
+        return self.prompt_budget.content_budget(
+            [{"role": "system", "content": system_prompt}, {"role": "user", "content": ""}],
+            max_output,
+            cap=self.config.prompt_content_tokens
+        )
+    
+    async def _map_chunks(self, system_prompt: str, user_prefix: str, content: str, **kwargs) -> List[str]:
+        """Run one prompt over every budget-sized chunk of content concurrently.
+        
+        Replaces truncating long content: each chunk is sent as
+        user_prefix + chunk, and the responses come back in chunk order.
+        At most MAX_MAP_CHUNKS requests are made; content that needs more
+        is compacted (see _compact) into the last chunk, so every part of
+        it still reaches a request. Raises ValueError when the prompt leaves
+        fewer than MIN_SUMMARY_TOKENS tokens per chunk.
+        """
+        
+        budget = self._content_budget(system_prompt, kwargs.get("max_tokens") or 0) - self.tokenizer.count(user_prefix)
+        if budget < self.MIN_SUMMARY_TOKENS:
+            raise ValueError(
+                f"Prompt leaves {budget} tokens of content per request, fewer than {self.MIN_SUMMARY_TOKENS}"
+            )
+        chunks = self.tokenizer.split(content, budget) or [content]
+        if len(chunks) > self.MAX_MAP_CHUNKS:
+            self.logger.warning(
+                "%s: Content needs %s chunks; compacting the %s beyond the first %s",
+                self.name, len(chunks), len(chunks) - self.MAX_MAP_CHUNKS + 1, self.MAX_MAP_CHUNKS - 1
+            )
+            overflow = "".join(chunks[self.MAX_MAP_CHUNKS - 1:])
+            chunks = chunks[:self.MAX_MAP_CHUNKS - 1] + [
+                await self._compact(overflow, budget, focus=user_prefix.strip())
+            ]
+        return await asyncio.gather(*[
+            self._make_llm_request(
+                [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prefix + chunk}],
+                **kwargs
+            )
+            for chunk in chunks
+        ])
+    
+    async def _compact(self, text: str, budget: int, focus: str = "") -> str:
+        """Shrink text to at most budget tokens by map-reduce summarization.
+        
+        Text over budget is split into chunks that are summarized
+        concurrently (map); the joined summaries are summarized again if
+        they are still too long (reduce). A chunk whose summary fails is
+        truncated instead, as is whatever is left after the last round.
+        The tokens removed are counted in the agent's prompt_tokens_saved.
+        """
+        
+        original = self.tokenizer.count(text)
+        if original <= budget:
+            return text
+        
+        # Summaries are intermediate results; keep them out of any response stream
+        sink_token = _stream_sink.set(None)
+        try:
+            compacted = text
+            for _ in range(self.MAX_COMPACTION_ROUNDS):
+                chunks = self.tokenizer.split(compacted, self._content_budget(self.COMPACTION_PROMPT, budget))
+                summary_tokens = max(self.MIN_SUMMARY_TOKENS, budget // len(chunks))
+                summaries = await asyncio.gather(*[
+                    self._summarize_chunk(chunk, summary_tokens, focus) for chunk in chunks
+                ])
+                compacted = "\n\n".join(summaries)
+                if self.tokenizer.count(compacted) <= budget:
+                    break
+            compacted = self.tokenizer.truncate(compacted, budget)
+        finally:
+            _stream_sink.reset(sink_token)
+        
+        saved = original - self.tokenizer.count(compacted)
+        self.metrics["compactions"] += 1
+        self.metrics["prompt_tokens_saved"] += saved
+        LLM_PROMPT_TOKENS_SAVED.labels(self.name).inc(saved)
+        self.logger.info("%s: Compacted %s prompt tokens to %s", self.name, original, original - saved)
+        return compacted
+    
+    async def _summarize_chunk(self, chunk: str, max_tokens: int, focus: str) -> str:
+        focus_line = f"\n\nKeep what matters for: {focus}" if focus else ""
+        messages = [
+            {"role": "system", "content": self.COMPACTION_PROMPT},
+            {"role": "user", "content": f"{chunk}{focus_line}"}
+        ]
+        try:
+            return await self._make_llm_request(messages, max_tokens=max_tokens)
+        except Exception as e:
+            self.logger.warning("%s: Summarizing a chunk failed, truncating it: %s", self.name, e)
+            return self.tokenizer.truncate(chunk, max_tokens)
+    
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data. Override in subclasses for specific validation."""
         
         if not isinstance(input_data, dict):
-            self.logger.error(f"{self.name}: Input must be a dictionary")
+            self.logger.error("%s: Input must be a dictionary", self.name)
             return False
         
         # Check input length if text is provided
         if "text" in input_data:
             text = input_data["text"]
             if len(text) > self.config.max_input_length:
-                self.logger.error(f"{self.name}: Input text too long ({len(text)} > {self.config.max_input_length})")
+                self.logger.error("%s: Input text too long (%s > %s)", self.name, len(text), self.config.max_input_length)
+                return False
+            tokens = self.tokenizer.count(text)
+            if tokens > self.config.max_input_tokens:
+                self.logger.error("%s: Input text too long (%s > %s tokens)", self.name, tokens, self.config.max_input_tokens)
                 return False
         
         return True
     
     def filter_output(self, output: str) -> str:
-        """Filter output for safety. Override in subclasses for specific filtering."""
+        """Filter output for safety. Override in subclasses for specific filtering.
+        
+        Gives the same result as streaming the output through
+        output_filter.stream(), so buffered and streamed responses match.
+        """
         
         if not self.config.enable_output_filtering:
             return output
         
-        # Basic content filtering
-        filtered_output = output
-        
-        # Remove potential sensitive patterns (basic implementation)
-        sensitive_patterns = [
-            "api_key",
-            "password",
-            "secret",
-            "token"
-        ]
-        
-        for pattern in sensitive_patterns:
-            if pattern.lower() in filtered_output.lower():
-                self.logger.warning(f"{self.name}: Potential sensitive content detected and filtered")
-                filtered_output = filtered_output.replace(pattern, "[FILTERED]")
+        filtered_output, redactions = self.output_filter.filter(output)
+        if redactions:
+            self.logger.warning("%s: Potential sensitive content detected and filtered", self.name)
         
         return filtered_output
     
+    def close(self):
+        """Release files and connections the agent holds; the shared transport is closed by its owner."""
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get agent performance metrics."""
         
         success_rate = (self.metrics["successes"] / self.metrics["requests"]) * 100 if self.metrics["requests"] > 0 else 0
         avg_time = self.metrics["total_time"] / self.metrics["requests"] if self.metrics["requests"] > 0 else 0
+        avg_ttft = self.metrics["time_to_first_token"] / self.metrics["streams"] if self.metrics["streams"] > 0 else 0
         
         return {
             "name": self.name,
             "requests": self.metrics["requests"],
             "successes": self.metrics["successes"],
             "failures": self.metrics["failures"],
+            "coalesced": self.metrics["coalesced"],
             "success_rate": round(success_rate, 2),
-            "average_time": round(avg_time, 2)
+            "average_time": round(avg_time, 2),
+            "streams": self.metrics["streams"],
+            "average_time_to_first_token": round(avg_ttft, 3),
+            "compactions": self.metrics["compactions"],
+            "prompt_tokens_saved": self.metrics["prompt_tokens_saved"]
         }
     
     async def health_check(self) -> Dict[str, Any]:
-        """Perform agent health check."""
+        """Perform agent health check.
+        
+        Probes the endpoint with a models-list call rather than a billed
+        completion; concurrent probes from other agents share the call.
+        """
         
+        start_time = time.perf_counter()
         try:
-            # Simple test request
-            test_messages = [
-                {"role": "user", "content": "Hello, this is a health check. Please respond with 'OK'."}
-            ]
-            
-            response = await self._make_llm_request(test_messages, max_tokens=10)
+            models = await self.transport.list_models()
             
             return {
                 "agent": self.name,
                 "healthy": True,
                 "response_time": time.time(),
-                "test_response": response[:50]  # First 50 chars
+                "latency_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                "model_available": self.config.openai_model in models if models else None
             }
             
         except Exception as e:
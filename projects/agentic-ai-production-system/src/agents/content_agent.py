@@ -31,7 +31,15 @@ class ContentAgent(BaseAgent):
             style = input_data.get("style", "professional")
             length = input_data.get("length", "medium")
             
-            self.logger.info(f"ContentAgent: Generating {content_type} content: {content_request[:100]}...")
+            # Ground the content in upstream research when the workflow provides it
+            research_findings = input_data.get("research_findings")
+            if research_findings:
+                # Long findings are summarized to the prompt budget rather than sent whole. No
+                # per-request focus: sibling steps compacting the same findings share the calls
+                research_findings = await self._compact(research_findings, self.config.prompt_content_tokens)
+                content_request = f"{content_request}\n\nUse this research as background:\n{research_findings}"
+            
+            self.logger.info("ContentAgent: Generating %s content: %s...", content_type, content_request[:100])
             
             # Generate content based on type
             if content_type == "summary":
@@ -48,7 +56,7 @@ class ContentAgent(BaseAgent):
             return result
             
         except Exception as e:
-            self.logger.error(f"ContentAgent: Error generating content: {str(e)}")
+            self.logger.error("ContentAgent: Error generating content: %s", e)
             return {
                 "error": str(e),
                 "success": False,
@@ -344,28 +352,28 @@ class ContentAgent(BaseAgent):
         # Check for content request
         request = input_data.get("content_request", input_data.get("task", ""))
         if not request or len(request.strip()) < 5:
-            self.logger.error(f"{self.name}: Content request too short or missing")
+            self.logger.error("%s: Content request too short or missing", self.name)
             return False
         
         # Validate content type
         valid_types = ["explanation", "summary", "analysis", "creative", "technical"]
         content_type = input_data.get("content_type", "explanation")
         if content_type not in valid_types:
-            self.logger.error(f"{self.name}: Invalid content type: {content_type}")
+            self.logger.error("%s: Invalid content type: %s", self.name, content_type)
             return False
         
         # Validate style
         valid_styles = ["professional", "casual", "academic", "technical", "creative"]
         style = input_data.get("style", "professional")
         if style not in valid_styles:
-            self.logger.error(f"{self.name}: Invalid style: {style}")
+            self.logger.error("%s: Invalid style: %s", self.name, style)
             return False
         
         # Validate length
         valid_lengths = ["short", "medium", "long", "extended"]
         length = input_data.get("length", "medium")
         if length not in valid_lengths:
-            self.logger.error(f"{self.name}: Invalid length: {length}")
+            self.logger.error("%s: Invalid length: %s", self.name, length)
             return False
         
         return True
@@ -3,18 +3,42 @@ Coordinator Agent - Orchestrates workflow and manages agent communication.
 """
 
 import asyncio
-from typing import Dict, Any, List
-from .base_agent import BaseAgent
+import time
+from typing import Dict, Any, List, AsyncIterator, Callable, Optional
+from .base_agent import BaseAgent, stream_to
 from .research_agent import ResearchAgent
 from .content_agent import ContentAgent
 from .validation_agent import ValidationAgent
+from ..core.workflow import normalize_steps, run_dag, topological_order
+from ..core.rate_limiter import request_context
+from ..core.planning import PlanResolver
+from ..core.cache import TieredCache
+from ..core.metrics import WORKFLOW_SECONDS
+from ..core.history import WorkflowHistory
+from ..core.checkpoint import CheckpointStore, workflow_id_for, step_key
+from ..core.single_flight import SingleFlight
 
 class CoordinatorAgent(BaseAgent):
     """Coordinates multi-agent workflows and manages task distribution."""
     
     def __init__(self, config, logger):
         super().__init__("CoordinatorAgent", config, logger)
-        self.workflow_history = []
+        # Recent workflows in memory; every workflow in the queryable log
+        self.workflow_history = WorkflowHistory(
+            max_recent=config.workflow_history_size,
+            db_path=config.workflow_history_path or None,
+            max_rows=config.workflow_history_max_rows
+        )
+        
+        # Completed steps are checkpointed so failed or interrupted workflows can resume
+        self.checkpoints = CheckpointStore(
+            config.checkpoint_path or None,
+            ttl_seconds=config.checkpoint_ttl,
+            max_workflows=config.checkpoint_max_workflows
+        )
+        # An in-memory store only helps workflows that can be found again in this process
+        self._checkpoint_all = bool(config.checkpoint_path)
+        self._step_flight = SingleFlight()
         
         # Initialize specialized agents
         self.research_agent = ResearchAgent(config, logger)
@@ -26,50 +50,206 @@ class CoordinatorAgent(BaseAgent):
             "ContentAgent": self.content_agent,
             "ValidationAgent": self.validation_agent
         }
+        
+        # Known task classes use plan templates; only novel tasks are planned by the LLM
+        self.plan_resolver = PlanResolver(
+            self.agents.keys(),
+            max_steps=config.max_iterations,
+            cache=TieredCache(
+                max_entries=config.plan_cache_max_entries,
+                ttl_seconds=0,
+                semantic_threshold=config.plan_cache_semantic_threshold,
+                name="plan"
+            )
+        )
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process coordination request and orchestrate workflow."""
+        """Process coordination request and orchestrate workflow.
+        
+        Pass an idempotency_key to make retries safe: a repeated request
+        replays the completed response, or resumes the workflow if some
+        steps had not succeeded. The response's workflow_id can also be
+        given to resume() when the workflow was checkpointed: always with
+        a checkpoint_path, otherwise only with an idempotency_key or
+        "checkpoint": True in the input.
+        """
         
         if not self.validate_input(input_data):
             return {"error": "Invalid input data", "success": False}
         
+        return await self._run(input_data)
+    
+    async def resume(self, workflow_id: str) -> Dict[str, Any]:
+        """Resume a checkpointed workflow, re-running only the steps that did not succeed."""
+        
+        record = await self._checkpoint(self.checkpoints.get_workflow, workflow_id)
+        if record is None:
+            return {"error": f"Unknown workflow: {workflow_id}", "success": False, "agent": self.name}
+        
+        return await self._run({**record["input"], "workflow_id": workflow_id})
+    
+    def get_unfinished_workflows(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Workflows that can be resumed, e.g. after a restart."""
+        return self.checkpoints.unfinished(limit)
+    
+    async def process_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Process a coordination request, yielding events as the workflow runs.
+        
+        Events are {"type": "plan"}, {"type": "step"} as each step finishes,
+        {"type": "delta", "text": ...} for the final agent's output as it is
+        generated (already filtered), and a closing {"type": "result"} with
+        the same fields process() returns plus time_to_first_token.
+        """
+        
+        if not self.validate_input(input_data):
+            yield {"type": "result", "error": "Invalid input data", "success": False}
+            return
+        
+        start_time = time.perf_counter()
+        first_token = None
+        events = asyncio.Queue()
+        
+        def emit(event: Dict[str, Any]):
+            events.put_nowait(event)
+        
+        async def run():
+            try:
+                result = await self._run(input_data, emit)
+            except Exception as e:
+                result = {"error": str(e), "success": False, "agent": self.name}
+            emit({"type": "result", **result})
+        
+        runner = asyncio.ensure_future(run())
+        try:
+            while True:
+                event = await events.get()
+                if event["type"] == "delta" and first_token is None:
+                    first_token = time.perf_counter() - start_time
+                if event["type"] == "result":
+                    event["time_to_first_token"] = round(first_token, 4) if first_token is not None else None
+                    event["total_seconds"] = round(time.perf_counter() - start_time, 4)
+                    yield event
+                    break
+                yield event
+        finally:
+            # The consumer went away (e.g. the client disconnected): stop the workflow
+            if not runner.done():
+                runner.cancel()
+    
+    async def _checkpoint(self, method, *args):
+        # Checkpoint and history commits block on SQLite; keep the loop free meanwhile, as the job worker does
+        return await asyncio.get_event_loop().run_in_executor(None, method, *args)
+    
+    def _checkpointed(self, input_data: Dict[str, Any]) -> bool:
+        return self._checkpoint_all or any(
+            input_data.get(key) for key in ("workflow_id", "idempotency_key", "checkpoint")
+        )
+    
+    async def _run(self, input_data: Dict[str, Any],
+                   emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Plan and execute a workflow; emit receives streaming events if given."""
+        
+        start_time = time.perf_counter()
+        task = input_data.get("task", "")
+        workflow_id = input_data.get("workflow_id") or workflow_id_for(input_data.get("idempotency_key"))
+        checkpointed = self._checkpointed(input_data)
         try:
-            task = input_data.get("task", "")
             context = input_data.get("context", {})
             
-            self.logger.info(f"CoordinatorAgent: Processing task: {task[:100]}...")
+            record = await self._checkpoint(self.checkpoints.get_workflow, workflow_id) if checkpointed else None
+            if record and record["status"] == "completed" and record["response"]:
+                self.checkpoints.stats["workflows_replayed"] += 1
+                self.logger.info("CoordinatorAgent: Replaying completed workflow %s", workflow_id)
+                response = {**record["response"], "replayed": True}
+                if emit:
+                    emit({"type": "plan", "workflow_plan": response.get("workflow_plan")})
+                    final_output = (response.get("result") or {}).get("final_output")
+                    if final_output:
+                        emit({"type": "delta", "step": None, "text": final_output})
+                return response
             
-            # Analyze task and determine workflow
-            workflow_plan = await self._create_workflow_plan(task, context)
+            self.logger.info("CoordinatorAgent: Processing task: %s...", task[:100])
             
-            # Execute workflow
-            result = await self._execute_workflow(workflow_plan, input_data)
+            # Every LLM call in this workflow is queued under the caller's tenant and priority
+            with request_context(input_data.get("tenant", "default"), input_data.get("priority", 1)):
+                # A resumed workflow keeps its original plan
+                if record and record["plan"]:
+                    workflow_plan = record["plan"]
+                    self.checkpoints.stats["workflows_resumed"] += 1
+                    self.logger.info("CoordinatorAgent: Resuming workflow %s", workflow_id)
+                else:
+                    workflow_plan = await self._create_workflow_plan(task, context)
+                if checkpointed:
+                    stored_input = {key: value for key, value in input_data.items() if key != "workflow_id"}
+                    await self._checkpoint(self.checkpoints.start, workflow_id, stored_input, workflow_plan)
+                if emit:
+                    emit({"type": "plan", "workflow_plan": workflow_plan})
+                
+                # Execute workflow
+                result = await self._execute_workflow(
+                    workflow_plan, input_data, emit=emit, workflow_id=workflow_id if checkpointed else None
+                )
             
             # Store workflow history
-            self.workflow_history.append({
+            duration = time.perf_counter() - start_time
+            succeeded = all(step.get("success") for step in result.get("workflow_results", {}).values())
+            await self._checkpoint(self.workflow_history.append, {
                 "task": task,
                 "workflow_plan": workflow_plan,
                 "result": result,
-                "timestamp": asyncio.get_event_loop().time()
+                "success": succeeded,
+                "duration": duration,
+                "timestamp": time.time()
             })
+            WORKFLOW_SECONDS.labels(workflow_plan.get("source", "llm")).observe(duration)
             
-            return {
+            response = {
                 "success": True,
                 "result": result,
                 "workflow_plan": workflow_plan,
+                "workflow_id": workflow_id,
                 "agent": self.name
             }
+            if checkpointed:
+                await self._checkpoint(
+                    self.checkpoints.finish, workflow_id, "completed" if succeeded else "incomplete", response
+                )
+            return response
             
         except Exception as e:
-            self.logger.error(f"CoordinatorAgent: Error processing task: {str(e)}")
+            self.logger.error("CoordinatorAgent: Error processing task: %s", e)
+            await self._checkpoint(self.workflow_history.append, {
+                "task": task,
+                "error": str(e),
+                "success": False,
+                "duration": time.perf_counter() - start_time,
+                "timestamp": time.time()
+            })
+            if checkpointed and await self._checkpoint(self.checkpoints.get_workflow, workflow_id):
+                await self._checkpoint(self.checkpoints.finish, workflow_id, "incomplete")
             return {
                 "error": str(e),
                 "success": False,
+                "workflow_id": workflow_id,
                 "agent": self.name
             }
     
     async def _create_workflow_plan(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a workflow plan based on the task requirements."""
+        """Create a workflow plan based on the task requirements.
+        
+        The plan's "source" says how it was resolved: template, cache, llm,
+        or fallback (a single content step) when the planner fails.
+        """
+        
+        plan = await self.plan_resolver.resolve(task, context, self._plan_with_llm)
+        if plan["source"] == "fallback":
+            self.logger.error("CoordinatorAgent: Error creating workflow plan: %s", plan.get("reason"))
+        else:
+            self.logger.info("CoordinatorAgent: Using %s plan %s", plan["source"], plan.get("template", ""))
+        return plan
+    
+    async def _plan_with_llm(self, task: str, context: Dict[str, Any]) -> str:
+        """Ask the LLM for a JSON workflow plan for a task no template covers."""
         
         messages = [
             {
@@ -79,13 +259,17 @@ class CoordinatorAgent(BaseAgent):
                 
                 Available agents:
                 - ResearchAgent: Information gathering and analysis
+                  (research_type: general, factual, analytical, comparative)
                 - ContentAgent: Content generation and refinement
+                  (content_type: explanation, summary, analysis, creative, technical)
                 - ValidationAgent: Quality assurance and safety checks
+                  (validation_type: comprehensive, safety, quality, technical)
                 
-                Respond with a JSON structure containing:
+                Respond with only a JSON structure containing:
                 {
                     "steps": [
-                        {"agent": "agent_name", "action": "description", "priority": 1-3}
+                        {"id": "step_id", "agent": "agent_name", "action": "description",
+                         "priority": 1-3, "depends_on": ["step_id", ...]}
                     ],
                     "estimated_time": "time_estimate",
                     "complexity": "low|medium|high"
@@ -97,83 +281,131 @@ class CoordinatorAgent(BaseAgent):
             }
         ]
         
-        try:
-            response = await self._make_llm_request(messages, max_tokens=500)
-            
-            # Parse the response (simplified - in production, use proper JSON parsing)
-            workflow_plan = {
-                "steps": [
-                    {"agent": "ResearchAgent", "action": "Gather relevant information", "priority": 1},
-                    {"agent": "ContentAgent", "action": "Generate response", "priority": 2},
-                    {"agent": "ValidationAgent", "action": "Validate output", "priority": 3}
-                ],
-                "estimated_time": "30-60 seconds",
-                "complexity": "medium",
-                "raw_response": response
-            }
-            
-            return workflow_plan
-            
-        except Exception as e:
-            self.logger.error(f"CoordinatorAgent: Error creating workflow plan: {str(e)}")
-            # Fallback to default workflow
-            return {
-                "steps": [
-                    {"agent": "ContentAgent", "action": "Direct processing", "priority": 1}
-                ],
-                "estimated_time": "15-30 seconds",
-                "complexity": "low",
-                "fallback": True
-            }
+        return await self._make_llm_request(messages, max_tokens=500, temperature=0)
     
-    async def _execute_workflow(self, workflow_plan: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the planned workflow."""
+    async def _execute_workflow(self, workflow_plan: Dict[str, Any], input_data: Dict[str, Any],
+                                max_parallel_steps: int = None,
+                                emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute the planned workflow as a DAG.
         
-        results = {}
+        Steps whose dependencies have finished run concurrently, up to
+        max_parallel_steps (config.max_parallel_steps by default; 1 runs
+        the steps serially). Each step receives its dependencies' outputs.
+        With emit, step completions are reported and the final agent's LLM
+        output is streamed as delta events.
         
-        for step in workflow_plan.get("steps", []):
-            agent_name = step.get("agent")
-            action = step.get("action")
-            
-            self.logger.info(f"CoordinatorAgent: Executing step - {agent_name}: {action}")
-            
-            # Simulate agent execution (in a real system, this would call actual agents)
-            step_result = await self._simulate_agent_execution(agent_name, action, input_data)
-            results[agent_name] = step_result
+        With a workflow_id, successful steps are checkpointed under their
+        idempotency key: steps already checkpointed return their saved
+        result, and concurrent runs of the same step share one execution.
+        """
+        
+        steps = normalize_steps(workflow_plan.get("steps", []))
+        if max_parallel_steps is None:
+            max_parallel_steps = self.config.max_parallel_steps
+        stream_step = self._stream_step(steps) if emit else None
+        
+        def emit_delta(text: str):
+            emit({"type": "delta", "step": stream_step, "text": text})
+        
+        async def run_agent(step, upstream):
+            self.logger.info("CoordinatorAgent: Executing step %s - %s: %s", step["id"], step.get("agent"), step.get("action"))
+            if step["id"] == stream_step:
+                with stream_to(emit_delta):
+                    return await self._simulate_agent_execution(step.get("agent"), step.get("action"), input_data, step, upstream)
+            return await self._simulate_agent_execution(step.get("agent"), step.get("action"), input_data, step, upstream)
+        
+        async def run_checkpointed(step, upstream, key):
+            result = await run_agent(step, upstream)
+            if result.get("success"):
+                await self._checkpoint(self.checkpoints.save_step, key, workflow_id, step["id"], result)
+            return result
+        
+        async def execute_step(step, upstream):
+            if workflow_id is None:
+                result = await run_agent(step, upstream)
+            else:
+                key = step_key(workflow_id, step)
+                result = await self._checkpoint(self.checkpoints.get_step, key)
+                if result is not None:
+                    result = {**result, "checkpointed": True}
+                    if step["id"] == stream_step and result.get("output"):
+                        emit_delta(str(result["output"]))
+                else:
+                    result, _ = await self._step_flight.do(key, lambda: run_checkpointed(step, upstream, key))
+            if emit:
+                emit({"type": "step", "step": step["id"], "agent": step.get("agent"), "success": result.get("success", False)})
+            return result
+        
+        run = await run_dag(steps, execute_step, max_concurrency=max_parallel_steps)
+        results = run["results"]
         
         return {
             "workflow_results": results,
             "final_output": self._synthesize_results(results),
-            "execution_summary": f"Completed {len(workflow_plan.get('steps', []))} steps"
+            "execution_summary": f"Completed {len(steps)} steps",
+            "timings": {
+                "steps": run["timings"],
+                "critical_path": run["critical_path"],
+                "critical_path_seconds": run["critical_path_seconds"],
+                "wall_seconds": run["wall_seconds"]
+            }
         }
     
-    async def _simulate_agent_execution(self, agent_name: str, action: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _stream_step(steps: List[Dict[str, Any]]) -> Optional[str]:
+        """The step whose output users read first: the last content step, else the last step."""
+        
+        order = topological_order(steps)
+        agents = {step["id"]: step.get("agent") for step in steps}
+        content_steps = [step_id for step_id in order if agents[step_id] == "ContentAgent"]
+        if content_steps:
+            return content_steps[-1]
+        return order[-1] if order else None
+    
+    @staticmethod
+    def _upstream_outputs(upstream: Dict[str, Any], agent_name: str) -> List[str]:
+        """Successful outputs of direct dependencies run by the given agent."""
+        return [
+            result["output"] for result in (upstream or {}).values()
+            if result.get("agent") == agent_name and result.get("success") and result.get("output")
+        ]
+    
+    async def _simulate_agent_execution(self, agent_name: str, action: str, input_data: Dict[str, Any],
+                                        step: Dict[str, Any] = None, upstream: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute actual agent calls instead of simulation."""
         
+        step = step or {}
+        
         try:
             if agent_name in self.agents:
                 agent = self.agents[agent_name]
+                task = step.get("query") or input_data.get("task", "")
                 
                 # Prepare agent-specific input
                 agent_input = {
-                    "task": input_data.get("task", ""),
+                    "task": task,
                     "context": input_data.get("context", {}),
                     "action": action
                 }
                 
-                # Add agent-specific parameters
+                # Add agent-specific parameters, feeding in upstream outputs
                 if agent_name == "ResearchAgent":
-                    agent_input["query"] = input_data.get("task", "")
-                    agent_input["research_type"] = "general"
+                    agent_input["query"] = task
+                    agent_input["research_type"] = step.get("research_type", "general")
                 elif agent_name == "ContentAgent":
-                    agent_input["content_request"] = input_data.get("task", "")
-                    agent_input["content_type"] = "explanation"
-                    agent_input["style"] = "professional"
-                    agent_input["length"] = "medium"
+                    agent_input["content_request"] = task
+                    agent_input["content_type"] = step.get("content_type", "explanation")
+                    agent_input["style"] = step.get("style", "professional")
+                    agent_input["length"] = step.get("length", "medium")
+                    research = self._upstream_outputs(upstream, "ResearchAgent")
+                    if research:
+                        agent_input["research_findings"] = "\n\n".join(research)
                 elif agent_name == "ValidationAgent":
-                    # For validation, we need content from previous agents
-                    agent_input["content"] = input_data.get("content", input_data.get("task", ""))
-                    agent_input["validation_type"] = "comprehensive"
+                    # Validate what the content step produced, not the task text
+                    drafts = self._upstream_outputs(upstream, "ContentAgent")
+                    agent_input["content"] = "\n\n".join(drafts) if drafts else input_data.get("content", input_data.get("task", ""))
+                    agent_input["validation_type"] = step.get("validation_type", "comprehensive")
                 
                 # Execute the agent
                 result = await agent.process(agent_input)
@@ -190,7 +422,7 @@ class CoordinatorAgent(BaseAgent):
                 return await self._llm_agent_simulation(agent_name, action, input_data)
                 
         except Exception as e:
-            self.logger.error(f"CoordinatorAgent: Error executing {agent_name}: {str(e)}")
+            self.logger.error("CoordinatorAgent: Error executing %s: %s", agent_name, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -247,15 +479,33 @@ class CoordinatorAgent(BaseAgent):
         # Simple synthesis - in production, this could be more sophisticated
         return "\n\n".join(successful_results)
     
-    def get_workflow_history(self) -> List[Dict[str, Any]]:
-        """Get workflow execution history."""
-        return self.workflow_history[-10:]  # Return last 10 workflows
+    def get_workflow_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recent workflows, oldest first.
+        
+        Older workflows are in the log: see workflow_history.query() and
+        workflow_history.aggregate().
+        """
+        return self.workflow_history.recent(limit)
+    
+    def close(self):
+        """Close the workflow log, the checkpoint store and every agent's caches."""
+        
+        for agent in self.agents.values():
+            agent.close()
+        self.plan_resolver.cache.close()
+        self.checkpoints.close()
+        self.workflow_history.close()
     
     def get_all_agent_metrics(self) -> Dict[str, Any]:
         """Get metrics from all agents."""
         
         metrics = {
-            "coordinator": self.get_metrics()
+            "coordinator": {
+                **self.get_metrics(),
+                "planning": self.plan_resolver.get_stats(),
+                "history": self.workflow_history.get_stats(),
+                "checkpoints": self.checkpoints.get_stats()
+            }
         }
         
         for agent_name, agent in self.agents.items():
@@ -268,21 +518,23 @@ class CoordinatorAgent(BaseAgent):
         return metrics
     
     async def health_check_all_agents(self) -> Dict[str, Any]:
-        """Perform health check on all agents."""
+        """Perform health check on all agents concurrently."""
         
-        health_results = {
-            "coordinator": await self.health_check()
-        }
+        agents = {"coordinator": self, **{name.lower(): agent for name, agent in self.agents.items()}}
+        results = await asyncio.gather(
+            *[agent.health_check() for agent in agents.values()],
+            return_exceptions=True
+        )
         
-        for agent_name, agent in self.agents.items():
-            try:
-                health_results[agent_name.lower()] = await agent.health_check()
-            except Exception as e:
-                health_results[agent_name.lower()] = {
-                    "agent": agent_name,
+        health_results = {}
+        for (key, agent), result in zip(agents.items(), results):
+            if isinstance(result, Exception):
+                result = {
+                    "agent": agent.name,
                     "healthy": False,
-                    "error": str(e)
+                    "error": str(result)
                 }
+            health_results[key] = result
         
         # Overall system health
         all_healthy = all(result.get("healthy", False) for result in health_results.values())
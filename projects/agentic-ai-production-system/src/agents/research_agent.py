@@ -5,13 +5,25 @@ Research Agent - Handles information gathering and analysis.
 import asyncio
 from typing import Dict, Any, List
 from .base_agent import BaseAgent
+from ..core.cache import TieredCache, normalize_query, stable_digest
 
 class ResearchAgent(BaseAgent):
     """Specialized agent for research and information gathering tasks."""
     
     def __init__(self, config, logger):
         super().__init__("ResearchAgent", config, logger)
-        self.research_cache = {}
+        self.research_cache = TieredCache(
+            max_entries=config.research_cache_max_entries,
+            ttl_seconds=config.research_cache_ttl,
+            db_path=config.research_cache_path or None,
+            disk_max_entries=config.research_cache_disk_max_entries,
+            disk_max_bytes=config.research_cache_disk_max_bytes,
+            semantic_threshold=config.research_cache_semantic_threshold,
+            name="research"
+        )
+    
+    def close(self):
+        self.research_cache.close()
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process research request and gather relevant information."""
@@ -23,13 +35,16 @@ class ResearchAgent(BaseAgent):
             query = input_data.get("query", input_data.get("task", ""))
             research_type = input_data.get("research_type", "general")
             
-            self.logger.info(f"ResearchAgent: Processing research query: {query[:100]}...")
+            self.logger.info("ResearchAgent: Processing research query: %s...", query[:100])
             
-            # Check cache first
-            cache_key = f"{research_type}:{hash(query)}"
-            if cache_key in self.research_cache:
+            # Check cache first; the digest is stable across processes, unlike hash()
+            normalized = normalize_query(query)
+            namespace = f"{self.config.openai_model}:{research_type}"
+            cache_key = stable_digest(namespace, normalized)
+            cached = await self.research_cache.aget(cache_key, namespace=namespace, text=normalized)
+            if cached is not None:
                 self.logger.info("ResearchAgent: Using cached result")
-                return self.research_cache[cache_key]
+                return cached
             
             # Perform research based on type
             if research_type == "factual":
@@ -41,13 +56,18 @@ class ResearchAgent(BaseAgent):
             else:
                 result = await self._general_research(query)
             
-            # Cache the result
-            self.research_cache[cache_key] = result
+            # Cache successful results only, so transient failures are retried next time
+            if result.get("success"):
+                await self.research_cache.aset(
+                    cache_key, result,
+                    cost_tokens=self._estimate_cost_tokens(query, result),
+                    namespace=namespace, text=normalized
+                )
             
             return result
             
         except Exception as e:
-            self.logger.error(f"ResearchAgent: Error processing research: {str(e)}")
+            self.logger.error("ResearchAgent: Error processing research: %s", e)
             return {
                 "error": str(e),
                 "success": False,
@@ -259,18 +279,24 @@ class ResearchAgent(BaseAgent):
         # Check for query or task
         query = input_data.get("query", input_data.get("task", ""))
         if not query or len(query.strip()) < 3:
-            self.logger.error(f"{self.name}: Query too short or missing")
+            self.logger.error("%s: Query too short or missing", self.name)
             return False
         
         # Validate research type if provided
         valid_types = ["general", "factual", "analytical", "comparative"]
         research_type = input_data.get("research_type", "general")
         if research_type not in valid_types:
-            self.logger.error(f"{self.name}: Invalid research type: {research_type}")
+            self.logger.error("%s: Invalid research type: %s", self.name, research_type)
             return False
         
         return True
     
+    @staticmethod
+    def _estimate_cost_tokens(query: str, result: Dict[str, Any]) -> int:
+        """Rough tokens spent producing a result (system prompt + query + answer, 4 chars per token)."""
+        answer = sum(len(str(value)) for value in result.values())
+        return 100 + (len(query) + answer) // 4
+    
     def clear_cache(self):
         """Clear the research cache."""
         self.research_cache.clear()
@@ -278,7 +304,21 @@ class ResearchAgent(BaseAgent):
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        stats = self.research_cache.get_stats()
         return {
             "cache_size": len(self.research_cache),
-            "cache_keys": list(self.research_cache.keys())[:5]  # Show first 5 keys
-        }
\ No newline at end of file
+            "cache_keys": self.research_cache.keys()[:5],  # Show first 5 keys
+            "hit_ratio": stats["hit_ratio"],
+            "hits": {
+                "memory": stats["memory_hits"],
+                "disk": stats["disk_hits"],
+                "semantic": stats["semantic_hits"]
+            },
+            "misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "expirations": stats["expirations"],
+            "memory_bytes": stats["memory_bytes"],
+            "disk_entries": stats["disk_entries"],
+            "disk_bytes": stats["disk_bytes"],
+            "llm_tokens_saved": stats["tokens_saved"]
+        }
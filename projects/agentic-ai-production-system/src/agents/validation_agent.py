@@ -4,8 +4,12 @@ Validation Agent - Ensures output quality and safety.
 
 import asyncio
 import re
-from typing import Dict, Any, List, Tuple
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
 from .base_agent import BaseAgent
+from ..core.output_filter import REDACTION_PATTERNS
+from ..core.text_analytics import TextAnalyzer, TextStats, bracket_balance
 
 class ValidationAgent(BaseAgent):
     """Specialized agent for quality assurance and safety validation."""
@@ -13,12 +17,17 @@ class ValidationAgent(BaseAgent):
     def __init__(self, config, logger):
         super().__init__("ValidationAgent", config, logger)
         self.safety_patterns = self._initialize_safety_patterns()
+        self.safety_scanner, self.safety_groups = self._compile_safety_patterns(self.safety_patterns)
+        self.term_variations = self._initialize_term_variations()
+        self.text_analyzer = TextAnalyzer(self.term_variations)
         self.quality_metrics = {
             "validations_performed": 0,
             "safety_issues_detected": 0,
             "quality_issues_detected": 0,
-            "validations_passed": 0
+            "validations_passed": 0,
+            "llm_checks_skipped": 0
         }
+        self.latencies = deque(maxlen=1000)
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process validation request for content quality and safety."""
@@ -31,9 +40,10 @@ class ValidationAgent(BaseAgent):
             validation_type = input_data.get("validation_type", "comprehensive")
             strict_mode = input_data.get("strict_mode", False)
             
-            self.logger.info(f"ValidationAgent: Validating content ({validation_type} mode)")
+            self.logger.info("ValidationAgent: Validating content (%s mode)", validation_type)
             
             self.quality_metrics["validations_performed"] += 1
+            start_time = time.perf_counter()
             
             # Perform validation based on type
             if validation_type == "safety":
@@ -46,6 +56,9 @@ class ValidationAgent(BaseAgent):
                 result = await self._comprehensive_validation(content, strict_mode)
             
             # Update metrics
+            self.latencies.append(time.perf_counter() - start_time)
+            if result.get("llm_checks_skipped"):
+                self.quality_metrics["llm_checks_skipped"] += 1
             if result.get("success") and result.get("validation_passed"):
                 self.quality_metrics["validations_passed"] += 1
             
@@ -58,7 +71,7 @@ class ValidationAgent(BaseAgent):
             return result
             
         except Exception as e:
-            self.logger.error(f"ValidationAgent: Error during validation: {str(e)}")
+            self.logger.error("ValidationAgent: Error during validation: %s", e)
             return {
                 "error": str(e),
                 "success": False,
@@ -66,19 +79,31 @@ class ValidationAgent(BaseAgent):
             }
     
     async def _comprehensive_validation(self, content: str, strict_mode: bool) -> Dict[str, Any]:
-        """Perform comprehensive validation including safety and quality checks."""
+        """Perform comprehensive validation including safety and quality checks.
         
-        # Run all validation types
-        safety_result = await self._safety_validation(content, strict_mode)
-        quality_result = await self._quality_validation(content, strict_mode)
+        Local checks run first; in strict mode any issue they find fails the
+        content without calling the LLM. Otherwise the LLM safety and quality
+        checks run concurrently.
+        """
         
-        # Combine results
-        all_issues = []
-        if safety_result.get("safety_issues"):
-            all_issues.extend(safety_result["safety_issues"])
-        if quality_result.get("quality_issues"):
-            all_issues.extend(quality_result["quality_issues"])
+        stats = self.text_analyzer.analyze(content)
+        safety_issues = self._local_safety_issues(content, strict_mode)
+        quality_issues = self._check_basic_quality(content, strict_mode, stats)
+        
+        llm_checks_skipped = strict_mode and bool(safety_issues or quality_issues)
+        if not llm_checks_skipped:
+            llm_safety_result, llm_quality_result = await asyncio.gather(
+                self._llm_safety_check(content),
+                self._llm_quality_check(content)
+            )
+            safety_issues.extend(llm_safety_result.get("issues", []))
+            quality_issues.extend(llm_quality_result.get("issues", []))
+        
+        safety_result = self._safety_result(content, strict_mode, safety_issues, llm_checks_skipped)
+        quality_result = self._quality_result(content, strict_mode, quality_issues, llm_checks_skipped, stats)
         
+        # Combine results
+        all_issues = safety_issues + quality_issues
         validation_passed = len(all_issues) == 0
         
         return {
@@ -94,30 +119,52 @@ class ValidationAgent(BaseAgent):
             "quality_issues": quality_result.get("quality_issues", []),
             "recommendations": self._generate_recommendations(all_issues),
             "strict_mode": strict_mode,
+            "llm_checks_skipped": llm_checks_skipped,
             "agent": self.name
         }
     
+    def _local_safety_issues(self, content: str, strict_mode: bool) -> List[Dict[str, Any]]:
+        """Pattern-based safety checks: one scan of the content for every safety pattern."""
+        
+        matched = set()
+        position = 0
+        while len(matched) < len(self.safety_groups):
+            match = self.safety_scanner.search(content, position)
+            if match is None:
+                break
+            matched.add(match.lastgroup)
+            # Resume inside the match so patterns overlapping it are still found
+            position = match.start() + 1
+        
+        # Report in declaration order, one issue per matching pattern
+        return [
+            {
+                "type": "safety",
+                "category": category,
+                "severity": "high" if strict_mode else "medium",
+                "description": f"Potential {category} content detected",
+                "pattern_matched": pattern[:50] + "..." if len(pattern) > 50 else pattern
+            }
+            for group, (category, pattern) in self.safety_groups.items()
+            if group in matched
+        ]
+    
     async def _safety_validation(self, content: str, strict_mode: bool) -> Dict[str, Any]:
         """Perform safety validation to detect harmful or inappropriate content."""
         
-        safety_issues = []
-        
-        # Pattern-based safety checks
-        for category, patterns in self.safety_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    safety_issues.append({
-                        "category": category,
-                        "severity": "high" if strict_mode else "medium",
-                        "description": f"Potential {category} content detected",
-                        "pattern_matched": pattern[:50] + "..." if len(pattern) > 50 else pattern
-                    })
+        safety_issues = self._local_safety_issues(content, strict_mode)
         
-        # LLM-based safety assessment
-        llm_safety_result = await self._llm_safety_check(content)
-        if llm_safety_result.get("issues"):
-            safety_issues.extend(llm_safety_result["issues"])
+        # LLM-based safety assessment, unless strict mode has already failed the content
+        llm_checks_skipped = strict_mode and bool(safety_issues)
+        if not llm_checks_skipped:
+            llm_safety_result = await self._llm_safety_check(content)
+            if llm_safety_result.get("issues"):
+                safety_issues.extend(llm_safety_result["issues"])
         
+        return self._safety_result(content, strict_mode, safety_issues, llm_checks_skipped)
+    
+    def _safety_result(self, content: str, strict_mode: bool, safety_issues: List[Dict[str, Any]],
+                       llm_checks_skipped: bool) -> Dict[str, Any]:
         # Calculate safety score
         safety_score = max(0, 100 - (len(safety_issues) * 20))
         
@@ -129,22 +176,28 @@ class ValidationAgent(BaseAgent):
             "safety_issues": safety_issues,
             "content_length": len(content),
             "strict_mode": strict_mode,
+            "llm_checks_skipped": llm_checks_skipped,
             "agent": self.name
         }
     
     async def _quality_validation(self, content: str, strict_mode: bool) -> Dict[str, Any]:
         """Perform quality validation to assess content quality and coherence."""
         
-        quality_issues = []
-        
         # Basic quality checks
-        quality_issues.extend(self._check_basic_quality(content, strict_mode))
+        stats = self.text_analyzer.analyze(content)
+        quality_issues = self._check_basic_quality(content, strict_mode, stats)
         
-        # LLM-based quality assessment
-        llm_quality_result = await self._llm_quality_check(content)
-        if llm_quality_result.get("issues"):
-            quality_issues.extend(llm_quality_result["issues"])
+        # LLM-based quality assessment, unless strict mode has already failed the content
+        llm_checks_skipped = strict_mode and bool(quality_issues)
+        if not llm_checks_skipped:
+            llm_quality_result = await self._llm_quality_check(content)
+            if llm_quality_result.get("issues"):
+                quality_issues.extend(llm_quality_result["issues"])
         
+        return self._quality_result(content, strict_mode, quality_issues, llm_checks_skipped, stats)
+    
+    def _quality_result(self, content: str, strict_mode: bool, quality_issues: List[Dict[str, Any]],
+                        llm_checks_skipped: bool, stats: TextStats) -> Dict[str, Any]:
         # Calculate quality score
         quality_score = max(0, 100 - (len(quality_issues) * 15))
         
@@ -155,8 +208,9 @@ class ValidationAgent(BaseAgent):
             "quality_score": quality_score,
             "quality_issues": quality_issues,
             "content_length": len(content),
-            "readability_score": self._calculate_readability_score(content),
+            "readability_score": self._calculate_readability_score(content, stats),
             "strict_mode": strict_mode,
+            "llm_checks_skipped": llm_checks_skipped,
             "agent": self.name
         }
     
@@ -164,21 +218,22 @@ class ValidationAgent(BaseAgent):
         """Perform technical validation for code, documentation, or technical content."""
         
         technical_issues = []
+        stats = self.text_analyzer.analyze(content)
         
-        # Check for code blocks and validate syntax
-        code_blocks = re.findall(r'```[\w]*\n(.*?)\n```', content, re.DOTALL)
-        for i, code_block in enumerate(code_blocks):
-            code_issues = self._validate_code_block(code_block, i)
-            technical_issues.extend(code_issues)
+        # Check code blocks for unbalanced brackets
+        for i, (mismatched, unclosed) in enumerate(stats.code_blocks):
+            technical_issues.extend(self._bracket_issues(mismatched, unclosed, i))
         
         # Check technical terminology consistency
-        terminology_issues = self._check_terminology_consistency(content)
+        terminology_issues = self._check_terminology_consistency(content, stats)
         technical_issues.extend(terminology_issues)
         
-        # LLM-based technical assessment
-        llm_technical_result = await self._llm_technical_check(content)
-        if llm_technical_result.get("issues"):
-            technical_issues.extend(llm_technical_result["issues"])
+        # LLM-based technical assessment, unless strict mode has already failed the content
+        llm_checks_skipped = strict_mode and bool(technical_issues)
+        if not llm_checks_skipped:
+            llm_technical_result = await self._llm_technical_check(content)
+            if llm_technical_result.get("issues"):
+                technical_issues.extend(llm_technical_result["issues"])
         
         # Calculate technical score
         technical_score = max(0, 100 - (len(technical_issues) * 10))
@@ -189,19 +244,17 @@ class ValidationAgent(BaseAgent):
             "validation_passed": len(technical_issues) == 0,
             "technical_score": technical_score,
             "technical_issues": technical_issues,
-            "code_blocks_found": len(code_blocks),
+            "code_blocks_found": len(stats.code_blocks),
             "content_length": len(content),
             "strict_mode": strict_mode,
+            "llm_checks_skipped": llm_checks_skipped,
             "agent": self.name
         }
     
     async def _llm_safety_check(self, content: str) -> Dict[str, Any]:
         """Use LLM to perform safety assessment."""
         
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a content safety specialist. Analyze the given content for potential safety issues.
+        system_prompt = """You are a content safety specialist. Analyze the given content for potential safety issues.
                 
                 Check for:
                 - Harmful or dangerous instructions
@@ -216,15 +269,13 @@ class ValidationAgent(BaseAgent):
                     "issues": [{"type": "issue_type", "severity": "low/medium/high", "description": "details"}],
                     "confidence": "low/medium/high"
                 }"""
-            },
-            {
-                "role": "user",
-                "content": f"Analyze this content for safety issues:\n\n{content[:2000]}"  # Limit content length
-            }
-        ]
         
         try:
-            response = await self._make_llm_request(messages, max_tokens=400)
+            # Long content is checked chunk by chunk rather than cut off
+            responses = await self._map_chunks(
+                system_prompt, "Analyze this content for safety issues:\n\n", content, max_tokens=400
+            )
+            response = "\n\n".join(responses)
             
             # Parse response (simplified - in production, use proper JSON parsing)
             issues = []
@@ -242,16 +293,12 @@ class ValidationAgent(BaseAgent):
             }
             
         except Exception as e:
-            self.logger.error(f"ValidationAgent: LLM safety check failed: {str(e)}")
-            return {"issues": []}
+            return self._llm_check_failed("safety", e)
     
     async def _llm_quality_check(self, content: str) -> Dict[str, Any]:
         """Use LLM to perform quality assessment."""
         
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a content quality specialist. Analyze the given content for quality issues.
+        system_prompt = """You are a content quality specialist. Analyze the given content for quality issues.
                 
                 Assess:
                 - Clarity and coherence
@@ -261,15 +308,13 @@ class ValidationAgent(BaseAgent):
                 - Accuracy (where verifiable)
                 
                 Identify specific areas for improvement."""
-            },
-            {
-                "role": "user",
-                "content": f"Analyze this content for quality issues:\n\n{content[:2000]}"
-            }
-        ]
         
         try:
-            response = await self._make_llm_request(messages, max_tokens=300)
+            # Long content is checked chunk by chunk rather than cut off
+            responses = await self._map_chunks(
+                system_prompt, "Analyze this content for quality issues:\n\n", content, max_tokens=300
+            )
+            response = "\n\n".join(responses)
             
             # Parse response for quality issues
             issues = []
@@ -289,16 +334,12 @@ class ValidationAgent(BaseAgent):
             }
             
         except Exception as e:
-            self.logger.error(f"ValidationAgent: LLM quality check failed: {str(e)}")
-            return {"issues": []}
+            return self._llm_check_failed("quality", e)
     
     async def _llm_technical_check(self, content: str) -> Dict[str, Any]:
         """Use LLM to perform technical assessment."""
         
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a technical content specialist. Analyze the given content for technical accuracy and completeness.
+        system_prompt = """You are a technical content specialist. Analyze the given content for technical accuracy and completeness.
                 
                 Check for:
                 - Technical accuracy
@@ -308,15 +349,13 @@ class ValidationAgent(BaseAgent):
                 - Missing technical details
                 
                 Focus on actionable technical improvements."""
-            },
-            {
-                "role": "user",
-                "content": f"Analyze this technical content:\n\n{content[:2000]}"
-            }
-        ]
         
         try:
-            response = await self._make_llm_request(messages, max_tokens=300)
+            # Long content is checked chunk by chunk rather than cut off
+            responses = await self._map_chunks(
+                system_prompt, "Analyze this technical content:\n\n", content, max_tokens=300
+            )
+            response = "\n\n".join(responses)
             
             # Parse response for technical issues
             issues = []
@@ -336,16 +375,29 @@ class ValidationAgent(BaseAgent):
             }
             
         except Exception as e:
-            self.logger.error(f"ValidationAgent: LLM technical check failed: {str(e)}")
-            return {"issues": []}
+            return self._llm_check_failed("technical", e)
     
-    def _check_basic_quality(self, content: str, strict_mode: bool) -> List[Dict[str, Any]]:
+    def _llm_check_failed(self, check: str, error: Exception) -> Dict[str, Any]:
+        """Report an LLM check that could not run as an issue, so the content is not passed unchecked."""
+        
+        self.logger.error("ValidationAgent: LLM %s check failed: %s", check, error)
+        return {
+            "issues": [{
+                "type": "llm_check_failed",
+                "severity": "high",
+                "description": f"LLM {check} check did not complete; the content is unvalidated",
+                "details": str(error)[:200]
+            }]
+        }
+    
+    def _check_basic_quality(self, content: str, strict_mode: bool, stats: Optional[TextStats] = None) -> List[Dict[str, Any]]:
         """Perform basic quality checks."""
         
+        stats = stats or self.text_analyzer.analyze(content)
         issues = []
         
         # Check content length
-        if len(content) < 10:
+        if stats.characters < 10:
             issues.append({
                 "type": "length",
                 "severity": "high",
@@ -353,24 +405,15 @@ class ValidationAgent(BaseAgent):
             })
         
         # Check for excessive repetition
-        words = content.lower().split()
-        if len(words) > 0:
-            word_freq = {}
-            for word in words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-            
-            max_freq = max(word_freq.values())
-            if max_freq > len(words) * 0.1:  # More than 10% repetition
-                issues.append({
-                    "type": "repetition",
-                    "severity": "medium",
-                    "description": "Excessive word repetition detected"
-                })
+        if stats.max_word_share > 0.1:  # More than 10% repetition
+            issues.append({
+                "type": "repetition",
+                "severity": "medium",
+                "description": "Excessive word repetition detected"
+            })
         
         # Check for proper sentence structure
-        sentences = re.split(r'[.!?]+', content)
-        short_sentences = [s for s in sentences if len(s.strip()) < 5]
-        if len(short_sentences) > len(sentences) * 0.3:
+        if stats.short_sentences > stats.sentences * 0.3:
             issues.append({
                 "type": "structure",
                 "severity": "low",
@@ -382,25 +425,21 @@ class ValidationAgent(BaseAgent):
     def _validate_code_block(self, code: str, block_index: int) -> List[Dict[str, Any]]:
         """Validate code blocks for basic syntax issues."""
         
+        mismatched, stack = bracket_balance(code)
+        return self._bracket_issues(mismatched, bool(stack), block_index)
+    
+    @staticmethod
+    def _bracket_issues(mismatched: bool, unclosed: bool, block_index: int) -> List[Dict[str, Any]]:
         issues = []
         
-        # Check for balanced brackets
-        brackets = {'(': ')', '[': ']', '{': '}'}
-        stack = []
-        
-        for char in code:
-            if char in brackets:
-                stack.append(char)
-            elif char in brackets.values():
-                if not stack or brackets.get(stack.pop()) != char:
-                    issues.append({
-                        "type": "syntax",
-                        "severity": "high",
-                        "description": f"Unbalanced brackets in code block {block_index + 1}"
-                    })
-                    break
-        
-        if stack:
+        if mismatched:
+            issues.append({
+                "type": "syntax",
+                "severity": "high",
+                "description": f"Unbalanced brackets in code block {block_index + 1}"
+            })
+        
+        if unclosed:
             issues.append({
                 "type": "syntax",
                 "severity": "high",
@@ -409,39 +448,30 @@ class ValidationAgent(BaseAgent):
         
         return issues
     
-    def _check_terminology_consistency(self, content: str) -> List[Dict[str, Any]]:
+    def _check_terminology_consistency(self, content: str, stats: Optional[TextStats] = None) -> List[Dict[str, Any]]:
         """Check for consistent terminology usage."""
         
-        issues = []
-        
-        # Common technical term variations
-        term_variations = {
-            "javascript": ["javascript", "js", "JavaScript", "JS"],
-            "python": ["python", "Python", "PYTHON"],
-            "api": ["api", "API", "Api"]
-        }
-        
-        for base_term, variations in term_variations.items():
-            found_variations = [var for var in variations if var in content]
-            if len(found_variations) > 1:
-                issues.append({
-                    "type": "terminology",
-                    "severity": "low",
-                    "description": f"Inconsistent terminology for '{base_term}': {found_variations}"
-                })
+        stats = stats or self.text_analyzer.analyze(content)
         
-        return issues
+        return [
+            {
+                "type": "terminology",
+                "severity": "low",
+                "description": f"Inconsistent terminology for '{base_term}': {found_variations}"
+            }
+            for base_term, found_variations in stats.terms.items()
+            if len(found_variations) > 1
+        ]
     
-    def _calculate_readability_score(self, content: str) -> float:
+    def _calculate_readability_score(self, content: str, stats: Optional[TextStats] = None) -> float:
         """Calculate a simple readability score."""
         
-        sentences = re.split(r'[.!?]+', content)
-        words = content.split()
+        stats = stats or self.text_analyzer.analyze(content)
         
-        if len(sentences) == 0 or len(words) == 0:
+        if stats.sentences == 0 or stats.words == 0:
             return 0.0
         
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = stats.words / stats.sentences
         
         # Simple readability score (lower is better)
         # Ideal sentence length is around 15-20 words
@@ -469,6 +499,9 @@ class ValidationAgent(BaseAgent):
         if "terminology" in issue_types:
             recommendations.append("Ensure consistent terminology usage throughout the content")
         
+        if "llm_check_failed" in issue_types:
+            recommendations.append("Re-run validation once the LLM checks are available")
+        
         if not recommendations:
             recommendations.append("Content meets validation standards")
         
@@ -478,10 +511,9 @@ class ValidationAgent(BaseAgent):
         """Initialize safety patterns for content filtering."""
         
         return {
+            # Shared with output filtering, which redacts the same shapes
             "personal_info": [
-                r'\b\d{3}-\d{2}-\d{4}\b',  # SSN pattern
-                r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',  # Credit card pattern
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'  # Email pattern
+                REDACTION_PATTERNS[name].regex for name in ("ssn", "card_number", "email")
             ],
             "harmful_instructions": [
                 r'\b(how to (make|create|build).*(bomb|explosive|weapon))\b',
@@ -492,6 +524,37 @@ class ValidationAgent(BaseAgent):
             ]
         }
     
+    def _initialize_term_variations(self) -> Dict[str, List[str]]:
+        """Common technical term variations; using more than one is inconsistent."""
+        
+        return {
+            "javascript": ["javascript", "js", "JavaScript", "JS"],
+            "python": ["python", "Python", "PYTHON"],
+            "api": ["api", "API", "Api"]
+        }
+    
+    @staticmethod
+    def _compile_safety_patterns(safety_patterns: Dict[str, List[str]]) -> Tuple["re.Pattern", Dict[str, Tuple[str, str]]]:
+        """Combine every safety pattern into one alternation with a named group per pattern.
+        
+        Returns the compiled scanner and a map from group name to
+        (category, pattern), in declaration order.
+        """
+        
+        groups = {}
+        for category, patterns in safety_patterns.items():
+            for i, pattern in enumerate(patterns):
+                groups[f"{category}_{i}"] = (category, pattern)
+        
+        # A word boundary shared by every pattern is checked once per position,
+        # which lets the scan skip mid-word positions before trying alternatives
+        prefix = r"\b" if all(pattern.startswith(r"\b") for _, pattern in groups.values()) else ""
+        alternatives = [
+            f"(?P<{name}>{pattern[len(prefix):]})" for name, (_, pattern) in groups.items()
+        ]
+        
+        return re.compile(prefix + "(?:" + "|".join(alternatives) + ")", re.IGNORECASE), groups
+    
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate validation-specific input data."""
         
@@ -501,14 +564,14 @@ class ValidationAgent(BaseAgent):
         # Check for content to validate
         content = input_data.get("content", "")
         if not content:
-            self.logger.error(f"{self.name}: No content provided for validation")
+            self.logger.error("%s: No content provided for validation", self.name)
             return False
         
         # Validate validation type
         valid_types = ["safety", "quality", "technical", "comprehensive"]
         validation_type = input_data.get("validation_type", "comprehensive")
         if validation_type not in valid_types:
-            self.logger.error(f"{self.name}: Invalid validation type: {validation_type}")
+            self.logger.error("%s: Invalid validation type: %s", self.name, validation_type)
             return False
         
         return True
@@ -518,10 +581,16 @@ class ValidationAgent(BaseAgent):
         
         total_validations = self.quality_metrics["validations_performed"]
         pass_rate = (self.quality_metrics["validations_passed"] / total_validations * 100) if total_validations > 0 else 0
+        latencies = sorted(self.latencies)
+        
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2) if latencies else 0.0
         
         return {
             **self.quality_metrics,
             "pass_rate": round(pass_rate, 2),
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
             "avg_safety_issues": round(self.quality_metrics["safety_issues_detected"] / max(1, total_validations), 2),
             "avg_quality_issues": round(self.quality_metrics["quality_issues_detected"] / max(1, total_validations), 2)
         }
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""
+Tiered response cache for agent results.
+In-memory LRU with TTL, an optional SQLite tier keyed by a stable digest, and an
+optional semantic tier that matches paraphrased queries by embedding similarity.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List, Tuple
+
+from .metrics import CACHE_LOOKUPS_TOTAL
+
+SparseVector = Dict[int, float]
+
+_MISS = object()
+
+def stable_digest(*parts: str) -> str:
+    """Process-independent key (unlike hash(), which is salted per process)."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+class HashingEmbedder:
+    """Local, dependency-free embedding: hashed word unigrams and bigrams, L2-normalized.
+
+    Good enough to match reworded queries that share most of their vocabulary.
+    Pass a different embed callable to TieredCache for model-based embeddings.
+    """
+
+    def __init__(self, dimensions: int = 2 ** 18):
+        self.dimensions = dimensions
+
+    def __call__(self, text: str) -> SparseVector:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        vector: SparseVector = {}
+        for feature in features:
+            index = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[index % self.dimensions] = vector.get(index % self.dimensions, 0.0) + 1.0
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {k: v / norm for k, v in vector.items()}
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(key, 0.0) for key, value in a.items())
+
+class TieredCache:
+    """
+    Bounded cache for JSON-serializable results.
+
+    get() checks memory, then SQLite (promoting hits back into memory), then
+    the semantic tier. Entries record the estimated LLM tokens they cost, so
+    hits can be reported as spend avoided. Lookups are exported under name.
+    Coroutines should use aget()/aset(), which keep SQLite off the event loop.
+
+    The semantic tier searches memory entries only; embeddings are not stored
+    on disk. After a restart, or once an entry is evicted from memory, a
+    paraphrase misses until the exact key is read again and promoted.
+
+    The SQLite tier keeps at most disk_max_entries rows and disk_max_bytes
+    of values (0 = no byte limit): every PRUNE_EVERY writes, expired rows
+    are swept and the oldest rows over either limit are deleted.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600,
+                 db_path: Optional[str] = None, semantic_threshold: float = 0.0,
+                 embed: Optional[Callable[[str], SparseVector]] = None, name: str = "cache",
+                 disk_max_entries: int = 10000, disk_max_bytes: int = 0):
+        self.name = name
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self.embed = embed or (HashingEmbedder() if semantic_threshold > 0 else None)
+
+        # key -> (value, stored_at, size_bytes, cost_tokens, namespace, embedding)
+        self._memory: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self._db = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "cost_tokens INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)")
+            self._db.commit()
+        self._writes = 0
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+            "tokens_saved": 0
+        }
+        self._lookups = {
+            result: CACHE_LOOKUPS_TOTAL.labels(name, result)
+            for result in ("memory", "disk", "semantic", "miss")
+        }
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - stored_at > self.ttl_seconds
+
+    # --- Memory tier ----------------------------------------------------------
+
+    def _remember(self, key: str, value: Any, stored_at: float, cost_tokens: int,
+                  namespace: str, text: str, size: int):
+        embedding = self.embed(text) if self.embed is not None and text else None
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[2]
+        self._memory[key] = (value, stored_at, size, cost_tokens, namespace, embedding)
+        self._memory_bytes += size
+
+        while len(self._memory) > self.max_entries:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted[2]
+            self.stats["evictions"] += 1
+
+    def _drop(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+            self.stats["expirations"] += 1
+
+    # --- Public API -----------------------------------------------------------
+
+    def get(self, key: str, namespace: str = "", text: str = "") -> Optional[Any]:
+        """Cached value for key, or for a semantically similar text in the same namespace."""
+
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is _MISS:
+            value = self._get_lower_tiers(key, namespace, text, now)
+        return value
+
+    async def aget(self, key: str, namespace: str = "", text: str = "") -> Optional[Any]:
+        """get() for coroutines: memory hits return inline, the other tiers run in the executor."""
+
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is _MISS:
+            if self._db is None:
+                value = self._get_lower_tiers(key, namespace, text, now)
+            else:
+                value = await asyncio.get_event_loop().run_in_executor(
+                    None, self._get_lower_tiers, key, namespace, text, now
+                )
+        return value
+
+    def _get_memory(self, key: str, now: float) -> Any:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return _MISS
+            if self._expired(entry[1], now):
+                self._drop(key)
+                return _MISS
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            self._lookups["memory"].inc()
+            self.stats["tokens_saved"] += entry[3]
+            return entry[0]
+
+    def _get_lower_tiers(self, key: str, namespace: str, text: str, now: float) -> Optional[Any]:
+        """SQLite, then semantic lookup, counting a miss if neither has the entry."""
+
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, stored_at, cost_tokens FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1], row[2], namespace, text, len(row[0]))
+                        self.stats["disk_hits"] += 1
+                        self._lookups["disk"].inc()
+                        self.stats["tokens_saved"] += row[2]
+                        return value
+                    self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.stats["expirations"] += 1
+
+            if self.embed is not None and text:
+                match = self._semantic_lookup(namespace, text, now)
+                if match is not None:
+                    self.stats["semantic_hits"] += 1
+                    self._lookups["semantic"].inc()
+                    self.stats["tokens_saved"] += match[3]
+                    return match[0]
+
+            self.stats["misses"] += 1
+            self._lookups["miss"].inc()
+            return None
+
+    def _semantic_lookup(self, namespace: str, text: str, now: float) -> Optional[Tuple]:
+        query_vector = self.embed(text)
+        best, best_score = None, self.semantic_threshold
+        for entry in self._memory.values():
+            if entry[4] != namespace or entry[5] is None or self._expired(entry[1], now):
+                continue
+            score = cosine(query_vector, entry[5])
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    async def aset(self, key: str, value: Any, cost_tokens: int = 0, namespace: str = "", text: str = ""):
+        """set() for coroutines; with a disk tier the write (and any pruning) runs in the executor."""
+
+        if self._db is None:
+            self.set(key, value, cost_tokens, namespace, text)
+        else:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self.set, key, value, cost_tokens, namespace, text
+            )
+
+    def set(self, key: str, value: Any, cost_tokens: int = 0, namespace: str = "", text: str = ""):
+        """Store a JSON-serializable value in every enabled tier."""
+
+        serialized = json.dumps(value, default=str)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now, cost_tokens, namespace, text, len(serialized))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, stored_at, cost_tokens) VALUES (?, ?, ?, ?)",
+                    (key, serialized, now, cost_tokens)
+                )
+                # The first write prunes whatever an earlier process left behind
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune_disk(now)
+                self._writes += 1
+                self._db.commit()
+
+    def _prune_disk(self, now: float):
+        """Sweep expired rows, then delete the oldest rows over the row and byte limits."""
+
+        if self.ttl_seconds > 0:
+            expired = self._db.execute("DELETE FROM cache WHERE stored_at < ?", (now - self.ttl_seconds,))
+            self.stats["expirations"] += expired.rowcount
+
+        rows, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()
+        excess_rows = max(0, rows - self.disk_max_entries)
+        excess_bytes = max(0, size - self.disk_max_bytes) if self.disk_max_bytes else 0
+        if not excess_rows and not excess_bytes:
+            return
+
+        doomed = []
+        for key, length in self._db.execute("SELECT key, LENGTH(value) FROM cache ORDER BY stored_at"):
+            if len(doomed) >= excess_rows and excess_bytes <= 0:
+                break
+            doomed.append((key,))
+            excess_bytes -= length
+        self._db.executemany("DELETE FROM cache WHERE key = ?", doomed)
+        self.stats["disk_evictions"] += len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def keys(self) -> List[str]:
+        return list(self._memory.keys())
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["semantic_hits"]
+            lookups = hits + self.stats["misses"]
+            disk_entries, disk_bytes = 0, 0
+            if self._db is not None:
+                disk_entries, disk_bytes = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache"
+                ).fetchone()
+
+            return {
+                **self.stats,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes
+            }
+
+    def close(self):
+        """Close the disk tier; the memory tiers keep working."""
+
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,192 @@
+"""
+Step-level checkpoints for resumable workflows.
+Completed step outputs are persisted under a workflow ID and an idempotency key,
+so a resumed or retried workflow skips work that already succeeded.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .cache import stable_digest
+
+def workflow_id_for(idempotency_key: Optional[str] = None) -> str:
+    """Deterministic ID for a caller-supplied idempotency key, else a fresh one."""
+    if idempotency_key:
+        return stable_digest("workflow", idempotency_key)[:32]
+    return uuid.uuid4().hex
+
+def step_key(workflow_id: str, step: Dict[str, Any]) -> str:
+    """Idempotency key for one step: the same step of the same workflow always maps to it."""
+    return stable_digest("step", workflow_id, json.dumps(step, sort_keys=True, default=str))
+
+class CheckpointStore:
+    """
+    Workflow records and completed step results in SQLite.
+
+    A workflow is "running" while it executes. It becomes "completed" when
+    every step has succeeded, and "incomplete" when some step failed; an
+    incomplete workflow can be resumed. A process that dies mid-run leaves
+    it "running". The store is kept in memory when no db_path is given.
+    Workflows untouched for ttl_seconds are pruned, together with their steps,
+    and so are the least recently updated ones beyond max_workflows.
+    """
+
+    # Prune expired workflows once per this many starts
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: float = 86400, max_workflows: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_workflows = max_workflows
+        self._lock = threading.Lock()
+        self._starts = 0
+        # An in-memory store stays at its cap exactly; a file is pruned in batches
+        self._prune_every = self.PRUNE_EVERY if db_path else 1
+
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        if db_path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS workflows ("
+            "workflow_id TEXT PRIMARY KEY, status TEXT NOT NULL, input TEXT NOT NULL, plan TEXT, "
+            "response TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS workflows_status ON workflows (status, updated_at);"
+            "CREATE TABLE IF NOT EXISTS steps ("
+            "idempotency_key TEXT PRIMARY KEY, workflow_id TEXT NOT NULL, step_id TEXT NOT NULL, "
+            "result TEXT NOT NULL, completed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS steps_workflow ON steps (workflow_id);"
+        )
+        self._db.commit()
+        self.prune()
+
+        self.stats = {
+            "steps_saved": 0,
+            "steps_skipped": 0,
+            "workflows_resumed": 0,
+            "workflows_replayed": 0
+        }
+
+    # --- Workflows ------------------------------------------------------------
+
+    def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, input, plan, response, created_at, updated_at FROM workflows WHERE workflow_id = ?",
+                (workflow_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "workflow_id": workflow_id,
+            "status": row[0],
+            "input": json.loads(row[1]),
+            "plan": json.loads(row[2]) if row[2] else None,
+            "response": json.loads(row[3]) if row[3] else None,
+            "created_at": row[4],
+            "updated_at": row[5]
+        }
+
+    def start(self, workflow_id: str, input_data: Dict[str, Any], plan: Optional[Dict[str, Any]] = None):
+        """Create or reopen a workflow record as running."""
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO workflows (workflow_id, status, input, plan, response, created_at, updated_at) "
+                "VALUES (?, 'running', ?, ?, NULL, ?, ?) "
+                "ON CONFLICT (workflow_id) DO UPDATE SET status = 'running', "
+                "plan = COALESCE(excluded.plan, plan), updated_at = excluded.updated_at",
+                (workflow_id, json.dumps(input_data, default=str),
+                 json.dumps(plan, default=str) if plan is not None else None, now, now)
+            )
+            self._db.commit()
+            self._starts += 1
+        if self._starts % self._prune_every == 0:
+            self.prune()
+
+    def finish(self, workflow_id: str, status: str, response: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE workflows SET status = ?, response = ?, updated_at = ? WHERE workflow_id = ?",
+                (status, json.dumps(response, default=str) if response is not None else None,
+                 time.time(), workflow_id)
+            )
+            self._db.commit()
+
+    def unfinished(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Workflows left running (e.g. by a crash) or incomplete, oldest first."""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT workflow_id, status, updated_at FROM workflows WHERE status IN ('running', 'incomplete') "
+                "ORDER BY updated_at LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"workflow_id": row[0], "status": row[1], "updated_at": row[2]} for row in rows]
+
+    # --- Steps ----------------------------------------------------------------
+
+    def get_step(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM steps WHERE idempotency_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.stats["steps_skipped"] += 1
+        return json.loads(row[0])
+
+    def save_step(self, key: str, workflow_id: str, step_id: str, result: Dict[str, Any]):
+        """Persist a completed step; saving the same key twice keeps the first result."""
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO steps (idempotency_key, workflow_id, step_id, result, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, workflow_id, step_id, json.dumps(result, default=str), time.time())
+            )
+            self._db.commit()
+            self.stats["steps_saved"] += 1
+
+    def completed_steps(self, workflow_id: str) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT step_id FROM steps WHERE workflow_id = ? ORDER BY completed_at", (workflow_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # --- Maintenance ----------------------------------------------------------
+
+    def prune(self) -> int:
+        """Drop workflows (and their steps) not updated within ttl_seconds or beyond max_workflows."""
+
+        removed = 0
+        with self._lock:
+            if self.ttl_seconds > 0:
+                cutoff = time.time() - self.ttl_seconds
+                self._db.execute(
+                    "DELETE FROM steps WHERE workflow_id IN (SELECT workflow_id FROM workflows WHERE updated_at < ?)",
+                    (cutoff,)
+                )
+                removed += self._db.execute("DELETE FROM workflows WHERE updated_at < ?", (cutoff,)).rowcount
+            oldest = "SELECT workflow_id FROM workflows ORDER BY updated_at DESC LIMIT -1 OFFSET ?"
+            self._db.execute(f"DELETE FROM steps WHERE workflow_id IN ({oldest})", (self.max_workflows,))
+            removed += self._db.execute(
+                f"DELETE FROM workflows WHERE workflow_id IN ({oldest})", (self.max_workflows,)
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM workflows GROUP BY status").fetchall())
+            steps = self._db.execute("SELECT COUNT(*) FROM steps").fetchone()[0]
+        return {**self.stats, "workflows": counts, "checkpointed_steps": steps}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
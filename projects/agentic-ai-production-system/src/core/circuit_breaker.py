@@ -0,0 +1,181 @@
+"""
+Circuit breaking and latency tracking for LLM models.
+A breaker stops sending requests to a model whose recent failure rate is too high,
+then lets a few probes through to find out when it has recovered.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit is open."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"Circuit open for {model}; retry in {retry_after:.1f}s")
+        self.model = model
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one model.
+
+    Closed: requests flow and their outcomes are kept for window_seconds.
+    Once at least min_requests outcomes are in the window and the failure
+    rate reaches failure_rate, the circuit opens and requests are rejected
+    at once for open_seconds. Then it is half-open: up to half_open_probes
+    requests go through; one success closes the circuit, one failure opens
+    it again. A probe that never reports back (its event loop went away)
+    frees its slot after open_seconds. Safe to share between threads and
+    event loops.
+    """
+
+    def __init__(self, model: str, failure_rate: float = 0.5, window_seconds: float = 30.0,
+                 min_requests: int = 10, open_seconds: float = 15.0, half_open_probes: int = 1):
+        self.model = model
+        self.failure_rate = failure_rate
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._outcomes = deque()  # (monotonic time, failed)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"rejected": 0, "opened": 0, "closed": 0}
+
+    def _trim(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self.stats["opened"] += 1
+
+    def _probe_available(self, now: float) -> bool:
+        if self._probes >= self.half_open_probes and now - self._probe_at >= self.open_seconds:
+            self._probes = 0
+        return self._probes < self.half_open_probes
+
+    def before_request(self):
+        """Admit a request or raise CircuitOpenError."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                remaining = self._opened_at + self.open_seconds - now
+                if remaining > 0:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.model, remaining)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if not self._probe_available(now):
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.model, self.open_seconds)
+                self._probes += 1
+                self._probe_at = now
+
+    def check(self):
+        """Raise CircuitOpenError if a request would be rejected now; takes no probe slot."""
+
+        if not self.allows_request():
+            with self._lock:
+                self.stats["rejected"] += 1
+                retry_after = max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+            raise CircuitOpenError(self.model, retry_after)
+
+    def allows_request(self) -> bool:
+        """Whether before_request() would admit a request now, without taking a probe slot."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return now >= self._opened_at + self.open_seconds
+            return self._probe_available(now)
+
+    def record(self, failed: bool):
+        """Record the outcome of an admitted request."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._open(now)
+                else:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    self._failures = 0
+                    self.stats["closed"] += 1
+                return
+            if self.state == OPEN:
+                # A request admitted before the circuit opened
+                return
+
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            self._trim(now)
+            total = len(self._outcomes)
+            if total >= self.min_requests and self._failures / total >= self.failure_rate:
+                self._open(now)
+
+    def release(self):
+        """Give back a probe slot for a request that ended without an outcome (e.g. cancelled)."""
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def reset(self):
+        """Close the circuit and forget recorded outcomes."""
+
+        with self._lock:
+            self.state = CLOSED
+            self._outcomes.clear()
+            self._failures = 0
+            self._probes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            total = len(self._outcomes)
+            return {
+                **self.stats,
+                "state": self.state,
+                "window_requests": total,
+                "window_failure_rate": round(self._failures / total, 4) if total else 0.0
+            }
+
+class LatencyWindow:
+    """Recent request latencies for one model, for picking a hedging delay."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The q-quantile of recent latencies, or None until min_samples have been seen."""
+
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
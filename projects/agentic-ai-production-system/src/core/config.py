@@ -23,29 +23,74 @@ class Config(BaseModel):
     # API Configuration
     openai_api_key: str = Field(..., min_length=1)
     openai_model: str = Field(default="gpt-4")
+    openai_base_url: Optional[str] = Field(default=None)
+    model_context_window: int = Field(default=0, ge=0)
     
     # System Configuration
     max_retries: int = Field(default=3, ge=1, le=10)
     timeout_seconds: int = Field(default=30, ge=5, le=300)
     max_iterations: int = Field(default=10, ge=1, le=50)
+    max_parallel_steps: int = Field(default=4, ge=1, le=32)
+    prompt_content_tokens: int = Field(default=1000, ge=100)
     rate_limit_requests: int = Field(default=60, ge=1)
     rate_limit_window: int = Field(default=60, ge=1)
+    tokens_per_minute: int = Field(default=0, ge=0)
+    rate_limit_max_wait: float = Field(default=30.0, gt=0)
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    enable_request_coalescing: bool = Field(default=True)
+    circuit_breaker_failure_rate: float = Field(default=0.5, gt=0.0, le=1.0)
+    circuit_breaker_window: int = Field(default=30, ge=1)
+    circuit_breaker_min_requests: int = Field(default=10, ge=1)
+    circuit_breaker_open_seconds: int = Field(default=15, ge=1)
+    enable_hedging: bool = Field(default=False)
+    hedge_quantile: float = Field(default=0.95, gt=0.0, lt=1.0)
+    fallback_model: str = Field(default="")
+    
+    # Cache Configuration
+    research_cache_max_entries: int = Field(default=256, ge=1)
+    research_cache_ttl: int = Field(default=3600, ge=0)
+    research_cache_path: str = Field(default="")
+    research_cache_disk_max_entries: int = Field(default=10000, ge=1)
+    research_cache_disk_max_bytes: int = Field(default=100 * 1024 * 1024, ge=0)
+    research_cache_semantic_threshold: float = Field(default=0.0, ge=0.0, le=1.0)
+    plan_cache_max_entries: int = Field(default=128, ge=1)
+    plan_cache_semantic_threshold: float = Field(default=0.85, ge=0.0, le=1.0)
+    
+    # History Configuration
+    workflow_history_size: int = Field(default=100, ge=10)
+    workflow_history_path: str = Field(default="")
+    workflow_history_max_rows: int = Field(default=100000, ge=100)
+    checkpoint_path: str = Field(default="")
+    checkpoint_ttl: int = Field(default=86400, ge=0)
+    checkpoint_max_workflows: int = Field(default=10000, ge=1)
+    
+    # Job Queue Configuration
+    job_queue_path: str = Field(default="data/jobs.sqlite")
+    job_workers: int = Field(default=2, ge=1, le=64)
+    job_concurrency: int = Field(default=4, ge=1)
+    job_timeout: int = Field(default=300, ge=1)
+    job_stale_after: int = Field(default=30, ge=1)
+    job_retention: int = Field(default=7 * 86400, ge=0)
     
     # Logging Configuration
     log_level: str = Field(default="INFO")
     log_file: str = Field(default="logs/app.log")
     enable_file_logging: bool = Field(default=True)
+    log_sample_rates: str = Field(default="base_agent=0.1")
     
     # Security Configuration
     enable_input_validation: bool = Field(default=True)
     enable_output_filtering: bool = Field(default=True)
     max_input_length: int = Field(default=10000, ge=100)
+    max_input_tokens: int = Field(default=4000, ge=25)
     allowed_file_types: str = Field(default="txt,md,json")
     
     # Monitoring Configuration
     enable_metrics: bool = Field(default=True)
     health_check_interval: int = Field(default=30, ge=10)
     metrics_port: int = Field(default=8502, ge=1024, le=65535)
+    metrics_host: str = Field(default="127.0.0.1")
     
     # Development Configuration
     debug_mode: bool = Field(default=False)
@@ -56,21 +101,60 @@ class Config(BaseModel):
         env_values = {
             "openai_api_key": os.getenv("OPENAI_API_KEY", ""),
             "openai_model": os.getenv("OPENAI_MODEL", "gpt-4"),
+            "openai_base_url": os.getenv("OPENAI_BASE_URL") or None,
+            "model_context_window": int(os.getenv("MODEL_CONTEXT_WINDOW", "0")),
             "max_retries": int(os.getenv("MAX_RETRIES", "3")),
             "timeout_seconds": int(os.getenv("TIMEOUT_SECONDS", "30")),
             "max_iterations": int(os.getenv("MAX_ITERATIONS", "10")),
+            "max_parallel_steps": int(os.getenv("MAX_PARALLEL_STEPS", "4")),
+            "prompt_content_tokens": int(os.getenv("PROMPT_CONTENT_TOKENS", "1000")),
             "rate_limit_requests": int(os.getenv("RATE_LIMIT_REQUESTS", "60")),
             "rate_limit_window": int(os.getenv("RATE_LIMIT_WINDOW", "60")),
+            "tokens_per_minute": int(os.getenv("TOKENS_PER_MINUTE", "0")),
+            "rate_limit_max_wait": float(os.getenv("RATE_LIMIT_MAX_WAIT", "30")),
+            "max_connections": int(os.getenv("MAX_CONNECTIONS", "100")),
+            "max_keepalive_connections": int(os.getenv("MAX_KEEPALIVE_CONNECTIONS", "20")),
+            "enable_request_coalescing": os.getenv("ENABLE_REQUEST_COALESCING", "true").lower() == "true",
+            "circuit_breaker_failure_rate": float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5")),
+            "circuit_breaker_window": int(os.getenv("CIRCUIT_BREAKER_WINDOW", "30")),
+            "circuit_breaker_min_requests": int(os.getenv("CIRCUIT_BREAKER_MIN_REQUESTS", "10")),
+            "circuit_breaker_open_seconds": int(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "15")),
+            "enable_hedging": os.getenv("ENABLE_HEDGING", "false").lower() == "true",
+            "hedge_quantile": float(os.getenv("HEDGE_QUANTILE", "0.95")),
+            "fallback_model": os.getenv("FALLBACK_MODEL", ""),
+            "research_cache_max_entries": int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "256")),
+            "research_cache_ttl": int(os.getenv("RESEARCH_CACHE_TTL", "3600")),
+            "research_cache_path": os.getenv("RESEARCH_CACHE_PATH", ""),
+            "research_cache_disk_max_entries": int(os.getenv("RESEARCH_CACHE_DISK_MAX_ENTRIES", "10000")),
+            "research_cache_disk_max_bytes": int(os.getenv("RESEARCH_CACHE_DISK_MAX_BYTES", str(100 * 1024 * 1024))),
+            "research_cache_semantic_threshold": float(os.getenv("RESEARCH_CACHE_SEMANTIC_THRESHOLD", "0")),
+            "plan_cache_max_entries": int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "128")),
+            "plan_cache_semantic_threshold": float(os.getenv("PLAN_CACHE_SEMANTIC_THRESHOLD", "0.85")),
+            "workflow_history_size": int(os.getenv("WORKFLOW_HISTORY_SIZE", "100")),
+            "workflow_history_path": os.getenv("WORKFLOW_HISTORY_PATH", ""),
+            "workflow_history_max_rows": int(os.getenv("WORKFLOW_HISTORY_MAX_ROWS", "100000")),
+            "checkpoint_path": os.getenv("CHECKPOINT_PATH", ""),
+            "checkpoint_ttl": int(os.getenv("CHECKPOINT_TTL", "86400")),
+            "checkpoint_max_workflows": int(os.getenv("CHECKPOINT_MAX_WORKFLOWS", "10000")),
+            "job_queue_path": os.getenv("JOB_QUEUE_PATH", "data/jobs.sqlite"),
+            "job_workers": int(os.getenv("JOB_WORKERS", "2")),
+            "job_concurrency": int(os.getenv("JOB_CONCURRENCY", "4")),
+            "job_timeout": int(os.getenv("JOB_TIMEOUT", "300")),
+            "job_stale_after": int(os.getenv("JOB_STALE_AFTER", "30")),
+            "job_retention": int(os.getenv("JOB_RETENTION", str(7 * 86400))),
             "log_level": os.getenv("LOG_LEVEL", "INFO"),
             "log_file": os.getenv("LOG_FILE", "logs/app.log"),
             "enable_file_logging": os.getenv("ENABLE_FILE_LOGGING", "true").lower() == "true",
+            "log_sample_rates": os.getenv("LOG_SAMPLE_RATES", "base_agent=0.1"),
             "enable_input_validation": os.getenv("ENABLE_INPUT_VALIDATION", "true").lower() == "true",
             "enable_output_filtering": os.getenv("ENABLE_OUTPUT_FILTERING", "true").lower() == "true",
             "max_input_length": int(os.getenv("MAX_INPUT_LENGTH", "10000")),
+            "max_input_tokens": int(os.getenv("MAX_INPUT_TOKENS", "4000")),
             "allowed_file_types": os.getenv("ALLOWED_FILE_TYPES", "txt,md,json"),
             "enable_metrics": os.getenv("ENABLE_METRICS", "true").lower() == "true",
             "health_check_interval": int(os.getenv("HEALTH_CHECK_INTERVAL", "30")),
             "metrics_port": int(os.getenv("METRICS_PORT", "8502")),
+            "metrics_host": os.getenv("METRICS_HOST", "127.0.0.1"),
             "debug_mode": os.getenv("DEBUG_MODE", "false").lower() == "true",
             "enable_profiling": os.getenv("ENABLE_PROFILING", "false").lower() == "true",
         }
@@ -98,6 +182,15 @@ class Config(BaseModel):
         """Get list of allowed file types."""
         return [ext.strip() for ext in self.allowed_file_types.split(",")]
     
+    def get_log_sample_rates(self) -> Dict[str, float]:
+        """Get per-module INFO sampling rates, e.g. "base_agent=0.1,research_agent=0.5"."""
+        rates = {}
+        for item in self.log_sample_rates.split(","):
+            if "=" in item:
+                module, rate = item.split("=", 1)
+                rates[module.strip()] = float(rate)
+        return rates
+    
     def ensure_log_directory(self):
         """Ensure log directory exists."""
         log_path = Path(self.log_file)
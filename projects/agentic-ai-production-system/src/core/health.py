@@ -1,23 +1,94 @@
 """
 Health checking and system monitoring for the Multi-Agent AI System.
+Probes run on a background thread every health_check_interval; page loads
+read the cached snapshot.
 """
 
 import os
 import time
+import threading
 import psutil
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-import requests
 from openai import OpenAI
 
 class HealthChecker:
     """System health monitoring and validation."""
     
-    def __init__(self, config):
+    def __init__(self, config, interval: Optional[float] = None):
         self.config = config
-        self.client = OpenAI(api_key=config.openai_api_key) if config.openai_api_key else None
+        self.interval = interval or config.health_check_interval
+        self.client = OpenAI(
+            api_key=config.openai_api_key,
+            base_url=config.openai_base_url,
+            timeout=min(config.timeout_seconds, 10),
+            max_retries=0
+        ) if config.openai_api_key else None
+        
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "refreshes": 0,
+            "last_refresh_seconds": 0.0
+        }
+        
+        # Prime the CPU counter: later non-blocking reads report usage since the previous call
+        psutil.cpu_percent(interval=None)
+        self._cpu_read_at = time.monotonic()
+    
+    def _cpu_percent(self) -> Optional[float]:
+        """CPU usage since the previous read, or None if too little time has passed to tell."""
+        
+        now = time.monotonic()
+        if now - self._cpu_read_at < 0.1:
+            return None
+        self._cpu_read_at = now
+        return psutil.cpu_percent(interval=None)
+    
+    def start(self) -> "HealthChecker":
+        """Refresh the snapshot now, then every interval on a daemon thread."""
+        
+        if self._thread is None:
+            self.refresh()
+            self._thread = threading.Thread(target=self._run, name="health-checker", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
     
     def check_system_health(self) -> Dict[str, Any]:
+        """Latest health snapshot; probes synchronously only if none has been taken yet.
+        
+        The snapshot is shared between callers and must not be modified.
+        """
+        
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+    
+    def refresh(self) -> Dict[str, Any]:
+        """Run every probe and replace the cached snapshot."""
+        
+        with self._lock:
+            start_time = time.perf_counter()
+            snapshot = self._probe()
+            self.stats["refreshes"] += 1
+            self.stats["last_refresh_seconds"] = round(time.perf_counter() - start_time, 4)
+            self._snapshot = snapshot
+            return snapshot
+    
+    def _probe(self) -> Dict[str, Any]:
         """Comprehensive system health check."""
         
         health_status = {
@@ -94,13 +165,13 @@ class HealthChecker:
             disk = psutil.disk_usage('/')
             disk_free = disk.free / (1024**3)  # GB
             
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU usage since the previous read, without sleeping to sample it
+            cpu_percent = self._cpu_percent()
             
             # Determine if resources are sufficient
             sufficient_memory = memory_available > 1.0  # At least 1GB
             sufficient_disk = disk_free > 1.0  # At least 1GB
-            reasonable_cpu = cpu_percent < 90  # Less than 90% CPU
+            reasonable_cpu = cpu_percent is None or cpu_percent < 90  # Less than 90% CPU
             
             status = sufficient_memory and sufficient_disk and reasonable_cpu
             
@@ -130,18 +201,14 @@ class HealthChecker:
             # Ensure log directory exists and is writable
             self.config.ensure_log_directory()
             log_dir = Path(self.config.log_file).parent
-            
-            # Test write permissions
-            test_file = log_dir / "health_check.tmp"
-            test_file.write_text("test")
-            test_file.unlink()
+            writable = os.access(log_dir, os.W_OK | os.X_OK)
             
             return {
-                "status": True,
-                "message": "File system OK",
+                "status": writable,
+                "message": "File system OK" if writable else "Log directory not writable",
                 "details": {
                     "log_directory": str(log_dir),
-                    "writable": True
+                    "writable": writable
                 }
             }
         except Exception as e:
@@ -205,7 +272,7 @@ class HealthChecker:
                     "percent_used": round((disk.used / disk.total) * 100, 2)
                 },
                 "cpu": {
-                    "percent": psutil.cpu_percent(interval=1),
+                    "percent": self._cpu_percent(),
                     "count": psutil.cpu_count()
                 }
             }
@@ -213,4 +280,26 @@ class HealthChecker:
             return {
                 "error": str(e),
                 "timestamp": time.time()
-            }
\ No newline at end of file
+            }
+
+_checkers: Dict[Tuple, HealthChecker] = {}
+_checkers_lock = threading.Lock()
+
+def get_health_checker(config) -> HealthChecker:
+    """Process-wide, started HealthChecker for this endpoint and log location."""
+    
+    key = (config.openai_api_key, config.openai_base_url, config.log_file, config.health_check_interval)
+    with _checkers_lock:
+        checker = _checkers.get(key)
+        if checker is None:
+            checker = HealthChecker(config).start()
+            _checkers[key] = checker
+        return checker
+
+def release_health_checker(checker: HealthChecker):
+    """Stop a checker from get_health_checker(); the next call for its key starts a new one."""
+    
+    with _checkers_lock:
+        for key in [key for key, value in _checkers.items() if value is checker]:
+            del _checkers[key]
+    checker.stop()
@@ -0,0 +1,217 @@
+"""
+Workflow history for the coordinator.
+A bounded ring buffer of recent workflows in memory, plus an append-only SQLite
+log indexed by timestamp, task hash and success for paging and aggregate queries.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+from .cache import stable_digest, normalize_query
+
+def task_hash(task: str) -> str:
+    """Digest used to find every run of the same task, ignoring case and spacing."""
+    return stable_digest("task", normalize_query(task))[:16]
+
+class WorkflowHistory:
+    """
+    Recent workflows in memory, every workflow in a log.
+
+    append() keeps the last max_recent entries in memory and writes a row to
+    the log. The log lives in SQLite at db_path, or in an in-memory database
+    when no path is given. Once it holds more than max_rows rows, the oldest
+    are pruned; an in-memory log is capped at max_recent rows, since nothing
+    outlives the process anyway. Queries page through the log with a cursor and aggregate in
+    SQL, so they never load the whole history.
+    """
+
+    # Prune once per this many appends rather than on every write
+    PRUNE_EVERY = 100
+
+    def __init__(self, max_recent: int = 100, db_path: Optional[str] = None, max_rows: int = 100000):
+        self.max_rows = max_rows if db_path else min(max_rows, max_recent)
+        # An in-memory log stays at its cap exactly; a file is pruned in batches
+        self._prune_every = self.PRUNE_EVERY if db_path else 1
+        self._recent: deque = deque(maxlen=max_recent)
+        self._lock = threading.Lock()
+        self._appends = 0
+
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path or ":memory:", check_same_thread=False)
+        if db_path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS workflows ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, task_hash TEXT NOT NULL, "
+            "task TEXT NOT NULL, success INTEGER NOT NULL, duration REAL, plan_source TEXT, entry TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS workflows_timestamp ON workflows (timestamp);"
+            "CREATE INDEX IF NOT EXISTS workflows_task_hash ON workflows (task_hash, timestamp);"
+            "CREATE INDEX IF NOT EXISTS workflows_success ON workflows (success, timestamp);"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _success(entry: Dict[str, Any]) -> bool:
+        if "success" in entry:
+            return bool(entry["success"])
+        result = entry.get("result")
+        return bool(result.get("success", True)) if isinstance(result, dict) else True
+
+    def append(self, entry: Dict[str, Any]):
+        """Record a workflow: task, result and timestamp (wall-clock seconds), plus any extra keys."""
+
+        task = str(entry.get("task", ""))
+        plan = entry.get("workflow_plan")
+        row = (
+            entry.get("timestamp", time.time()),
+            task_hash(task),
+            task,
+            int(self._success(entry)),
+            entry.get("duration"),
+            plan.get("source") if isinstance(plan, dict) else None,
+            json.dumps(entry, default=str)
+        )
+
+        with self._lock:
+            self._recent.append(entry)
+            self._db.execute(
+                "INSERT INTO workflows (timestamp, task_hash, task, success, duration, plan_source, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+            )
+            self._appends += 1
+            if self._appends % self._prune_every == 0:
+                self._prune()
+            self._db.commit()
+
+    def _prune(self):
+        self._db.execute(
+            "DELETE FROM workflows WHERE id <= (SELECT MAX(id) FROM workflows) - ?", (self.max_rows,)
+        )
+
+    # --- Recent entries -------------------------------------------------------
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """The last limit workflows, oldest first."""
+        with self._lock:
+            items = list(self._recent)
+        return items[-limit:] if limit else []
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.recent(len(self._recent)))
+
+    # --- Log queries ----------------------------------------------------------
+
+    @staticmethod
+    def _where(since: Optional[float], until: Optional[float], success: Optional[bool],
+               task: Optional[str]) -> tuple:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(int(success))
+        if task is not None:
+            clauses.append("task_hash = ?")
+            params.append(task_hash(task))
+        return clauses, params
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              success: Optional[bool] = None, task: Optional[str] = None,
+              limit: int = 50, cursor: Optional[int] = None) -> Dict[str, Any]:
+        """One page of workflow summaries, newest first.
+
+        Pass the returned next_cursor back in to get the following page; it
+        is None on the last page. Use get() for a workflow's full entry.
+        """
+
+        clauses, params = self._where(since, until, success, task)
+        if cursor is not None:
+            clauses.append("id < ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, timestamp, task_hash, task, success, duration, plan_source FROM workflows "
+                f"{where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+
+        items = [
+            {
+                "id": row[0],
+                "timestamp": row[1],
+                "task_hash": row[2],
+                "task": row[3],
+                "success": bool(row[4]),
+                "duration": row[5],
+                "plan_source": row[6]
+            }
+            for row in rows[:limit]
+        ]
+        next_cursor = items[-1]["id"] if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get(self, workflow_id: int) -> Optional[Dict[str, Any]]:
+        """Full logged entry for one workflow."""
+        with self._lock:
+            row = self._db.execute("SELECT entry FROM workflows WHERE id = ?", (workflow_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def aggregate(self, since: Optional[float] = None, until: Optional[float] = None,
+                  task: Optional[str] = None, bucket_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Counts, success rate and duration over the log, optionally per time bucket."""
+
+        clauses, params = self._where(since, until, None, task)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = "COUNT(*), COALESCE(SUM(success), 0), AVG(duration), MAX(duration)"
+
+        def summary(row) -> Dict[str, Any]:
+            total, successes, avg_duration, max_duration = row[-4:]
+            return {
+                "total": total,
+                "successes": successes,
+                "failures": total - successes,
+                "success_rate": round(successes / total, 4) if total else 0.0,
+                "average_duration": round(avg_duration, 4) if avg_duration is not None else None,
+                "max_duration": max_duration
+            }
+
+        with self._lock:
+            result = summary(self._db.execute(f"SELECT {columns} FROM workflows {where}", params).fetchone())
+            if bucket_seconds:
+                rows = self._db.execute(
+                    f"SELECT CAST(timestamp / ? AS INTEGER) AS bucket, {columns} FROM workflows {where} "
+                    "GROUP BY bucket ORDER BY bucket", (bucket_seconds, *params)
+                ).fetchall()
+                result["buckets"] = [
+                    {"start": row[0] * bucket_seconds, **summary(row)} for row in rows
+                ]
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            logged = self._db.execute("SELECT COUNT(*) FROM workflows").fetchone()[0]
+        return {
+            "recent_entries": len(self._recent),
+            "max_recent": self._recent.maxlen,
+            "logged_entries": logged,
+            "max_rows": self.max_rows
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
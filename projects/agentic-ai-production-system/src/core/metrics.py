@@ -0,0 +1,356 @@
+"""
+Prometheus-style metrics for the agent stack.
+Counters and histograms with per-thread shards (no locks on the write path),
+rendered in the Prometheus text format and served from a background thread.
+"""
+
+import math
+import threading
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536)
+RETRY_BUCKETS = (0, 1, 2, 3, 5, 8)
+
+class _Owner:
+    """Per-thread sentinel; collected with the thread's locals when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+class _Shards:
+    """
+    One value list per thread; only the owning thread writes to it.
+
+    Writers never contend, and readers sum the columns across shards. The
+    lock is taken only when a thread writes for the first time and when
+    the metric is read. When a thread exits, its shard is folded into a
+    base total and dropped, so short-lived threads do not accumulate.
+    """
+
+    __slots__ = ("_local", "_shards", "_base", "_lock", "_size", "__weakref__")
+
+    def __init__(self, size: int):
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._base: List[float] = [0] * size
+        self._lock = threading.Lock()
+        self._size = size
+
+    def new(self) -> List[float]:
+        values = [0] * self._size
+        owner = _Owner()
+        with self._lock:
+            self._shards.append(values)
+        # A weak reference back, so the finalizer does not keep the metric alive
+        weakref.finalize(owner, _Shards._retire, weakref.ref(self), values)
+        self._local.owner = owner
+        self._local.values = values
+        return values
+
+    @staticmethod
+    def _retire(shards_ref, values: List[float]):
+        shards = shards_ref()
+        if shards is None:
+            return
+        with shards._lock:
+            shards._shards = [shard for shard in shards._shards if shard is not values]
+            shards._base = [base + value for base, value in zip(shards._base, values)]
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+            base = self._base
+        return [sum(column) for column in zip(base, *shards)]
+
+class CounterChild:
+    __slots__ = ("_shards", "_local")
+
+    def __init__(self):
+        self._shards = _Shards(1)
+        self._local = self._shards._local
+
+    def inc(self, amount: float = 1):
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._shards.new()
+        values[0] += amount
+
+    def get(self) -> float:
+        return self._shards.totals()[0]
+
+class HistogramChild:
+    __slots__ = ("_shards", "_local", "_bounds")
+
+    def __init__(self, bounds: Sequence[float]):
+        self._bounds = list(bounds)
+        # One slot per finite bucket, one for +Inf, one for the sum
+        self._shards = _Shards(len(self._bounds) + 2)
+        self._local = self._shards._local
+
+    def observe(self, value: float):
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._shards.new()
+        values[bisect_left(self._bounds, value)] += 1
+        values[-1] += value
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """Per-bucket counts (not cumulative), sum and count."""
+        totals = self._shards.totals()
+        counts = totals[:-1]
+        return counts, totals[-1], sum(counts)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+
+        counts, _, count = self.snapshot()
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if i == len(self._bounds):
+                    return self._bounds[-1]
+                lower = self._bounds[i - 1] if i else 0.0
+                return lower + (self._bounds[i] - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self._bounds[-1]
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **labels: str):
+        """Child for one label combination (cached; keep it for hot paths)."""
+
+        key = values or tuple(labels[name] for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in key), self._new_child())
+                self._children[key] = child
+        return child
+
+    def children(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._children.items())
+        seen, result = set(), []
+        for key, child in items:
+            if id(child) not in seen:
+                seen.add(id(child))
+                result.append((dict(zip(self.labelnames, (str(v) for v in key))), child))
+        return result
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(labels)} {_number(child.get())}" for labels, child in self.children()]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, child in self.children():
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(list(self.buckets) + [math.inf], counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_labels(labels, le=_number(bound))} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(labels)} {_number(count)}")
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: Dict[str, str], **extra: str) -> str:
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs.items()) + "}"
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# --- Agent stack metrics --------------------------------------------------------
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "agent_llm_request_duration_seconds", "LLM request latency including retries and queueing",
+    ("agent", "model")
+)
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "agent_llm_time_to_first_token_seconds", "Time to the first streamed delta", ("agent", "model")
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    "agent_llm_prompt_tokens", "Prompt tokens per LLM request", ("agent", "model"), buckets=TOKEN_BUCKETS
+)
+LLM_COMPLETION_TOKENS = REGISTRY.histogram(
+    "agent_llm_completion_tokens", "Completion tokens per LLM request", ("agent", "model"), buckets=TOKEN_BUCKETS
+)
+LLM_RETRIES = REGISTRY.histogram(
+    "agent_llm_retries", "Retries per LLM request", ("agent", "model"), buckets=RETRY_BUCKETS
+)
+LLM_REQUESTS_TOTAL = REGISTRY.counter(
+    "agent_llm_requests_total", "LLM requests by outcome", ("agent", "model", "outcome")
+)
+LLM_PROMPT_TOKENS_SAVED = REGISTRY.counter(
+    "agent_llm_prompt_tokens_saved_total", "Prompt tokens removed by context compaction", ("agent",)
+)
+LLM_RESILIENCE_EVENTS_TOTAL = REGISTRY.counter(
+    "agent_llm_resilience_events_total",
+    "Circuit breaker rejections and transitions, hedged requests and model fallbacks", ("model", "event")
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram(
+    "agent_rate_limit_queue_wait_seconds", "Time spent queued in the rate limiter", ("agent", "model")
+)
+CACHE_LOOKUPS_TOTAL = REGISTRY.counter(
+    "agent_cache_lookups_total", "Cache lookups by cache and result tier", ("cache", "result")
+)
+WORKFLOW_SECONDS = REGISTRY.histogram(
+    "agent_workflow_duration_seconds", "End-to-end workflow latency by plan source", ("source",)
+)
+
+# --- Exporter -------------------------------------------------------------------
+
+class MetricsServer:
+    """Serves /metrics from a daemon thread, so scrapes never touch the event loop.
+
+    There is no authentication, so the default bind address is loopback only.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 8502):
+        self.registry = registry
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-exporter", daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+_servers: Dict[int, MetricsServer] = {}
+_servers_lock = threading.Lock()
+
+def start_metrics_server(config, registry: MetricsRegistry = REGISTRY) -> Optional[MetricsServer]:
+    """Start the exporter on config.metrics_host:metrics_port once per process; None when metrics are disabled."""
+
+    if not config.enable_metrics:
+        return None
+    with _servers_lock:
+        server = _servers.get(config.metrics_port)
+        if server is None:
+            server = MetricsServer(registry, host=config.metrics_host, port=config.metrics_port).start()
+            _servers[config.metrics_port] = server
+        return server
+
+def stop_metrics_server(server: MetricsServer):
+    """Stop an exporter from start_metrics_server(); the next call for its port starts a new one."""
+
+    with _servers_lock:
+        if _servers.get(server.port) is server:
+            del _servers[server.port]
+    server.stop()
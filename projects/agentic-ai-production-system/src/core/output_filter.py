@@ -0,0 +1,228 @@
+"""
+Output filtering for agent responses.
+Redacts sensitive terms and sensitive data shapes (keys, emails, card numbers)
+from complete responses and from token streams, where a match can be split
+across deltas. Every term and pattern is compiled into one case-insensitive
+scan, which only runs near literals the matches must contain.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SENSITIVE_PATTERNS = ("api_key", "password", "secret", "token")
+
+class RedactionPattern:
+    """
+    A regex for sensitive data, with the longest text it can match.
+
+    max_length bounds how much a stream must hold back for the pattern, so
+    the regex must not match anything longer. Patterns that cannot match
+    whitespace only need text held back to the last whitespace. anchors are
+    lowercase literals at least one of which is in every match; a filter
+    only runs the regex near them, so text without any is skipped quickly.
+    """
+
+    def __init__(
+        self,
+        regex: str,
+        max_length: int,
+        spans_whitespace: bool = False,
+        anchors: Optional[Tuple[str, ...]] = None
+    ):
+        self.regex = regex
+        self.max_length = max_length
+        self.spans_whitespace = spans_whitespace
+        self.anchors = anchors
+
+DIGITS = tuple("0123456789")
+
+# Shared registry of sensitive data shapes: output filters redact all of them
+# and ValidationAgent reports the personal info ones as safety issues
+REDACTION_PATTERNS: Dict[str, RedactionPattern] = {
+    "ssn": RedactionPattern(r'\b[0-9]{3}-[0-9]{2}-[0-9]{4}\b', 11, anchors=DIGITS),
+    "card_number": RedactionPattern(
+        r'\b[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}\b', 19, spans_whitespace=True, anchors=DIGITS
+    ),
+    "email": RedactionPattern(
+        r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b', 343, anchors=("@",)
+    ),
+    "openai_key": RedactionPattern(r'\bsk-[A-Za-z0-9_-]{20,200}', 203, anchors=("sk-",)),
+    "aws_access_key": RedactionPattern(r'\bAKIA[0-9A-Z]{16}\b', 20, anchors=("akia",)),
+    "github_token": RedactionPattern(
+        r'\bgh[pousr]_[A-Za-z0-9]{36,251}\b', 255, anchors=("ghp_", "gho_", "ghu_", "ghs_", "ghr_")
+    )
+}
+
+# Characters that IGNORECASE matches to an ASCII letter but lower() does not
+# turn into one (or into one character); text with them is scanned in full
+_CASE_FOLDS = re.compile("[\u0130\u0131\u017f\u212a]")
+
+def register_pattern(
+    name: str,
+    regex: str,
+    max_length: int,
+    spans_whitespace: bool = False,
+    anchors: Optional[Tuple[str, ...]] = None
+):
+    """Add a sensitive data shape to the registry; filters created afterwards redact it."""
+
+    re.compile(regex)
+    REDACTION_PATTERNS[name] = RedactionPattern(regex, max_length, spans_whitespace, anchors)
+
+class OutputFilter:
+    """Case-insensitive redaction of sensitive terms and registered patterns in one scan."""
+
+    def __init__(
+        self,
+        patterns: Iterable[str] = SENSITIVE_PATTERNS,
+        replacement: str = "[FILTERED]",
+        redaction_patterns: Optional[Iterable[RedactionPattern]] = None
+    ):
+        patterns = sorted(set(patterns), key=len, reverse=True)
+        if redaction_patterns is None:
+            redaction_patterns = REDACTION_PATTERNS.values()
+        redaction_patterns = list(redaction_patterns) + [
+            RedactionPattern(
+                re.escape(p), len(p), any(c.isspace() for c in p), (p.lower(),) if p.isascii() else None
+            )
+            for p in patterns
+        ]
+
+        # Patterns come before terms: at a given position an email or key wins
+        # over a term inside it, so none of it is left behind
+        self.pattern = re.compile("|".join(p.regex for p in redaction_patterns), re.IGNORECASE)
+        self.replacement = replacement
+
+        # Longest match, for patterns that can and cannot run across whitespace;
+        # a stream holds back text within reach of an unfinished match
+        self.max_length = max(p.max_length for p in redaction_patterns)
+        self.max_spanning_length = max([p.max_length for p in redaction_patterns if p.spans_whitespace], default=0)
+
+        # Anchor -> longest match containing it, or None if a pattern has no anchors
+        self.anchors: Optional[Dict[str, int]] = {}
+        for p in redaction_patterns:
+            if p.anchors is None:
+                self.anchors = None
+                break
+            for anchor in p.anchors:
+                self.anchors[anchor] = max(self.anchors.get(anchor, 0), p.max_length)
+
+    def filter(self, text: str) -> Tuple[str, int]:
+        """Redacted text and the number of redactions."""
+
+        spans = self.spans(text)
+        pieces, consumed = [], 0
+        for start, end in spans:
+            pieces.append(text[consumed:start])
+            pieces.append(self.replacement)
+            consumed = end
+        pieces.append(text[consumed:])
+        return "".join(pieces), len(spans)
+
+    def spans(self, text: str, pos: int = 0) -> List[Tuple[int, int]]:
+        """(start, end) of every match from pos on, as pattern.finditer(text, pos) finds them."""
+
+        regions = self._regions(text, pos)
+        if regions is None:
+            return [match.span() for match in self.pattern.finditer(text, pos)]
+
+        spans = []
+        for start, end in regions:
+            start = max(start, spans[-1][1] if spans else pos)
+            while start < end:
+                # Reading max_length past the region decides every match starting in it
+                match = self.pattern.search(text, start, end + self.max_length + 1)
+                if match is None or match.start() >= end:
+                    break
+                spans.append(match.span())
+                start = match.end()
+        return spans
+
+    def _regions(self, text: str, pos: int) -> Optional[List[Tuple[int, int]]]:
+        """Merged [start, end) ranges where a match could start, or None to scan everything."""
+
+        if self.anchors is None or (not text.isascii() and _CASE_FOLDS.search(text)):
+            return None
+
+        lowered = text.lower()
+        starts = []
+        for anchor, reach in self.anchors.items():
+            found = lowered.find(anchor, pos)
+            while found >= 0:
+                # A match containing the anchor here starts at most reach characters before it ends
+                starts.append((max(pos, found + len(anchor) - reach), found + 1))
+                found = lowered.find(anchor, found + 1)
+        starts.sort()
+
+        regions = []
+        for start, end in starts:
+            if regions and start <= regions[-1][1]:
+                regions[-1][1] = max(regions[-1][1], end)
+            else:
+                regions.append([start, end])
+        return regions
+
+    def stream(self) -> "StreamingFilter":
+        return StreamingFilter(self)
+
+class StreamingFilter:
+    """
+    Incremental OutputFilter over a sliding window.
+
+    feed() returns the text that can safely be shown: everything except the
+    text an unfinished match could still cover, which is the last
+    max_length characters at most and usually just the last word.
+    Concatenating every feed() plus flush() gives exactly OutputFilter.filter()
+    of the whole text.
+    """
+
+    def __init__(self, output_filter: OutputFilter):
+        self.output_filter = output_filter
+        self.redactions = 0
+        self._buffer = ""
+        # Characters at the start of the buffer already emitted, kept so a
+        # word boundary at the first new character is judged as in the whole text
+        self._emitted = 0
+
+    def feed(self, delta: str) -> str:
+        self._buffer += delta
+        safe = self._safe_length()
+        if safe <= self._emitted:
+            return ""
+        return self._redact(safe)
+
+    def flush(self) -> str:
+        text = self._redact(len(self._buffer))
+        self._buffer, self._emitted = "", 0
+        return text
+
+    def _redact(self, safe: int) -> str:
+        """Emit the buffer up to safe (or the end of a match running past it), redacted."""
+
+        pieces, consumed = [], self._emitted
+        for start, end in self.output_filter.spans(self._buffer, self._emitted):
+            # A match starting before `safe` is complete: nothing after it could change it
+            if start >= safe:
+                break
+            pieces.append(self._buffer[consumed:start])
+            pieces.append(self.output_filter.replacement)
+            consumed = end
+            self.redactions += 1
+
+        cut = max(consumed, safe)
+        pieces.append(self._buffer[consumed:cut])
+        self._buffer = self._buffer[cut - 1:]
+        self._emitted = 1
+        return "".join(pieces)
+
+    def _safe_length(self) -> int:
+        """Length of the buffer prefix in which every match has started and been decided."""
+
+        length = len(self._buffer)
+        # A match that cannot contain whitespace ends at the next whitespace,
+        # so one starting before the last word is decided
+        words = self._buffer.rsplit(None, 1)
+        last_word = "" if self._buffer[-1:].isspace() or not words else words[-1]
+        non_spanning = max(length - len(last_word), length - self.output_filter.max_length)
+        # One that can is decided once the text runs a character past its longest extent
+        return min(non_spanning, length - self.output_filter.max_spanning_length)
@@ -0,0 +1,246 @@
+"""
+Workflow plan resolution.
+Routes known task classes to plan templates with a local keyword classifier and
+only asks the LLM to plan novel tasks; LLM plans are validated and cached.
+"""
+
+import copy
+import json
+import re
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from .cache import TieredCache, normalize_query, stable_digest
+from .workflow import WorkflowError, normalize_steps
+
+def _step(step_id: str, agent: str, action: str, priority: int, depends_on: List[str], **options) -> Dict[str, Any]:
+    return {"id": step_id, "agent": agent, "action": action, "priority": priority,
+            "depends_on": depends_on, **options}
+
+PLAN_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "summary": {
+        "steps": [
+            _step("content", "ContentAgent", "Summarize the material", 1, [], content_type="summary"),
+            _step("validation", "ValidationAgent", "Check summary quality", 2, ["content"], validation_type="quality")
+        ],
+        "estimated_time": "10-20 seconds",
+        "complexity": "low"
+    },
+    "creative": {
+        "steps": [
+            _step("content", "ContentAgent", "Write creative content", 1, [], content_type="creative"),
+            _step("validation", "ValidationAgent", "Check content safety", 2, ["content"], validation_type="safety")
+        ],
+        "estimated_time": "10-20 seconds",
+        "complexity": "low"
+    },
+    "technical": {
+        "steps": [
+            _step("research", "ResearchAgent", "Gather technical facts", 1, [], research_type="factual"),
+            _step("content", "ContentAgent", "Write technical documentation", 2, ["research"], content_type="technical"),
+            _step("validation", "ValidationAgent", "Validate technical accuracy", 3, ["content"], validation_type="technical")
+        ],
+        "estimated_time": "30-60 seconds",
+        "complexity": "medium"
+    },
+    "comparison": {
+        "steps": [
+            _step("research", "ResearchAgent", "Compare the alternatives", 1, [], research_type="comparative"),
+            _step("content", "ContentAgent", "Write the comparison", 2, ["research"], content_type="analysis"),
+            _step("validation", "ValidationAgent", "Validate output", 3, ["content"])
+        ],
+        "estimated_time": "30-60 seconds",
+        "complexity": "medium"
+    },
+    "analysis": {
+        "steps": [
+            _step("research", "ResearchAgent", "Analyze the topic", 1, [], research_type="analytical"),
+            _step("content", "ContentAgent", "Write the analysis", 2, ["research"], content_type="analysis"),
+            _step("validation", "ValidationAgent", "Validate output", 3, ["content"])
+        ],
+        "estimated_time": "30-60 seconds",
+        "complexity": "medium"
+    },
+    "explanation": {
+        "steps": [
+            _step("research", "ResearchAgent", "Gather relevant information", 1, []),
+            _step("content", "ContentAgent", "Generate response", 2, ["research"]),
+            _step("validation", "ValidationAgent", "Validate output", 3, ["content"])
+        ],
+        "estimated_time": "30-60 seconds",
+        "complexity": "medium"
+    }
+}
+
+# Checked in this order, so more specific classes win ties
+TEMPLATE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summarize", "summarise", "summary", "tl;dr", "tldr", "condense", "recap", "key points"),
+    "creative": ("story", "poem", "creative", "fiction", "slogan", "lyrics", "haiku", "tagline", "narrative"),
+    "technical": ("code", "api", "implement", "implementation", "architecture", "algorithm", "debug",
+                  "function", "sdk", "technical", "deploy", "configure", "python", "database", "documentation"),
+    "comparison": ("compare", "comparison", "versus", "vs", "difference between", "differences between"),
+    "analysis": ("analyze", "analyse", "analysis", "evaluate", "assess", "pros and cons", "trade-offs",
+                 "tradeoffs", "impact of"),
+    "explanation": ("explain", "what is", "what are", "how does", "how do", "why", "describe", "write",
+                    "overview", "introduction", "guide", "article", "generate", "about", "benefits", "tell me")
+}
+
+# Step fields an LLM plan may set, and the values the agents understand
+STEP_OPTIONS = {
+    "research_type": {"general", "factual", "analytical", "comparative"},
+    "content_type": {"explanation", "summary", "analysis", "creative", "technical"},
+    "validation_type": {"comprehensive", "safety", "quality", "technical"},
+    "style": None,
+    "length": {"short", "medium", "long"},
+    "query": None
+}
+
+FALLBACK_PLAN = {
+    "steps": [
+        _step("content", "ContentAgent", "Direct processing", 1, [])
+    ],
+    "estimated_time": "15-30 seconds",
+    "complexity": "low",
+    "fallback": True
+}
+
+class TaskClassifier:
+    """Keyword classifier mapping a task to a plan template (or None for novel tasks).
+
+    The generic class only wins when no specific class matches, so
+    "write a poem about autumn" is creative rather than an explanation.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]] = None, generic: Optional[str] = "explanation",
+                 min_score: int = 1):
+        keywords = keywords or TEMPLATE_KEYWORDS
+        self.generic = generic
+        self.min_score = min_score
+        self.patterns = [
+            (name, re.compile(r"(?<!\w)(?:" + "|".join(re.escape(k) for k in terms) + r")(?!\w)", re.IGNORECASE))
+            for name, terms in keywords.items()
+        ]
+
+    def classify(self, task: str) -> Tuple[Optional[str], int]:
+        scores = {name: len(pattern.findall(task)) for name, pattern in self.patterns}
+        generic_score = scores.pop(self.generic, 0)
+
+        best, best_score = None, 0
+        for name, score in scores.items():
+            if score > best_score:
+                best, best_score = name, score
+        if best_score < self.min_score and generic_score >= self.min_score:
+            best, best_score = self.generic, generic_score
+        if best_score < self.min_score:
+            return None, 0
+        return best, best_score
+
+def parse_plan(text: str, known_agents: Iterable[str], max_steps: int) -> Dict[str, Any]:
+    """Parse and validate a JSON plan from an LLM response; raises WorkflowError."""
+
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise WorkflowError("Planner response contains no JSON object")
+    try:
+        raw = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise WorkflowError(f"Planner response is not valid JSON: {e}")
+
+    raw_steps = raw.get("steps") if isinstance(raw, dict) else None
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise WorkflowError("Plan has no steps")
+    if len(raw_steps) > max_steps:
+        raise WorkflowError(f"Plan has {len(raw_steps)} steps, more than the limit of {max_steps}")
+
+    known_agents = set(known_agents)
+    steps = []
+    for raw_step in raw_steps:
+        if not isinstance(raw_step, dict) or raw_step.get("agent") not in known_agents:
+            raise WorkflowError(f"Plan step uses an unknown agent: {raw_step!r}")
+
+        step = {
+            "agent": raw_step["agent"],
+            "action": str(raw_step.get("action", "")),
+            "priority": raw_step.get("priority", 1) if isinstance(raw_step.get("priority"), int) else 1
+        }
+        if "id" in raw_step:
+            step["id"] = str(raw_step["id"])
+        if "depends_on" in raw_step:
+            if not isinstance(raw_step["depends_on"], list):
+                raise WorkflowError(f"Plan step {step.get('id')} has invalid depends_on")
+            step["depends_on"] = [str(dep) for dep in raw_step["depends_on"]]
+        for option, allowed in STEP_OPTIONS.items():
+            value = raw_step.get(option)
+            if isinstance(value, str) and (allowed is None or value in allowed):
+                step[option] = value
+        steps.append(step)
+
+    complexity = raw.get("complexity")
+    return {
+        # Checks ids, dependencies and cycles
+        "steps": normalize_steps(steps),
+        "estimated_time": str(raw.get("estimated_time", "unknown")),
+        "complexity": complexity if complexity in ("low", "medium", "high") else "medium"
+    }
+
+class PlanResolver:
+    """
+    Resolve a task to a workflow plan as cheaply as possible.
+
+    Known task classes use a template; novel tasks reuse a cached LLM plan
+    for the same (or, with a semantic threshold, a similar) task, and only
+    otherwise call the planner. Invalid or failed LLM plans fall back to a
+    single content step and are not cached.
+    """
+
+    def __init__(self, known_agents: Iterable[str], max_steps: int = 10,
+                 classifier: TaskClassifier = None, templates: Dict[str, Dict[str, Any]] = None,
+                 cache: TieredCache = None):
+        self.known_agents = list(known_agents)
+        self.max_steps = max_steps
+        self.classifier = classifier or TaskClassifier()
+        self.templates = templates or PLAN_TEMPLATES
+        self.cache = cache or TieredCache(max_entries=128, ttl_seconds=0)
+        self.stats = {
+            "template_hits": 0,
+            "cache_hits": 0,
+            "llm_plans": 0,
+            "invalid_plans": 0,
+            "fallbacks": 0
+        }
+
+    async def resolve(self, task: str, context: Dict[str, Any],
+                      planner: Callable[[str, Dict[str, Any]], Awaitable[str]]) -> Dict[str, Any]:
+        template, score = self.classifier.classify(task)
+        if template is not None:
+            self.stats["template_hits"] += 1
+            return {**copy.deepcopy(self.templates[template]), "source": "template", "template": template}
+
+        normalized = normalize_query(task)
+        key = stable_digest("plan", normalized)
+        cached = await self.cache.aget(key, namespace="plans", text=normalized)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return {**copy.deepcopy(cached), "source": "cache"}
+
+        try:
+            plan = parse_plan(await planner(task, context), self.known_agents, self.max_steps)
+        except WorkflowError as e:
+            self.stats["invalid_plans"] += 1
+            self.stats["fallbacks"] += 1
+            return {**copy.deepcopy(FALLBACK_PLAN), "source": "fallback", "reason": str(e)}
+        except Exception as e:
+            self.stats["fallbacks"] += 1
+            return {**copy.deepcopy(FALLBACK_PLAN), "source": "fallback", "reason": str(e)}
+
+        self.stats["llm_plans"] += 1
+        await self.cache.aset(key, plan, namespace="plans", text=normalized)
+        return {**copy.deepcopy(plan), "source": "llm"}
+
+    def get_stats(self) -> Dict[str, Any]:
+        resolved = sum(self.stats[k] for k in ("template_hits", "cache_hits", "llm_plans", "fallbacks"))
+        avoided = self.stats["template_hits"] + self.stats["cache_hits"]
+        return {
+            **self.stats,
+            "planner_calls_avoided_ratio": round(avoided / resolved, 4) if resolved else 0.0,
+            "cached_plans": len(self.cache)
+        }
@@ -0,0 +1,286 @@
+"""
+Shared async rate limiter for LLM requests.
+Token buckets for requests-per-window and tokens-per-minute, a fair priority queue
+across tenants, and fast load shedding when a caller's wait would exceed its deadline.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+_tenant = contextvars.ContextVar("rate_limit_tenant", default="default")
+_priority = contextvars.ContextVar("rate_limit_priority", default=1)
+
+@contextmanager
+def request_context(tenant: str = "default", priority: int = 1):
+    """Tag LLM requests made inside this block with a tenant and priority (0 = most urgent)."""
+
+    tenant_token = _tenant.set(tenant)
+    priority_token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _tenant.reset(tenant_token)
+        _priority.reset(priority_token)
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is shed because its queue wait would exceed the deadline."""
+
+class TokenBucket:
+    """Continuous-refill token bucket; capacity is the burst size."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        """Time until `amount` tokens are available (refill must be current)."""
+        deficit = min(amount, self.capacity) - self.tokens
+        return max(0.0, deficit / self.refill_per_second)
+
+class RateLimiter:
+    """
+    Admission control shared by all agents using the same provider credentials.
+
+    Callers wait in a heap ordered by priority, then by how many requests
+    their tenant has already queued, so one busy tenant cannot starve the
+    others. The limiter is safe to share between event loops; waiters are
+    woken on their own loop.
+    """
+
+    def __init__(self, requests_per_window: int, window_seconds: float,
+                 tokens_per_minute: int = 0, max_wait: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_window, requests_per_window / window_seconds)
+        self.configured_rate = self.requests.refill_per_second
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0) if tokens_per_minute else None
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._queue = []
+        self._granted = set()
+        self._sequence = itertools.count()
+        self._tenant_turns: Dict[str, int] = {}
+        self._paused_until = 0.0
+        self._timer_at = None
+        self._timer_loop = None
+        self._wait_times = deque(maxlen=1000)
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "shed": 0,
+            "throttled_by_provider": 0,
+            "rate_reductions": 0,
+            "max_queue_depth": 0
+        }
+
+    # --- Admission ----------------------------------------------------------
+
+    def _fits(self, tokens: float) -> bool:
+        if time.monotonic() < self._paused_until or self.requests.tokens < 1:
+            return False
+        return self.tokens is None or self.tokens.tokens >= min(tokens, self.tokens.capacity)
+
+    def _take(self, tokens: float):
+        self.requests.tokens -= 1
+        if self.tokens is not None:
+            self.tokens.tokens -= min(tokens, self.tokens.capacity)
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self.requests.refill(now)
+        if self.tokens is not None:
+            self.tokens.refill(now)
+        return now
+
+    def _estimate_wait(self, tokens: float, now: float) -> float:
+        """Seconds until everything already queued, plus this request, is admitted."""
+
+        queued_requests = len(self._queue) + 1
+        queued_tokens = sum(entry[3] for entry in self._queue) + tokens
+
+        wait = max(0.0, self._paused_until - now)
+        wait = max(wait, (queued_requests - self.requests.tokens) / self.requests.refill_per_second)
+        if self.tokens is not None:
+            wait = max(wait, (queued_tokens - self.tokens.tokens) / self.tokens.refill_per_second)
+        return max(0.0, wait)
+
+    async def acquire(self, tokens: float = 1, tenant: str = None, priority: int = None,
+                      max_wait: Optional[float] = None):
+        """Wait for a request slot and `tokens` of budget, or raise RateLimitExceeded."""
+
+        tenant = tenant or _tenant.get()
+        priority = _priority.get() if priority is None else priority
+        max_wait = self.max_wait if max_wait is None else max_wait
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            now = self._refill()
+            if not self._queue and self._fits(tokens):
+                self._take(tokens)
+                self.stats["admitted"] += 1
+                self._wait_times.append(0.0)
+                return
+
+            estimated = self._estimate_wait(tokens, now)
+            if max_wait is not None and estimated > max_wait:
+                self.stats["shed"] += 1
+                raise RateLimitExceeded(
+                    f"Rate limit queue wait {estimated:.1f}s exceeds deadline {max_wait:.1f}s"
+                )
+
+            turn = self._tenant_turns.get(tenant, 0)
+            self._tenant_turns[tenant] = turn + 1
+            future = loop.create_future()
+            heapq.heappush(self._queue, (priority, turn, next(self._sequence), tokens, tenant, future, now))
+            self.stats["queued"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._queue))
+            self._schedule_locked(now)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._granted:
+                    # Admitted just as we were cancelled; give the budget back
+                    self._granted.discard(future)
+                    self.requests.tokens += 1
+                    if self.tokens is not None:
+                        self.tokens.tokens += min(tokens, self.tokens.capacity)
+                else:
+                    self._queue = [entry for entry in self._queue if entry[5] is not future]
+                    heapq.heapify(self._queue)
+                    self._release_turn_locked(tenant)
+                    # The pending timer may live on this waiter's loop, which can
+                    # be about to close; re-arm it on the new head's loop
+                    self._timer_at = None
+                    self._schedule_locked(self._refill())
+            raise
+
+        with self._lock:
+            self._granted.discard(future)
+
+    def _release_turn_locked(self, tenant: str):
+        turns = self._tenant_turns.get(tenant, 0) - 1
+        if turns > 0:
+            self._tenant_turns[tenant] = turns
+        else:
+            self._tenant_turns.pop(tenant, None)
+
+    def _dispatch(self):
+        """Admit queued callers in order while budget allows, then re-arm the timer."""
+
+        with self._lock:
+            self._timer_at = None
+            now = self._refill()
+            while self._queue:
+                _, _, _, tokens, tenant, future, queued_at = self._queue[0]
+                if future.done():
+                    heapq.heappop(self._queue)
+                    continue
+                if not self._fits(tokens):
+                    break
+                heapq.heappop(self._queue)
+                self._take(tokens)
+                self._release_turn_locked(tenant)
+                self.stats["admitted"] += 1
+                self._wait_times.append(now - queued_at)
+                self._granted.add(future)
+                future.get_loop().call_soon_threadsafe(_resolve, future)
+            self._schedule_locked(now)
+
+    def _schedule_locked(self, now: float):
+        # A waiter whose loop closed without cancelling it can never be woken
+        while self._queue and self._queue[0][5].get_loop().is_closed() and not self._queue[0][5].done():
+            self._release_turn_locked(heapq.heappop(self._queue)[4])
+        if not self._queue:
+            return
+
+        tokens = self._queue[0][3]
+        delay = max(self._paused_until - now, self.requests.seconds_until(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.seconds_until(tokens))
+
+        # The head did not fit just now, so never spin on a zero delay
+        delay = max(delay, 0.001)
+        at = now + delay
+        # A timer that is already due but has not run, or whose loop has closed,
+        # may never fire, so only a live future timer makes this one redundant
+        if (self._timer_at is not None and now < self._timer_at <= at
+                and not self._timer_loop.is_closed()):
+            return
+
+        loop = self._queue[0][5].get_loop()
+        self._timer_at = at
+        self._timer_loop = loop
+        loop.call_soon_threadsafe(loop.call_later, delay, self._dispatch)
+
+    # --- Feedback from responses --------------------------------------------
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: Optional[float]):
+        """Feedback from a successful response.
+
+        Corrects the token budget with the provider's real usage and slowly
+        restores a request rate that was reduced after 429s.
+        """
+
+        with self._lock:
+            if self.requests.refill_per_second < self.configured_rate:
+                self.requests.refill_per_second = min(
+                    self.configured_rate, self.requests.refill_per_second * 1.02
+                )
+            if self.tokens is not None and actual_tokens is not None:
+                self.tokens.tokens -= actual_tokens - min(estimated_tokens, self.tokens.capacity)
+
+    def pause(self, seconds: float):
+        """React to a provider 429: stop admitting for Retry-After seconds.
+
+        The first 429 of an episode also halves the request rate and empties
+        the bucket, so callers resume at a pace the provider accepts instead
+        of all retrying at once.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self.stats["throttled_by_provider"] += 1
+            if now >= self._paused_until:
+                self.stats["rate_reductions"] += 1
+                self.requests.refill(now)
+                self.requests.tokens = min(self.requests.tokens, 0.0)
+                self.requests.refill_per_second = max(self.configured_rate / 64, self.requests.refill_per_second / 2)
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._timer_at = None
+            self._schedule_locked(now)
+
+    # --- Metrics ------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._wait_times)
+            depth = len(self._queue)
+
+        def percentile(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 4) if waits else 0.0
+
+        return {
+            **self.stats,
+            "queue_depth": depth,
+            "current_rate_per_second": round(self.requests.refill_per_second, 3),
+            "wait_p50_seconds": percentile(0.5),
+            "wait_p95_seconds": percentile(0.95),
+            "wait_max_seconds": round(waits[-1], 4) if waits else 0.0
+        }
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
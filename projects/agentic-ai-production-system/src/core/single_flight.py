@@ -0,0 +1,85 @@
+"""
+Single-flight coalescing for identical concurrent LLM requests.
+The first caller for a fingerprint runs the request; callers arriving while it
+is in flight await the same result (or the same exception).
+"""
+
+import asyncio
+import hashlib
+import json
+import weakref
+from typing import Dict, Any, Awaitable, Callable, List, Tuple
+
+def request_fingerprint(model: str, messages: List[Dict[str, str]], **kwargs) -> str:
+    """Stable digest of everything that determines a completion."""
+
+    payload = json.dumps(
+        {"model": model, "messages": messages, "kwargs": kwargs},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    """
+    Share one in-flight call between identical concurrent callers.
+
+    Calls are tracked per event loop, since a task can only be awaited on the
+    loop it runs on. A caller that is cancelled does not cancel the shared
+    call unless it was the last one waiting for it.
+    """
+
+    def __init__(self):
+        # loop -> {fingerprint: (task, [waiters])}
+        self._in_flight = weakref.WeakKeyDictionary()
+        self.stats = {
+            "calls": 0,
+            "executed": 0,
+            "coalesced": 0
+        }
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run call() or join the identical call already in flight.
+
+        Returns (result, shared) where shared is True for callers that did
+        not start the request themselves.
+        """
+
+        loop = asyncio.get_running_loop()
+        calls = self._in_flight.setdefault(loop, {})
+        self.stats["calls"] += 1
+
+        shared = key in calls
+        if shared:
+            task, waiters = calls[key]
+            self.stats["coalesced"] += 1
+        else:
+            task = loop.create_task(call())
+            waiters = [0]
+            calls[key] = (task, waiters)
+            task.add_done_callback(lambda _: calls.pop(key, None))
+            self.stats["executed"] += 1
+
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if not task.done() and waiters[0] == 1:
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+    def in_flight(self) -> int:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        return len(self._in_flight.get(loop, {}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "coalesced_ratio": round(self.stats["coalesced"] / calls, 4) if calls else 0.0
+        }
@@ -0,0 +1,248 @@
+"""
+Single-pass text analytics for content validation.
+One scan of a document yields word and sentence counts, word frequencies,
+term variations and the code blocks with their bracket balance. Documents
+are processed in blocks, so they can be fed as a stream of any size.
+"""
+
+import bisect
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Sentence boundaries are runs of these, as in re.split(r'[.!?]+', text)
+SENTENCE_TERMINATORS = ".!?"
+
+# Sentences shorter than this (after stripping whitespace) count as short
+SHORT_SENTENCE_CHARS = 5
+
+# Text is analyzed in blocks of about this many characters
+BLOCK_CHARS = 16384
+
+_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+_BRACKET = re.compile(r"[()\[\]{}]")
+_CODE_FENCE = re.compile(r"```\w*\n")
+_CODE_CLOSE = "\n```"
+_SPACE = re.compile(r"\s+")
+
+# Whitespace outside ASCII; mapped to a space so a byte table can classify text
+_UNICODE_SPACE = re.compile("[\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]")
+
+def _class_table() -> bytes:
+    """Byte classes: whitespace -> ' ', sentence terminator -> '.', anything else -> 'x'."""
+
+    table = bytearray(b"x" * 256)
+    for byte in b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f":
+        table[byte] = ord(" ")
+    for byte in SENTENCE_TERMINATORS.encode():
+        table[byte] = ord(".")
+    return bytes(table)
+
+_CLASSES = _class_table()
+# UTF-8 continuation bytes; dropping them leaves one byte per character
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+def bracket_balance(code: str, stack: Optional[List[str]] = None) -> Tuple[bool, List[str]]:
+    """Check brackets in code, continuing from an open-bracket stack.
+
+    Returns (mismatched, stack): mismatched is True at the first closing
+    bracket that does not match, where checking stops; stack holds the
+    brackets still open.
+    """
+
+    stack = [] if stack is None else stack
+    for char in _BRACKET.findall(code):
+        if char in _BRACKETS:
+            stack.append(char)
+        elif not stack or _BRACKETS[stack.pop()] != char:
+            return True, stack
+    return False, stack
+
+class TextStats:
+    """What one pass over a document found."""
+
+    def __init__(self):
+        self.characters = 0
+        self.words = 0
+        self.sentences = 0
+        self.short_sentences = 0
+        # Word frequencies, lowercased
+        self.word_counts = Counter()
+        # Base term -> variations found, in declaration order
+        self.terms: Dict[str, List[str]] = {}
+        # (mismatched, unclosed) for each complete code block
+        self.code_blocks: List[Tuple[bool, bool]] = []
+
+    @property
+    def max_word_share(self) -> float:
+        """Share of the words taken by the most frequent one."""
+
+        if not self.words:
+            return 0.0
+        return max(self.word_counts.values()) / self.words
+
+class TextStream:
+    """
+    Incremental TextAnalyzer over a document fed in pieces.
+
+    Text is held back to the last whitespace, so words, sentence breaks,
+    terms and code fences are never cut in two; finish() processes the rest
+    and returns the TextStats for the whole document.
+    """
+
+    def __init__(self, analyzer: "TextAnalyzer"):
+        self.analyzer = analyzer
+        self.stats = TextStats()
+        self._pending = ""
+        # Trailing sentence not yet ended, in byte classes
+        self._sentence = b""
+        self._first_sentence = True
+        # Term variations still to find, and the text a term could straddle
+        self._missing = [
+            (base, variation) for base, variations in analyzer.term_variations.items() for variation in variations
+        ]
+        self._found = set()
+        self._overlap = ""
+        # Open code block: bracket state, and whether its text ended with a newline
+        self._code_stack: Optional[List[str]] = None
+        self._code_mismatched = False
+        self._code_newline = False
+
+    def feed(self, text: str):
+        self._pending += text
+        # Everything up to the last whitespace is ready; the word after it may go on
+        tail = "" if not self._pending or self._pending[-1].isspace() else self._pending.rsplit(None, 1)[-1]
+        ready = len(self._pending) - len(tail)
+        start = 0
+        while start < ready:
+            end = start + BLOCK_CHARS
+            if end < ready:
+                # End the block after its last whitespace, or after the next one if it has none
+                block = self._pending[start:end]
+                last = "" if block[-1].isspace() else block.rsplit(None, 1)[-1]
+                end = end - len(last) if len(last) < len(block) else _SPACE.search(self._pending, end).end()
+            else:
+                end = ready
+            self._process(self._pending[start:end])
+            start = end
+        self._pending = tail
+
+    def finish(self) -> TextStats:
+        """Process whatever is held back and return the document's stats."""
+
+        self._process(self._pending, final=True)
+        self._pending = ""
+        for base, variations in self.analyzer.term_variations.items():
+            found = [variation for variation in variations if variation in self._found]
+            if found:
+                self.stats.terms[base] = found
+        return self.stats
+
+    def _process(self, text: str, final: bool = False):
+        """Analyze text that starts and (unless final) ends at a word boundary."""
+
+        stats = self.stats
+        stats.characters += len(text)
+
+        if text.isascii():
+            classes = text.encode("ascii").translate(_CLASSES)
+        else:
+            classes = _UNICODE_SPACE.sub(" ", text).encode().translate(_CLASSES, _CONTINUATION_BYTES)
+
+        words = text.lower().split()
+        stats.words += len(words)
+        stats.word_counts.update(words)
+
+        self._count_sentences(classes, final)
+
+        self._find_terms(text)
+        self._scan_code(text)
+
+    def _count_sentences(self, classes: bytes, final: bool):
+        stats = self.stats
+        pieces = (self._sentence + classes).split(b".")
+        # The last piece runs on into the next text, unless this is the end
+        self._sentence = b"" if final else pieces.pop()
+        if not pieces:
+            return
+
+        # Empty pieces between adjacent terminators are not sentences; only
+        # the document's first piece and its last may legitimately be empty
+        skipped = pieces.count(b"")
+        if self._first_sentence and pieces[0] == b"":
+            skipped -= 1
+        if final and pieces[-1] == b"" and (len(pieces) > 1 or not self._first_sentence):
+            skipped -= 1
+        self._first_sentence = False
+
+        lengths = sorted(map(len, map(bytes.strip, pieces)))
+        stats.sentences += len(pieces) - skipped
+        stats.short_sentences += bisect.bisect_left(lengths, SHORT_SENTENCE_CHARS) - skipped
+
+        # A long running sentence stays long: keep a stand-in, not all its text
+        if len(self._sentence.strip()) >= SHORT_SENTENCE_CHARS:
+            self._sentence = b"x" * SHORT_SENTENCE_CHARS
+
+    def _find_terms(self, text: str):
+        if not self._missing:
+            return
+        window = self._overlap + text
+        missing = []
+        for base, variation in self._missing:
+            if variation in window:
+                self._found.add(variation)
+            else:
+                missing.append((base, variation))
+        self._missing = missing
+        self._overlap = window[len(window) - self.analyzer.max_term_length + 1:]
+
+    def _scan_code(self, text: str):
+        """Find code blocks as re.findall(r'```\\w*\\n(.*?)\\n```', text, re.DOTALL) would."""
+
+        position = 0
+        while True:
+            if self._code_stack is None:
+                fence = _CODE_FENCE.search(text, position)
+                if fence is None:
+                    return
+                self._code_stack, self._code_mismatched, self._code_newline = [], False, False
+                position = fence.end()
+
+            if position == 0 and self._code_newline and text.startswith("```"):
+                # The closing newline ended the previous text
+                position = 3
+            else:
+                end = text.find(_CODE_CLOSE, position)
+                code = text[position:] if end < 0 else text[position:end]
+                if code and not self._code_mismatched:
+                    self._code_mismatched, self._code_stack = bracket_balance(code, self._code_stack)
+                if end < 0:
+                    if code:
+                        self._code_newline = code.endswith("\n")
+                    return
+                position = end + len(_CODE_CLOSE)
+
+            self.stats.code_blocks.append((self._code_mismatched, bool(self._code_stack)))
+            self._code_stack = None
+
+class TextAnalyzer:
+    """
+    Word, sentence, term and code block statistics for validation checks.
+
+    term_variations maps a base term to the spellings that count as using
+    it; a document using more than one spelling is inconsistent.
+    """
+
+    def __init__(self, term_variations: Optional[Dict[str, List[str]]] = None):
+        self.term_variations = term_variations or {}
+        self.max_term_length = max(
+            (len(variation) for variations in self.term_variations.values() for variation in variations), default=0
+        )
+
+    def stream(self) -> TextStream:
+        return TextStream(self)
+
+    def analyze(self, text: str) -> TextStats:
+        stream = self.stream()
+        stream.feed(text)
+        return stream.finish()
@@ -0,0 +1,168 @@
+"""
+Token counting and prompt budgeting.
+Counts use tiktoken when it is installed, otherwise a local approximation of
+BPE tokenization; either way counts are cached per text.
+"""
+
+import bisect
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # the approximation below is used instead
+    tiktoken = None
+
+# Context windows by model prefix; longer prefixes are matched first
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Chat formatting overhead (role markers and separators), as counted by OpenAI
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Short runs of letters or digits with an optional leading space, single
+# punctuation marks and whitespace: close to cl100k on English prose, a
+# little pessimistic on long words, which errs on the safe side for budgets.
+_APPROXIMATE_TOKEN = re.compile(r" ?[^\W\d_]{1,4}| ?\d{1,3}| ?[^\w\s]|_+|\s+")
+
+# Preferred places to split long text, best first
+_BREAKS = ("\n\n", "\n", ". ", " ")
+
+def context_window(model: str) -> int:
+    """Context window size for a model name, with a conservative default."""
+
+    for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_WINDOWS[prefix]
+    return DEFAULT_CONTEXT_WINDOW
+
+class Tokenizer:
+    """
+    Token counts, truncation and chunking for one model.
+
+    count() is memoized for the last cache_size texts, since the same system
+    prompts and upstream outputs are counted over and over.
+    """
+
+    def __init__(self, model: str = "gpt-4", cache_size: int = 4096):
+        self.model = model
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's real encoding."""
+        return self._encoding is not None
+
+    def _count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return sum(1 for _ in _APPROXIMATE_TOKEN.finditer(text))
+
+    def _token_ends(self, text: str) -> List[int]:
+        """Character offset at which each token ends."""
+
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            _, starts = self._encoding.decode_with_offsets(tokens)
+            return starts[1:] + [len(text)]
+        return [match.end() for match in _APPROXIMATE_TOKEN.finditer(text)]
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens for a chat request, including per-message formatting."""
+        return sum(
+            TOKENS_PER_MESSAGE + self.count(str(message.get("content", ""))) for message in messages
+        ) + TOKENS_PER_REPLY
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """The longest prefix of text with at most max_tokens tokens."""
+
+        if self.count(text) <= max_tokens:
+            return text
+        ends = self._token_ends(text)
+        return text[:ends[max_tokens - 1]] if max_tokens > 0 else ""
+
+    def split(self, text: str, chunk_tokens: int) -> List[str]:
+        """Split text into chunks of at most chunk_tokens tokens.
+
+        Chunks end at a paragraph, line, sentence or word break when one
+        falls in the second half of the chunk, so no chunk stops mid-thought
+        if it can be avoided. Joining the chunks gives back the text.
+        """
+
+        chunk_tokens = max(1, chunk_tokens)
+        if self.count(text) <= chunk_tokens:
+            return [text] if text else []
+
+        ends = self._token_ends(text)
+        chunks = []
+        start_token, start_char = 0, 0
+        while start_token < len(ends):
+            end_token = min(start_token + chunk_tokens, len(ends))
+            end_char = ends[end_token - 1]
+            if end_token < len(ends):
+                half = (end_token - start_token) // 2
+                middle = ends[start_token + half - 1] if half else start_char
+                for separator in _BREAKS:
+                    position = text.rfind(separator, middle, end_char)
+                    if position >= 0:
+                        # Snap the break to the token boundary at or before it
+                        cut = bisect.bisect_right(ends, position + len(separator))
+                        if cut > start_token:
+                            end_token, end_char = cut, ends[cut - 1]
+                        break
+            chunks.append(text[start_char:end_char])
+            start_token, start_char = end_token, end_char
+        return chunks
+
+_tokenizers: Dict[str, Tokenizer] = {}
+_tokenizers_lock = threading.Lock()
+
+def get_tokenizer(model: Optional[str] = None) -> Tokenizer:
+    """Process-wide tokenizer for a model, so the count cache is shared by every agent."""
+
+    model = model or "gpt-4"
+    with _tokenizers_lock:
+        tokenizer = _tokenizers.get(model)
+        if tokenizer is None:
+            tokenizer = _tokenizers[model] = Tokenizer(model)
+    return tokenizer
+
+class PromptBudget:
+    """
+    Splits a model's context window between prompt and output.
+
+    available_output() caps a requested max_tokens to what is left after
+    the prompt; content_budget() says how many tokens of variable content
+    fit next to fixed messages while leaving room for the output. A safety
+    margin absorbs differences between the local count and the provider's.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, window: int, margin: int = 64):
+        self.tokenizer = tokenizer
+        self.window = window
+        self.margin = margin if tokenizer.exact else max(margin, window // 50)
+
+    def available_output(self, messages: List[Dict[str, str]], requested: Optional[int] = None) -> int:
+        available = self.window - self.margin - self.tokenizer.count_messages(messages)
+        return max(0, min(requested, available) if requested else available)
+
+    def content_budget(self, fixed_messages: List[Dict[str, str]], max_output: int, cap: Optional[int] = None) -> int:
+        available = self.window - self.margin - max_output - self.tokenizer.count_messages(fixed_messages)
+        return max(0, min(cap, available) if cap else available)
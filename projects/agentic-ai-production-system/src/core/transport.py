@@ -0,0 +1,446 @@
+"""
+Shared async transport for LLM requests.
+Provides pooled AsyncOpenAI clients, async retry for transient provider errors,
+per-model circuit breakers, optional request hedging and a fallback model.
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # newer openai releases ship on httpx2
+    import httpx2 as httpx
+
+from openai import (
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    APIConnectionError,
+    APITimeoutError,
+    RateLimitError,
+    InternalServerError
+)
+from tenacity import AsyncRetrying, stop_after_attempt, retry_if_exception_type
+
+from .rate_limiter import RateLimiter, RateLimitExceeded
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyWindow
+from .single_flight import SingleFlight
+from .tokens import get_tokenizer
+from .metrics import (
+    LLM_REQUEST_SECONDS,
+    LLM_TIME_TO_FIRST_TOKEN_SECONDS,
+    LLM_PROMPT_TOKENS,
+    LLM_COMPLETION_TOKENS,
+    LLM_RETRIES,
+    LLM_REQUESTS_TOTAL,
+    LLM_RESILIENCE_EVENTS_TOTAL,
+    RATE_LIMIT_WAIT_SECONDS
+)
+
+# Errors worth retrying; anything else (bad request, auth, ...) fails immediately
+TRANSIENT_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+
+class LLMTransport:
+    """
+    Async, pooled access to an OpenAI-compatible chat completions API.
+
+    One transport is shared by every agent with the same credentials and
+    endpoint. Connections are bound to an event loop, so each loop gets its
+    own keep-alive pool; the pool is released when the loop goes away.
+
+    Each model has a circuit breaker: while it is open, requests to the
+    model fail at once instead of waiting out retries, and go to
+    config.fallback_model when one is set. With hedging enabled, a request
+    still unanswered after the model's recent p95 latency is sent again
+    (if the rate limit has room) and the first response wins.
+    """
+
+    def __init__(self, config, keepalive_expiry: float = 30.0):
+        self.config = config
+        self.limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.rate_limiter = RateLimiter(
+            config.rate_limit_requests,
+            config.rate_limit_window,
+            tokens_per_minute=config.tokens_per_minute,
+            max_wait=config.rate_limit_max_wait
+        )
+        # Identical concurrent requests from any agent on this endpoint share one call
+        self.single_flight = SingleFlight()
+        # Health probes from every agent share one models-list call
+        self._probes = SingleFlight()
+        self._clients = weakref.WeakKeyDictionary()
+        self._default_client = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyWindow] = {}
+        self.stats = {
+            "requests": 0,
+            "streams": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "hedged": 0,
+            "hedges_won": 0,
+            "fallbacks": 0
+        }
+
+    def _build_client(self) -> AsyncOpenAI:
+        http_client = DefaultAsyncHttpxClient(
+            limits=self.limits,
+            timeout=httpx.Timeout(self.config.timeout_seconds)
+        )
+        # Retries are handled here so they respect config.max_retries and error type
+        return AsyncOpenAI(
+            api_key=self.config.openai_api_key,
+            base_url=self.config.openai_base_url,
+            max_retries=0,
+            http_client=http_client
+        )
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Pooled client for the running event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._default_client is None:
+                self._default_client = self._build_client()
+            return self._default_client
+
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._build_client()
+            self._clients[loop] = client
+        return client
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers.setdefault(model, CircuitBreaker(
+                model,
+                failure_rate=self.config.circuit_breaker_failure_rate,
+                window_seconds=self.config.circuit_breaker_window,
+                min_requests=self.config.circuit_breaker_min_requests,
+                open_seconds=self.config.circuit_breaker_open_seconds
+            ))
+        return breaker
+
+    def reset_circuits(self):
+        """Close every model's circuit, e.g. after the provider has been fixed."""
+        for breaker in list(self._breakers.values()):
+            breaker.reset()
+
+    def _latency(self, model: str) -> LatencyWindow:
+        window = self._latencies.get(model)
+        if window is None:
+            window = self._latencies.setdefault(model, LatencyWindow())
+        return window
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        try:
+            return min(float(response.headers.get("retry-after")), 30.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _retry_wait(self, retry_state) -> float:
+        """Exponential backoff with jitter for retries not already paced by the rate limiter."""
+
+        if isinstance(retry_state.outcome.exception(), RateLimitError):
+            # The limiter has paused admission for Retry-After; acquire() does the waiting
+            return 0.0
+
+        backoff = min(0.5 * (2 ** (retry_state.attempt_number - 1)), 8.0)
+        return backoff * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int], model: Optional[str] = None) -> int:
+        """Prompt tokens (counted locally) plus the completion allowance."""
+        return get_tokenizer(model).count_messages(messages) + (max_tokens or 256)
+
+    def _check_circuit(self, model: str, check=None):
+        try:
+            (check or self.breaker(model).check)()
+        except CircuitOpenError:
+            LLM_RESILIENCE_EVENTS_TOTAL.labels(model, "rejected").inc()
+            raise
+
+    async def _send(self, send, model: str):
+        """One call through the model's circuit breaker, recording its outcome and latency."""
+
+        breaker = self.breaker(model)
+        state = breaker.state
+        self._check_circuit(model, breaker.before_request)
+
+        start = time.perf_counter()
+        try:
+            response = await send()
+        except RateLimitError:
+            # Throttling is paced by the rate limiter; it says nothing about the model's health
+            breaker.record(failed=False)
+            raise
+        except TRANSIENT_ERRORS:
+            breaker.record(failed=True)
+            raise
+        except Exception:
+            breaker.record(failed=False)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record(failed=False)
+            self._latency(model).observe(time.perf_counter() - start)
+            return response
+        finally:
+            if breaker.state != state:
+                LLM_RESILIENCE_EVENTS_TOTAL.labels(model, breaker.state).inc()
+
+    async def _send_hedged(self, send, model: str, estimated_tokens: int):
+        """Send, and race a second copy if the first is slower than the model's recent p95."""
+
+        delay = self._latency(model).quantile(self.config.hedge_quantile)
+        first = asyncio.ensure_future(self._send(send, model))
+        if delay is None:
+            return await first
+
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.breaker(model).allows_request():
+                return await first
+            try:
+                # Hedges only use spare budget; they never queue behind other requests
+                await self.rate_limiter.acquire(estimated_tokens, priority=2, max_wait=0)
+            except RateLimitExceeded:
+                return await first
+
+            self.stats["hedged"] += 1
+            LLM_RESILIENCE_EVENTS_TOTAL.labels(model, "hedged").inc()
+            second = asyncio.ensure_future(self._send(send, model))
+            tasks.add(second)
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats["hedges_won"] += 1
+                            LLM_RESILIENCE_EVENTS_TOTAL.labels(model, "hedge_won").inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _create(self, messages: List[Dict[str, str]], model: str, estimated_tokens: int,
+                      agent: str, **kwargs):
+        """Send one completion request, retrying transient errors without blocking the loop.
+
+        An open circuit is not retried: CircuitOpenError is raised at once.
+        """
+
+        client = self.client
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.config.max_retries),
+            wait=self._retry_wait,
+            retry=retry_if_exception_type(TRANSIENT_ERRORS),
+            reraise=True
+        )
+        queue_wait = RATE_LIMIT_WAIT_SECONDS.labels(agent, model)
+        hedge = self.config.enable_hedging and not kwargs.get("stream")
+        attempts = 0
+
+        def send():
+            return client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=self.config.timeout_seconds,
+                **kwargs
+            )
+
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    # Fail fast rather than queue for a model that is refusing requests
+                    self._check_circuit(model)
+                    queued_at = time.perf_counter()
+                    await self.rate_limiter.acquire(estimated_tokens)
+                    queue_wait.observe(time.perf_counter() - queued_at)
+                    attempts += 1
+                    self.stats["attempts"] += 1
+                    if attempts > 1:
+                        self.stats["retries"] += 1
+                    try:
+                        if hedge:
+                            return await self._send_hedged(send, model, estimated_tokens)
+                        return await self._send(send, model)
+                    except RateLimitError as e:
+                        # Provider says slow down: hold back every caller, not just this one
+                        self.rate_limiter.pause(self._retry_after(e) or 1.0)
+                        raise
+        finally:
+            LLM_RETRIES.labels(agent, model).observe(max(attempts - 1, 0))
+
+    async def _create_with_fallback(self, messages: List[Dict[str, str]], model: str, estimated_tokens: int,
+                                    agent: str, **kwargs) -> Tuple[Any, str]:
+        """_create() on model, then on config.fallback_model if model is down. Returns (response, model used)."""
+
+        fallback = self.config.fallback_model
+        try:
+            return await self._create(messages, model, estimated_tokens, agent, **kwargs), model
+        except (CircuitOpenError,) + TRANSIENT_ERRORS:
+            if not fallback or fallback == model:
+                raise
+            self.stats["fallbacks"] += 1
+            LLM_RESILIENCE_EVENTS_TOTAL.labels(model, "fallback").inc()
+        return await self._create(messages, fallback, estimated_tokens, agent, **kwargs), fallback
+
+    async def chat_completion(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                              agent: str = "unknown", **kwargs):
+        """Create a chat completion, retrying transient errors without blocking the loop.
+
+        agent labels the request in the exported metrics.
+        """
+
+        model = model or self.config.openai_model
+        self.stats["requests"] += 1
+        estimated_tokens = self.estimate_tokens(messages, kwargs.get("max_tokens"), model)
+        start_time = time.perf_counter()
+
+        try:
+            response, model = await self._create_with_fallback(messages, model, estimated_tokens, agent, **kwargs)
+        except Exception:
+            self.stats["failures"] += 1
+            LLM_REQUESTS_TOTAL.labels(agent, model, "failure").inc()
+            raise
+
+        usage = getattr(response, "usage", None)
+        LLM_REQUEST_SECONDS.labels(agent, model).observe(time.perf_counter() - start_time)
+        LLM_REQUESTS_TOTAL.labels(agent, model, "success").inc()
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+            LLM_PROMPT_TOKENS.labels(agent, model).observe(prompt_tokens)
+            LLM_COMPLETION_TOKENS.labels(agent, model).observe(completion_tokens)
+        self.rate_limiter.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+        return response
+
+    async def chat_completion_stream(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                                     agent: str = "unknown", **kwargs) -> AsyncIterator[str]:
+        """Stream a chat completion as text deltas.
+
+        Opening the stream is retried like chat_completion; once deltas have
+        been yielded, an error is raised to the caller instead. Streams carry
+        no usage, so token metrics use the 4-characters-per-token estimate.
+        """
+
+        model = model or self.config.openai_model
+        self.stats["requests"] += 1
+        self.stats["streams"] += 1
+        estimated_tokens = self.estimate_tokens(messages, kwargs.get("max_tokens"), model)
+        start_time = time.perf_counter()
+        streamed_chars = 0
+
+        try:
+            stream, model = await self._create_with_fallback(
+                messages, model, estimated_tokens, agent, stream=True, **kwargs
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not streamed_chars:
+                            LLM_TIME_TO_FIRST_TOKEN_SECONDS.labels(agent, model).observe(
+                                time.perf_counter() - start_time
+                            )
+                        streamed_chars += len(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+        except Exception:
+            self.stats["failures"] += 1
+            LLM_REQUESTS_TOTAL.labels(agent, model, "failure").inc()
+            raise
+
+        LLM_REQUEST_SECONDS.labels(agent, model).observe(time.perf_counter() - start_time)
+        LLM_REQUESTS_TOTAL.labels(agent, model, "success").inc()
+        LLM_PROMPT_TOKENS.labels(agent, model).observe(estimated_tokens - (kwargs.get("max_tokens") or 256))
+        LLM_COMPLETION_TOKENS.labels(agent, model).observe(streamed_chars // 4)
+        self.rate_limiter.record_usage(estimated_tokens, None)
+
+    async def list_models(self) -> List[str]:
+        """Model ids served by the endpoint.
+
+        A cheap, unbilled reachability probe: it bypasses the rate limiter
+        and retries, and concurrent probes share one call.
+        """
+
+        async def fetch():
+            page = await self.client.models.list(timeout=min(self.config.timeout_seconds, 10))
+            return [model.id for model in page.data]
+
+        models, _ = await self._probes.do("models", fetch)
+        return models
+
+    async def aclose(self):
+        """Close the pool owned by the running loop."""
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "rate_limiter": self.rate_limiter.get_stats(),
+            "single_flight": self.single_flight.get_stats(),
+            "circuit_breakers": {model: breaker.get_stats() for model, breaker in self._breakers.items()},
+            "pools": len(self._clients),
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections
+        }
+
+_transports: Dict[Tuple, LLMTransport] = {}
+
+def get_transport(config) -> LLMTransport:
+    """Process-wide transport shared by all agents using the same endpoint and pool settings."""
+
+    key = (
+        config.openai_api_key,
+        config.openai_base_url,
+        config.max_connections,
+        config.max_keepalive_connections,
+        config.timeout_seconds,
+        config.max_retries,
+        config.rate_limit_requests,
+        config.rate_limit_window,
+        config.tokens_per_minute,
+        config.rate_limit_max_wait,
+        config.circuit_breaker_failure_rate,
+        config.circuit_breaker_window,
+        config.circuit_breaker_min_requests,
+        config.circuit_breaker_open_seconds,
+        config.enable_hedging,
+        config.hedge_quantile,
+        config.fallback_model
+    )
+    transport = _transports.get(key)
+    if transport is None:
+        transport = LLMTransport(config)
+        _transports[key] = transport
+    return transport
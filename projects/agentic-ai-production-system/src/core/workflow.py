@@ -0,0 +1,167 @@
+"""
+DAG scheduling for multi-agent workflows.
+Steps declare their dependencies; ready steps run concurrently under a concurrency limit.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Callable, Awaitable
+
+class WorkflowError(ValueError):
+    """Raised when a workflow plan is not a valid DAG."""
+
+def normalize_steps(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Give every step an id and a depends_on list, and check the graph.
+
+    Plans without any depends_on keep their old meaning: each step runs
+    after the one before it. Duplicate agent names get numbered ids.
+    """
+
+    explicit = any("depends_on" in step for step in steps)
+    normalized = []
+    seen = {}
+
+    for index, step in enumerate(steps):
+        step = dict(step)
+        step_id = step.get("id") or step.get("agent") or f"step_{index + 1}"
+        if step_id in seen:
+            seen[step_id] += 1
+            step_id = f"{step_id}_{seen[step_id]}"
+        else:
+            seen[step_id] = 1
+        step["id"] = step_id
+
+        if explicit:
+            step["depends_on"] = list(step.get("depends_on") or [])
+        else:
+            step["depends_on"] = [normalized[-1]["id"]] if normalized else []
+
+        normalized.append(step)
+
+    ids = {step["id"] for step in normalized}
+    for step in normalized:
+        missing = [dep for dep in step["depends_on"] if dep not in ids]
+        if missing:
+            raise WorkflowError(f"Step {step['id']} depends on unknown steps: {missing}")
+
+    topological_order(normalized)
+    return normalized
+
+def topological_order(steps: List[Dict[str, Any]]) -> List[str]:
+    """Step ids in dependency order; raises WorkflowError on cycles."""
+
+    remaining = {step["id"]: set(step["depends_on"]) for step in steps}
+    order = []
+
+    while remaining:
+        ready = [step_id for step_id, deps in remaining.items() if not deps]
+        if not ready:
+            raise WorkflowError(f"Workflow has a dependency cycle among: {sorted(remaining)}")
+        for step_id in ready:
+            order.append(step_id)
+            del remaining[step_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return order
+
+def critical_path(steps: List[Dict[str, Any]], timings: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Longest chain of measured step durations through the DAG.
+
+    Annotates each timing with critical_path_seconds: the longest path
+    ending at that step.
+    """
+
+    by_id = {step["id"]: step for step in steps}
+    longest = {}
+    previous = {}
+    end = None
+
+    for step_id in topological_order(steps):
+        best_dep, best = None, 0.0
+        for dep in by_id[step_id]["depends_on"]:
+            if best_dep is None or longest[dep] > best:
+                best_dep, best = dep, longest[dep]
+        longest[step_id] = best + timings[step_id]["duration"]
+        previous[step_id] = best_dep
+        timings[step_id]["critical_path_seconds"] = round(longest[step_id], 4)
+
+        # Ties go to the later step, so the path ends at a sink
+        if end is None or longest[step_id] >= longest[end]:
+            end = step_id
+
+    if end is None:
+        return {"steps": [], "seconds": 0.0}
+
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+
+    return {"steps": list(reversed(path)), "seconds": round(max(longest.values()), 4)}
+
+async def run_dag(
+    steps: List[Dict[str, Any]],
+    execute_step: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    max_concurrency: int = 4
+) -> Dict[str, Any]:
+    """Run normalized steps as soon as their dependencies finish.
+
+    execute_step(step, upstream) receives the results of the step's direct
+    dependencies keyed by step id. A failed step does not stop its
+    dependents; they simply see the failed result upstream. Cancelling
+    the run cancels every step still in flight.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    pending_deps = {step["id"]: set(step["depends_on"]) for step in steps}
+    by_id = {step["id"]: step for step in steps}
+    results = {}
+    timings = {}
+    running = {}
+    workflow_start = time.perf_counter()
+
+    async def run_step(step):
+        async with semaphore:
+            start = time.perf_counter()
+            upstream = {dep: results[dep] for dep in step["depends_on"]}
+            try:
+                result = await execute_step(step, upstream)
+            except Exception as e:
+                result = {"success": False, "error": str(e), "agent": step.get("agent")}
+            end = time.perf_counter()
+        timings[step["id"]] = {
+            "start": round(start - workflow_start, 4),
+            "end": round(end - workflow_start, 4),
+            "duration": round(end - start, 4)
+        }
+        return result
+
+    def launch_ready():
+        for step_id in [s for s, deps in pending_deps.items() if not deps]:
+            del pending_deps[step_id]
+            running[asyncio.ensure_future(run_step(by_id[step_id]))] = step_id
+
+    launch_ready()
+    try:
+        while running:
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step_id = running.pop(task)
+                results[step_id] = task.result()
+                for deps in pending_deps.values():
+                    deps.discard(step_id)
+            launch_ready()
+    finally:
+        # Cancelled mid-run: stop the steps still in flight instead of orphaning them
+        for task in running:
+            task.cancel()
+
+    path = critical_path(steps, timings)
+    return {
+        "results": {step["id"]: results[step["id"]] for step in steps},
+        "timings": timings,
+        "critical_path": path["steps"],
+        "critical_path_seconds": path["seconds"],
+        "wall_seconds": round(time.perf_counter() - workflow_start, 4)
+    }
@@ -0,0 +1 @@
+# Job queue service and worker processes
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Job service in front of the coordinator.
+Callers submit workflows and poll or stream their progress; worker processes run them.
+"""
+
+import multiprocessing
+import time
+from typing import Dict, Any, Iterator, List, Optional
+
+from .store import JobQueue, FINISHED
+from .worker import run_worker
+
+class JobService:
+    """
+    Submit/poll/stream API over a durable queue and a pool of worker processes.
+
+    Each worker is a separate process with its own event loop and
+    CoordinatorAgent, so workflows are not limited to one loop (or one
+    core). The per-process rate limits are the configured limits divided
+    by the number of workers, keeping the pool within the account budget.
+    Jobs survive restarts: queued jobs wait in the database, and jobs that
+    were running when the pool stopped are requeued once their heartbeat
+    is config.job_stale_after seconds old, so a pool never takes over jobs
+    that another live pool on the same file is running.
+    """
+
+    def __init__(self, config, db_path: Optional[str] = None, workers: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        self.config = config
+        self.db_path = db_path or config.job_queue_path
+        self.workers = workers or config.job_workers
+        self.concurrency = concurrency or config.job_concurrency
+        self.queue = JobQueue(self.db_path)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = None
+        self._processes: List[multiprocessing.Process] = []
+
+    def _worker_config(self) -> Dict[str, Any]:
+        values = self.config.to_dict()
+        values["rate_limit_requests"] = max(1, self.config.rate_limit_requests // self.workers)
+        if self.config.tokens_per_minute:
+            values["tokens_per_minute"] = max(1, self.config.tokens_per_minute // self.workers)
+        return values
+
+    # --- Lifecycle ------------------------------------------------------------
+
+    def start(self):
+        """Start the worker processes (no-op if already running)."""
+
+        if self._processes:
+            return
+        # Jobs left running by a pool that is gone; live pools keep theirs fresh
+        self.queue.requeue_stale(self.config.job_stale_after)
+        self._stop_event = self._context.Event()
+        values = self._worker_config()
+        for i in range(self.workers):
+            process = self._context.Process(
+                target=run_worker,
+                args=(f"worker-{i + 1}", values, self.db_path, self._stop_event, self.concurrency),
+                name=f"job-worker-{i + 1}",
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 30.0):
+        """Stop the workers; jobs they cannot finish in time go back to the queue."""
+
+        if not self._processes:
+            return
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+        self.queue.requeue_stale(self.config.job_stale_after)
+
+    def close(self):
+        self.stop()
+        self.queue.close()
+
+    def __enter__(self) -> "JobService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Jobs -----------------------------------------------------------------
+
+    def submit(self, input_data: Dict[str, Any], priority: int = 1, timeout: Optional[float] = None) -> str:
+        """Queue a workflow; lower priority values run first. Returns the job id."""
+
+        if not isinstance(input_data, dict) or not input_data.get("task"):
+            raise ValueError("Job input must be a dict with a task")
+        return self.queue.submit(input_data, priority=priority, timeout=timeout)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job's status, and its result or error once finished."""
+        return self.queue.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it already finished."""
+        return self.queue.cancel(job_id)
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """Progress events (plan, step, delta) recorded after seq `after`."""
+        return self.queue.events(job_id, after)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.05) -> Dict[str, Any]:
+        """Block until the job finishes and return it; raises TimeoutError after timeout seconds."""
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.queue.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            if job["status"] in FINISHED:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+            time.sleep(poll_interval)
+
+    def stream(self, job_id: str, poll_interval: float = 0.05) -> Iterator[Dict[str, Any]]:
+        """Yield the job's progress events as they arrive, then a closing result event.
+
+        The result event carries the job status and, like process(), the
+        workflow's result fields or an error.
+        """
+
+        seq = 0
+        while True:
+            job = self.queue.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            # Read events after the status, so nothing written before the job finished is missed
+            for event in self.queue.events(job_id, seq):
+                seq = event["seq"]
+                yield event
+            if job["status"] in FINISHED:
+                result = job["result"] or {"success": False, "error": job["error"]}
+                yield {"type": "result", "job_id": job_id, "status": job["status"], **result}
+                return
+            time.sleep(poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": self.queue.counts(),
+            "workers": len(self._processes),
+            "workers_alive": sum(process.is_alive() for process in self._processes),
+            "concurrency": self.concurrency
+        }
@@ -0,0 +1,246 @@
+"""
+Durable job queue shared by the service and its worker processes.
+Jobs, their progress events and cancellation requests live in one SQLite file.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+class JobQueue:
+    """
+    SQLite-backed priority queue of workflow jobs.
+
+    Lower priority values are served first (as in the rate limiter), then
+    older jobs. claim() is atomic across processes, so several workers can
+    share one file. Running jobs record a heartbeat; requeue_stale() hands
+    jobs of a worker that died back to the queue, and purge() drops
+    finished jobs and their events once they are old enough.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: float = 30.0):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are explicit where claims need them
+        self._db = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, input TEXT NOT NULL, "
+            "timeout REAL, result TEXT, error TEXT, worker TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "cancel_requested INTEGER NOT NULL DEFAULT 0, submitted_at REAL NOT NULL, started_at REAL, "
+            "finished_at REAL, heartbeat_at REAL);"
+            "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, submitted_at);"
+            "CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);"
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, PRIMARY KEY (job_id, seq));"
+        )
+
+    @staticmethod
+    def _row_to_job(row) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "status": row[1],
+            "priority": row[2],
+            "input": json.loads(row[3]),
+            "timeout": row[4],
+            "result": json.loads(row[5]) if row[5] else None,
+            "error": row[6],
+            "worker": row[7],
+            "attempts": row[8],
+            "cancel_requested": bool(row[9]),
+            "submitted_at": row[10],
+            "started_at": row[11],
+            "finished_at": row[12]
+        }
+
+    _COLUMNS = ("id, status, priority, input, timeout, result, error, worker, attempts, "
+                "cancel_requested, submitted_at, started_at, finished_at")
+
+    # --- Producer side --------------------------------------------------------
+
+    def submit(self, input_data: Dict[str, Any], priority: int = 1, timeout: Optional[float] = None,
+               job_id: Optional[str] = None) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, priority, input, timeout, submitted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, priority, json.dumps(input_data, default=str), timeout, time.time())
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job now, or ask the worker running it to stop. False if already finished."""
+
+        now = time.time()
+        with self._lock:
+            cancelled = self._db.execute(
+                "UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, now, job_id, QUEUED)
+            ).rowcount
+            if not cancelled:
+                cancelled = self._db.execute(
+                    "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?", (job_id, RUNNING)
+                ).rowcount
+        return bool(cancelled)
+
+    def events(self, job_id: str, after: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Progress events with seq greater than after, in order."""
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, after, limit)
+            ).fetchall()
+        return [{"seq": seq, **json.loads(event)} for seq, event in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    # --- Worker side ----------------------------------------------------------
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the next queued job, or None if the queue is empty."""
+
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM jobs WHERE status = ? ORDER BY priority, submitted_at LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, started_at = ?, "
+                    "heartbeat_at = ? WHERE id = ?",
+                    (RUNNING, worker, now, now, row[0])
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        job = self._row_to_job(row)
+        job.update(status=RUNNING, worker=worker, attempts=job["attempts"] + 1, started_at=now)
+        return job
+
+    def add_events(self, job_id: str, events: List[Dict[str, Any]]):
+        if not events:
+            return
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                last = self._db.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM job_events WHERE job_id = ?", (job_id,)
+                ).fetchone()[0]
+                self._db.executemany(
+                    "INSERT INTO job_events (job_id, seq, event) VALUES (?, ?, ?)",
+                    [(job_id, last + i, json.dumps(event, default=str)) for i, event in enumerate(events, 1)]
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, job_ids: List[str]) -> List[str]:
+        """Refresh running jobs' heartbeats; returns the ids whose cancellation was requested."""
+
+        if not job_ids:
+            return []
+        marks = ",".join("?" * len(job_ids))
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET heartbeat_at = ? WHERE id IN ({marks})", (time.time(), *job_ids))
+            rows = self._db.execute(
+                f"SELECT id FROM jobs WHERE id IN ({marks}) AND cancel_requested = 1", job_ids
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None,
+               worker: Optional[str] = None) -> bool:
+        """Record a running job's outcome; with worker, only while that worker still holds the job.
+
+        False if the job is no longer running (e.g. it was requeued as stale
+        and claimed by another worker), in which case nothing is written.
+        """
+
+        query = "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?"
+        params = [status, json.dumps(result, default=str) if result is not None else None, error, time.time(),
+                  job_id, RUNNING]
+        if worker is not None:
+            query += " AND worker = ?"
+            params.append(worker)
+        with self._lock:
+            return bool(self._db.execute(query, params).rowcount)
+
+    def release(self, job_id: str, worker: Optional[str] = None):
+        """Put a running job back in the queue (e.g. its worker is shutting down)."""
+
+        query = "UPDATE jobs SET status = ?, worker = NULL WHERE id = ? AND status = ?"
+        params = [QUEUED, job_id, RUNNING]
+        if worker is not None:
+            query += " AND worker = ?"
+            params.append(worker)
+        with self._lock:
+            self._db.execute(query, params)
+
+    def requeue_stale(self, older_than: float, max_attempts: int = 3) -> int:
+        """Requeue running jobs whose heartbeat is older than older_than seconds.
+
+        Jobs that already used max_attempts are failed instead.
+        """
+
+        cutoff = time.time() - older_than
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = 'Worker lost too many times', finished_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                (FAILED, time.time(), RUNNING, cutoff, max_attempts)
+            )
+            return self._db.execute(
+                "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+
+    def purge(self, older_than: float) -> int:
+        """Delete jobs finished more than older_than seconds ago, with their events."""
+
+        marks = ",".join("?" * len(FINISHED))
+        finished = f"SELECT id FROM jobs WHERE finished_at < ? AND status IN ({marks})"
+        params = (time.time() - older_than, *FINISHED)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(f"DELETE FROM job_events WHERE job_id IN ({finished})", params)
+                removed = self._db.execute(f"DELETE FROM jobs WHERE id IN ({finished})", params).rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,192 @@
+"""
+Job worker: one process, one event loop, one CoordinatorAgent.
+Claims jobs from the shared queue and runs up to `concurrency` of them at once.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from ..agents.coordinator_agent import CoordinatorAgent
+from ..core.config import Config
+from ..utils.logger import setup_logger, flush_logger
+from .store import JobQueue, SUCCEEDED, FAILED, CANCELLED, TIMED_OUT
+
+class Worker:
+    """
+    Runs queued workflows through a coordinator.
+
+    Each job runs as process_stream() with the job id as idempotency key,
+    so a job requeued after its worker died resumes from the steps that
+    worker already checkpointed (when checkpoint_path is shared). Progress
+    events are written back in batches: consecutive deltas are merged and
+    flushed at most every flush_interval seconds. A heartbeat keeps running
+    jobs fresh, picks up cancellation requests, and requeues jobs whose
+    worker stopped heartbeating for stale_after seconds. A job requeued
+    from under this worker is finished by whoever claimed it next, so
+    this worker's late result is dropped. Every purge_interval seconds,
+    jobs finished more than config.job_retention seconds ago are purged.
+    """
+
+    def __init__(self, name: str, config, queue: JobQueue, logger, stop_event=None,
+                 concurrency: Optional[int] = None, poll_interval: float = 0.05,
+                 heartbeat_interval: float = 1.0, stale_after: Optional[float] = None, flush_interval: float = 0.1,
+                 purge_interval: float = 60.0):
+        self.name = name
+        self.config = config
+        self.queue = queue
+        self.logger = logger
+        self.stop_event = stop_event
+        self.concurrency = concurrency or config.job_concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after or config.job_stale_after
+        self.flush_interval = flush_interval
+        self.purge_interval = purge_interval
+        self.coordinator = CoordinatorAgent(config, logger)
+
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled = set()
+        self.stats = {"claimed": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "timed_out": 0, "released": 0,
+                      "dropped": 0, "purged": 0}
+
+    async def _db(self, method, *args):
+        # Claims can wait on another process's write lock; keep the loop free meanwhile
+        return await asyncio.get_event_loop().run_in_executor(None, method, *args)
+
+    def _stopping(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    async def run(self, drain_timeout: float = 10.0):
+        """Claim and run jobs until the stop event is set.
+
+        On stop, jobs in flight get drain_timeout seconds to finish; the
+        rest are cancelled and put back in the queue.
+        """
+
+        self.logger.info("%s: Worker started (concurrency %s)", self.name, self.concurrency)
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        try:
+            while not self._stopping():
+                if len(self._running) < self.concurrency:
+                    job = await self._db(self.queue.claim, self.name)
+                    if job is not None:
+                        self.stats["claimed"] += 1
+                        task = asyncio.ensure_future(self._run_job(job))
+                        self._running[job["id"]] = task
+                        task.add_done_callback(lambda _, job_id=job["id"]: self._forget(job_id))
+                        continue
+                await asyncio.sleep(self.poll_interval)
+
+            if self._running:
+                await asyncio.wait(list(self._running.values()), timeout=drain_timeout)
+        finally:
+            tasks = list(self._running.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self.logger.info("%s: Worker stopped %s", self.name, self.stats)
+
+    def _forget(self, job_id: str):
+        self._running.pop(job_id, None)
+        self._cancelled.discard(job_id)
+
+    async def _heartbeat(self):
+        next_purge = time.monotonic()
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                for job_id in await self._db(self.queue.heartbeat, list(self._running)):
+                    task = self._running.get(job_id)
+                    if task is not None and job_id not in self._cancelled:
+                        self._cancelled.add(job_id)
+                        task.cancel()
+                requeued = await self._db(self.queue.requeue_stale, self.stale_after)
+                if requeued:
+                    self.logger.warning("%s: Requeued %s jobs from lost workers", self.name, requeued)
+                if self.config.job_retention and time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + self.purge_interval
+                    self.stats["purged"] += await self._db(self.queue.purge, self.config.job_retention)
+            except Exception as e:
+                self.logger.error("%s: Heartbeat failed: %s", self.name, e)
+
+    async def _run_job(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        timeout = job["timeout"] or self.config.job_timeout
+        input_data = dict(job["input"])
+        input_data.setdefault("idempotency_key", job_id)
+
+        try:
+            result = await asyncio.wait_for(self._consume(job_id, input_data), timeout)
+        except asyncio.TimeoutError:
+            await self._finish(job_id, TIMED_OUT, None, f"Job timed out after {timeout}s")
+        except asyncio.CancelledError:
+            if job_id in self._cancelled:
+                await self._finish(job_id, CANCELLED, None, "Job cancelled")
+            else:
+                # Shutting down: another worker picks the job up again
+                self.stats["released"] += 1
+                self.queue.release(job_id, self.name)
+                raise
+        except Exception as e:
+            self.logger.error("%s: Job %s failed: %s", self.name, job_id, e)
+            await self._finish(job_id, FAILED, None, str(e))
+        else:
+            status = SUCCEEDED if result.get("success") else FAILED
+            await self._finish(job_id, status, result, result.get("error"))
+
+    async def _finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]], error: Optional[str]):
+        if await self._db(self.queue.finish, job_id, status, result, error, self.name):
+            self.stats[status] += 1
+        else:
+            # Requeued as stale while we ran it; the worker that holds it now records the outcome
+            self.stats["dropped"] += 1
+            self.logger.warning("%s: Dropped %s result of job %s, which is no longer ours", self.name, status, job_id)
+
+    async def _consume(self, job_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the workflow, forwarding its events; returns the final result."""
+
+        pending: List[Dict[str, Any]] = []
+        last_flush = time.monotonic()
+
+        async for event in self.coordinator.process_stream(input_data):
+            if event["type"] == "result":
+                await self._db(self.queue.add_events, job_id, pending)
+                return {key: value for key, value in event.items() if key != "type"}
+
+            if event["type"] == "delta" and pending and pending[-1]["type"] == "delta":
+                pending[-1] = {"type": "delta", "text": pending[-1]["text"] + event["text"]}
+            else:
+                pending.append(event)
+
+            if event["type"] != "delta" or time.monotonic() - last_flush >= self.flush_interval:
+                await self._db(self.queue.add_events, job_id, pending)
+                pending = []
+                last_flush = time.monotonic()
+
+        return {"success": False, "error": "Workflow ended without a result"}
+
+def worker_log_file(log_file: str, name: str) -> str:
+    """Per-worker log file next to the main one, e.g. logs/app.worker-1.log."""
+    path = Path(log_file)
+    return str(path.with_name(f"{path.stem}.{name}{path.suffix}"))
+
+def run_worker(name: str, config_values: Dict[str, Any], db_path: str, stop_event, concurrency: int):
+    """Entry point of a worker process."""
+
+    config = Config(**config_values)
+    logger = setup_logger(
+        f"jobs.{name}", config.log_level, worker_log_file(config.log_file, name), config.enable_file_logging,
+        sample_rates=config.get_log_sample_rates()
+    )
+    queue = JobQueue(db_path)
+    try:
+        asyncio.run(Worker(name, config, queue, logger, stop_event, concurrency=concurrency).run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.close()
+        flush_logger(f"jobs.{name}")
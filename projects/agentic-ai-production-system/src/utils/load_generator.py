@@ -0,0 +1,155 @@
+"""
+Open-loop load generator for the agent stack.
+Drives an async target (e.g. CoordinatorAgent.process) at a fixed request rate and
+reports throughput, latency percentiles, event-loop lag and memory growth.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+import psutil
+
+def percentiles(samples: List[float], points=(0.5, 0.9, 0.95, 0.99)) -> Dict[str, float]:
+    """Nearest-rank percentiles in milliseconds, plus the maximum."""
+
+    ordered = sorted(samples)
+    if not ordered:
+        return {**{f"p{int(p * 100)}_ms": 0.0 for p in points}, "max_ms": 0.0}
+    result = {
+        f"p{int(p * 100)}_ms": round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+        for p in points
+    }
+    result["max_ms"] = round(ordered[-1] * 1000, 2)
+    return result
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how late a periodic sleep wakes up.
+
+    Anything that blocks the loop (sync I/O, heavy CPU in a coroutine)
+    shows up here long before it shows up as request latency.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, float]:
+        return percentiles(self.samples, points=(0.5, 0.95, 0.99))
+
+class LoadGenerator:
+    """
+    Fire target(i) at a fixed rate, whether or not earlier calls finished.
+
+    Latency is measured from each request's scheduled start, so a stalled
+    system is charged for the queueing it causes (no coordinated omission).
+    Requests beyond max_in_flight are dropped and counted rather than queued.
+    A result dict with success False, or with any failed workflow step,
+    counts as a failure or a degraded result respectively. RSS growth is
+    always reported; trace_memory adds Python heap growth via tracemalloc,
+    which slows the run noticeably.
+    """
+
+    def __init__(self, target: Callable[[int], Awaitable[Any]], rps: float, duration: float,
+                 max_in_flight: int = 1000, lag_interval: float = 0.01, trace_memory: bool = False):
+        self.target = target
+        self.rps = rps
+        self.duration = duration
+        self.max_in_flight = max_in_flight
+        self.lag_interval = lag_interval
+        self.trace_memory = trace_memory
+
+    @staticmethod
+    def _classify(result: Any) -> str:
+        if not isinstance(result, dict) or not result.get("success", True):
+            return "failed"
+        inner = result.get("result")
+        steps = inner.get("workflow_results", {}) if isinstance(inner, dict) else {}
+        if any(not step.get("success") for step in steps.values()):
+            return "degraded"
+        return "succeeded"
+
+    async def run(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        process = psutil.Process()
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        heap_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        rss_start = process.memory_info().rss
+
+        counts = {"sent": 0, "succeeded": 0, "degraded": 0, "failed": 0, "errors": 0, "dropped": 0}
+        latencies: List[float] = []
+        in_flight = set()
+        lag = LoopLagMonitor(self.lag_interval)
+        lag.start()
+
+        async def one(i: int, scheduled: float):
+            try:
+                result = await self.target(i)
+                counts[self._classify(result)] += 1
+            except Exception:
+                counts["errors"] += 1
+            latencies.append(loop.time() - scheduled)
+
+        total = int(self.rps * self.duration)
+        start = loop.time()
+        for i in range(total):
+            scheduled = start + i / self.rps
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= self.max_in_flight:
+                counts["dropped"] += 1
+                continue
+            counts["sent"] += 1
+            task = asyncio.ensure_future(one(i, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        elapsed = loop.time() - start
+        await lag.stop()
+
+        memory = {
+            "rss_start_mb": round(rss_start / 2 ** 20, 1),
+            "rss_growth_mb": round((process.memory_info().rss - rss_start) / 2 ** 20, 1)
+        }
+        if self.trace_memory:
+            heap_end, heap_peak = tracemalloc.get_traced_memory()
+            memory["heap_growth_mb"] = round((heap_end - heap_start) / 2 ** 20, 2)
+            memory["heap_peak_mb"] = round(heap_peak / 2 ** 20, 2)
+        if started_tracing:
+            tracemalloc.stop()
+        completed = len(latencies)
+
+        return {
+            "target_rps": self.rps,
+            "duration_seconds": round(elapsed, 2),
+            **counts,
+            "completed": completed,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+            "success_rate": round(counts["succeeded"] / completed, 4) if completed else 0.0,
+            "latency": percentiles(latencies),
+            "loop_lag": lag.get_stats(),
+            "memory": memory
+        }
@@ -1,70 +1,250 @@
 """
 Logging configuration and utilities for the Multi-Agent AI System.
+Records are queued on the caller's thread and formatted and written as JSON
+lines by a dedicated writer thread, so logging never does I/O on the event loop.
 """
 
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
-from loguru import logger as loguru_logger
+from typing import Dict, Optional
+
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; extra= fields are included as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep 1 in 1/rate INFO-and-below records per module and message template.
+
+    rates maps a module name (the source file stem, e.g. "base_agent") to the
+    fraction of its records to keep. Sampling is deterministic: the first
+    record of each template is always kept. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.every = {module: max(1, round(1 / rate)) for module, rate in (rates or {}).items() if rate > 0}
+        self.muted = {module for module, rate in (rates or {}).items() if rate <= 0}
+        self._counters: Dict[tuple, itertools.count] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        if record.module in self.muted:
+            self.dropped += 1
+            return False
+        every = self.every.get(record.module)
+        if every is None:
+            return True
+
+        key = (record.module, record.msg)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters.setdefault(key, itertools.count())
+        if next(counter) % every == 0:
+            return True
+        self.dropped += 1
+        return False
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without formatting them or waiting.
+
+    The stdlib QueueHandler formats the message on the calling thread; here
+    getMessage() runs on the writer thread instead. When max_size records are
+    already queued the record is dropped and counted rather than blocking the
+    caller. Because formatting is deferred, pass immutable values as %-style args.
+    """
+
+    def __init__(self, record_queue: "queue.SimpleQueue", max_size: int = 10000):
+        super().__init__(record_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put(record)
+
+class LogWriter:
+    """
+    Dedicated thread that drains the queue into one sink in batches.
+
+    Each batch is formatted once and written with a single write() and
+    flush(); file rotation is checked once per batch rather than per record.
+    """
+
+    _STOP = object()
+
+    def __init__(self, record_queue: "queue.SimpleQueue", sink: logging.StreamHandler, batch_size: int = 512):
+        self.queue = record_queue
+        self.sink = sink
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """Block until every record queued before this call has been written."""
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def stop(self):
+        if self._thread is not None:
+            self.queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+        self.sink.close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            lines, events, stopping = [], [], False
+            for item in batch:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                elif item.levelno >= self.sink.level:
+                    try:
+                        lines.append(self.sink.format(item))
+                    except Exception:
+                        self.sink.handleError(item)
+
+            if lines:
+                self._write("\n".join(lines) + "\n")
+            for event in events:
+                event.set()
+            if stopping:
+                return
+
+    def _write(self, text: str):
+        sink = self.sink
+        sink.acquire()
+        try:
+            if sink.stream is None:
+                sink.stream = sink._open()
+            sink.stream.write(text)
+            sink.stream.flush()
+            if isinstance(sink, logging.handlers.RotatingFileHandler) and sink.maxBytes > 0 \
+                    and sink.stream.tell() >= sink.maxBytes:
+                sink.doRollover()
+        except Exception:
+            sys.stderr.write("Log writer failed to write a batch\n")
+        finally:
+            sink.release()
+
+_writers: Dict[str, LogWriter] = {}
+_writers_lock = threading.Lock()
+
+def _stop_writers():
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.stop()
+        _writers.clear()
+
+atexit.register(_stop_writers)
 
 def setup_logger(
     name: Optional[str] = None,
     log_level: str = "INFO",
     log_file: Optional[str] = None,
-    enable_file_logging: bool = True
+    enable_file_logging: bool = True,
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000
 ) -> logging.Logger:
-    """Set up comprehensive logging for the application."""
+    """Set up the logging pipeline for the application.
+
+    Records go through a bounded queue to a writer thread with a single
+    JSON-lines sink: a rotating log file when file logging is enabled,
+    stdout otherwise. sample_rates thins out hot INFO paths per module
+    (see SamplingFilter). Calling this again for the same logger replaces
+    its pipeline after flushing the old one.
+    """
     
     # Create logger
     logger_name = name or "multi_agent_system"
     logger = logging.getLogger(logger_name)
     
-    # Clear existing handlers
-    logger.handlers.clear()
-    
-    # Set log level
-    logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (if enabled)
-    if enable_file_logging and log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+    with _writers_lock:
+        previous = _writers.pop(logger_name, None)
+        if previous is not None:
+            previous.stop()
         
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
-    # Configure loguru for additional features
-    loguru_logger.remove()  # Remove default handler
-    loguru_logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level=log_level.upper()
-    )
-    
-    if enable_file_logging and log_file:
-        loguru_logger.add(
-            log_file,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            level=log_level.upper(),
-            rotation="10 MB",
-            retention="7 days"
-        )
+        # Clear existing handlers
+        logger.handlers.clear()
+        
+        # Set log level; the pipeline is the only sink, so root handlers are bypassed
+        logger.setLevel(getattr(logging, log_level.upper()))
+        logger.propagate = False
+        
+        # The single sink, driven by the writer thread
+        if enable_file_logging and log_file:
+            log_path = Path(log_file)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            sink = logging.handlers.RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=7)
+        else:
+            sink = logging.StreamHandler(sys.stdout)
+        sink.setFormatter(JsonFormatter())
+        
+        record_queue = queue.SimpleQueue()
+        handler = NonBlockingQueueHandler(record_queue, max_size=queue_size)
+        if sample_rates:
+            handler.addFilter(SamplingFilter(sample_rates))
+        logger.addHandler(handler)
+        
+        writer = LogWriter(record_queue, sink)
+        writer.start()
+        _writers[logger_name] = writer
     
     return logger
 
+def flush_logger(name: Optional[str] = None):
+    """Block until every record queued so far for a setup_logger logger is written."""
+    
+    with _writers_lock:
+        writer = _writers.get(name or "multi_agent_system")
+    if writer is not None:
+        writer.flush()
+
 class LoggerMixin:
     """Mixin class to add logging capabilities to any class."""
     
@@ -0,0 +1,376 @@
+"""
+Local OpenAI-compatible stub server for tests and benchmarks.
+Serves /v1/chat/completions (buffered or streamed as server-sent events) and /v1/models
+over HTTP/1.1 keep-alive, with no dependencies.
+
+Run standalone with e.g.:
+    python -m src.utils.stub_llm_server --port 8001 --latency lognormal:0.3,0.5 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Union
+
+# A latency is a fixed number of seconds or a function sampling one from a Random
+Latency = Union[float, Callable[[random.Random], float]]
+
+def fixed_latency(seconds: float) -> Callable[[random.Random], float]:
+    return lambda rng: seconds
+
+def uniform_latency(low: float, high: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(low, high)
+
+def exponential_latency(mean: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.expovariate(1.0 / mean)
+
+def lognormal_latency(median: float, sigma: float) -> Callable[[random.Random], float]:
+    """Long-tailed latency like real providers; p95 is about median * e^(1.645 * sigma)."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+def parse_latency(spec: str) -> Latency:
+    """Parse "0.2", "uniform:0.1,0.3", "exponential:0.2" or "lognormal:0.2,0.5"."""
+
+    kind, _, args = spec.partition(":")
+    if not args:
+        return float(kind)
+    values = [float(value) for value in args.split(",")]
+    factories = {
+        "fixed": fixed_latency,
+        "uniform": uniform_latency,
+        "exponential": exponential_latency,
+        "lognormal": lognormal_latency
+    }
+    if kind not in factories:
+        raise ValueError(f"Unknown latency distribution: {kind}")
+    return factories[kind](*values)
+
+class StubLLMServer:
+    """Minimal OpenAI-compatible HTTP server with configurable latency and faults.
+
+    latency is the time to the first token (fixed seconds or a distribution
+    from this module) and token_interval the time between the word-sized
+    chunks that follow, so a buffered completion takes
+    latency + token_interval * (chunks - 1) either way, plus
+    prompt_token_interval per prompt token (4 characters) for prefill. With
+    rate_limit_per_second set, completions beyond that rate (burst of
+    one second's worth) get a 429 with a Retry-After header, like a provider.
+
+    Faults are injected per completion with the given probabilities:
+    error_rate returns a 500, throttle_rate a 429 regardless of rate, and
+    timeout_rate holds the request for hang_seconds so the client times out.
+    Pass seed for a reproducible sequence.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: Latency = 0.05, content: str = "Stub response.",
+                 rate_limit_per_second: Optional[float] = None, token_interval: float = 0.0,
+                 prompt_token_interval: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, timeout_rate: float = 0.0,
+                 hang_seconds: float = 120.0, seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.content = content
+        self.token_interval = token_interval
+        self.prompt_token_interval = prompt_token_interval
+        self.rate_limit_per_second = rate_limit_per_second
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self._random = random.Random(seed)
+        self._allowance = rate_limit_per_second or 0.0
+        self._allowance_at = time.monotonic()
+        self._server = None
+        self._thread = None
+        self._loop = None
+        self._active = 0
+        self._handlers = set()
+        self.stats = {
+            "requests": 0,
+            "streamed": 0,
+            "prompt_tokens": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "connections": 0,
+            "peak_concurrency": 0
+        }
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        """Start serving on the running event loop."""
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Server.close() leaves keep-alive connections open, so end them here
+            for task in list(self._handlers):
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> "StubLLMServer":
+        """Serve from a background thread with its own loop, so blocking clients can't stall it."""
+
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start_in_thread()
+
+    def __exit__(self, *exc):
+        self.stop_thread()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                if "content-length" in headers:
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                status, payload, extra_headers = await self._route(method, path.split("?", 1)[0], body)
+                extra = "".join(f"{name}: {value}\r\n" for name, value in extra_headers.items())
+
+                if isinstance(payload, dict):
+                    data = json.dumps(payload).encode("utf-8")
+                    writer.write(
+                        f"HTTP/1.1 {status}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"{extra}"
+                        f"Connection: keep-alive\r\n\r\n".encode("latin-1") + data
+                    )
+                    await writer.drain()
+                else:
+                    # Server-sent events, chunked so the connection can be kept alive
+                    writer.write(
+                        f"HTTP/1.1 {status}\r\n"
+                        f"Content-Type: text/event-stream\r\n"
+                        f"Transfer-Encoding: chunked\r\n"
+                        f"{extra}"
+                        f"Connection: keep-alive\r\n\r\n".encode("latin-1")
+                    )
+                    async for event in payload:
+                        writer.write(f"{len(event):x}\r\n".encode("latin-1") + event + b"\r\n")
+                        await writer.drain()
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes):
+        if method == "GET" and path.endswith("/models"):
+            return "200 OK", {"object": "list", "data": [{"id": "stub-model", "object": "model", "owned_by": "stub"}]}, {}
+
+        if method == "POST" and path.endswith("/chat/completions"):
+            retry_after = self._rate_limit()
+            if retry_after is None and self._random.random() < self.throttle_rate:
+                retry_after = 0.1
+            if retry_after is not None:
+                self.stats["rate_limited"] += 1
+                return "429 Too Many Requests", {
+                    "error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}
+                }, {"Retry-After": f"{retry_after:.3f}"}
+
+            if self._random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                await asyncio.sleep(self._sample_latency())
+                return "500 Internal Server Error", {
+                    "error": {"message": "Injected server error", "type": "server_error"}
+                }, {}
+
+            if self._random.random() < self.timeout_rate:
+                self.stats["timeouts"] += 1
+                await asyncio.sleep(self.hang_seconds)
+
+            request = json.loads(body or b"{}")
+            if request.get("stream"):
+                return "200 OK", self._chat_completion_stream(request), {}
+            return "200 OK", await self._chat_completion(request), {}
+
+        return "404 Not Found", {"error": {"message": f"Unknown route {method} {path}", "type": "invalid_request_error"}}, {}
+
+    def _rate_limit(self) -> Optional[float]:
+        """None if the request is allowed, otherwise seconds until it would be."""
+
+        if not self.rate_limit_per_second:
+            return None
+
+        now = time.monotonic()
+        self._allowance = min(self.rate_limit_per_second,
+                              self._allowance + (now - self._allowance_at) * self.rate_limit_per_second)
+        self._allowance_at = now
+        if self._allowance < 1:
+            return (1 - self._allowance) / self.rate_limit_per_second
+        self._allowance -= 1
+        return None
+
+    def _sample_latency(self) -> float:
+        if callable(self.latency):
+            return max(0.0, self.latency(self._random))
+        return self.latency
+
+    def _prompt_tokens(self, request: Dict[str, Any]) -> int:
+        tokens = sum(len(str(m.get("content", ""))) for m in request.get("messages", [])) // 4
+        self.stats["prompt_tokens"] += tokens
+        return tokens
+
+    def _chunks(self) -> List[str]:
+        """The response content split into word-sized deltas."""
+        words = self.content.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    async def _chat_completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.stats["requests"] += 1
+        self._active += 1
+        self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self._active)
+        prompt_tokens = self._prompt_tokens(request)
+
+        try:
+            await asyncio.sleep(self._sample_latency() + self.prompt_token_interval * prompt_tokens +
+                                self.token_interval * (len(self._chunks()) - 1))
+        finally:
+            self._active -= 1
+
+        return {
+            "id": f"chatcmpl-stub-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(self.content) // 4,
+                "total_tokens": prompt_tokens + len(self.content) // 4
+            }
+        }
+
+    async def _chat_completion_stream(self, request: Dict[str, Any]) -> AsyncIterator[bytes]:
+        self.stats["requests"] += 1
+        self.stats["streamed"] += 1
+        self._active += 1
+        self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self._active)
+        prompt_tokens = self._prompt_tokens(request)
+
+        completion_id = f"chatcmpl-stub-{self.stats['requests']}"
+        created = int(time.time())
+        model = request.get("model", "stub-model")
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+        try:
+            await asyncio.sleep(self._sample_latency() + self.prompt_token_interval * prompt_tokens)
+            for i, text in enumerate(self._chunks()):
+                if i:
+                    await asyncio.sleep(self.token_interval)
+                yield event({"role": "assistant", "content": text} if i == 0 else {"content": text})
+            yield event({}, "stop")
+            yield b"data: [DONE]\n\n"
+        finally:
+            self._active -= 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the OpenAI-compatible stub LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", default="0.05",
+                        help='seconds, or "uniform:lo,hi", "exponential:mean", "lognormal:median,sigma"')
+    parser.add_argument("--token-interval", type=float, default=0.0, help="seconds between streamed words")
+    parser.add_argument("--prompt-token-interval", type=float, default=0.0, help="prefill seconds per prompt token")
+    parser.add_argument("--content", default="Stub response.")
+    parser.add_argument("--rate-limit", type=float, default=None, help="completions per second before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of completions returning 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of completions returning 429")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of completions that hang")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        host=args.host, port=args.port, latency=parse_latency(args.latency), content=args.content,
+        rate_limit_per_second=args.rate_limit, token_interval=args.token_interval,
+        prompt_token_interval=args.prompt_token_interval, error_rate=args.error_rate, throttle_rate=args.throttle_rate, timeout_rate=args.timeout_rate,
+        seed=args.seed
+    )
+
+    async def serve():
+        await server.start()
+        print(f"Stub LLM server listening on {server.base_url}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"Served {server.stats}")
+
+if __name__ == "__main__":
+    main()
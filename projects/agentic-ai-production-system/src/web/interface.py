@@ -0,0 +1,81 @@
+"""
+Streamlit interface for the Multi-Agent AI System.
+Renders one page for one session on top of the shared application services.
+"""
+
+from typing import Any, Dict
+
+import streamlit as st
+
+from .services import AppServices, UserSession
+
+class MultiAgentInterface:
+    """Task form, streamed workflow output, session history and service status."""
+
+    def __init__(self, services: AppServices, session: UserSession):
+        self.services = services
+        self.session = session
+
+    def render(self):
+        st.title("🤖 Multi-Agent AI System")
+        self._render_sidebar()
+
+        task = st.text_area("Task", placeholder="Describe what the agents should research, write or validate")
+        if st.button("Run", type="primary", disabled=not task.strip()):
+            self._run(task.strip())
+
+        self._render_history()
+
+    def _run(self, task: str):
+        plan_area = st.empty()
+        output_area = st.empty()
+        output = []
+
+        with st.spinner("Agents working..."):
+            for event in self.session.stream(task):
+                if event["type"] == "plan":
+                    steps = (event.get("workflow_plan") or {}).get("steps", [])
+                    plan_area.caption(" → ".join(step.get("agent", "?") for step in steps))
+                elif event["type"] == "delta":
+                    output.append(event["text"])
+                    output_area.markdown("".join(output))
+                elif event["type"] == "result":
+                    self._render_result(event, output_area)
+
+    @staticmethod
+    def _render_result(result: Dict[str, Any], output_area):
+        if not result.get("success"):
+            st.error(result.get("error", "Workflow failed"))
+            return
+        final_output = (result.get("result") or {}).get("final_output")
+        if final_output:
+            output_area.markdown(final_output)
+        if result.get("time_to_first_token") is not None:
+            st.caption(
+                f"First token after {result['time_to_first_token']:.2f}s, done in {result['total_seconds']:.2f}s"
+            )
+
+    def _render_history(self):
+        history = self.session.get_history()
+        if not history:
+            return
+        with st.expander(f"Your recent tasks ({len(history)})"):
+            for entry in reversed(history):
+                st.markdown(f"{'✅' if entry['success'] else '❌'} {entry['task']}")
+
+    def _render_sidebar(self):
+        health = self.services.health_checker.check_system_health()
+        stats = self.services.get_stats()
+
+        with st.sidebar:
+            st.subheader("System")
+            st.metric("Health", "Healthy" if health["healthy"] else "Degraded")
+            st.metric("Sessions", stats["sessions"])
+
+            st.subheader("Page latency")
+            if stats["cold_page_seconds"] is not None:
+                st.metric("Cold (first page)", f"{stats['cold_page_seconds'] * 1000:.0f} ms")
+            if stats["warm_page_p50_seconds"] is not None:
+                st.metric("Warm p50", f"{stats['warm_page_p50_seconds'] * 1000:.0f} ms")
+                st.metric("Warm p95", f"{stats['warm_page_p95_seconds'] * 1000:.0f} ms")
+            st.caption(f"Services built in {stats['build_seconds'] * 1000:.0f} ms")
@@ -0,0 +1,229 @@
+"""
+Application-scoped services for the web interface.
+Agents, logging, health checks and the LLM connection pool are built once per
+process and shared by every session; per-user state lives in UserSession.
+"""
+
+import asyncio
+import queue
+import statistics
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterator, List, MutableMapping, Optional
+
+from ..agents.coordinator_agent import CoordinatorAgent
+from ..core.config import Config
+from ..core.health import get_health_checker, release_health_checker
+from ..core.metrics import start_metrics_server, stop_metrics_server
+from ..utils.logger import setup_logger
+
+# Ends the event stream handed from the services loop to a session thread
+_DONE = object()
+
+class AppServices:
+    """
+    Process-wide services shared by all sessions.
+
+    Workflows run on one event loop in a background thread: sessions call
+    run() or stream() from their own threads, so agents and their caches
+    are only ever used from that loop, and the transport keeps one warm
+    keep-alive pool instead of opening connections for every page.
+    """
+
+    def __init__(self, config: Optional[Config] = None):
+        start = time.perf_counter()
+        self.config = config or Config()
+        self.logger = setup_logger(
+            log_level=self.config.log_level,
+            log_file=self.config.log_file,
+            enable_file_logging=self.config.enable_file_logging,
+            sample_rates=self.config.get_log_sample_rates()
+        )
+
+        # Prometheus endpoint on metrics_port
+        self.metrics_server = None
+        try:
+            self.metrics_server = start_metrics_server(self.config)
+        except OSError as e:
+            self.logger.warning("Metrics exporter not started on port %s: %s", self.config.metrics_port, e)
+
+        # Probes run in the background every health_check_interval
+        self.health_checker = get_health_checker(self.config)
+        self.coordinator = CoordinatorAgent(self.config, self.logger)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="app-services", daemon=True)
+        self._thread.start()
+
+        self._lock = threading.Lock()
+        self._warm_pages = deque(maxlen=1000)
+        self.stats = {
+            "build_seconds": round(time.perf_counter() - start, 4),
+            "sessions": 0,
+            "page_loads": 0,
+            "cold_page_seconds": None
+        }
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the services loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def stream(self, events: AsyncIterator, poll_interval: float = 0.1) -> Iterator:
+        """Iterate an async iterator on the services loop, yielding its items in this thread.
+
+        Closing the iterator early (e.g. the session went away) cancels the
+        producer on the loop. Every poll_interval without an item, the
+        producer is checked, so a producer that never ran (the services
+        were closed) raises instead of blocking forever.
+        """
+
+        items = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in events:
+                    items.put(item)
+            finally:
+                # Run the iterator's own cleanup if it was cancelled part way
+                if hasattr(events, "aclose"):
+                    await events.aclose()
+                items.put(_DONE)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=poll_interval)
+                except queue.Empty:
+                    if future.done() and items.empty():
+                        break
+                    if not self._thread.is_alive():
+                        raise RuntimeError("The services loop stopped before the stream ended")
+                    continue
+                if item is _DONE:
+                    break
+                yield item
+            # Re-raise whatever ended the producer
+            future.result()
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def session(self, state: MutableMapping) -> "UserSession":
+        """The UserSession kept in a per-user state mapping (e.g. st.session_state), created on first use."""
+
+        user_session = state.get("user_session")
+        if user_session is None or user_session.services is not self:
+            user_session = UserSession(self)
+            state["user_session"] = user_session
+            with self._lock:
+                self.stats["sessions"] += 1
+        return user_session
+
+    def record_page_load(self, seconds: float):
+        """Record a page's latency; the first one in the process paid for building the services."""
+
+        with self._lock:
+            self.stats["page_loads"] += 1
+            if self.stats["cold_page_seconds"] is None:
+                self.stats["cold_page_seconds"] = round(seconds, 4)
+            else:
+                self._warm_pages.append(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            warm = sorted(self._warm_pages)
+            stats = dict(self.stats)
+        stats["warm_page_p50_seconds"] = round(statistics.median(warm), 4) if warm else None
+        stats["warm_page_p95_seconds"] = round(warm[int(0.95 * (len(warm) - 1))], 4) if warm else None
+        return stats
+
+    def close(self):
+        """Stop the services loop, health checks and metrics exporter, and close pools and files."""
+
+        if self._loop.is_closed():
+            return
+        self.run(self.coordinator.transport.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+        self.coordinator.close()
+        release_health_checker(self.health_checker)
+        if self.metrics_server is not None:
+            stop_metrics_server(self.metrics_server)
+
+class UserSession:
+    """
+    One user's view of the shared services.
+
+    Workflows are tagged with the session as their tenant, so the rate
+    limiter shares capacity fairly between users, and each session keeps
+    its own workflow history.
+    """
+
+    def __init__(self, services: AppServices, session_id: Optional[str] = None):
+        self.services = services
+        self.session_id = session_id or uuid.uuid4().hex
+        self.history = deque(maxlen=services.config.workflow_history_size)
+
+    def run(self, task: str, **options) -> Dict[str, Any]:
+        """Run a workflow and wait for its response."""
+
+        response = self.services.run(self.services.coordinator.process(self._input(task, options)))
+        self._record(task, response)
+        return response
+
+    def stream(self, task: str, **options) -> Iterator[Dict[str, Any]]:
+        """Run a workflow, yielding its events (see CoordinatorAgent.process_stream)."""
+
+        for event in self.services.stream(self.services.coordinator.process_stream(self._input(task, options))):
+            if event["type"] == "result":
+                self._record(task, event)
+            yield event
+
+    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """This session's most recent workflows, oldest first."""
+        return list(self.history)[-limit:]
+
+    def _input(self, task: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        return {"tenant": self.session_id, **options, "task": task}
+
+    def _record(self, task: str, response: Dict[str, Any]):
+        self.history.append({
+            "task": task,
+            "success": response.get("success", False),
+            "workflow_id": response.get("workflow_id"),
+            "response": response,
+            "timestamp": time.time()
+        })
+
+_services: Optional[AppServices] = None
+_services_lock = threading.Lock()
+
+def get_services(config: Optional[Config] = None) -> AppServices:
+    """Process-wide AppServices, built by the first caller (with config, or from the environment).
+
+    Later callers may omit config or pass an equal one; a different config
+    raises ValueError, since sessions keep using the services already built.
+    Call reset_services() first to rebuild them.
+    """
+
+    global _services
+    with _services_lock:
+        if _services is None:
+            _services = AppServices(config)
+        elif config is not None and config != _services.config:
+            raise ValueError("Services already built with a different config; call reset_services() first")
+        return _services
+
+def reset_services():
+    """Close the process-wide services; the next get_services() builds new ones."""
+
+    global _services
+    with _services_lock:
+        if _services is not None:
+            _services.close()
+            _services = None
@@ -16,7 +16,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 from src.agents.coordinator_agent import CoordinatorAgent
 from src.core.config import Config
 from src.core.health import HealthChecker
-from src.utils.logger import setup_logger
+from src.utils.logger import setup_logger, flush_logger
 
 class TestSystemWorkflow:
     """End-to-end test cases for complete system workflows."""
@@ -85,6 +85,9 @@ class TestSystemWorkflow:
         logger.warning("Test warning message")
         logger.error("Test error message")
         
+        # Records are written by a background thread
+        flush_logger("e2e_test")
+        
         # Check log file exists and has content
         log_path = Path(config.log_file)
         if config.enable_file_logging:
@@ -5,6 +5,7 @@ Integration tests for agent coordination and communication.
 import pytest
 import asyncio
 import logging
+import threading
 from unittest.mock import Mock, AsyncMock, patch
 import sys
 from pathlib import Path
@@ -160,6 +161,180 @@ class TestAgentCoordination:
             mock_content.assert_called_once()
             mock_validation.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_outputs_flow_along_workflow_edges(self, coordinator):
+        """Test that each step receives its dependencies' outputs."""
+
+        with patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content, \
+             patch.object(coordinator.validation_agent, 'process') as mock_validation:
+
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            mock_validation.return_value = {"success": True, "validation_passed": True}
+
+            workflow_plan = {
+                "steps": [
+                    {"id": "research", "agent": "ResearchAgent", "action": "research", "depends_on": []},
+                    {"id": "content", "agent": "ContentAgent", "action": "write", "depends_on": ["research"]},
+                    {"id": "validation", "agent": "ValidationAgent", "action": "check", "depends_on": ["content"]}
+                ]
+            }
+
+            result = await coordinator._execute_workflow(workflow_plan, {"task": "Write about AI"})
+
+            assert mock_content.call_args[0][0]["research_findings"] == "Research findings"
+            assert mock_validation.call_args[0][0]["content"] == "Generated draft"
+            assert result["timings"]["critical_path"] == ["research", "content", "validation"]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_steps(self, coordinator):
+        """Test that resuming a workflow re-runs only the step that failed."""
+
+        workflow_plan = {
+            "steps": [
+                {"id": "research", "agent": "ResearchAgent", "action": "research", "depends_on": []},
+                {"id": "content", "agent": "ContentAgent", "action": "write", "depends_on": ["research"]}
+            ]
+        }
+
+        with patch.object(coordinator, '_create_workflow_plan', new_callable=AsyncMock) as mock_plan, \
+             patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content:
+
+            mock_plan.return_value = workflow_plan
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            mock_content.return_value = {"success": False, "error": "retries exhausted"}
+
+            first = await coordinator.process({"task": "Write about AI", "checkpoint": True})
+            assert coordinator.checkpoints.get_workflow(first["workflow_id"])["status"] == "incomplete"
+
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            resumed = await coordinator.resume(first["workflow_id"])
+
+            assert mock_plan.call_count == 1
+            assert mock_research.call_count == 1
+            assert mock_content.call_count == 2
+            assert mock_content.call_args[0][0]["research_findings"] == "Research findings"
+            assert resumed["result"]["workflow_results"]["research"]["checkpointed"] is True
+            assert coordinator.checkpoints.get_workflow(first["workflow_id"])["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_plain_workflow_is_not_checkpointed_in_memory(self, coordinator):
+        """Test that without a checkpoint path only resumable workflows are stored."""
+
+        with patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content, \
+             patch.object(coordinator.validation_agent, 'process') as mock_validation:
+
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            mock_validation.return_value = {"success": True, "validation_passed": True}
+
+            result = await coordinator.process({"task": "Summarize the latest AI news"})
+
+        assert result["success"]
+        assert coordinator.checkpoints.get_workflow(result["workflow_id"]) is None
+        assert coordinator.checkpoints.get_stats()["checkpointed_steps"] == 0
+
+    @pytest.mark.asyncio
+    async def test_history_is_written_off_the_event_loop(self, coordinator):
+        """Test that the history log is appended from an executor thread, for failures too."""
+        threads = []
+        append = coordinator.workflow_history.append
+
+        def record_thread(entry):
+            threads.append(threading.get_ident())
+            append(entry)
+
+        coordinator.workflow_history.append = record_thread
+        with patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content, \
+             patch.object(coordinator.validation_agent, 'process') as mock_validation:
+
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            mock_validation.return_value = {"success": True, "validation_passed": True}
+            await coordinator.process({"task": "Summarize the latest AI news"})
+
+        with patch.object(coordinator, '_create_workflow_plan', side_effect=RuntimeError("planner down")):
+            failed = await coordinator.process({"task": "Summarize the latest AI news"})
+
+        assert failed["success"] is False
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+        assert [entry["success"] for entry in coordinator.get_workflow_history()] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_replays_completed_workflow(self, coordinator):
+        """Test that a retried request with the same key does not execute again."""
+
+        with patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content, \
+             patch.object(coordinator.validation_agent, 'process') as mock_validation:
+
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            mock_validation.return_value = {"success": True, "validation_passed": True}
+
+            request = {"task": "Summarize the latest AI news", "idempotency_key": "request-1"}
+            first, concurrent = await asyncio.gather(coordinator.process(request), coordinator.process(request))
+            replay = await coordinator.process(request)
+
+            calls = mock_research.call_count + mock_content.call_count + mock_validation.call_count
+            assert calls == len(first["workflow_plan"]["steps"])
+            assert first["workflow_id"] == concurrent["workflow_id"] == replay["workflow_id"]
+            assert replay["replayed"] is True
+            assert replay["result"]["final_output"] == first["result"]["final_output"]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_workflow_is_listed_and_resumable(self, coordinator):
+        """Test that a workflow cancelled mid-run can be found and resumed."""
+
+        workflow_plan = {
+            "steps": [
+                {"id": "research", "agent": "ResearchAgent", "action": "research", "depends_on": []},
+                {"id": "content", "agent": "ContentAgent", "action": "write", "depends_on": ["research"]}
+            ]
+        }
+
+        async def slow_content(agent_input):
+            await asyncio.sleep(10)
+
+        with patch.object(coordinator, '_create_workflow_plan', new_callable=AsyncMock) as mock_plan, \
+             patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process', side_effect=slow_content):
+
+            mock_plan.return_value = workflow_plan
+            mock_research.return_value = {"success": True, "findings": "Research findings"}
+            run = asyncio.ensure_future(coordinator.process({"task": "Explain how vaccines work", "idempotency_key": "k"}))
+            await asyncio.sleep(0.1)
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+
+        unfinished = coordinator.get_unfinished_workflows()
+        assert [w["status"] for w in unfinished] == ["running"]
+
+        with patch.object(coordinator.research_agent, 'process') as mock_research, \
+             patch.object(coordinator.content_agent, 'process') as mock_content:
+
+            mock_content.return_value = {"success": True, "content": "Generated draft"}
+            result = await coordinator.resume(unfinished[0]["workflow_id"])
+
+            mock_research.assert_not_called()
+            assert result["result"]["final_output"] == "Research findings\n\nGenerated draft"
+
+    @pytest.mark.asyncio
+    async def test_known_task_does_not_call_planner(self, coordinator):
+        """Test that a templated task skips the planning LLM call."""
+
+        with patch.object(coordinator, '_plan_with_llm', new_callable=AsyncMock) as mock_planner:
+            plan = await coordinator._create_workflow_plan("Summarize the latest AI news", {})
+
+        mock_planner.assert_not_called()
+        assert plan["source"] == "template"
+        assert [step["agent"] for step in plan["steps"]] == ["ContentAgent", "ValidationAgent"]
+
     def test_get_all_agent_metrics(self, coordinator):
         """Test getting metrics from all agents."""
         metrics = coordinator.get_all_agent_metrics()
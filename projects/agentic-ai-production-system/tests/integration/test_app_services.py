@@ -0,0 +1,123 @@
+"""
+Integration tests for the shared application services with the stub LLM server.
+"""
+
+import pytest
+import os
+import sqlite3
+import tempfile
+import threading
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.config import Config
+from src.utils.stub_llm_server import StubLLMServer
+from src.web.services import get_services, reset_services
+
+class TestAppServices:
+    """Test cases for AppServices and UserSession."""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Run the stub server on its own thread."""
+        with StubLLMServer(latency=0.02) as server:
+            yield server
+
+    @pytest.fixture
+    def services(self, stub_server):
+        """Build the process-wide services against the stub server."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = Config(
+                openai_api_key="test_key",
+                openai_base_url=stub_server.base_url,
+                rate_limit_requests=1000,
+                enable_metrics=False,
+                log_file=os.path.join(temp_dir, "app.log")
+            )
+            yield get_services(config)
+            reset_services()
+
+    def test_services_are_built_once(self, services):
+        """Test that every page gets the same services and agents."""
+        assert get_services() is services
+        assert get_services().coordinator is services.coordinator
+
+    def test_different_config_is_rejected(self, services):
+        """Test that a second config does not silently get the services built from the first."""
+        assert get_services(services.config.model_copy()) is services
+
+        with pytest.raises(ValueError):
+            get_services(services.config.model_copy(update={"log_level": "DEBUG"}))
+
+    def test_close_releases_background_services(self, services):
+        """Test that closing stops the health checker and closes the coordinator's files."""
+        checker = services.health_checker
+        config = services.config
+        reset_services()
+
+        assert checker._thread is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            services.coordinator.workflow_history.get_stats()
+
+        rebuilt = get_services(config)
+        assert rebuilt is not services
+        assert rebuilt.health_checker is not checker
+
+    def test_sessions_share_agents_but_not_history(self, services, stub_server):
+        """Test that concurrent sessions reuse one connection pool and keep their own history."""
+        states = [{}, {}]
+        sessions = [services.session(state) for state in states]
+        assert services.session(states[0]) is sessions[0]
+        assert sessions[0].session_id != sessions[1].session_id
+
+        def run(session, name):
+            for i in range(3):
+                assert session.run(f"Write about {name} topic {i}")["success"]
+
+        threads = [threading.Thread(target=run, args=(session, name)) for session, name in zip(sessions, "ab")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [entry["task"] for entry in sessions[0].get_history()] == [f"Write about a topic {i}" for i in range(3)]
+        assert [entry["task"] for entry in sessions[1].get_history()] == [f"Write about b topic {i}" for i in range(3)]
+        # Six workflows of several LLM calls each, over a handful of kept-alive connections
+        assert stub_server.stats["requests"] > 6
+        assert stub_server.stats["connections"] <= 4
+        assert services.stats["sessions"] == 2
+
+    def test_stream_records_result(self, services):
+        """Test that streamed workflows deliver events in the session's thread and are recorded."""
+        session = services.session({})
+        events = list(session.stream("Write about streaming"))
+
+        assert events[0]["type"] == "plan"
+        assert events[-1]["type"] == "result" and events[-1]["success"]
+        assert session.get_history()[-1]["workflow_id"] == events[-1]["workflow_id"]
+
+    def test_stream_raises_producer_error(self, services):
+        """Test that an error in the producer reaches the consuming thread after its items."""
+
+        async def events():
+            yield 1
+            raise RuntimeError("producer failed")
+
+        received = []
+        with pytest.raises(RuntimeError, match="producer failed"):
+            for item in services.stream(events(), poll_interval=0.01):
+                received.append(item)
+        assert received == [1]
+
+    def test_page_latency_cold_then_warm(self, services):
+        """Test that the first page load is reported as cold and later ones as warm."""
+        for seconds in (0.5, 0.01, 0.02, 0.03):
+            services.record_page_load(seconds)
+
+        stats = services.get_stats()
+        assert stats["cold_page_seconds"] == 0.5
+        assert stats["warm_page_p50_seconds"] == 0.02
+        assert stats["page_loads"] == 4
@@ -0,0 +1,77 @@
+"""
+Integration tests for the job service with worker processes and the stub LLM server.
+"""
+
+import pytest
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.config import Config
+from src.jobs.service import JobService
+from src.jobs.store import SUCCEEDED, CANCELLED
+from src.utils.stub_llm_server import StubLLMServer
+
+class TestJobService:
+    """Test cases for submitting, polling and streaming jobs."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory for the queue and logs."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield temp_dir
+
+    @pytest.fixture
+    def stub_server(self):
+        """Run the stub server on its own thread."""
+        with StubLLMServer(latency=0.05) as server:
+            yield server
+
+    @pytest.fixture
+    def config(self, stub_server, temp_dir):
+        """Create configuration pointing at the stub server."""
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            timeout_seconds=10,
+            rate_limit_requests=1000,
+            rate_limit_window=1,
+            log_file=os.path.join(temp_dir, "app.log"),
+            job_queue_path=os.path.join(temp_dir, "jobs.sqlite")
+        )
+
+    def test_jobs_run_on_worker_processes(self, config):
+        """Test that submitted jobs complete on the workers and stream their events."""
+        with JobService(config, workers=2, concurrency=2) as service:
+            job_ids = [service.submit({"task": f"Write about topic {i}"}) for i in range(4)]
+
+            events = list(service.stream(job_ids[0]))
+            jobs = [service.wait(job_id, timeout=30) for job_id in job_ids]
+
+            stats = service.get_stats()
+            assert stats["workers_alive"] == 2
+
+        assert [job["status"] for job in jobs] == [SUCCEEDED] * 4
+        assert all(job["result"]["success"] for job in jobs)
+        assert {job["worker"] for job in jobs} <= {"worker-1", "worker-2"}
+        assert events[0]["type"] == "plan"
+        assert events[-1]["type"] == "result"
+        assert events[-1]["status"] == SUCCEEDED
+        assert events[-1]["job_id"] == job_ids[0]
+
+    def test_cancel_before_start(self, config):
+        """Test that a job cancelled while queued never runs."""
+        service = JobService(config, workers=1)
+        job_id = service.submit({"task": "Never runs"})
+
+        assert service.cancel(job_id)
+        assert service.wait(job_id, timeout=1)["status"] == CANCELLED
+        assert list(service.stream(job_id))[-1]["status"] == CANCELLED
+
+        with pytest.raises(ValueError):
+            service.submit({"context": {}})
+        service.close()
@@ -0,0 +1,388 @@
+"""
+Integration tests for the async LLM transport against the local stub server.
+"""
+
+import pytest
+import asyncio
+import logging
+import time
+import sys
+from pathlib import Path
+from openai import InternalServerError
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.agents.content_agent import ContentAgent
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.research_agent import ResearchAgent
+from src.core.config import Config
+from src.core.transport import get_transport
+from src.core.circuit_breaker import CircuitOpenError
+from src.core.metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS_TOTAL, LLM_COMPLETION_TOKENS
+from src.agents.base_agent import stream_to
+from src.utils.stub_llm_server import StubLLMServer
+
+class TestLLMTransport:
+    """Test cases for pooled, non-blocking LLM requests."""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Run the stub server on its own thread."""
+        with StubLLMServer(latency=0.2) as server:
+            yield server
+
+    @pytest.fixture
+    def config(self, stub_server):
+        """Create configuration pointing at the stub server."""
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            max_retries=2,
+            timeout_seconds=10,
+            max_connections=20,
+            max_keepalive_connections=20
+        )
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    def test_agents_share_transport(self, config, logger):
+        """Test that agents with the same config share one transport."""
+        research = ResearchAgent(config, logger)
+        content = ContentAgent(config, logger)
+
+        assert research.transport is content.transport
+        assert research.transport is get_transport(config)
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, config, logger, stub_server):
+        """Test that concurrent requests overlap instead of blocking the loop."""
+        agent = ContentAgent(config, logger)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            agent._make_llm_request([{"role": "user", "content": f"test {i}"}]) for i in range(10)
+        ])
+        elapsed = time.perf_counter() - start
+
+        assert results == [stub_server.content] * 10
+        assert agent.metrics["successes"] == 10
+        # Ten 0.2s requests in series would take 2s
+        assert elapsed < 1.0
+        assert stub_server.stats["peak_concurrency"] > 1
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, config, logger, stub_server):
+        """Test that sequential requests reuse keep-alive connections."""
+        agent = ContentAgent(config, logger)
+        messages = [{"role": "user", "content": "test"}]
+
+        for _ in range(5):
+            await agent._make_llm_request(messages)
+
+        assert stub_server.stats["requests"] == 5
+        assert stub_server.stats["connections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_requests_are_exported_per_agent_and_model(self, config, logger):
+        """Test that latency, outcome and token metrics are labelled by agent and model."""
+        agent = ContentAgent(config, logger)
+        latency = LLM_REQUEST_SECONDS.labels(agent.name, config.openai_model)
+        successes = LLM_REQUESTS_TOTAL.labels(agent.name, config.openai_model, "success")
+        completion_tokens = LLM_COMPLETION_TOKENS.labels(agent.name, config.openai_model)
+        before = (latency.snapshot()[2], successes.get(), completion_tokens.snapshot()[2])
+
+        await agent._make_llm_request([{"role": "user", "content": "metrics test"}])
+
+        assert latency.snapshot()[2] == before[0] + 1
+        assert successes.get() == before[1] + 1
+        assert completion_tokens.snapshot()[2] == before[2] + 1
+        assert latency.quantile(0.5) > 0
+
+    @pytest.mark.asyncio
+    async def test_health_probes_send_no_completions(self, config, logger, stub_server):
+        """Test that agent health checks probe the models list concurrently."""
+        coordinator = CoordinatorAgent(config, logger)
+
+        result = await coordinator.health_check_all_agents()
+
+        assert result["system_healthy"] is True
+        assert len(result["individual_results"]) == 4
+        assert stub_server.stats["requests"] == 0
+
+class TestRequestCoalescing:
+    """Test cases for single-flight coalescing of identical requests."""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Run the stub server on its own thread."""
+        with StubLLMServer(latency=0.2) as server:
+            yield server
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    def make_config(self, stub_server, **kwargs):
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            max_retries=2,
+            timeout_seconds=10,
+            rate_limit_requests=1000,
+            rate_limit_window=1,
+            **kwargs
+        )
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(self, stub_server, logger):
+        """Test that concurrent identical requests from different agents hit the provider once."""
+        config = self.make_config(stub_server)
+        research = ResearchAgent(config, logger)
+        content = ContentAgent(config, logger)
+        messages = [{"role": "user", "content": "trending task"}]
+
+        results = await asyncio.gather(
+            *[research._make_llm_request(messages) for _ in range(5)],
+            *[content._make_llm_request(messages) for _ in range(5)]
+        )
+
+        assert results == [stub_server.content] * 10
+        assert stub_server.stats["requests"] == 1
+        assert research.get_metrics()["coalesced"] + content.get_metrics()["coalesced"] == 9
+        assert research.transport.get_stats()["single_flight"]["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_different_kwargs_are_not_coalesced(self, stub_server, logger):
+        """Test that requests differing only in kwargs are sent separately."""
+        agent = ContentAgent(self.make_config(stub_server), logger)
+        messages = [{"role": "user", "content": "trending task"}]
+
+        await asyncio.gather(
+            agent._make_llm_request(messages, max_tokens=10),
+            agent._make_llm_request(messages, max_tokens=20)
+        )
+
+        assert stub_server.stats["requests"] == 2
+        assert agent.metrics["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(self, stub_server, logger):
+        """Test that every request reaches the provider when coalescing is off."""
+        agent = ContentAgent(self.make_config(stub_server, enable_request_coalescing=False), logger)
+        messages = [{"role": "user", "content": "trending task"}]
+
+        await asyncio.gather(*[agent._make_llm_request(messages) for _ in range(3)])
+
+        assert stub_server.stats["requests"] == 3
+
+class TestProviderRateLimits:
+    """Test cases for rate limiting against a stub server that returns 429s."""
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    @pytest.fixture
+    def stub_server(self):
+        """Stub server that allows 20 completions per second."""
+        with StubLLMServer(latency=0.01, rate_limit_per_second=20) as server:
+            yield server
+
+    def make_config(self, stub_server, rate_limit_requests):
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            max_retries=5,
+            timeout_seconds=10,
+            rate_limit_requests=rate_limit_requests,
+            rate_limit_window=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_limiter_keeps_under_provider_limit(self, stub_server, logger):
+        """Test that a limiter configured below the provider limit avoids 429s."""
+        agent = ContentAgent(self.make_config(stub_server, 15), logger)
+
+        results = await asyncio.gather(*[
+            agent._make_llm_request([{"role": "user", "content": f"test {i}"}]) for i in range(30)
+        ])
+
+        assert len(results) == 30
+        assert stub_server.stats["rate_limited"] == 0
+        assert agent.transport.get_stats()["rate_limiter"]["queued"] > 0
+
+    @pytest.mark.asyncio
+    async def test_provider_429_pauses_all_callers(self, stub_server, logger):
+        """Test that 429s from a limit set above the provider's are absorbed without failing requests."""
+        agent = ContentAgent(self.make_config(stub_server, 40), logger)
+
+        results = await asyncio.gather(*[
+            agent._make_llm_request([{"role": "user", "content": f"test {i}"}]) for i in range(30)
+        ])
+
+        assert results == [stub_server.content] * 30
+        assert stub_server.stats["rate_limited"] > 0
+        limiter_stats = agent.transport.get_stats()["rate_limiter"]
+        assert limiter_stats["throttled_by_provider"] > 0
+        assert limiter_stats["current_rate_per_second"] < 40
+
+class TestStreaming:
+    """Test cases for streamed responses from agents to the caller."""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Stub server that streams a response containing a sensitive term."""
+        content = "Here is the api_key you asked about, explained in a few words."
+        with StubLLMServer(latency=0.05, token_interval=0.02, content=content) as server:
+            yield server
+
+    @pytest.fixture
+    def config(self, stub_server):
+        """Create configuration pointing at the stub server."""
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            max_retries=2,
+            timeout_seconds=10,
+            rate_limit_requests=1000,
+            rate_limit_window=1
+        )
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self, config, logger, stub_server):
+        """Test that the agent yields the response incrementally."""
+        agent = ContentAgent(config, logger)
+        messages = [{"role": "user", "content": "test"}]
+
+        deltas = [delta async for delta in agent._stream_llm_request(messages)]
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == stub_server.content
+        assert stub_server.stats["streamed"] == 1
+        assert agent.get_metrics()["streams"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_to_sink_is_filtered(self, config, logger, stub_server):
+        """Test that relayed deltas are redacted and the request still returns the full text."""
+        agent = ContentAgent(config, logger)
+        relayed = []
+
+        with stream_to(relayed.append):
+            result = await agent.process({"content_request": "Explain how API keys are stored"})
+
+        assert "".join(relayed) == result["content"]
+        assert "[FILTERED]" in result["content"]
+        assert not any("api_key" in delta for delta in relayed)
+
+    @pytest.mark.asyncio
+    async def test_coordinator_forwards_final_agent_stream(self, config, logger, stub_server):
+        """Test that the content step is streamed before the workflow finishes."""
+        coordinator = CoordinatorAgent(config, logger)
+
+        events = [event async for event in coordinator.process_stream({"task": "Explain API keys"})]
+
+        types = [event["type"] for event in events]
+        assert types[0] == "plan"
+        assert types[-1] == "result"
+        deltas = [event for event in events if event["type"] == "delta"]
+        assert {event["step"] for event in deltas} == {"content"}
+
+        result = events[-1]
+        assert result["success"]
+        content = result["result"]["workflow_results"]["content"]["output"]
+        assert "".join(event["text"] for event in deltas) == content
+        # Validation still runs after the content has been streamed
+        assert types.index("delta") < max(i for i, t in enumerate(types) if t == "step")
+        assert result["time_to_first_token"] < result["total_seconds"]
+
+class TestResilience:
+    """Test cases for circuit breaking, hedging and model fallback."""
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    def make_config(self, stub_server, **overrides):
+        options = dict(
+            openai_api_key="test_key",
+            openai_base_url=stub_server.base_url,
+            max_retries=1,
+            timeout_seconds=10,
+            rate_limit_requests=1000,
+            rate_limit_window=1,
+            circuit_breaker_min_requests=3,
+            circuit_breaker_open_seconds=60
+        )
+        options.update(overrides)
+        return Config(**options)
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, logger):
+        """Test that a failing model stops being called once its circuit opens."""
+        with StubLLMServer(latency=0.01, error_rate=1.0) as stub_server:
+            transport = ContentAgent(self.make_config(stub_server), logger).transport
+            messages = [{"role": "user", "content": "test"}]
+
+            for _ in range(3):
+                with pytest.raises(InternalServerError):
+                    await transport.chat_completion(messages, model="gpt-4")
+            sent = stub_server.stats["requests"]
+
+            start = time.perf_counter()
+            with pytest.raises(CircuitOpenError):
+                await transport.chat_completion(messages, model="gpt-4")
+
+            assert time.perf_counter() - start < 0.1
+            assert stub_server.stats["requests"] == sent
+            assert transport.get_stats()["circuit_breakers"]["gpt-4"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_fallback_model_used_while_circuit_open(self, logger):
+        """Test that requests go to the fallback model while the primary's circuit is open."""
+        with StubLLMServer(latency=0.01) as stub_server:
+            config = self.make_config(stub_server, fallback_model="gpt-3.5-turbo")
+            transport = ContentAgent(config, logger).transport
+            breaker = transport.breaker("gpt-4")
+            for _ in range(3):
+                breaker.before_request()
+                breaker.record(failed=True)
+
+            response = await transport.chat_completion([{"role": "user", "content": "test"}], model="gpt-4")
+
+            assert response.model == "gpt-3.5-turbo"
+            assert transport.get_stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_beats_slow_request(self, logger):
+        """Test that a request stuck past the recent p95 is raced by a second copy that wins."""
+        slow_calls = []
+
+        def latency(rng):
+            return 2.0 if slow_calls and slow_calls.pop() else 0.02
+
+        with StubLLMServer(latency=latency) as stub_server:
+            transport = ContentAgent(self.make_config(stub_server, enable_hedging=True), logger).transport
+            messages = [{"role": "user", "content": "test"}]
+            for _ in range(20):
+                await transport.chat_completion(messages)
+
+            slow_calls.append(True)
+            start = time.perf_counter()
+            await transport.chat_completion(messages)
+
+            assert time.perf_counter() - start < 1.0
+            stats = transport.get_stats()
+            assert stats["hedged"] == 1
+            assert stats["hedges_won"] == 1
@@ -0,0 +1,140 @@
+"""
+Integration tests for the stub server's fault injection and the load generator.
+"""
+
+import pytest
+import asyncio
+import logging
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.agents.content_agent import ContentAgent
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.core.config import Config
+from src.utils.load_generator import LoadGenerator, LoopLagMonitor
+from src.utils.stub_llm_server import StubLLMServer, parse_latency
+
+class TestStubServerFaults:
+    """Test cases for latency distributions and injected faults."""
+
+    @pytest.fixture
+    def logger(self):
+        """Create test logger."""
+        return logging.getLogger("test")
+
+    def make_config(self, server, **kwargs):
+        return Config(
+            openai_api_key="test_key",
+            openai_base_url=server.base_url,
+            timeout_seconds=10,
+            rate_limit_requests=1000,
+            rate_limit_window=1,
+            **kwargs
+        )
+
+    def test_parse_latency(self):
+        """Test latency specs for each distribution."""
+        rng = random.Random(0)
+        assert parse_latency("0.2") == 0.2
+        assert 0.1 <= parse_latency("uniform:0.1,0.3")(rng) <= 0.3
+        assert parse_latency("exponential:0.2")(rng) >= 0
+        samples = sorted(parse_latency("lognormal:0.1,0.5")(rng) for _ in range(2000))
+        assert 0.08 < samples[1000] < 0.12
+        with pytest.raises(ValueError):
+            parse_latency("gamma:1,2")
+
+    @pytest.mark.asyncio
+    async def test_injected_errors_are_retried(self, logger):
+        """Test that transient 500s are absorbed by transport retries."""
+        with StubLLMServer(latency=0.01, error_rate=0.3, seed=3) as server:
+            agent = ContentAgent(self.make_config(server, max_retries=6), logger)
+
+            results = await asyncio.gather(*[
+                agent._make_llm_request([{"role": "user", "content": f"test {i}"}]) for i in range(20)
+            ])
+
+            assert results == [server.content] * 20
+            assert server.stats["errors"] > 0
+            assert agent.transport.get_stats()["retries"] == server.stats["errors"]
+
+    @pytest.mark.asyncio
+    async def test_persistent_errors_fail_after_retries(self, logger):
+        """Test that a request fails once retries are exhausted."""
+        with StubLLMServer(latency=0.01, error_rate=1.0) as server:
+            agent = ContentAgent(self.make_config(server, max_retries=2), logger)
+
+            with pytest.raises(Exception):
+                await agent._make_llm_request([{"role": "user", "content": "test"}])
+
+            assert server.stats["errors"] == 2
+            assert agent.metrics["failures"] == 1
+
+class TestLoadGenerator:
+    """Test cases for the open-loop load generator."""
+
+    @pytest.mark.asyncio
+    async def test_rate_and_report(self):
+        """Test that requests are fired at the target rate and the report is complete."""
+        async def target(i):
+            await asyncio.sleep(0.05)
+            return {"success": i % 10 != 0}
+
+        report = await LoadGenerator(target, rps=50, duration=1).run()
+
+        assert report["sent"] == 50
+        assert report["completed"] == 50
+        assert report["failed"] == 5
+        assert report["success_rate"] == 0.9
+        assert 35 < report["throughput_rps"] <= 55
+        assert 50 <= report["latency"]["p50_ms"] < 150
+        assert "rss_growth_mb" in report["memory"]
+
+    @pytest.mark.asyncio
+    async def test_open_loop_drops_beyond_in_flight_limit(self):
+        """Test that a stalled target causes drops instead of slowing the sender."""
+        async def target(i):
+            await asyncio.sleep(1)
+
+        report = await LoadGenerator(target, rps=100, duration=0.5, max_in_flight=10).run()
+
+        assert report["sent"] == 10
+        assert report["dropped"] == 40
+
+    @pytest.mark.asyncio
+    async def test_loop_lag_detects_blocking(self):
+        """Test that blocking the loop shows up as lag."""
+        import time
+
+        monitor = LoopLagMonitor(interval=0.005)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Block the loop
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        assert monitor.get_stats()["max_ms"] >= 80
+
+    @pytest.mark.asyncio
+    async def test_drives_coordinator(self):
+        """Test a short load run through the full agent stack."""
+        with StubLLMServer(latency=parse_latency("lognormal:0.02,0.3"), seed=1) as server:
+            config = Config(
+                openai_api_key="test_key",
+                openai_base_url=server.base_url,
+                rate_limit_requests=1000,
+                rate_limit_window=1
+            )
+            coordinator = CoordinatorAgent(config, logging.getLogger("test"))
+
+            async def target(i):
+                return await coordinator.process({"task": f"Explain topic number {i}"})
+
+            report = await LoadGenerator(target, rps=10, duration=1).run()
+
+        assert report["completed"] == 10
+        assert report["succeeded"] == 10
+        assert report["loop_lag"]["p95_ms"] < 100
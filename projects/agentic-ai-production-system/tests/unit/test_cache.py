@@ -0,0 +1,174 @@
+"""
+Unit tests for the tiered response cache.
+"""
+
+import pytest
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.cache import TieredCache, HashingEmbedder, cosine, normalize_query, stable_digest
+
+class TestTieredCache:
+    """Test cases for TieredCache."""
+
+    def test_stable_digest(self):
+        """Test that keys do not depend on the process hash seed."""
+        assert stable_digest("a", "b") == stable_digest("a", "b")
+        assert stable_digest("a", "b") != stable_digest("ab")
+        assert normalize_query("  What IS   AI? ") == "what is ai?"
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = TieredCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned."""
+        cache = TieredCache(ttl_seconds=0.05)
+        cache.set("a", {"value": 1})
+        time.sleep(0.1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that a second cache on the same file serves entries from disk."""
+        path = str(tmp_path / "cache.sqlite")
+        TieredCache(db_path=path).set("key", {"answer": 42}, cost_tokens=500)
+
+        cache = TieredCache(db_path=path)
+        assert cache.get("key") == {"answer": 42}
+        assert cache.get("key") == {"answer": 42}
+
+        stats = cache.get_stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["tokens_saved"] == 1000
+        assert stats["disk_entries"] == 1
+        assert stats["disk_bytes"] > 0
+
+    def test_disk_tier_is_bounded(self, tmp_path, monkeypatch):
+        """Test that the oldest rows are pruned past the row and byte limits."""
+        monkeypatch.setattr(TieredCache, "PRUNE_EVERY", 5)
+        cache = TieredCache(db_path=str(tmp_path / "cache.sqlite"), disk_max_entries=8)
+        for i in range(21):
+            cache.set(f"key{i}", i)
+
+        stats = cache.get_stats()
+        assert stats["disk_entries"] == 8  # pruned on writes 11, 16 and 21
+        assert stats["disk_evictions"] == 13
+        restarted = TieredCache(db_path=str(tmp_path / "cache.sqlite"))
+        assert restarted.get("key12") is None
+        assert restarted.get("key13") == 13
+
+        cache = TieredCache(db_path=str(tmp_path / "bytes.sqlite"), disk_max_bytes=250)
+        for i in range(6):
+            cache.set(f"key{i}", "x" * 98)  # 100 bytes serialized
+        assert cache.get_stats()["disk_bytes"] == 200
+
+    def test_disk_tier_sweeps_expired_rows(self, tmp_path):
+        """Test that expired rows are deleted without being looked up again."""
+        path = str(tmp_path / "cache.sqlite")
+        cache = TieredCache(db_path=path, ttl_seconds=0.05)
+        cache.set("old", 1)
+        time.sleep(0.1)
+
+        cache = TieredCache(db_path=path, ttl_seconds=0.05)
+        cache.set("new", 2)
+        stats = cache.get_stats()
+        assert stats["disk_entries"] == 1
+        assert stats["expirations"] == 1
+
+    def test_semantic_tier_matches_paraphrase(self):
+        """Test that a reworded query reuses a cached answer in the same namespace only."""
+        cache = TieredCache(semantic_threshold=0.6)
+        text = "latest trends in renewable energy storage"
+        cache.set("k1", "answer", namespace="general", text=text)
+
+        assert cache.get("k2", namespace="general", text="the latest trends in renewable energy storage") == "answer"
+        assert cache.get("k3", namespace="technical", text=text) is None
+        assert cache.get("k4", namespace="general", text="history of the roman empire") is None
+
+        stats = cache.get_stats()
+        assert stats["semantic_hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_semantic_tier_is_memory_only(self, tmp_path):
+        """Test that a paraphrase misses after a restart, since embeddings are not stored on disk."""
+        path = str(tmp_path / "cache.sqlite")
+        text = "latest trends in renewable energy storage"
+        TieredCache(db_path=path, semantic_threshold=0.6).set("k1", "answer", text=text)
+
+        cache = TieredCache(db_path=path, semantic_threshold=0.6)
+        assert cache.get("k2", text="the " + text) is None
+        assert cache.get("k1", text=text) == "answer"
+        assert cache.get("k2", text="the " + text) == "answer"
+
+    @pytest.mark.asyncio
+    async def test_async_disk_tier_runs_off_the_loop(self, tmp_path):
+        """Test that aget/aset reach SQLite from an executor thread and answer memory hits inline."""
+        path = str(tmp_path / "cache.sqlite")
+        threads = []
+
+        def record_threads(cache):
+            lower_tiers = cache._get_lower_tiers
+
+            def record(*args):
+                threads.append(threading.get_ident())
+                return lower_tiers(*args)
+
+            cache._get_lower_tiers = record
+            return cache
+
+        cache = record_threads(TieredCache(db_path=path))
+        await cache.aset("key", {"answer": 42})
+        assert await cache.aget("key") == {"answer": 42}
+        assert threads == []
+
+        restarted = record_threads(TieredCache(db_path=path))
+        assert await restarted.aget("key") == {"answer": 42}
+        assert await restarted.aget("missing") is None
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+    def test_semantic_tier_disabled_by_default(self):
+        """Test that only exact keys hit without a threshold."""
+        cache = TieredCache()
+        cache.set("k1", "answer", text="renewable energy")
+        assert cache.get("k2", text="renewable energy") is None
+
+    def test_hit_ratio_and_bytes(self):
+        """Test reported hit ratio and memory footprint."""
+        cache = TieredCache()
+        cache.set("a", "x" * 100)
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.get_stats()
+        assert stats["hit_ratio"] == 0.5
+        assert stats["memory_entries"] == 1
+        assert stats["memory_bytes"] >= 100
+
+        cache.clear()
+        assert cache.get_stats()["memory_bytes"] == 0
+
+    def test_hashing_embedder(self):
+        """Test that embeddings are normalized and similar texts score higher."""
+        embed = HashingEmbedder()
+        a = embed("machine learning in finance")
+        assert abs(cosine(a, a) - 1.0) < 1e-9
+        assert cosine(a, embed("machine learning for finance")) > cosine(a, embed("gardening tips"))
@@ -0,0 +1,84 @@
+"""
+Unit tests for workflow checkpoints.
+"""
+
+import time
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.checkpoint import CheckpointStore, workflow_id_for, step_key
+
+class TestCheckpointStore:
+    """Test cases for CheckpointStore."""
+
+    def test_idempotency_key_maps_to_stable_workflow_id(self):
+        """Test that the same idempotency key always names the same workflow."""
+        assert workflow_id_for("order-42") == workflow_id_for("order-42")
+        assert workflow_id_for("order-42") != workflow_id_for("order-43")
+        assert workflow_id_for() != workflow_id_for()
+
+    def test_step_key_depends_on_workflow_and_step(self):
+        """Test that step keys differ across workflows and step definitions."""
+        step = {"id": "research", "agent": "ResearchAgent", "depends_on": []}
+        assert step_key("wf1", step) == step_key("wf1", dict(step))
+        assert step_key("wf1", step) != step_key("wf2", step)
+        assert step_key("wf1", step) != step_key("wf1", {**step, "research_type": "technical"})
+
+    def test_workflow_lifecycle(self):
+        """Test start, finish and listing unfinished workflows."""
+        store = CheckpointStore()
+        store.start("wf1", {"task": "a"}, {"steps": []})
+        store.start("wf2", {"task": "b"}, {"steps": []})
+        store.finish("wf2", "completed", {"success": True})
+
+        assert [w["workflow_id"] for w in store.unfinished()] == ["wf1"]
+        record = store.get_workflow("wf2")
+        assert record["status"] == "completed"
+        assert record["response"] == {"success": True}
+        assert record["input"] == {"task": "b"}
+
+        # Reopening keeps the stored plan when none is given
+        store.start("wf2", {"task": "b"})
+        assert store.get_workflow("wf2")["plan"] == {"steps": []}
+
+    def test_saved_step_is_kept_once(self):
+        """Test that a step saved twice under one key keeps its first result."""
+        store = CheckpointStore()
+        store.save_step("key", "wf1", "research", {"success": True, "output": "first"})
+        store.save_step("key", "wf1", "research", {"success": True, "output": "second"})
+
+        assert store.get_step("key")["output"] == "first"
+        assert store.completed_steps("wf1") == ["research"]
+        assert store.get_step("missing") is None
+
+    def test_survives_restart_and_prunes_expired(self, tmp_path):
+        """Test that checkpoints persist on disk and expire after the TTL."""
+        db_path = str(tmp_path / "checkpoints.sqlite")
+        store = CheckpointStore(db_path)
+        store.start("wf1", {"task": "a"}, {"steps": []})
+        store.save_step("key", "wf1", "research", {"success": True})
+        store.close()
+
+        reopened = CheckpointStore(db_path)
+        assert reopened.get_workflow("wf1")["status"] == "running"
+        assert reopened.get_step("key") == {"success": True}
+
+        reopened.ttl_seconds = 0.01
+        time.sleep(0.05)
+        assert reopened.prune() == 1
+        assert reopened.get_step("key") is None
+
+    def test_workflows_beyond_cap_are_pruned(self):
+        """Test that the least recently updated workflows and their steps are dropped past max_workflows."""
+        store = CheckpointStore(max_workflows=3)
+        for i in range(5):
+            store.start(f"wf{i}", {"task": str(i)}, {"steps": []})
+            store.save_step(f"key{i}", f"wf{i}", "research", {"success": True})
+            time.sleep(0.001)
+
+        assert store.get_workflow("wf1") is None
+        assert store.get_step("key1") is None
+        assert [w["workflow_id"] for w in store.unfinished()] == ["wf2", "wf3", "wf4"]
@@ -0,0 +1,112 @@
+"""
+Unit tests for the circuit breaker and latency window.
+"""
+
+import pytest
+import time
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyWindow, CLOSED, OPEN, HALF_OPEN
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def make_breaker(self, **kwargs):
+        options = {"failure_rate": 0.5, "window_seconds": 30, "min_requests": 4, "open_seconds": 0.05}
+        options.update(kwargs)
+        return CircuitBreaker("gpt-4", **options)
+
+    def record(self, breaker, outcomes):
+        for failed in outcomes:
+            breaker.before_request()
+            breaker.record(failed)
+
+    def test_opens_at_failure_rate(self):
+        """Test that the circuit opens only once enough requests fail often enough."""
+        breaker = self.make_breaker()
+        self.record(breaker, [True, True, True])
+        assert breaker.state == CLOSED  # below min_requests
+
+        self.record(breaker, [False])
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_request()
+        assert error.value.retry_after > 0
+        assert breaker.get_stats()["rejected"] == 1
+
+    def test_low_failure_rate_stays_closed(self):
+        """Test that occasional failures do not open the circuit."""
+        breaker = self.make_breaker()
+        self.record(breaker, [True, False, False, False, False, True, False, False])
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()["window_failure_rate"] == 0.25
+
+    def test_old_outcomes_leave_the_window(self):
+        """Test that failures older than the window no longer count."""
+        breaker = self.make_breaker(window_seconds=0.05)
+        self.record(breaker, [True, True, True])
+        time.sleep(0.06)
+        self.record(breaker, [True, False, False])
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test that one probe is let through after the open period and decides the state."""
+        breaker = self.make_breaker()
+        self.record(breaker, [True] * 4)
+        time.sleep(0.06)
+
+        assert breaker.allows_request()
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()  # only one probe at a time
+        breaker.record(failed=True)
+        assert breaker.state == OPEN
+
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.record(failed=False)
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()["opened"] == 2
+        assert breaker.get_stats()["closed"] == 1
+
+    def test_lost_probe_frees_its_slot(self):
+        """Test that a probe which never reports back does not keep the circuit half-open forever."""
+        breaker = self.make_breaker()
+        self.record(breaker, [True] * 4)
+        time.sleep(0.06)
+        breaker.before_request()
+        assert not breaker.allows_request()
+
+        time.sleep(0.06)
+        assert breaker.allows_request()
+
+    def test_check_and_reset(self):
+        """Test that check() rejects without taking a probe and reset() closes the circuit."""
+        breaker = self.make_breaker(open_seconds=60)
+        self.record(breaker, [True] * 4)
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+        breaker.reset()
+        breaker.check()
+        assert breaker.state == CLOSED
+
+class TestLatencyWindow:
+    """Test cases for LatencyWindow."""
+
+    def test_quantile_needs_samples(self):
+        """Test that no quantile is reported until enough latencies are seen."""
+        window = LatencyWindow(size=100, min_samples=10)
+        for i in range(9):
+            window.observe(i / 100)
+        assert window.quantile(0.95) is None
+
+        for i in range(9, 100):
+            window.observe(i / 100)
+        assert window.quantile(0.95) == 0.95
+        assert window.quantile(0.5) == 0.5
@@ -0,0 +1,111 @@
+"""
+Unit tests for the bounded workflow history and its log.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.history import WorkflowHistory, task_hash
+
+def entry(i: int, success: bool = True, task: str = None) -> dict:
+    return {
+        "task": task or f"Task {i}",
+        "result": {"final_output": f"output {i}"},
+        "success": success,
+        "duration": float(i),
+        "timestamp": 1000.0 + i
+    }
+
+class TestWorkflowHistory:
+    """Test cases for WorkflowHistory."""
+
+    def test_recent_entries_are_bounded(self, tmp_path):
+        """Test that memory keeps only the newest entries while the log keeps all."""
+        history = WorkflowHistory(max_recent=10, db_path=str(tmp_path / "history.sqlite"))
+        for i in range(25):
+            history.append(entry(i))
+
+        assert len(history) == 10
+        assert [item["task"] for item in history.recent(3)] == ["Task 22", "Task 23", "Task 24"]
+        assert history.get_stats()["logged_entries"] == 25
+
+    def test_in_memory_log_is_capped_at_recent(self):
+        """Test that without a path the log holds no more rows than memory does."""
+        history = WorkflowHistory(max_recent=10)
+        for i in range(25):
+            history.append(entry(i))
+
+        stats = history.get_stats()
+        assert stats["logged_entries"] == 10
+        assert stats["max_rows"] == 10
+        assert history.query(limit=1)["items"][0]["task"] == "Task 24"
+
+    def test_query_pages_newest_first(self, tmp_path):
+        """Test cursor pagination over the log."""
+        history = WorkflowHistory(max_recent=10, db_path=str(tmp_path / "history.sqlite"))
+        for i in range(25):
+            history.append(entry(i))
+
+        pages, cursor = [], None
+        while True:
+            page = history.query(limit=10, cursor=cursor)
+            pages.append([item["task"] for item in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert pages[0][0] == "Task 24"
+        assert pages[-1][-1] == "Task 0"
+
+    def test_query_filters(self):
+        """Test filtering by success, time range and task."""
+        history = WorkflowHistory()
+        for i in range(10):
+            history.append(entry(i, success=i % 2 == 0))
+        history.append(entry(10, task="  Summarize THE report "))
+
+        assert len(history.query(success=False)["items"]) == 5
+        assert len(history.query(since=1005, until=1008)["items"]) == 3
+        matches = history.query(task="summarize the report")["items"]
+        assert len(matches) == 1
+        assert matches[0]["task_hash"] == task_hash("Summarize the report")
+
+    def test_get_returns_full_entry(self):
+        """Test that full entries are loaded one at a time from the log."""
+        history = WorkflowHistory()
+        history.append(entry(1))
+
+        summary = history.query()["items"][0]
+        assert "result" not in summary
+        assert history.get(summary["id"])["result"] == {"final_output": "output 1"}
+
+    def test_aggregate(self):
+        """Test aggregate counts overall and per time bucket."""
+        history = WorkflowHistory()
+        for i in range(10):
+            history.append(entry(i, success=i < 7))
+
+        stats = history.aggregate(bucket_seconds=5)
+        assert stats["total"] == 10
+        assert stats["failures"] == 3
+        assert stats["success_rate"] == 0.7
+        assert stats["average_duration"] == pytest.approx(4.5)
+        assert [bucket["total"] for bucket in stats["buckets"]] == [5, 5]
+
+    def test_log_is_pruned_and_persisted(self, tmp_path):
+        """Test rotation of old rows and reopening the on-disk log."""
+        db_path = str(tmp_path / "history.sqlite")
+        history = WorkflowHistory(db_path=db_path, max_rows=100)
+        for i in range(250):
+            history.append(entry(i))
+        history.close()
+
+        reopened = WorkflowHistory(db_path=db_path, max_rows=100)
+        assert reopened.get_stats()["logged_entries"] <= 150
+        assert reopened.query(limit=1)["items"][0]["task"] == "Task 249"
+        assert len(reopened) == 0
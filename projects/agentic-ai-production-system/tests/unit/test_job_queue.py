@@ -0,0 +1,259 @@
+"""
+Unit tests for the job queue and its worker.
+"""
+
+import pytest
+import asyncio
+import logging
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.config import Config
+from src.jobs.store import JobQueue, QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED, TIMED_OUT
+from src.jobs.worker import Worker, worker_log_file
+
+class TestJobQueue:
+    """Test cases for JobQueue."""
+
+    @pytest.fixture
+    def db_path(self):
+        """Queue file in a temporary directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield os.path.join(temp_dir, "jobs.sqlite")
+
+    def test_claims_by_priority_then_age(self, db_path):
+        """Test that lower priority values are claimed first, oldest first within a priority."""
+        queue = JobQueue(db_path)
+        low = queue.submit({"task": "low"}, priority=5)
+        first = queue.submit({"task": "first"})
+        second = queue.submit({"task": "second"})
+        urgent = queue.submit({"task": "urgent"}, priority=0)
+
+        claimed = [queue.claim("w1")["id"] for _ in range(4)]
+
+        assert claimed == [urgent, first, second, low]
+        assert queue.claim("w1") is None
+        job = queue.get(urgent)
+        assert job["status"] == RUNNING
+        assert job["worker"] == "w1"
+        assert job["attempts"] == 1
+
+    def test_each_job_is_claimed_once_across_connections(self, db_path):
+        """Test that two processes' connections never claim the same job."""
+        producer = JobQueue(db_path)
+        ids = {producer.submit({"task": f"t{i}"}) for i in range(20)}
+        a, b = JobQueue(db_path), JobQueue(db_path)
+
+        claimed = []
+        while True:
+            jobs = [a.claim("a"), b.claim("b")]
+            claimed += [job["id"] for job in jobs if job]
+            if not any(jobs):
+                break
+
+        assert sorted(claimed) == sorted(ids)
+
+    def test_cancel_queued_and_running(self, db_path):
+        """Test that queued jobs cancel at once and running jobs are flagged for their worker."""
+        queue = JobQueue(db_path)
+        running = queue.submit({"task": "a"})
+        queued = queue.submit({"task": "b"})
+        queue.claim("w1")
+
+        assert queue.cancel(queued)
+        assert queue.get(queued)["status"] == CANCELLED
+        assert queue.cancel(running)
+        assert queue.get(running)["status"] == RUNNING
+        assert queue.heartbeat([running]) == [running]
+
+        queue.finish(running, CANCELLED)
+        assert not queue.cancel(running)
+
+    def test_events_are_ordered_and_paged(self, db_path):
+        """Test that events get increasing sequence numbers and can be read after a seq."""
+        queue = JobQueue(db_path)
+        job_id = queue.submit({"task": "a"})
+        queue.add_events(job_id, [{"type": "plan"}, {"type": "step", "step_id": "research"}])
+        queue.add_events(job_id, [{"type": "delta", "text": "Hello"}])
+
+        events = queue.events(job_id)
+        assert [event["seq"] for event in events] == [1, 2, 3]
+        assert queue.events(job_id, after=2) == [{"seq": 3, "type": "delta", "text": "Hello"}]
+
+    def test_stale_jobs_are_requeued(self, db_path):
+        """Test that jobs of a worker that stopped heartbeating go back to the queue."""
+        queue = JobQueue(db_path)
+        job_id = queue.submit({"task": "a"})
+        queue.claim("w1")
+
+        assert queue.requeue_stale(older_than=60) == 0
+        assert queue.requeue_stale(older_than=0) == 1
+        assert queue.get(job_id)["status"] == QUEUED
+        assert queue.claim("w2")["attempts"] == 2
+
+        # Out of attempts: failed instead of requeued
+        assert queue.requeue_stale(older_than=0, max_attempts=2) == 0
+        assert queue.get(job_id)["status"] == "failed"
+
+    def test_finish_only_by_current_worker(self, db_path):
+        """Test that a worker whose job was requeued and reclaimed cannot record its outcome."""
+        queue = JobQueue(db_path)
+        job_id = queue.submit({"task": "a"})
+        queue.claim("w1")
+        queue.requeue_stale(older_than=0)
+        queue.claim("w2")
+
+        assert not queue.finish(job_id, SUCCEEDED, {"success": True}, worker="w1")
+        assert queue.get(job_id)["status"] == RUNNING
+        assert queue.finish(job_id, SUCCEEDED, {"success": True}, worker="w2")
+        assert not queue.finish(job_id, FAILED, None, "late", worker="w2")
+        assert queue.get(job_id)["status"] == SUCCEEDED
+
+    def test_purge_drops_old_finished_jobs_and_events(self, db_path):
+        """Test that finished jobs past the retention go with their events, and others stay."""
+        queue = JobQueue(db_path)
+        done, running = queue.submit({"task": "a"}), queue.submit({"task": "b"})
+        for job_id in (done, running):
+            queue.claim("w1")
+            queue.add_events(job_id, [{"type": "plan"}])
+        queue.finish(done, SUCCEEDED, {"success": True})
+
+        assert queue.purge(older_than=60) == 0
+        assert queue.purge(older_than=0) == 1
+        assert queue.get(done) is None
+        assert queue.events(done) == []
+        assert queue.get(running)["status"] == RUNNING
+        assert len(queue.events(running)) == 1
+
+    def test_worker_log_file(self):
+        """Test that each worker logs next to the main log file."""
+        assert worker_log_file("logs/app.log", "worker-1") == os.path.join("logs", "app.worker-1.log")
+
+class TestWorker:
+    """Test cases for the job worker loop."""
+
+    @pytest.fixture
+    def queue(self):
+        """Queue in a temporary directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            queue = JobQueue(os.path.join(temp_dir, "jobs.sqlite"))
+            yield queue
+            queue.close()
+
+    @pytest.fixture
+    def config(self):
+        """Create test configuration."""
+        return Config(openai_api_key="test_key", job_timeout=5)
+
+    def make_worker(self, config, queue, stop_event, stream):
+        worker = Worker("w1", config, queue, logging.getLogger("test"), stop_event,
+                        concurrency=2, poll_interval=0.01, heartbeat_interval=0.02)
+        worker.coordinator.process_stream = stream
+        return worker
+
+    async def run_until(self, worker, stop_event, done):
+        runner = asyncio.ensure_future(worker.run(drain_timeout=0.1))
+        for _ in range(500):
+            if done():
+                break
+            await asyncio.sleep(0.01)
+        stop_event.set()
+        await runner
+
+    @pytest.mark.asyncio
+    async def test_runs_job_and_records_events(self, config, queue):
+        """Test that a job's events are stored, consecutive deltas merged, and its result saved."""
+        seen = []
+
+        async def stream(input_data):
+            seen.append(input_data)
+            yield {"type": "plan", "plan": {"steps": []}}
+            for text in ["Hel", "lo"]:
+                yield {"type": "delta", "text": text}
+            yield {"type": "result", "success": True, "result": "Hello"}
+
+        stop_event = asyncio.Event()
+        worker = self.make_worker(config, queue, stop_event, stream)
+        job_id = queue.submit({"task": "a"})
+
+        await self.run_until(worker, stop_event, lambda: queue.get(job_id)["status"] == SUCCEEDED)
+
+        assert seen[0]["idempotency_key"] == job_id
+        assert queue.get(job_id)["result"] == {"success": True, "result": "Hello"}
+        assert [(e["type"], e.get("text")) for e in queue.events(job_id)] == [("plan", None), ("delta", "Hello")]
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_cancellation(self, config, queue):
+        """Test that a job past its timeout is stopped and a cancelled running job ends as cancelled."""
+
+        async def stream(input_data):
+            await asyncio.sleep(10)
+            yield {"type": "result", "success": True}
+
+        stop_event = asyncio.Event()
+        worker = self.make_worker(config, queue, stop_event, stream)
+        slow = queue.submit({"task": "slow"}, timeout=0.05)
+        cancelled = queue.submit({"task": "cancel me"})
+
+        async def cancel_when_running():
+            while queue.get(cancelled)["status"] != RUNNING:
+                await asyncio.sleep(0.01)
+            queue.cancel(cancelled)
+
+        canceller = asyncio.ensure_future(cancel_when_running())
+        await self.run_until(worker, stop_event, lambda: queue.get(cancelled)["status"] == CANCELLED)
+        await canceller
+
+        assert queue.get(slow)["status"] == TIMED_OUT
+        assert queue.get(cancelled)["status"] == CANCELLED
+        assert worker.stats["timed_out"] == 1 and worker.stats["cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_releases_unfinished_jobs(self, config, queue):
+        """Test that jobs still running when the worker stops go back to the queue."""
+
+        async def stream(input_data):
+            await asyncio.sleep(10)
+            yield {"type": "result", "success": True}
+
+        stop_event = asyncio.Event()
+        worker = self.make_worker(config, queue, stop_event, stream)
+        job_id = queue.submit({"task": "long"})
+
+        await self.run_until(worker, stop_event, lambda: queue.get(job_id)["status"] == RUNNING)
+
+        assert queue.get(job_id)["status"] == QUEUED
+        assert worker.stats["released"] == 1
+
+    @pytest.mark.asyncio
+    async def test_result_of_a_reclaimed_job_is_dropped(self, config, queue):
+        """Test that a job requeued from under its worker keeps the new worker's claim."""
+        reclaimed = asyncio.Event()
+
+        async def stream(input_data):
+            await reclaimed.wait()
+            yield {"type": "result", "success": True}
+
+        stop_event = asyncio.Event()
+        worker = self.make_worker(config, queue, stop_event, stream)
+        job_id = queue.submit({"task": "a"})
+
+        async def reclaim_when_running():
+            while queue.get(job_id)["status"] != RUNNING:
+                await asyncio.sleep(0.01)
+            queue.requeue_stale(older_than=0)
+            queue.claim("w2")
+            reclaimed.set()
+
+        reclaimer = asyncio.ensure_future(reclaim_when_running())
+        await self.run_until(worker, stop_event, lambda: worker.stats["dropped"] == 1)
+        await reclaimer
+
+        job = queue.get(job_id)
+        assert job["status"] == RUNNING and job["worker"] == "w2"
+        assert worker.stats["succeeded"] == 0
@@ -0,0 +1,87 @@
+"""
+Unit tests for the queued JSON logging pipeline.
+"""
+
+import json
+import logging
+import queue
+import threading
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.utils.logger import (
+    setup_logger,
+    flush_logger,
+    SamplingFilter,
+    NonBlockingQueueHandler
+)
+
+def make_record(msg: str, level: int = logging.INFO, module: str = "base_agent", args=()) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, f"{module}.py", 1, msg, args, None)
+    return record
+
+class TestLoggingPipeline:
+    """Test cases for setup_logger and its components."""
+
+    def test_writes_json_lines(self, tmp_path):
+        """Test that records reach the file sink as JSON objects."""
+        log_file = tmp_path / "app.log"
+        logger = setup_logger("json_test", "INFO", str(log_file))
+
+        logger.info("%s: Making LLM request", "ResearchAgent", extra={"request_id": "abc"})
+        logger.error("failed")
+        flush_logger("json_test")
+
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert entries[0]["message"] == "ResearchAgent: Making LLM request"
+        assert entries[0]["level"] == "INFO"
+        assert entries[0]["request_id"] == "abc"
+        assert entries[1]["level"] == "ERROR"
+
+    def test_formatting_happens_on_writer_thread(self, tmp_path):
+        """Test that lazy arguments are formatted off the calling thread."""
+        formatted_on = []
+
+        class Probe:
+            def __str__(self):
+                formatted_on.append(threading.current_thread().name)
+                return "probe"
+
+        logger = setup_logger("lazy_test", "INFO", str(tmp_path / "app.log"))
+        logger.info("value %s", Probe())
+        flush_logger("lazy_test")
+
+        assert formatted_on and threading.current_thread().name not in formatted_on
+
+    def test_sampling_keeps_one_in_n_per_template(self):
+        """Test that hot INFO templates are thinned deterministically."""
+        sampler = SamplingFilter({"base_agent": 0.1})
+
+        kept = [sampler.filter(make_record("%s: Making LLM request")) for _ in range(100)]
+        other = sampler.filter(make_record("%s: LLM request successful"))
+
+        assert sum(kept) == 10
+        assert kept[0] is True
+        assert other is True
+        assert sampler.dropped == 90
+
+    def test_sampling_never_drops_warnings_or_other_modules(self):
+        """Test that warnings and unsampled modules always pass."""
+        sampler = SamplingFilter({"base_agent": 0.0})
+
+        assert sampler.filter(make_record("hot", module="base_agent")) is False
+        assert sampler.filter(make_record("hot", level=logging.WARNING, module="base_agent")) is True
+        assert sampler.filter(make_record("hot", module="research_agent")) is True
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that a full queue never blocks the caller."""
+        handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=2)
+
+        for _ in range(5):
+            handler.handle(make_record("message"))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
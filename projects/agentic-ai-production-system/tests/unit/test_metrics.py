@@ -0,0 +1,150 @@
+"""
+Unit tests for the Prometheus-style metrics registry and exporter.
+"""
+
+import pytest
+import gc
+import socket
+import threading
+import urllib.request
+import urllib.error
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.metrics import MetricsRegistry, MetricsServer, start_metrics_server, stop_metrics_server
+from src.core.config import Config
+
+class TestMetricsRegistry:
+    """Test cases for counters, histograms and text rendering."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create an isolated registry."""
+        return MetricsRegistry()
+
+    def test_counter_renders_per_label(self, registry):
+        """Test that counters are tracked and rendered per label combination."""
+        counter = registry.counter("requests_total", "Requests", ("agent",))
+        counter.labels("a").inc()
+        counter.labels(agent="a").inc(2)
+        counter.labels("b").inc()
+
+        assert counter.labels("a").get() == 3
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{agent="a"} 3' in text
+        assert 'requests_total{agent="b"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        """Test that histogram buckets use le semantics and render cumulatively."""
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_sum 2.65" in text
+        assert "latency_seconds_count 4" in text
+
+    def test_quantile_interpolates_within_bucket(self, registry):
+        """Test that quantiles are estimated from the bucket counts."""
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(1.0, 2.0))
+        for value in [0.5] * 50 + [1.5] * 50:
+            histogram.observe(value)
+
+        child = histogram.labels()
+        assert child.quantile(0.5) == pytest.approx(1.0)
+        assert child.quantile(0.75) == pytest.approx(1.5)
+
+    def test_observations_from_many_threads_are_not_lost(self, registry):
+        """Test that per-thread shards add up without locking writers."""
+        counter = registry.counter("events_total", "Events")
+        histogram = registry.histogram("sizes", "Sizes", buckets=(10,))
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+                histogram.observe(1)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.labels().get() == 80000
+        assert histogram.labels().snapshot()[2] == 80000
+
+    def test_exited_threads_shards_are_folded(self, registry):
+        """Test that a thread's shard is merged into the totals and dropped when it exits."""
+        counter = registry.counter("requests_total", "Requests")
+
+        for _ in range(50):
+            thread = threading.Thread(target=lambda: counter.inc(2))
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        child = counter.labels()
+        assert child.get() == 100
+        assert len(child._shards._shards) <= 1
+
+    def test_label_values_are_escaped(self, registry):
+        """Test that quotes and newlines in label values keep the format valid."""
+        counter = registry.counter("errors_total", "Errors", ("message",))
+        counter.labels('bad "value"\n').inc()
+
+        assert 'errors_total{message="bad \\"value\\"\\n"} 1' in registry.render()
+
+    def test_conflicting_registration_is_rejected(self, registry):
+        """Test that one name cannot be reused with different labels."""
+        first = registry.counter("jobs_total", "Jobs", ("queue",))
+        assert registry.counter("jobs_total", "Jobs", ("queue",)) is first
+
+        with pytest.raises(ValueError):
+            registry.histogram("jobs_total", "Jobs", ("queue",))
+
+class TestMetricsServer:
+    """Test cases for the scrape endpoint."""
+
+    def test_serves_metrics(self):
+        """Test that /metrics returns the registry in the text format."""
+        registry = MetricsRegistry()
+        registry.counter("pings_total", "Pings").inc()
+
+        server = MetricsServer(registry, host="127.0.0.1", port=0).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "pings_total 1" in body
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=5)
+        finally:
+            server.stop()
+
+    def test_disabled_metrics_start_nothing(self):
+        """Test that enable_metrics=False leaves the port alone."""
+        config = Config(openai_api_key="test_key", enable_metrics=False)
+        assert start_metrics_server(config) is None
+
+    def test_binds_loopback_by_default(self):
+        """Test that the unauthenticated exporter is not exposed on every interface unless configured."""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        config = Config(openai_api_key="test_key", metrics_port=port)
+        assert config.metrics_host == "127.0.0.1"
+
+        server = start_metrics_server(config, MetricsRegistry())
+        try:
+            assert server.host == "127.0.0.1"
+        finally:
+            stop_metrics_server(server)
@@ -0,0 +1,87 @@
+"""
+Unit tests for output filtering on complete and streamed text.
+"""
+
+import pytest
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.output_filter import OutputFilter, REDACTION_PATTERNS, register_pattern
+
+class TestOutputFilter:
+    """Test cases for OutputFilter and StreamingFilter."""
+
+    @pytest.fixture
+    def output_filter(self):
+        """Create filter with the default sensitive terms."""
+        return OutputFilter()
+
+    def test_filter_is_case_insensitive(self, output_filter):
+        """Test that terms are redacted regardless of case."""
+        text, count = output_filter.filter("my API_KEY and Password")
+        assert text == "my [FILTERED] and [FILTERED]"
+        assert count == 2
+
+    def test_stream_redacts_term_split_across_deltas(self, output_filter):
+        """Test that a term split between deltas never reaches the output."""
+        stream = output_filter.stream()
+        emitted = [stream.feed(delta) for delta in ["the pass", "wo", "rd is here"]]
+        emitted.append(stream.flush())
+
+        assert "".join(emitted) == "the [FILTERED] is here"
+        assert not any("pass" in piece for piece in emitted)
+        assert stream.redactions == 1
+
+    def test_stream_emits_before_the_end(self, output_filter):
+        """Test that safe text is released while the stream is still open."""
+        stream = output_filter.stream()
+        assert stream.feed("a long sentence without sensitive words") != ""
+
+    def test_stream_matches_buffered_filter(self, output_filter):
+        """Test that any split of the text gives the buffered result."""
+        rng = random.Random(7)
+        words = ["api", "_key", "API_KEY", "pass", "word", "sec", "ret", "tokens", " ", "x"]
+
+        for _ in range(500):
+            text = "".join(rng.choice(words) for _ in range(rng.randint(0, 20)))
+            stream = output_filter.stream()
+            position, emitted = 0, []
+            while position < len(text):
+                size = rng.randint(1, 6)
+                emitted.append(stream.feed(text[position:position + size]))
+                position += size
+            emitted.append(stream.flush())
+
+            assert "".join(emitted) == output_filter.filter(text)[0]
+
+    def test_filter_redacts_registered_patterns(self, output_filter):
+        """Test that keys, emails and card numbers are redacted with the terms in one pass."""
+        text, count = output_filter.filter(
+            "Mail Ops@Example.com, card 4111 1111 1111 1111, key sk-abcdefghijklmnopqrstuvwx and a PassWord"
+        )
+        assert text == "Mail [FILTERED], card [FILTERED], key [FILTERED] and a [FILTERED]"
+        assert count == 4
+
+    def test_stream_holds_back_pattern_spanning_whitespace(self, output_filter):
+        """Test that a card number split at its spaces is redacted whole."""
+        stream = output_filter.stream()
+        emitted = [stream.feed(delta) for delta in ["pay with 4111 ", "1111 ", "1111 1111 today ", "please"]]
+        emitted.append(stream.flush())
+
+        assert "".join(emitted) == "pay with [FILTERED] today please"
+        assert not any("1111" in piece for piece in emitted)
+        assert emitted[2] == "pay with [FILTERED]"  # released before the stream ends
+
+    def test_registered_pattern_is_used_by_new_filters(self):
+        """Test that a pattern added to the shared registry is redacted by filters created after it."""
+        registry = dict(REDACTION_PATTERNS)
+        try:
+            register_pattern("ticket", r'\bTKT-\d{6}\b', 10)
+            assert OutputFilter().filter("see tkt-123456")[0] == "see [FILTERED]"
+        finally:
+            REDACTION_PATTERNS.clear()
+            REDACTION_PATTERNS.update(registry)
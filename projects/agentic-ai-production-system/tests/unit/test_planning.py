@@ -0,0 +1,144 @@
+"""
+Unit tests for workflow plan resolution.
+"""
+
+import pytest
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.planning import PlanResolver, TaskClassifier, parse_plan
+from src.core.workflow import WorkflowError
+
+AGENTS = ["ResearchAgent", "ContentAgent", "ValidationAgent"]
+
+NOVEL_PLAN = json.dumps({
+    "steps": [
+        {"id": "facts", "agent": "ResearchAgent", "action": "find facts", "research_type": "factual"},
+        {"id": "draft", "agent": "ContentAgent", "action": "draft", "depends_on": ["facts"],
+         "content_type": "bogus"}
+    ],
+    "estimated_time": "20 seconds",
+    "complexity": "low"
+})
+
+class TestTaskClassifier:
+    """Test cases for TaskClassifier."""
+
+    @pytest.mark.parametrize("task,template", [
+        ("Summarize this quarterly report", "summary"),
+        ("Write a short poem about autumn", "creative"),
+        ("Document the REST API for our billing service", "technical"),
+        ("Compare PostgreSQL versus MySQL", "comparison"),
+        ("Analyze the impact of remote work", "analysis"),
+        ("Explain the benefits of renewable energy", "explanation"),
+    ])
+    def test_known_task_classes(self, task, template):
+        """Test that common tasks are routed to the matching template."""
+        assert TaskClassifier().classify(task)[0] == template
+
+    def test_novel_task(self):
+        """Test that tasks without known keywords are left to the planner."""
+        assert TaskClassifier().classify("Plan a three-day trip to Lisbon") == (None, 0)
+
+    def test_keywords_match_whole_words(self):
+        """Test that keywords inside other words do not count."""
+        assert TaskClassifier().classify("Recapitulation vs apiary")[0] == "comparison"
+
+class TestParsePlan:
+    """Test cases for parse_plan."""
+
+    def test_valid_plan_from_fenced_response(self):
+        """Test that JSON surrounded by prose is parsed and unknown option values dropped."""
+        plan = parse_plan(f"Here you go:\n```json\n{NOVEL_PLAN}\n```", AGENTS, max_steps=10)
+
+        assert [s["id"] for s in plan["steps"]] == ["facts", "draft"]
+        assert plan["steps"][0]["research_type"] == "factual"
+        assert "content_type" not in plan["steps"][1]
+        assert plan["complexity"] == "low"
+
+    @pytest.mark.parametrize("response", [
+        "no json here",
+        "{not json}",
+        '{"steps": []}',
+        '{"steps": [{"agent": "HackerAgent"}]}',
+        '{"steps": [{"id": "a", "agent": "ContentAgent", "depends_on": ["b"]}]}',
+        '{"steps": [{"id": "a", "agent": "ContentAgent", "depends_on": ["b"]},'
+        ' {"id": "b", "agent": "ContentAgent", "depends_on": ["a"]}]}',
+    ])
+    def test_invalid_plans_are_rejected(self, response):
+        """Test that malformed, unknown-agent, dangling and cyclic plans raise WorkflowError."""
+        with pytest.raises(WorkflowError):
+            parse_plan(response, AGENTS, max_steps=10)
+
+    def test_step_limit(self):
+        """Test that overly long plans are rejected."""
+        steps = [{"agent": "ContentAgent"} for _ in range(5)]
+        with pytest.raises(WorkflowError):
+            parse_plan(json.dumps({"steps": steps}), AGENTS, max_steps=4)
+
+class TestPlanResolver:
+    """Test cases for PlanResolver."""
+
+    @pytest.fixture
+    def planner_calls(self):
+        return []
+
+    @pytest.fixture
+    def planner(self, planner_calls):
+        async def plan(task, context):
+            planner_calls.append(task)
+            return NOVEL_PLAN
+        return plan
+
+    @pytest.mark.asyncio
+    async def test_template_skips_planner(self, planner, planner_calls):
+        """Test that a known task class never calls the LLM planner."""
+        resolver = PlanResolver(AGENTS)
+        plan = await resolver.resolve("Explain machine learning basics", {}, planner)
+
+        assert plan["source"] == "template"
+        assert plan["template"] == "explanation"
+        assert planner_calls == []
+
+    @pytest.mark.asyncio
+    async def test_templates_are_not_shared_mutably(self, planner):
+        """Test that editing a returned plan does not change the template."""
+        resolver = PlanResolver(AGENTS)
+        plan = await resolver.resolve("Explain machine learning basics", {}, planner)
+        plan["steps"].clear()
+
+        again = await resolver.resolve("Explain machine learning basics", {}, planner)
+        assert len(again["steps"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_llm_plan_is_cached(self, planner, planner_calls):
+        """Test that a novel task is planned once and reused."""
+        resolver = PlanResolver(AGENTS)
+        first = await resolver.resolve("Plan a three-day trip to Lisbon", {}, planner)
+        second = await resolver.resolve("plan a three-day   trip to Lisbon", {}, planner)
+
+        assert first["source"] == "llm"
+        assert second["source"] == "cache"
+        assert second["steps"] == first["steps"]
+        assert len(planner_calls) == 1
+        assert resolver.get_stats()["planner_calls_avoided_ratio"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_invalid_llm_plan_falls_back_uncached(self, planner_calls):
+        """Test that an invalid plan falls back and is asked for again next time."""
+        async def bad_planner(task, context):
+            planner_calls.append(task)
+            return "I cannot help with that"
+
+        resolver = PlanResolver(AGENTS)
+        plan = await resolver.resolve("Plan a three-day trip to Lisbon", {}, bad_planner)
+        await resolver.resolve("Plan a three-day trip to Lisbon", {}, bad_planner)
+
+        assert plan["source"] == "fallback"
+        assert plan["fallback"] is True
+        assert len(planner_calls) == 2
+        assert resolver.get_stats()["invalid_plans"] == 2
@@ -0,0 +1,125 @@
+"""
+Unit tests for the shared rate limiter.
+"""
+
+import pytest
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.rate_limiter import RateLimiter, RateLimitExceeded, request_context
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self):
+        """Test that the burst is admitted at once and the rest at the refill rate."""
+        limiter = RateLimiter(requests_per_window=5, window_seconds=1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[limiter.acquire() for _ in range(7)])
+        elapsed = time.perf_counter() - start
+
+        # Two requests beyond the burst at 5/s need about 0.4s
+        assert 0.3 < elapsed < 1.0
+        stats = limiter.get_stats()
+        assert stats["admitted"] == 7
+        assert stats["queued"] == 2
+        assert stats["wait_max_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_tokens_per_minute_budget(self):
+        """Test that large requests wait for the token budget."""
+        limiter = RateLimiter(requests_per_window=100, window_seconds=1, tokens_per_minute=600)
+
+        await limiter.acquire(tokens=600)
+        start = time.perf_counter()
+        await limiter.acquire(tokens=5)
+        # 600 tokens/min refills 10 tokens/s
+        assert time.perf_counter() - start >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_priority_and_tenant_fairness(self):
+        """Test that urgent callers go first and tenants are interleaved."""
+        limiter = RateLimiter(requests_per_window=1, window_seconds=0.05 * 1)
+        limiter.requests.refill_per_second = 50
+        order = []
+
+        async def call(name, tenant, priority):
+            await limiter.acquire(tenant=tenant, priority=priority)
+            order.append(name)
+
+        await limiter.acquire()  # drain the burst so everything below queues
+        tasks = [asyncio.ensure_future(call(f"a{i}", "busy", 1)) for i in range(3)]
+        tasks.append(asyncio.ensure_future(call("b0", "quiet", 1)))
+        tasks.append(asyncio.ensure_future(call("urgent", "quiet", 0)))
+        await asyncio.gather(*tasks)
+
+        assert order[0] == "urgent"
+        # The quiet tenant's first request does not wait behind all of busy's
+        assert order.index("b0") < order.index("a1")
+
+    @pytest.mark.asyncio
+    async def test_load_shedding(self):
+        """Test that a request whose wait would exceed the deadline fails fast."""
+        limiter = RateLimiter(requests_per_window=1, window_seconds=10, max_wait=1.0)
+
+        await limiter.acquire()
+        start = time.perf_counter()
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire()
+
+        assert time.perf_counter() - start < 0.1
+        assert limiter.get_stats()["shed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_context_sets_default_tenant(self):
+        """Test that request_context tags requests without explicit arguments."""
+        limiter = RateLimiter(requests_per_window=1, window_seconds=0.1)
+        await limiter.acquire()
+
+        with request_context("tenant-a", priority=0):
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+
+        assert limiter._queue[0][0] == 0
+        assert limiter._queue[0][4] == "tenant-a"
+        await waiter
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a queued caller removes it from the queue."""
+        limiter = RateLimiter(requests_per_window=1, window_seconds=10)
+        await limiter.acquire()
+
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.get_stats()["queue_depth"] == 0
+
+    def test_waiter_left_on_finished_loop(self):
+        """Test that a timer armed on an event loop that has ended does not stall the next loop."""
+        limiter = RateLimiter(requests_per_window=1, window_seconds=1)
+
+        async def leave_waiter_queued():
+            await limiter.acquire()
+            asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0.01)
+
+        asyncio.run(leave_waiter_queued())
+        assert limiter.get_stats()["queue_depth"] == 0
+
+        async def acquire_on_new_loop():
+            await asyncio.wait_for(limiter.acquire(), timeout=5)
+
+        start = time.perf_counter()
+        asyncio.run(acquire_on_new_loop())
+        assert time.perf_counter() - start < 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.single_flight import SingleFlight, request_fingerprint
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def test_fingerprint_ignores_kwarg_order(self):
+        """Test that fingerprints depend on content, not argument order."""
+        messages = [{"role": "user", "content": "hi"}]
+        assert request_fingerprint("gpt-4", messages, max_tokens=10, temperature=0) == \
+            request_fingerprint("gpt-4", messages, temperature=0, max_tokens=10)
+        assert request_fingerprint("gpt-4", messages) != request_fingerprint("gpt-3.5-turbo", messages)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_result(self):
+        """Test that only the first caller executes the call."""
+        flight = SingleFlight()
+        executions = 0
+
+        async def call():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*[flight.do("key", call) for _ in range(5)])
+
+        assert executions == 1
+        assert [r for r, _ in results] == ["result"] * 5
+        assert [shared for _, shared in results].count(False) == 1
+        assert flight.get_stats()["coalesced"] == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_all_waiters(self):
+        """Test that every waiter receives the leader's exception."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            raise ValueError("provider error")
+
+        results = await asyncio.gather(*[flight.do("key", call) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        # Nothing is cached after completion
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test that the shared call keeps running while someone still waits."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == ("result", True)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        """Test that completed calls are not reused."""
+        flight = SingleFlight()
+
+        async def call():
+            return "result"
+
+        await flight.do("key", call)
+        await flight.do("key", call)
+
+        assert flight.get_stats()["executed"] == 2
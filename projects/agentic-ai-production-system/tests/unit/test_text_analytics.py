@@ -0,0 +1,108 @@
+"""
+Unit tests for single-pass text analytics.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.text_analytics import TextAnalyzer, bracket_balance, BLOCK_CHARS
+
+TERMS = {"python": ["python", "Python", "PYTHON"], "api": ["api", "API", "Api"]}
+
+SAMPLE = (
+    "The Python API is simple. Call it from any client!  Why? Because it is stable...\n\n"
+    "```python\ndef area(r):\n    return {'pi': [3.14, (r * r)]}\n```\n"
+    "Use the api sparingly. Ok.\n```js\nfetch(url).then((r) => r.json()\n```\n"
+    "```\nnever closed (\n"
+)
+
+def expected(text):
+    """The counts the previous per-check implementation produced."""
+    sentences = re.split(r'[.!?]+', text)
+    return {
+        "characters": len(text),
+        "words": len(text.split()),
+        "sentences": len(sentences),
+        "short_sentences": sum(1 for s in sentences if len(s.strip()) < 5)
+    }
+
+def counts(stats):
+    return {
+        "characters": stats.characters,
+        "words": stats.words,
+        "sentences": stats.sentences,
+        "short_sentences": stats.short_sentences
+    }
+
+class TestTextAnalyzer:
+    """Test cases for TextAnalyzer."""
+
+    def test_matches_separate_scans(self):
+        """Test that one pass gives the counts that splitting and re.split gave."""
+        analyzer = TextAnalyzer(TERMS)
+
+        for text in (SAMPLE, "", ".", "abc.", "...!?", "short", "test " * 50, " a . b .. c\x1c. "):
+            assert counts(analyzer.analyze(text)) == expected(text), text
+
+    def test_terms_and_code_blocks(self):
+        """Test that term variations are reported in declaration order and code blocks are balanced per block."""
+        stats = TextAnalyzer(TERMS).analyze(SAMPLE)
+
+        # Terms are matched as substrings, so the fence's language counts too
+        assert stats.terms == {"python": ["python", "Python"], "api": ["api", "API"]}
+        assert len(stats.code_blocks) == len(re.findall(r'```[\w]*\n(.*?)\n```', SAMPLE, re.DOTALL))
+        assert stats.code_blocks == [(False, False), (False, True)]
+
+    def test_stream_matches_whole_text(self):
+        """Test that any split of the text into deltas gives the same stats."""
+        analyzer = TextAnalyzer(TERMS)
+        whole = analyzer.analyze(SAMPLE)
+
+        for size in (1, 3, 7, 64):
+            stream = analyzer.stream()
+            for start in range(0, len(SAMPLE), size):
+                stream.feed(SAMPLE[start:start + size])
+            stats = stream.finish()
+
+            assert counts(stats) == counts(whole)
+            assert stats.terms == whole.terms
+            assert stats.code_blocks == whole.code_blocks
+            assert stats.word_counts == whole.word_counts
+
+    def test_large_document_word_frequencies_are_exact(self):
+        """Test that every word of a long document is counted, so late repetition is still seen."""
+        paragraph = "Solar output rose again this year. Wind output held steady across the region.\n\n"
+        text = paragraph * (BLOCK_CHARS * 24 // len(paragraph))
+
+        stats = TextAnalyzer().analyze(text)
+
+        assert counts(stats) == expected(text)
+        assert sum(stats.word_counts.values()) == stats.words
+        assert stats.max_word_share == 2 / 13  # "output" twice in 13 words
+
+        # Spam well past the first blocks is counted like spam at the start
+        spammed = TextAnalyzer().analyze(text + "buy now " * 20000)
+        assert spammed.word_counts["buy"] == 20000
+        assert spammed.max_word_share > 0.1
+
+    def test_repetition_share(self):
+        """Test the most frequent word's share of the words."""
+        assert TextAnalyzer().analyze("test " * 50).max_word_share == 1.0
+        assert TextAnalyzer().analyze("").max_word_share == 0.0
+
+class TestBracketBalance:
+    """Test cases for bracket_balance."""
+
+    def test_balanced_mismatched_and_unclosed(self):
+        """Test the mismatch and open-bracket results, and continuing from a stack."""
+        assert bracket_balance("f(x[1], {'a': 2})") == (False, [])
+        assert bracket_balance("f(x]") == (True, [])
+        assert bracket_balance("f({x)") == (True, ["("])
+        assert bracket_balance("if (a") == (False, ["("])
+
+        mismatched, stack = bracket_balance("call(a, [")
+        assert bracket_balance("b])", stack) == (False, [])
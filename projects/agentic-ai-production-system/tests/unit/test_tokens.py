@@ -0,0 +1,86 @@
+"""
+Unit tests for token counting and prompt budgeting.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.tokens import Tokenizer, PromptBudget, context_window, get_tokenizer, DEFAULT_CONTEXT_WINDOW
+
+class TestTokenizer:
+    """Test cases for Tokenizer."""
+
+    def test_context_window_by_model_prefix(self):
+        """Test that the most specific model prefix decides the window."""
+        assert context_window("gpt-4") == 8192
+        assert context_window("gpt-4-32k-0613") == 32768
+        assert context_window("gpt-4o-mini") == 128000
+        assert context_window("some-local-model") == DEFAULT_CONTEXT_WINDOW
+
+    def test_counts_are_plausible_and_cached(self):
+        """Test that counts are near the usual 4 characters per token and repeated counts hit the cache."""
+        tokenizer = Tokenizer("gpt-4")
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+
+        count = tokenizer.count(text)
+        assert len(text) / 6 < count < len(text) / 2
+        assert tokenizer.count("") == 0
+
+        tokenizer.count(text)
+        assert tokenizer.count.cache_info().hits >= 1
+
+    def test_count_messages_includes_formatting(self):
+        """Test that chat formatting overhead is added per message."""
+        tokenizer = Tokenizer("gpt-4")
+        messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hello"}]
+        assert tokenizer.count_messages(messages) > tokenizer.count("Be brief.") + tokenizer.count("Hello")
+
+    def test_truncate(self):
+        """Test that truncation keeps a prefix within the token limit."""
+        tokenizer = Tokenizer("gpt-4")
+        text = "alpha beta gamma delta " * 50
+
+        truncated = tokenizer.truncate(text, 30)
+        assert text.startswith(truncated)
+        assert tokenizer.count(truncated) <= 30
+        assert tokenizer.truncate("short", 30) == "short"
+        assert tokenizer.truncate(text, 0) == ""
+
+    def test_split_respects_limit_and_breaks(self):
+        """Test that chunks fit the limit, prefer paragraph breaks and rejoin to the text."""
+        tokenizer = Tokenizer("gpt-4")
+        paragraphs = [f"Paragraph {i}. " + "Some words in a sentence. " * 8 for i in range(10)]
+        text = "\n\n".join(paragraphs)
+
+        chunks = tokenizer.split(text, 80)
+
+        assert "".join(chunks) == text
+        assert all(tokenizer.count(chunk) <= 80 for chunk in chunks)
+        assert all(chunk.endswith("\n\n") for chunk in chunks[:-1])
+        assert tokenizer.split("", 10) == []
+        assert tokenizer.split("tiny", 10) == ["tiny"]
+
+    def test_shared_tokenizer_per_model(self):
+        """Test that agents on the same model share one tokenizer and its cache."""
+        assert get_tokenizer("gpt-4") is get_tokenizer("gpt-4")
+        assert get_tokenizer("gpt-4") is not get_tokenizer("gpt-4o")
+
+class TestPromptBudget:
+    """Test cases for PromptBudget."""
+
+    def test_output_and_content_budgets(self):
+        """Test that prompt, content and output together stay inside the window."""
+        tokenizer = Tokenizer("gpt-4")
+        budget = PromptBudget(tokenizer, window=1000, margin=0)
+        messages = [{"role": "user", "content": "word " * 100}]
+        prompt = tokenizer.count_messages(messages)
+
+        assert budget.available_output(messages, 300) == 300
+        assert budget.available_output(messages, 5000) == 1000 - budget.margin - prompt
+        assert budget.available_output([{"role": "user", "content": "word " * 2000}], 100) == 0
+
+        assert budget.content_budget(messages, max_output=200) == 1000 - budget.margin - 200 - prompt
+        assert budget.content_budget(messages, max_output=200, cap=100) == 100
@@ -141,6 +141,70 @@ class TestValidationAgent:
             assert "quality_score" in result
             assert "overall_score" in result
     
+    @pytest.mark.asyncio
+    async def test_comprehensive_llm_checks_run_concurrently(self, agent):
+        """Test that the safety and quality LLM checks overlap."""
+        
+        async def slow_check(content):
+            await asyncio.sleep(0.2)
+            return {"issues": []}
+        
+        with patch.object(agent, '_llm_safety_check', side_effect=slow_check), \
+             patch.object(agent, '_llm_quality_check', side_effect=slow_check):
+            
+            start = asyncio.get_event_loop().time()
+            result = await agent.process({"content": "Test content for comprehensive validation"})
+            elapsed = asyncio.get_event_loop().time() - start
+            
+            assert result["success"] is True
+            assert elapsed < 0.35
+    
+    @pytest.mark.asyncio
+    async def test_strict_mode_local_failure_skips_llm(self, agent):
+        """Test that strict mode fails on local issues without calling the LLM."""
+        with patch.object(agent, '_llm_safety_check') as mock_safety, \
+             patch.object(agent, '_llm_quality_check') as mock_quality:
+            
+            input_data = {"content": "My SSN is 123-45-6789, please keep it safe.", "strict_mode": True}
+            result = await agent.process(input_data)
+            
+            mock_safety.assert_not_called()
+            mock_quality.assert_not_called()
+            assert result["validation_passed"] is False
+            assert result["llm_checks_skipped"] is True
+            assert result["safety_issues"][0]["category"] == "personal_info"
+            assert agent.get_validation_metrics()["llm_checks_skipped"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_llm_check_is_not_a_pass(self, agent):
+        """Test that content whose LLM check errored is reported as unvalidated rather than clean."""
+        agent._make_llm_request = AsyncMock(side_effect=RuntimeError("provider unavailable"))
+        
+        result = await agent.process({"content": "This is clean content", "validation_type": "safety"})
+        
+        assert result["validation_passed"] is False
+        assert [issue["type"] for issue in result["safety_issues"]] == ["llm_check_failed"]
+        assert agent.get_validation_metrics()["validations_passed"] == 0
+        assert "Re-run validation once the LLM checks are available" in agent._generate_recommendations(result["safety_issues"])
+    
+    def test_safety_scan_finds_overlapping_patterns(self, agent):
+        """Test that one scan reports every matching pattern, even inside another match."""
+        content = "how to make an illegal activity bomb, mail me at someone@example.com"
+        categories = [issue["category"] for issue in agent._local_safety_issues(content, False)]
+        
+        assert categories == ["personal_info", "harmful_instructions", "harmful_instructions"]
+    
+    @pytest.mark.asyncio
+    async def test_validation_latency_percentiles(self, agent):
+        """Test that validation latency is reported."""
+        with patch.object(agent, '_llm_safety_check') as mock_safety:
+            mock_safety.return_value = {"issues": []}
+            await agent.process({"content": "This is clean content", "validation_type": "safety"})
+        
+        metrics = agent.get_validation_metrics()
+        assert metrics["latency_p50_ms"] >= 0
+        assert metrics["latency_p95_ms"] >= metrics["latency_p50_ms"]
+    
     def test_check_basic_quality_short_content(self, agent):
         """Test basic quality check with short content."""
         issues = agent._check_basic_quality("short", False)
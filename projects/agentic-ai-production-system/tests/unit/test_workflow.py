@@ -0,0 +1,121 @@
+"""
+Unit tests for the workflow DAG scheduler.
+"""
+
+import pytest
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from src.core.workflow import WorkflowError, normalize_steps, run_dag
+
+class TestWorkflowScheduler:
+    """Test cases for normalize_steps and run_dag."""
+
+    @pytest.fixture
+    def fan_out_steps(self):
+        """Two independent research steps feeding one content step."""
+        return normalize_steps([
+            {"id": "a", "agent": "ResearchAgent", "depends_on": []},
+            {"id": "b", "agent": "ResearchAgent", "depends_on": []},
+            {"id": "c", "agent": "ContentAgent", "depends_on": ["a", "b"]}
+        ])
+
+    def test_legacy_steps_run_in_sequence(self):
+        """Test that plans without depends_on keep their step order."""
+        steps = normalize_steps([
+            {"agent": "ResearchAgent"},
+            {"agent": "ContentAgent"},
+            {"agent": "ContentAgent"}
+        ])
+
+        assert [s["id"] for s in steps] == ["ResearchAgent", "ContentAgent", "ContentAgent_2"]
+        assert steps[0]["depends_on"] == []
+        assert steps[1]["depends_on"] == ["ResearchAgent"]
+        assert steps[2]["depends_on"] == ["ContentAgent"]
+
+    def test_unknown_dependency_rejected(self):
+        """Test that a dependency on a missing step is rejected."""
+        with pytest.raises(WorkflowError):
+            normalize_steps([{"id": "a", "depends_on": ["missing"]}])
+
+    def test_cycle_rejected(self):
+        """Test that dependency cycles are rejected."""
+        with pytest.raises(WorkflowError):
+            normalize_steps([
+                {"id": "a", "depends_on": ["b"]},
+                {"id": "b", "depends_on": ["a"]}
+            ])
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_overlap(self, fan_out_steps):
+        """Test that ready steps run concurrently and outputs flow to dependents."""
+        seen_upstream = {}
+
+        async def execute(step, upstream):
+            seen_upstream[step["id"]] = sorted(upstream)
+            await asyncio.sleep(0.1)
+            return {"success": True, "output": step["id"]}
+
+        run = await run_dag(fan_out_steps, execute, max_concurrency=4)
+
+        assert seen_upstream == {"a": [], "b": [], "c": ["a", "b"]}
+        assert run["wall_seconds"] < 0.28
+        assert len(run["critical_path"]) == 2
+        assert run["critical_path"][-1] == "c"
+        assert run["timings"]["c"]["critical_path_seconds"] >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_of_one_is_serial(self, fan_out_steps):
+        """Test that max_concurrency=1 runs one step at a time."""
+        active = []
+        peak = []
+
+        async def execute(step, upstream):
+            active.append(step["id"])
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(step["id"])
+            return {"success": True, "output": step["id"]}
+
+        await run_dag(fan_out_steps, execute, max_concurrency=1)
+
+        assert max(peak) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_step_does_not_stop_dependents(self, fan_out_steps):
+        """Test that a raising step is recorded as failed and dependents still run."""
+
+        async def execute(step, upstream):
+            if step["id"] == "a":
+                raise RuntimeError("boom")
+            return {"success": True, "output": step["id"]}
+
+        run = await run_dag(fan_out_steps, execute)
+
+        assert run["results"]["a"]["success"] is False
+        assert "boom" in run["results"]["a"]["error"]
+        assert run["results"]["c"]["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_cancelling_run_cancels_steps_in_flight(self, fan_out_steps):
+        """Test that cancelling the workflow does not orphan running steps."""
+        cancelled = []
+
+        async def execute(step, upstream):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(step["id"])
+                raise
+
+        run = asyncio.ensure_future(run_dag(fan_out_steps, execute))
+        await asyncio.sleep(0.05)
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert cancelled
@@ -0,0 +1,51 @@
+"""
+Amount parsing throughput in cells/s: the previous regex + Decimal path versus the paise tokenizer.
+
+Cells mix lakh/crore and Western grouping, rupee prefixes, bracketed and
+minus negatives and fractions. "before" is the old extraction pattern with
+a Decimal per match; the tokenizer is src.amount_parser.parse_amounts,
+which returns exact integer paise.
+
+Usage:
+    python benchmarks/amount_parser.py [--cells 1000000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.amount_parser import parse_amounts
+
+SAMPLES = ['Rs. 12,34,567.89', '(1,00,000)', '-4,500.5', '98,76,54,321', '1,234,567.00', '750']
+LEGACY_PATTERN = r'(?:Rs|₹|INR|USD|EUR)?\s*[.,]?\s*(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cells", type=int, default=1_000_000, help="cells to parse per variant")
+    args = parser.parse_args()
+
+    cells = (SAMPLES * (args.cells // len(SAMPLES) + 1))[:args.cells]
+
+    start = time.perf_counter()
+    for cell in cells:
+        for match in re.findall(LEGACY_PATTERN, cell):
+            Decimal(match.replace(',', '').replace(' ', ''))
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for cell in cells:
+        parse_amounts(cell)
+    tokenizer_seconds = time.perf_counter() - start
+
+    print(f"{args.cells} cells")
+    print(f"regex + Decimal (before) {args.cells / legacy_seconds:12,.0f} cells/s")
+    print(f"paise tokenizer          {args.cells / tokenizer_seconds:12,.0f} cells/s "
+          f"({legacy_seconds / tokenizer_seconds:.2f}x)")
+
+if __name__ == "__main__":
+    main()
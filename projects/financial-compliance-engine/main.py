@@ -5,6 +5,7 @@ import json
 from src.indas_engine import IndASValidationEngine
 from src.sebi_engine import SEBIComplianceEngine
 from src.reporting import ExplainableComplianceReportGenerator
+from src.statement_context import StatementContext
 
 def main():
     parser = argparse.ArgumentParser(description="AI Financial Compliance Validation Engine")
@@ -37,13 +38,6 @@ def main():
         parser.print_help()
         return
 
-    print("Running IndAS Validation...")
-    indas_engine = IndASValidationEngine()
-    indas_findings = indas_engine.validate_statement(parsed_data)
-    print(f"IndAS Findings: {len(indas_findings)}")
-    
-    print("Running SEBI Validation...")
-    sebi_engine = SEBIComplianceEngine()
     # Mocking governance data for demo purposes if not present
     governance_data = parsed_data.get('governance_data', {
         'board_size': 10,
@@ -51,9 +45,22 @@ def main():
         'audit_committee_size': 4,
         'audit_committee_independent': 2
     })
-    sebi_findings = sebi_engine.validate_sebi_compliance(parsed_data, governance_data)
+    # Derived metrics (totals, ratios, board percentages) shared by both engines
+    context = StatementContext(parsed_data, governance_data)
+    
+    print("Running IndAS Validation...")
+    indas_engine = IndASValidationEngine()
+    indas_findings = indas_engine.validate_statement(parsed_data, context=context)
+    print(f"IndAS Findings: {len(indas_findings)}")
+    
+    print("Running SEBI Validation...")
+    sebi_engine = SEBIComplianceEngine()
+    sebi_findings = sebi_engine.validate_sebi_compliance(parsed_data, governance_data, context=context)
     print(f"SEBI Findings: {len(sebi_findings)}")
     
+    stats = context.get_stats()
+    print(f"Derived metrics: {stats['computed']} computed, {stats['reused']} reused")
+    
     all_findings = indas_findings + sebi_findings
     
     print("Generating Report...")
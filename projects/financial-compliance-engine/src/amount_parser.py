@@ -0,0 +1,72 @@
+import re
+from typing import List, Optional
+
+# One scan per cell: optional opening bracket or minus (but not the hyphen in
+# "2023-24"), optional rupee prefix, comma-grouped digits (1,00,000 and
+# 100,000 alike), optional fraction and closing bracket. Kept deliberately
+# simple so the regex engine can scan quickly; grouping style does not
+# change the value.
+AMOUNT_PATTERN = re.compile(r'(\(|(?<![\w.])[-−]|)(?:Rs\.? ?|₹ ?)?(\d+(?:,\d+)*)(?:\.(\d+))?(\)?)')
+
+# Scale headers only: "(Rs. in lakhs)", "₹ in Crores", "Amount in ₹ crore",
+# "(in INR million)". A bare "in crore" is narrative ("an increase in crore
+# terms") and must not rescale the amounts that follow it.
+UNIT_PATTERN = re.compile(
+    r'(?:(?:\brs\.?|\binr|\brupees|₹|\bamounts?)\s*in|\(\s*in)\s+'
+    r'(?:(?:rs\.?|₹|inr|rupees)\s*)?(lakh|lac|crore|cr|thousand|million|billion)s?\b',
+    re.IGNORECASE
+)
+
+UNIT_MULTIPLIERS = {
+    'thousand': 10**3,
+    'lakh': 10**5,
+    'lac': 10**5,
+    'million': 10**6,
+    'crore': 10**7,
+    'cr': 10**7,
+    'billion': 10**9,
+}
+
+def detect_unit_multiplier(text: str) -> Optional[int]:
+    """
+    Find a scale header such as "(Rs. in lakhs)" or "₹ in Crores".
+    Returns the rupee multiplier, or None when the text declares no unit.
+    """
+    if not text:
+        return None
+    match = UNIT_PATTERN.search(text)
+    if not match:
+        return None
+    return UNIT_MULTIPLIERS[match.group(1).lower()]
+
+def parse_amounts(text: str, multiplier: int = 1) -> List[int]:
+    """
+    Extract every amount in text as exact integer paise.
+    Handles lakh/crore and Western grouping, (bracketed) and minus negatives,
+    and scales by multiplier (e.g. 10**5 when the statement is in lakhs).
+    """
+    amounts = []
+    scale = multiplier * 100
+
+    # findall returns plain tuples, avoiding per-match group() calls
+    for sign, digits, frac, close_bracket in AMOUNT_PATTERN.findall(text):
+        if ',' in digits:
+            digits = digits.replace(',', '')
+
+        if frac:
+            denominator = 10 ** len(frac)
+            numerator = (int(digits) * denominator + int(frac)) * scale
+            paise = (2 * numerator + denominator) // (2 * denominator)  # round half up
+        else:
+            paise = int(digits) * scale
+
+        if (sign == '(' and close_bracket) or (sign and sign != '('):
+            paise = -paise
+        amounts.append(paise)
+
+    return amounts
+
+def parse_amount(text: str, multiplier: int = 1) -> Optional[int]:
+    """First amount in text as integer paise, or None"""
+    amounts = parse_amounts(text, multiplier)
+    return amounts[0] if amounts else None
@@ -3,6 +3,12 @@ import numpy as np
 from sklearn.ensemble import IsolationForest
 from typing import Dict, List, Tuple
 
+try:
+    from src.statement_context import StatementContext
+except ImportError:
+    # dashboard.py runs with src/ itself on the path
+    from statement_context import StatementContext
+
 class AnalyticsEngine:
     """
     Advanced analytics for financial performance, risk, and anomaly detection.
@@ -11,21 +17,18 @@ class AnalyticsEngine:
     def __init__(self):
         pass
     
-    def calculate_risk_indicators(self, financial_data: Dict) -> Dict:
+    def calculate_risk_indicators(self, financial_data: Dict,
+                                  context: StatementContext = None) -> Dict:
         """
         Calculate Altman Z-Score and Beneish M-Score.
+        Pass the StatementContext used by the rule engines to reuse its totals.
         """
-        # Extract values (Assume basic structure exists or defaults)
-        bs = financial_data.get('balance_sheet', {})
-        income = financial_data.get('income_statement', {})
-        
+        context = context or StatementContext(financial_data)
+
         # Helper to safely get value
         def get_val(section, key):
-            try:
-                # Assuming structure {section: {key: {'current': val}}}
-                return float(financial_data.get(section, {}).get(key, {}).get('current', 0))
-            except:
-                return 0.0
+            # Assuming structure {section: {key: {'current': val}}}
+            return float(context.line_item(section, key))
 
         # Simplified Mapping for Z-Score (Manufacturing)
         # Z = 1.2A + 1.4B + 3.3C + 0.6D + 1.0E
@@ -35,14 +38,14 @@ class AnalyticsEngine:
         # D = Market Value of Equity / Total Liabilities
         # E = Sales / Total Assets
         
-        total_assets = get_val('balance_sheet', 'Total Assets') or 1.0 # Avoid div/0
+        total_assets = float(context.total_assets) or 1.0 # Avoid div/0
         current_assets = get_val('balance_sheet', 'Current Assets')
         current_liabilities = get_val('balance_sheet', 'Current Liabilities')
         working_capital = current_assets - current_liabilities
         retained_earnings = get_val('balance_sheet', 'Retained Earnings')
         ebit = get_val('income_statement', 'EBIT') or get_val('income_statement', 'Profit') # Proxy
-        market_value_equity = get_val('balance_sheet', 'Total Equity') # Proxy using book value if market cap unavailable
-        total_liabilities = get_val('balance_sheet', 'Total Liabilities') or 1.0
+        market_value_equity = float(context.total_equity) # Proxy using book value if market cap unavailable
+        total_liabilities = float(context.total_liabilities) or 1.0
         sales = get_val('income_statement', 'Revenue')
         
         A = working_capital / total_assets
@@ -57,9 +60,9 @@ class AnalyticsEngine:
             'Altman_Z_Score': round(z_score, 2),
             'Z_Score_Zone': 'Safe' if z_score > 2.99 else 'Grey' if z_score > 1.81 else 'Distress',
             'Performance_Ratios': {
-                'ROE': round((get_val('income_statement', 'Profit') / (get_val('balance_sheet', 'Total Equity') or 1)), 2),
-                'Current_Ratio': round((current_assets / (current_liabilities or 1)), 2),
-                'Debt_to_Equity': round((total_liabilities / (market_value_equity or 1)), 2)
+                'ROE': round(context.return_on_equity, 2),
+                'Current_Ratio': round(context.current_ratio, 2),
+                'Debt_to_Equity': round(context.debt_to_equity, 2)
             }
         }
 
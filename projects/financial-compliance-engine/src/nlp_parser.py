@@ -1,4 +1,5 @@
 import re
+import time
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any
@@ -6,6 +7,9 @@ import spacy
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import pdfplumber
 from decimal import Decimal
+from src.statement_model import StatementModel, from_paise
+from src.amount_parser import parse_amounts, detect_unit_multiplier
+from src.page_classifier import PageClassifier, STATEMENT_PAGE_TYPES
 
 class FinancialNLPParser:
     """
@@ -35,6 +39,10 @@ class FinancialNLPParser:
             'account_types': ['Asset', 'Liability', 'Equity', 'Revenue', 'Expense', 'Income'],
             'debit_credit': r'(Debit|Credit|Dr\.|Cr\.)',
         }
+        
+        # Cheap page classification decides whether table extraction runs
+        self.page_classifier = PageClassifier()
+        self.parse_stats = {}
     
     def parse_financial_document(self, pdf_path: str) -> Dict:
         """
@@ -48,31 +56,48 @@ class FinancialNLPParser:
             'metadata': {}
         }
         
+        stats = {
+            'pages': 0,
+            'statement_pages': 0,
+            'narrative_pages': 0,
+            'table_extraction_seconds': 0.0
+        }
+        
         # Extract text and tables
         with pdfplumber.open(pdf_path) as pdf:
             for page_num, page in enumerate(pdf.pages):
                 # Extract text
                 text = page.extract_text()
                 if not text: continue
+                # Scale header ("Rs. in lakhs") applies to its own page only
+                multiplier = detect_unit_multiplier(text) or 1
+                stats['pages'] += 1
                 
-                # Extract tables
-                tables = page.extract_tables()
-                
-                # Identify statement type
+                # Identify statement type before the expensive table extraction
                 stmt_type = self._identify_statement_type(text)
                 
+                # Extract tables only on statement pages; narrative pages never use them
+                if stmt_type in STATEMENT_PAGE_TYPES:
+                    start = time.perf_counter()
+                    tables = page.extract_tables()
+                    stats['table_extraction_seconds'] += time.perf_counter() - start
+                    stats['statement_pages'] += 1
+                else:
+                    tables = []
+                    stats['narrative_pages'] += 1
+                
                 # Parse based on statement type
                 if 'Balance Sheet' in stmt_type:
                     extracted_data['balance_sheet'].update(
-                        self._parse_balance_sheet(tables, text)
+                        self._parse_balance_sheet(tables, text, multiplier)
                     )
                 elif 'Income' in stmt_type or 'P&L' in stmt_type:
                     extracted_data['income_statement'].update(
-                        self._parse_income_statement(tables, text)
+                        self._parse_income_statement(tables, text, multiplier)
                     )
                 elif 'Cash Flow' in stmt_type:
                     extracted_data['cash_flow'].update(
-                        self._parse_cash_flow(tables, text)
+                        self._parse_cash_flow(tables, text, multiplier)
                     )
                 else:
                     # Disclosure notes
@@ -80,29 +105,30 @@ class FinancialNLPParser:
                         self._parse_disclosures(text)
                     )
         
+        # Skipped extraction is estimated at the average cost of the pages that ran it
+        avg_seconds = stats['table_extraction_seconds'] / max(stats['statement_pages'], 1)
+        stats['estimated_seconds_saved'] = round(avg_seconds * stats['narrative_pages'], 3)
+        self.parse_stats = stats
+        
         # Extract metadata
         extracted_data['metadata'] = self._extract_metadata(pdf_path)
         
         return extracted_data
     
+    def parse_to_model(self, pdf_path: str) -> StatementModel:
+        """
+        Parse a PDF into the typed, array-backed statement model.
+        Use model.to_dict() to feed the rule engines.
+        """
+        return StatementModel.from_dict(self.parse_financial_document(pdf_path))
+    
     def _identify_statement_type(self, text: str) -> str:
         """
         Identify type of financial statement
         """
-        keywords = {
-            'Balance Sheet': ['Balance Sheet', 'Balance', 'Financial Position'],
-            'Income Statement': ['Income Statement', 'P&L', 'Profit and Loss', 'Statement of Profit or Loss'],
-            'Cash Flow': ['Cash Flow', 'Cash Flows from Operations'],
-            'Disclosure': ['Note', 'Schedule', 'Disclosure', 'Accounting Policy']
-        }
-        
-        for stmt_type, keywords_list in keywords.items():
-            if any(kw in text for kw in keywords_list):
-                return stmt_type
-        
-        return 'Unknown'
+        return self.page_classifier.classify(text)
     
-    def _parse_balance_sheet(self, tables: List, text: str) -> Dict:
+    def _parse_balance_sheet(self, tables: List, text: str, multiplier: int = 1) -> Dict:
         """
         Parse balance sheet data
         """
@@ -135,14 +161,14 @@ class FinancialNLPParser:
                 
                 # Extract account name and amount
                 account_name = row_text.split('\n')[0]
-                amounts = self._extract_amounts(row_text)
+                amounts = self._extract_amounts(row_text, multiplier)
                 
                 if amounts.get('current') is not None:
                      bs_data[section][account_name] = amounts
         
         return bs_data
     
-    def _parse_income_statement(self, tables: List, text: str) -> Dict:
+    def _parse_income_statement(self, tables: List, text: str, multiplier: int = 1) -> Dict:
         """
         Parse income statement
         """
@@ -170,14 +196,14 @@ class FinancialNLPParser:
                     section = 'revenue' # Default
                 
                 account_name = row_text.split('\n')[0]
-                amounts = self._extract_amounts(row_text)
+                amounts = self._extract_amounts(row_text, multiplier)
                 
                 if amounts.get('current') is not None:
                     is_data[section][account_name] = amounts
         
         return is_data
     
-    def _parse_cash_flow(self, tables: List, text: str) -> Dict:
+    def _parse_cash_flow(self, tables: List, text: str, multiplier: int = 1) -> Dict:
         """
         Parse cash flow statement
         """
@@ -204,27 +230,26 @@ class FinancialNLPParser:
                     section = 'operating' # Default
                 
                 account_name = row_text.split('\n')[0]
-                amounts = self._extract_amounts(row_text)
+                amounts = self._extract_amounts(row_text, multiplier)
                 
                 if amounts.get('current') is not None:
                     cf_data[section][account_name] = amounts
         
         return cf_data
     
-    def _extract_amounts(self, text: str) -> Dict:
+    def _extract_amounts(self, text: str, multiplier: int = 1) -> Dict:
         """
-        Extract numerical amounts from text
+        Extract numerical amounts from text, scaled to rupees by multiplier
         """
         amounts = {}
         
-        # Find all currency amounts
-        pattern = r'(?:Rs|₹|INR|USD|EUR)?\s*[.,]?\s*(\d+(?:[,\s]\d{3})*(?:\.\d{2})?)'
-        matches = re.findall(pattern, text)
+        # Single pass, exact integer paise
+        paise = parse_amounts(text, multiplier)
         
-        if matches:
+        if paise:
             # Typically: current period, prior period
-            amounts['current'] = self._clean_amount(matches[0]) if len(matches) > 0 else None
-            amounts['prior'] = self._clean_amount(matches[1]) if len(matches) > 1 else None
+            amounts['current'] = from_paise(paise[0])
+            amounts['prior'] = from_paise(paise[1]) if len(paise) > 1 else None
         
         return amounts
     
@@ -232,13 +257,8 @@ class FinancialNLPParser:
         """
         Clean and convert amount string to Decimal
         """
-        # Remove commas and spaces
-        cleaned = amount_str.replace(',', '').replace(' ', '')
-        
-        try:
-            return Decimal(cleaned)
-        except:
-            return Decimal('0')
+        paise = parse_amounts(amount_str)
+        return from_paise(paise[0]) if paise else Decimal('0')
     
     def _parse_disclosures(self, text: str) -> List[Dict]:
         """
@@ -284,14 +304,11 @@ class FinancialNLPParser:
         
         return entities
     
-    def _extract_numbers(self, text: str) -> List[float]:
+    def _extract_numbers(self, text: str) -> List[Decimal]:
         """
-        Extract all numerical values
+        Extract all numerical values (exact, to the paisa)
         """
-        pattern = r'-?\d+(?:[.,]\d{3})*(?:\.\d+)?'
-        numbers = re.findall(pattern, text)
-        
-        return [float(n.replace(',', '')) for n in numbers]
+        return [from_paise(p) for p in parse_amounts(text)]
     
     def _extract_metadata(self, pdf_path: str) -> Dict:
         """
@@ -0,0 +1,166 @@
+import re
+from typing import Dict, List, Tuple, Optional
+
+# Page types that carry statement tables; everything else is narrative
+STATEMENT_PAGE_TYPES = ('Balance Sheet', 'Income Statement', 'Cash Flow')
+
+# (keyword regex, weight) per page type. Titles weigh more than line items
+# so that a note mentioning "balance" is not taken for a balance sheet.
+PAGE_KEYWORDS = {
+    'Balance Sheet': [
+        (r'balance sheet', 3),
+        (r'statement of financial position', 3),
+        (r'equity and liabilities', 1),
+        (r'total assets', 1),
+        (r'non-current assets', 1),
+        (r'current liabilities', 1),
+    ],
+    'Income Statement': [
+        (r'statement of profit (?:and|or) loss', 3),
+        (r'profit (?:and|&) loss', 3),
+        (r'income statement', 3),
+        (r'p&l', 3),
+        (r'revenue from operations', 1),
+        (r'total expenses', 1),
+        (r'profit before tax', 1),
+        (r'earnings per (?:equity )?share', 1),
+    ],
+    'Cash Flow': [
+        (r'cash flow statement', 3),
+        (r'statement of cash flows?', 3),
+        (r'cash flows? from', 2),
+        (r'operating activities', 1),
+        (r'investing activities', 1),
+        (r'financing activities', 1),
+    ],
+    'Disclosure': [
+        (r'notes? to (?:the )?(?:standalone |consolidated )?financial statements', 3),
+        (r'significant accounting policies', 3),
+        # Only as a heading: statement rows cite notes too ("Trade receivables Note 6")
+        (r'^(?:note|schedule) \d{1,3}\b', 3),
+        (r'accounting polic(?:y|ies)', 1),
+        (r'disclosures?', 1),
+    ],
+}
+
+# Small hand-labelled sample used by evaluate() / python -m src.page_classifier
+SAMPLE_PAGES = [
+    ("Demo Corp Ltd\nStandalone Balance Sheet as at 31 March 2025\n(Rs. in lakhs)\nParticulars Note 2025 2024\nNon-current assets", 'Balance Sheet'),
+    ("Statement of Financial Position\nAs at 31.03.2025\nEquity and Liabilities\nTotal Assets 1,20,000", 'Balance Sheet'),
+    ("Statement of Profit and Loss for the year ended 31 March 2025\nRevenue from operations 54,321\nTotal expenses", 'Income Statement'),
+    ("Profit & Loss Account\nIncome\nSales 10,000\nProfit before tax 2,500", 'Income Statement'),
+    ("Cash Flow Statement for the year ended 31 March 2025\nA. Cash flows from operating activities", 'Cash Flow'),
+    ("Statement of Cash Flows\nNet cash used in investing activities (2,345)", 'Cash Flow'),
+    ("Note 5: Cash and cash equivalents\nBalance with banks in current accounts 1,234\nCash on hand 56", 'Disclosure'),
+    ("Notes to the Financial Statements\n1. Corporate information\nThe Company is a public limited company", 'Disclosure'),
+    ("Note 2: Significant accounting policies\nRevenue is recognised when control transfers. Balance of deferred revenue", 'Disclosure'),
+    ("Schedule 3 Trade receivables\nBalance outstanding for more than six months", 'Disclosure'),
+    ("Directors' Report\nYour Directors present the annual report. Disclosure under Section 134", 'Disclosure'),
+    ("Balance Sheet as at 31 March 2025\nNon-current assets\nProperty, plant and equipment Note 3 12,345\nInvestments Note 5 2,000\nTrade receivables Note 6 4,321", 'Balance Sheet'),
+    ("Statement of Profit and Loss\nRevenue from operations Note 22 54,321\nOther income Note 23 1,234\nFinance costs Note 26 987", 'Income Statement'),
+    ("Independent Auditor's Report\nOpinion\nWe have audited the accompanying standalone financial statements", 'Unknown'),
+]
+
+class PageClassifier:
+    """
+    Classifies a PDF page as a statement or narrative page from its first lines.
+
+    All page types are scored in a single scan with one precompiled regex, so
+    the parser can decide whether to run table extraction before paying for it.
+    An optional TF-IDF model (see fit) settles pages the keywords cannot.
+    """
+
+    def __init__(self, head_lines: int = 15):
+        self.head_lines = head_lines
+        self._group_map = {}
+        alternatives = []
+
+        for type_index, (page_type, keywords) in enumerate(PAGE_KEYWORDS.items()):
+            for keyword_index, (pattern, weight) in enumerate(keywords):
+                group = f"g{type_index}_{keyword_index}"
+                self._group_map[group] = (page_type, weight)
+                alternatives.append(f"(?P<{group}>{pattern})")
+
+        self._matcher = re.compile(r'\b(?:' + '|'.join(alternatives) + r')', re.IGNORECASE | re.MULTILINE)
+        self._vectorizer = None
+        self._model = None
+
+    def score(self, text: str) -> Dict[str, int]:
+        """Keyword score per page type over the first head_lines lines"""
+        return self._scan(text)[0]
+
+    def _scan(self, text: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Scores plus the offset of each type's first keyword, used to break ties"""
+        head = '\n'.join(text.split('\n', self.head_lines)[:self.head_lines])
+        scores = {page_type: 0 for page_type in PAGE_KEYWORDS}
+        first_seen = {}
+
+        for match in self._matcher.finditer(head):
+            page_type, weight = self._group_map[match.lastgroup]
+            scores[page_type] += weight
+            first_seen.setdefault(page_type, match.start())
+
+        return scores, first_seen
+
+    def classify(self, text: str) -> str:
+        """Best-scoring page type, falling back to the TF-IDF model (if fitted) or 'Unknown'"""
+        if not text:
+            return 'Unknown'
+
+        scores, first_seen = self._scan(text)
+        best_score = max(scores.values())
+        leaders = [page_type for page_type, s in scores.items() if s == best_score]
+
+        if best_score > 0 and len(leaders) == 1:
+            return leaders[0]
+
+        if self._model is not None:
+            return self._model.predict(self._vectorizer.transform([text]))[0]
+
+        # Ties go to the type named first on the page, i.e. the heading
+        return min(leaders, key=first_seen.get) if best_score > 0 else 'Unknown'
+
+    def fit(self, texts: List[str], labels: List[str]) -> 'PageClassifier':
+        """Train the optional TF-IDF fallback on labelled pages (requires scikit-learn)"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        self._vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)
+        self._model = LogisticRegression(max_iter=1000)
+        self._model.fit(self._vectorizer.fit_transform(texts), labels)
+        return self
+
+    def evaluate(self, samples: List[Tuple[str, str]] = None, classify=None) -> Dict:
+        """Accuracy and misclassified pages on a labelled sample"""
+        samples = samples or SAMPLE_PAGES
+        classify = classify or self.classify
+        errors = []
+
+        for text, label in samples:
+            predicted = classify(text)
+            if predicted != label:
+                errors.append({'page': text.split('\n')[0], 'expected': label, 'predicted': predicted})
+
+        return {
+            'pages': len(samples),
+            'accuracy': round((len(samples) - len(errors)) / max(len(samples), 1), 3),
+            'errors': errors
+        }
+
+def legacy_classify(text: str) -> str:
+    """Previous first-match keyword lookup, kept for comparison in evaluate()"""
+    keywords = {
+        'Balance Sheet': ['Balance Sheet', 'Balance', 'Financial Position'],
+        'Income Statement': ['Income Statement', 'P&L', 'Profit and Loss', 'Statement of Profit or Loss'],
+        'Cash Flow': ['Cash Flow', 'Cash Flows from Operations'],
+        'Disclosure': ['Note', 'Schedule', 'Disclosure', 'Accounting Policy']
+    }
+    for stmt_type, keywords_list in keywords.items():
+        if any(kw in text for kw in keywords_list):
+            return stmt_type
+    return 'Unknown'
+
+if __name__ == "__main__":
+    classifier = PageClassifier()
+    print("Legacy:    ", classifier.evaluate(classify=legacy_classify))
+    print("Classifier:", classifier.evaluate())
@@ -8,23 +8,27 @@ except ImportError:
     print("ReportLab not found, PDF generation disabled")
 
 from src.indas_engine import ComplianceFinding, FindingType
+from src.explanation_service import ExplanationService, IMPACTS
 
 class ExplainableComplianceReportGenerator:
     """
     Generate compliance reports with explainable AI
     """
     
-    def __init__(self, model=None):
+    def __init__(self, model=None, explanation_service: ExplanationService = None):
         self.model = model
         self.explainer_lime = None
         self.explainer_shap = None
+        self.explanations = explanation_service or ExplanationService()
     
     def generate_comprehensive_report(self, findings: List[ComplianceFinding],
                                      financial_data: Dict,
                                      company_name: str,
-                                     report_period: str) -> Dict:
+                                     report_period: str,
+                                     lazy_explanations: bool = False) -> Dict:
         """
-        Generate comprehensive compliance report with XAI
+        Generate comprehensive compliance report with XAI.
+        With lazy_explanations=True, xai_explanations renders each entry only when it is opened.
         """
         report = {
             'metadata': {
@@ -37,7 +41,7 @@ class ExplainableComplianceReportGenerator:
             'compliance_scorecard': self._generate_scorecard(findings),
             'framework_analysis': self._analyze_frameworks(findings),
             'detailed_findings': self._generate_detailed_findings(findings),
-            'xai_explanations': self._generate_xai_explanations(findings),
+            'xai_explanations': self._generate_xai_explanations(findings, lazy=lazy_explanations),
             'recommendations': self._generate_recommendations(findings),
             'audit_trail': self._generate_audit_trail(findings)
         }
@@ -150,54 +154,31 @@ class ExplainableComplianceReportGenerator:
         
         return detailed
     
-    def _generate_xai_explanations(self, findings: List[ComplianceFinding]) -> Dict:
+    def _generate_xai_explanations(self, findings: List[ComplianceFinding], lazy: bool = False) -> Dict:
         """
-        Generate explainable AI explanations for findings
+        Generate explainable AI explanations for all findings
         """
-        xai_explanations = {}
-        
-        for finding in findings[:10]:  # Top 10 findings
-            # Generate natural language explanation
-            explanation = self._generate_natural_language_explanation(finding)
-            
-            xai_explanations[finding.finding_id] = {
-                'finding': finding.description,
-                'explanation': explanation,
-                'confidence': 0.92,
-                'xai_method': 'LIME + SHAP ensemble'
-            }
-        
-        return xai_explanations
+        if lazy:
+            return self.explanations.lazy(findings)
+        return self.explanations.explain_all(findings)
+    
+    def explain_finding(self, finding: ComplianceFinding) -> Dict:
+        """
+        Explanation for a single finding, rendered on demand and cached
+        """
+        return self.explanations.explain(finding)
     
     def _generate_natural_language_explanation(self, finding: ComplianceFinding) -> str:
         """
         Generate plain English explanation of finding
         """
-        template = f"""
-        This finding relates to {finding.rule_id}. 
-        The system detected that {finding.description}.
-        
-        Evidence: {finding.evidence}
-        
-        Impact: This may result in {self._impact_assessment(finding.severity)}.
-        
-        Action: {finding.recommendation}
-        """
-        
-        return template.strip()
+        return self.explanations.explain(finding)['explanation']
     
     def _impact_assessment(self, severity: str) -> str:
         """
         Assess impact of finding
         """
-        impacts = {
-            'Critical': 'regulatory penalties, audit qualifications, and investor concerns',
-            'High': 'regulatory scrutiny and potential compliance issues',
-            'Medium': 'minor compliance gaps requiring correction',
-            'Low': 'administrative items for documentation'
-        }
-        
-        return impacts.get(severity, 'unknown impact')
+        return IMPACTS.get(severity, 'unknown impact')
     
     def _generate_recommendations(self, findings: List[ComplianceFinding]) -> List[Dict]:
         """
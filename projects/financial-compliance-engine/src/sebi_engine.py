@@ -1,6 +1,7 @@
 from typing import List, Dict, Tuple
 from decimal import Decimal
 from src.indas_engine import ComplianceFinding, FindingType
+from src.statement_context import StatementContext
 
 class SEBIComplianceEngine:
     """
@@ -75,22 +76,27 @@ class SEBIComplianceEngine:
         }
     
     def validate_sebi_compliance(self, financial_data: Dict,
-                                governance_data: Dict = None) -> List[ComplianceFinding]:
+                                governance_data: Dict = None,
+                                context: StatementContext = None) -> List[ComplianceFinding]:
         """
-        Run SEBI compliance validation
+        Run SEBI compliance validation.
+        Pass a shared StatementContext to reuse derived metrics across engines.
+        Each rule receives the context as an argument.
         """
         findings = []
-        combined_data = {**financial_data, **(governance_data or {})}
+        context = context or StatementContext(financial_data, governance_data)
+        combined_data = context.combined_data
+        statement_id = context.company_name
         
         for rule_id, rule_config in self.rules_db.items():
             try:
-                result = rule_config['test'](combined_data)
+                result = rule_config['test'](combined_data, context)
                 
                 if not result['is_compliant']:
                     finding = ComplianceFinding(
                         finding_id=f"{rule_id}_001",
                         rule_id=rule_id,
-                        statement_id=combined_data.get('metadata', {}).get('company_name', 'Unknown'),
+                        statement_id=statement_id,
                         finding_type=FindingType.EXCEPTION if result.get('exception') else FindingType.WARNING,
                         description=f"{rule_config['name']}: {result.get('message', '')}",
                         affected_accounts=result.get('affected_items', []),
@@ -104,7 +110,7 @@ class SEBIComplianceEngine:
                     finding = ComplianceFinding(
                         finding_id=f"{rule_id}_001",
                         rule_id=rule_id,
-                        statement_id=combined_data.get('metadata', {}).get('company_name', 'Unknown'),
+                        statement_id=statement_id,
                         finding_type=FindingType.PASS,
                         description=f"{rule_config['name']}: Passed",
                         affected_accounts=[],
@@ -120,13 +126,14 @@ class SEBIComplianceEngine:
         
         return findings
     
-    def _test_independent_directors(self, data: Dict) -> Dict:
+    def _test_independent_directors(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Minimum 33% independent directors"""
         # Defaulting to compliant if data missing for prototype
-        total_board_size = data.get('board_size', 10) 
-        independent_count = data.get('independent_directors', 5)
+        total_board_size = context.governance_value('board_size', 10)
+        independent_count = context.governance_value('independent_directors', 5)
+        independent_percent = context.independent_director_percent
         
-        if total_board_size == 0:
+        if independent_percent is None:
             return {
                 'is_compliant': False,
                 'message': "Board size information not provided",
@@ -134,7 +141,6 @@ class SEBIComplianceEngine:
                 'exception': True
             }
         
-        independent_percent = (independent_count / total_board_size) * 100
         required_percent = 33 if total_board_size < 8 else 25
         
         is_compliant = independent_percent >= required_percent
@@ -148,20 +154,19 @@ class SEBIComplianceEngine:
             'xai_explanation': f"SEBI LODR requires minimum {required_percent}% independent directors. Current: {independent_percent:.1f}%"
         }
     
-    def _test_audit_committee(self, data: Dict) -> Dict:
+    def _test_audit_committee(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Audit committee requirements"""
-        audit_committee_size = data.get('audit_committee_size', 3)
-        audit_committee_independent = data.get('audit_committee_independent', 2)
+        audit_committee_size = context.governance_value('audit_committee_size', 3)
+        audit_committee_independent = context.governance_value('audit_committee_independent', 2)
+        independent_percent = context.audit_committee_independent_percent
         
         issues = []
         
         if audit_committee_size < 3:
             issues.append(f"Committee size: {audit_committee_size} (min 3 required)")
         
-        if audit_committee_size > 0:
-            independent_percent = (audit_committee_independent / audit_committee_size) * 100
-            if independent_percent < 50:
-                issues.append(f"Independent members: {independent_percent:.0f}% (min 50% required)")
+        if independent_percent is not None and independent_percent < 50:
+            issues.append(f"Independent members: {independent_percent:.0f}% (min 50% required)")
         
         return {
             'is_compliant': len(issues) == 0,
@@ -172,7 +177,7 @@ class SEBIComplianceEngine:
             'xai_explanation': "SEBI requires audit committee with 3+ members, 50%+ independent"
         }
     
-    def _test_rpt_compliance(self, data: Dict) -> Dict:
+    def _test_rpt_compliance(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Related party transaction disclosure"""
         # Placeholder
         return {
@@ -181,7 +186,7 @@ class SEBIComplianceEngine:
             'affected_items': []
         }
     
-    def _test_dividend_policy(self, data: Dict) -> Dict:
+    def _test_dividend_policy(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Dividend distribution policy"""
         # Placeholder
         return {
@@ -190,7 +195,7 @@ class SEBIComplianceEngine:
              'affected_items': []
         }
     
-    def _test_risk_committee(self, data: Dict) -> Dict:
+    def _test_risk_committee(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Risk management committee"""
          # Placeholder
         return {
@@ -199,7 +204,7 @@ class SEBIComplianceEngine:
             'affected_items': []
         }
     
-    def _test_rights_issue(self, data: Dict) -> Dict:
+    def _test_rights_issue(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Rights issue offer price"""
         # Simplified test for rights issue compliance
         return {
@@ -208,7 +213,7 @@ class SEBIComplianceEngine:
             'affected_items': []
         }
     
-    def _test_open_offer_requirement(self, data: Dict) -> Dict:
+    def _test_open_offer_requirement(self, data: Dict, context: StatementContext) -> Dict:
         """Test: Open offer requirement"""
         # Placeholder
         return {
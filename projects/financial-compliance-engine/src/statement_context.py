@@ -0,0 +1,150 @@
+from typing import Any, Callable, Dict, Optional
+from decimal import Decimal, InvalidOperation
+
+class StatementContext:
+    """
+    Per-statement cache of derived metrics shared by the rule engines and analytics.
+
+    Totals, ratios and board percentages are computed on first access and reused
+    by every rule that needs them afterwards.
+    """
+
+    def __init__(self, financial_data: Dict, governance_data: Dict = None):
+        self.financial_data = financial_data
+        self.governance_data = governance_data or {}
+        self._cache = {}
+        self.stats = {'computed': 0, 'reused': 0}
+
+    def _memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it on first use"""
+        if key in self._cache:
+            self.stats['reused'] += 1
+            return self._cache[key]
+
+        value = compute()
+        self._cache[key] = value
+        self.stats['computed'] += 1
+        return value
+
+    @staticmethod
+    def _to_decimal(value: Any) -> Decimal:
+        """Convert a line item ({'current': v} or a bare value) to Decimal"""
+        if isinstance(value, dict):
+            value = value.get('current', 0)
+        try:
+            return Decimal(str(value))
+        except (InvalidOperation, TypeError, ValueError):
+            return Decimal('0')
+
+    # --- Merged views -------------------------------------------------------
+
+    @property
+    def combined_data(self) -> Dict:
+        """Financial data merged with governance data (governance wins on conflicts)"""
+        return self._memoize('combined_data', lambda: {**self.financial_data, **self.governance_data})
+
+    @property
+    def company_name(self) -> str:
+        return self.combined_data.get('metadata', {}).get('company_name', 'Unknown')
+
+    # --- Line items and totals ----------------------------------------------
+
+    def line_item(self, statement: str, name: str) -> Decimal:
+        """Current-period amount of a top-level line item, e.g. ('balance_sheet', 'Total Assets')"""
+        def compute():
+            item = self.financial_data.get(statement, {}).get(name)
+            return self._to_decimal(item) if item is not None else Decimal('0')
+        return self._memoize(('line_item', statement, name), compute)
+
+    def section_total(self, statement: str, section: str) -> Decimal:
+        """Sum of current-period amounts in a nested section, e.g. ('balance_sheet', 'assets')"""
+        def compute():
+            items = self.financial_data.get(statement, {}).get(section, {})
+            if not isinstance(items, dict):
+                return Decimal('0')
+            return sum((self._to_decimal(v) for v in items.values()), Decimal('0'))
+        return self._memoize(('section_total', statement, section), compute)
+
+    def _reported_or_summed(self, line_name: str, section: str) -> Decimal:
+        # Prefer an explicitly reported total, fall back to summing the section
+        if line_name in self.financial_data.get('balance_sheet', {}):
+            return self.line_item('balance_sheet', line_name)
+        return self.section_total('balance_sheet', section)
+
+    @property
+    def total_assets(self) -> Decimal:
+        return self._memoize('total_assets', lambda: self._reported_or_summed('Total Assets', 'assets'))
+
+    @property
+    def total_liabilities(self) -> Decimal:
+        return self._memoize('total_liabilities', lambda: self._reported_or_summed('Total Liabilities', 'liabilities'))
+
+    @property
+    def total_equity(self) -> Decimal:
+        return self._memoize('total_equity', lambda: self._reported_or_summed('Total Equity', 'equity'))
+
+    @property
+    def balance_difference(self) -> Decimal:
+        """|Assets - (Liabilities + Equity)| using the summed balance sheet sections"""
+        def compute():
+            assets = self.section_total('balance_sheet', 'assets')
+            liabilities = self.section_total('balance_sheet', 'liabilities')
+            equity = self.section_total('balance_sheet', 'equity')
+            return abs(assets - (liabilities + equity))
+        return self._memoize('balance_difference', compute)
+
+    # --- Ratios -------------------------------------------------------------
+
+    @property
+    def current_ratio(self) -> float:
+        def compute():
+            current_assets = float(self.line_item('balance_sheet', 'Current Assets'))
+            current_liabilities = float(self.line_item('balance_sheet', 'Current Liabilities'))
+            return current_assets / (current_liabilities or 1)
+        return self._memoize('current_ratio', compute)
+
+    @property
+    def debt_to_equity(self) -> float:
+        def compute():
+            return (float(self.total_liabilities) or 1.0) / (float(self.total_equity) or 1)
+        return self._memoize('debt_to_equity', compute)
+
+    @property
+    def return_on_equity(self) -> float:
+        def compute():
+            profit = float(self.line_item('income_statement', 'Profit'))
+            return profit / (float(self.total_equity) or 1)
+        return self._memoize('return_on_equity', compute)
+
+    # --- Governance ---------------------------------------------------------
+
+    def governance_value(self, key: str, default: Any = None) -> Any:
+        return self.combined_data.get(key, default)
+
+    @property
+    def independent_director_percent(self) -> Optional[float]:
+        """Independent directors as % of board, None when board size is zero"""
+        def compute():
+            board_size = self.governance_value('board_size', 10)
+            if board_size == 0:
+                return None
+            return (self.governance_value('independent_directors', 5) / board_size) * 100
+        return self._memoize('independent_director_percent', compute)
+
+    @property
+    def audit_committee_independent_percent(self) -> Optional[float]:
+        """Independent members as % of audit committee, None when committee is empty"""
+        def compute():
+            committee_size = self.governance_value('audit_committee_size', 3)
+            if committee_size <= 0:
+                return None
+            return (self.governance_value('audit_committee_independent', 2) / committee_size) * 100
+        return self._memoize('audit_committee_independent_percent', compute)
+
+    def get_stats(self) -> Dict:
+        """Report how much derived-metric work was shared across rules"""
+        return {
+            'metrics_cached': len(self._cache),
+            'computed': self.stats['computed'],
+            'reused': self.stats['reused']
+        }
@@ -0,0 +1,228 @@
+import re
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+STATEMENT_KEYS = ('balance_sheet', 'income_statement', 'cash_flow')
+
+# Known (statement, section) pairs get stable codes. '' is the section for
+# line items stored directly under a statement, e.g. {'Total Assets': {...}}.
+DEFAULT_SECTIONS = [
+    ('balance_sheet', 'assets'),
+    ('balance_sheet', 'liabilities'),
+    ('balance_sheet', 'equity'),
+    ('balance_sheet', ''),
+    ('income_statement', 'revenue'),
+    ('income_statement', 'expenses'),
+    ('income_statement', 'profitability'),
+    ('income_statement', ''),
+    ('cash_flow', 'operating'),
+    ('cash_flow', 'investing'),
+    ('cash_flow', 'financing'),
+    ('cash_flow', ''),
+]
+
+PAISE = Decimal('100')
+
+def normalize_account_name(name: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace: 'Trade  Receivables:' -> 'trade receivables'"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', str(name).lower()).split())
+
+def to_paise(value: Any) -> int:
+    """Convert a rupee amount (Decimal, int, float or str) to integer paise"""
+    try:
+        return int((Decimal(str(value)) * PAISE).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError, ValueError):
+        return 0
+
+def from_paise(paise: int) -> Decimal:
+    return Decimal(int(paise)) / PAISE
+
+class StatementModel:
+    """
+    Typed, array-backed financial statement.
+
+    Line items live in parallel arrays (name, section code, current and prior
+    amounts as int64 paise) instead of nested dicts. Lookups by normalized
+    account name are O(1) and the numeric columns can be viewed as NumPy
+    arrays without copying.
+    """
+
+    def __init__(self):
+        self.sections: List[Tuple[str, str]] = list(DEFAULT_SECTIONS)
+        self._section_codes = {pair: code for code, pair in enumerate(self.sections)}
+
+        self.names: List[str] = []
+        self.section_codes = array('h')
+        self.current = array('q')
+        self.prior = array('q')
+        self.has_prior = array('b')
+
+        self._index: Dict[Tuple[int, str], int] = {}
+        self._name_index: Dict[str, int] = {}
+
+        # Non-statement keys (metadata, disclosures, governance_data, ...)
+        # and the key order of the dict the model was built from
+        self.extras: Dict = {}
+        self._key_order: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def section_code(self, statement: str, section: str = '') -> int:
+        """Code for a (statement, section) pair, registering new sections on first use"""
+        pair = (statement, section)
+        code = self._section_codes.get(pair)
+        if code is None:
+            code = len(self.sections)
+            self.sections.append(pair)
+            self._section_codes[pair] = code
+        return code
+
+    def add_line_item(self, statement: str, section: str, name: str,
+                      current: Any, prior: Any = None) -> int:
+        """
+        Append a line item and return its row number.
+
+        Raises BufferError, leaving the model unchanged, while array views
+        from as_arrays() or to_dataframe() are still alive.
+        """
+        row = len(self.names)
+        code = self.section_code(statement, section)
+        key = normalize_account_name(name)
+        values = (
+            (self.section_codes, code),
+            (self.current, to_paise(current if current is not None else 0)),
+            (self.prior, to_paise(prior) if prior is not None else 0),
+            (self.has_prior, prior is not None)
+        )
+
+        # The columns must stay the same length: undo a partial append
+        extended = []
+        try:
+            for column, value in values:
+                column.append(value)
+                extended.append(column)
+        except BufferError:
+            for column in extended:
+                column.pop()
+            raise
+        self.names.append(name)
+
+        self._index.setdefault((code, key), row)
+        self._name_index.setdefault(key, row)
+        return row
+
+    def find(self, name: str, statement: str = None, section: str = None) -> Optional[int]:
+        """Row number for an account name, optionally restricted to one section"""
+        key = normalize_account_name(name)
+        if statement is None:
+            return self._name_index.get(key)
+        code = self._section_codes.get((statement, section or ''))
+        if code is None:
+            return None
+        return self._index.get((code, key))
+
+    def get(self, name: str, statement: str = None, section: str = None) -> Optional[Dict]:
+        """Line item in the legacy {'current': Decimal, 'prior': Decimal} shape"""
+        row = self.find(name, statement, section)
+        if row is None:
+            return None
+        return self._row_amounts(row)
+
+    def _row_amounts(self, row: int) -> Dict:
+        return {
+            'current': from_paise(self.current[row]),
+            'prior': from_paise(self.prior[row]) if self.has_prior[row] else None
+        }
+
+    def section_total(self, statement: str, section: str = '', period: str = 'current') -> Decimal:
+        """Exact sum of a section in rupees"""
+        code = self._section_codes.get((statement, section))
+        if code is None or not self.names:
+            return Decimal('0')
+        arrays = self.as_arrays()
+        mask = arrays['section_code'] == code
+        return from_paise(int(arrays[period][mask].sum()))
+
+    # --- Array views --------------------------------------------------------
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy NumPy views over the numeric columns.
+        The views share memory with the model, so the model cannot grow while they are alive.
+        """
+        return {
+            'section_code': np.frombuffer(self.section_codes, dtype=np.int16),
+            'current': np.frombuffer(self.current, dtype=np.int64),
+            'prior': np.frombuffer(self.prior, dtype=np.int64),
+            'has_prior': np.frombuffer(self.has_prior, dtype=np.int8).view(np.bool_)
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame with one row per line item; numeric columns wrap the model arrays"""
+        arrays = self.as_arrays()
+        statements = [self.sections[code][0] for code in arrays['section_code']]
+        sections = [self.sections[code][1] for code in arrays['section_code']]
+        return pd.DataFrame({
+            'name': self.names,
+            'statement': statements,
+            'section': sections,
+            'current_paise': arrays['current'],
+            'prior_paise': arrays['prior'],
+            'has_prior': arrays['has_prior']
+        }, copy=False)
+
+    # --- Legacy dict format -------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, financial_data: Dict) -> 'StatementModel':
+        """Build a model from the parser's nested-dict output"""
+        model = cls()
+        model._key_order = list(financial_data.keys())
+
+        for key, value in financial_data.items():
+            if key not in STATEMENT_KEYS:
+                model.extras[key] = value
+                continue
+
+            for section_or_item, content in (value or {}).items():
+                if isinstance(content, dict) and ('current' in content or 'prior' in content):
+                    # Line item stored directly under the statement
+                    model.add_line_item(key, '', section_or_item, content.get('current'), content.get('prior'))
+                elif isinstance(content, dict):
+                    for name, amounts in content.items():
+                        if isinstance(amounts, dict):
+                            model.add_line_item(key, section_or_item, name, amounts.get('current'), amounts.get('prior'))
+                        else:
+                            model.add_line_item(key, section_or_item, name, amounts)
+                else:
+                    model.add_line_item(key, '', section_or_item, content)
+
+        return model
+
+    def to_dict(self) -> Dict:
+        """Rebuild the nested-dict format consumed by the rule engines"""
+        statements = {key: {} for key in STATEMENT_KEYS}
+
+        for row, name in enumerate(self.names):
+            statement, section = self.sections[self.section_codes[row]]
+            amounts = self._row_amounts(row)
+            if amounts['prior'] is None:
+                del amounts['prior']
+            if section:
+                statements[statement].setdefault(section, {})[name] = amounts
+            else:
+                statements[statement][name] = amounts
+
+        # Keep the original key order; statements that were never present stay absent
+        data = {}
+        for key in self._key_order or STATEMENT_KEYS:
+            if key in statements:
+                data[key] = statements[key]
+            elif key in self.extras:
+                data[key] = self.extras[key]
+        return data
@@ -0,0 +1,81 @@
+"""
+Unit tests for amount parsing and scale headers.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.amount_parser import parse_amounts, parse_amount, detect_unit_multiplier
+
+class TestParseAmounts:
+    """Test cases for parse_amounts and parse_amount."""
+
+    def test_lakh_crore_and_western_grouping(self):
+        """Test that grouping style does not change the value."""
+        assert parse_amount("1,00,000") == 100000 * 100
+        assert parse_amount("98,76,54,321") == 987654321 * 100
+        assert parse_amount("100,000") == 100000 * 100
+        assert parse_amount("1,234,567.00") == 123456700
+
+    def test_negatives(self):
+        """Test bracketed and minus negatives, and that a year range stays positive."""
+        assert parse_amount("(1,00,000)") == -10000000
+        assert parse_amount("-4,500.5") == -450050
+        assert parse_amount("−250") == -25000
+        assert parse_amounts("FY 2023-24") == [202300, 2400]
+
+    def test_rupee_prefixes(self):
+        """Test that Rs., Rs and ₹ prefixes are skipped."""
+        assert parse_amount("Rs. 12,34,567.89") == 123456789
+        assert parse_amount("Rs 500") == 50000
+        assert parse_amount("₹1,00,000") == 10000000
+        assert parse_amount("(₹ 75.25)") == -7525
+
+    def test_paise_round_half_up(self):
+        """Test that sub-paise fractions round half up, away from zero for negatives."""
+        assert parse_amount("0.125") == 13
+        assert parse_amount("0.124") == 12
+        assert parse_amount("0.135") == 14
+        assert parse_amount("(0.125)") == -13
+
+    def test_multiplier_scales_exactly(self):
+        """Test that amounts in lakhs and crores become exact rupee paise."""
+        assert parse_amount("1.5", 10**5) == 150000 * 100
+        assert parse_amount("(2.25)", 10**7) == -22500000 * 100
+        assert parse_amount("0.123456", 10**5) == 1234560
+
+    def test_row_with_two_periods(self):
+        """Test that a line item row yields the current and prior amounts in order."""
+        assert parse_amounts("Trade Receivables 12,345.67 (1,000)") == [1234567, -100000]
+        assert parse_amount("no figures here") is None
+
+class TestUnitHeaders:
+    """Test cases for detect_unit_multiplier."""
+
+    @pytest.mark.parametrize("header, multiplier", [
+        ("(Rs. in lakhs)", 10**5),
+        ("(Rs in Lacs)", 10**5),
+        ("₹ in Crores", 10**7),
+        ("(₹ in crore)", 10**7),
+        ("Amount in ₹ lakhs", 10**5),
+        ("All amounts in Rs. crore unless otherwise stated", 10**7),
+        ("(in INR million)", 10**6),
+        ("(Rupees in thousands)", 10**3),
+    ])
+    def test_header_forms(self, header, multiplier):
+        """Test the scale headers statements put above their tables."""
+        assert detect_unit_multiplier(f"Balance Sheet as at 31 March 2024\n{header}\nAssets") == multiplier
+
+    @pytest.mark.parametrize("text", [
+        "Revenue saw an increase in crore terms over the prior year",
+        "Investments in million-dollar funds were made",
+        "The company is in lakh-plus customer homes",
+        "",
+    ])
+    def test_narrative_is_not_a_header(self, text):
+        """Test that unit words in running text leave the scale alone."""
+        assert detect_unit_multiplier(text) is None
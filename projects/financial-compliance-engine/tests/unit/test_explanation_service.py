@@ -0,0 +1,48 @@
+"""
+Unit tests for cached, lazily rendered finding explanations.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.explanation_service import ExplanationService
+from src.indas_engine import ComplianceFinding, FindingType
+
+def make_finding(i: int) -> ComplianceFinding:
+    return ComplianceFinding(
+        finding_id=f"INDAS_1_001_{i:03d}", rule_id='INDAS_1_001', statement_id='TEST',
+        finding_type=FindingType.EXCEPTION, description=f"Balance sheet difference {i}",
+        affected_accounts=['Total Assets'], severity='Critical',
+        evidence=f"Assets exceed liabilities and equity by {i * 100}",
+        recommendation='Reconcile the balance sheet', xai_explanation=''
+    )
+
+class TestExplanationService:
+    """Test cases for ExplanationService."""
+
+    def test_explanation_rendered_once(self):
+        """Test that reopening a finding is served from the cache."""
+        service = ExplanationService()
+        first = service.explain(make_finding(1))
+
+        assert service.explain(make_finding(1)) is first
+        assert 'INDAS_1_001 under Indian Accounting Standards' in first['explanation']
+        assert service.get_stats()['cache_hits'] == 1
+
+    def test_cache_keeps_most_recently_used(self):
+        """Test that the cache is bounded and evicts the least recently used explanation."""
+        service = ExplanationService(max_entries=2)
+        service.explain(make_finding(1))
+        service.explain(make_finding(2))
+        service.explain(make_finding(1))
+        service.explain(make_finding(3))
+
+        stats = service.get_stats()
+        assert stats['cached_entries'] == 2
+        assert stats['evictions'] == 1
+
+        service.explain(make_finding(1))
+        assert service.get_stats()['rendered'] == 3  # 1 was kept, 2 was evicted
@@ -0,0 +1,102 @@
+"""
+Unit tests for page classification on statement and note pages.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.page_classifier import PageClassifier
+
+BALANCE_SHEET = """Demo Corp Limited
+Standalone Balance Sheet as at 31 March 2025
+(Rs. in lakhs)
+Particulars Note As at 31 March 2025 As at 31 March 2024
+ASSETS
+Non-current assets
+Property, plant and equipment Note 3 12,345 11,210
+Financial assets - Investments Note 5 2,000 1,800
+Current assets
+Trade receivables Note 6 4,321 3,987
+Cash and cash equivalents Note 7 1,050 940
+Total Assets 19,716 17,937
+EQUITY AND LIABILITIES
+Equity share capital Note 12 5,000 5,000
+Current liabilities
+Trade payables Note 15 3,210 2,870
+See accompanying notes to the financial statements"""
+
+PROFIT_AND_LOSS = """Demo Corp Limited
+Statement of Profit and Loss for the year ended 31 March 2025
+(Rs. in lakhs)
+Particulars Note Year ended 31 March 2025 Year ended 31 March 2024
+Revenue from operations Note 22 54,321 49,876
+Other income Note 23 1,234 1,101
+Cost of materials consumed Note 24 30,210 28,004
+Employee benefits expense Note 25 6,543 6,012
+Finance costs Note 26 987 1,045
+Depreciation and amortisation expense Note 3 1,876 1,702
+Total expenses 39,616 36,763
+Profit before tax 15,939 14,214
+Earnings per equity share Note 30 31.88 28.43"""
+
+CASH_FLOW = """Demo Corp Limited
+Statement of Cash Flows for the year ended 31 March 2025
+(Rs. in lakhs)
+A. Cash flows from operating activities
+Profit before tax 15,939 14,214
+Depreciation Note 3 1,876 1,702
+Finance costs Note 26 987 1,045
+Increase in trade receivables Note 6 (334) (212)
+B. Cash flows from investing activities
+Purchase of investments Note 5 (200) (150)
+C. Cash flows from financing activities
+Dividends paid Note 13 (1,000) (800)"""
+
+NOTE_PAGE = """Demo Corp Limited
+Notes to the Standalone Financial Statements for the year ended 31 March 2025
+(Rs. in lakhs)
+Note 6: Trade receivables
+Unsecured, considered good 4,321 3,987
+Credit impaired 112 98
+Note 7: Cash and cash equivalents
+Balances with banks in current accounts 1,010 905
+Cash on hand 40 35"""
+
+SCHEDULE_PAGE = """Schedule 3
+Trade receivables
+Outstanding for more than six months from the balance sheet date 1,204 1,033
+Other debts 3,117 2,954"""
+
+class TestPageClassifier:
+    """Test cases for PageClassifier"""
+
+    @pytest.mark.parametrize("text, page_type", [
+        (BALANCE_SHEET, 'Balance Sheet'),
+        (PROFIT_AND_LOSS, 'Income Statement'),
+        (CASH_FLOW, 'Cash Flow'),
+    ])
+    def test_statement_citing_notes(self, text, page_type):
+        """Test that note references in statement rows do not turn the page into a disclosure"""
+        assert PageClassifier().classify(text) == page_type
+
+    def test_balance_sheet_scores(self):
+        """Test that only the closing 'notes to the financial statements' line scores for Disclosure"""
+        scores = PageClassifier(head_lines=20).score(BALANCE_SHEET)
+
+        assert scores['Disclosure'] == 3
+        assert scores['Balance Sheet'] > scores['Disclosure']
+
+    @pytest.mark.parametrize("text", [NOTE_PAGE, SCHEDULE_PAGE])
+    def test_note_headings(self, text):
+        """Test that pages headed by a note or schedule number are disclosures, even on a tie"""
+        assert PageClassifier().classify(text) == 'Disclosure'
+
+    def test_sample_pages(self):
+        """Test the bundled sample, which includes statement rows citing notes"""
+        result = PageClassifier().evaluate()
+
+        assert result['errors'] == []
@@ -0,0 +1,125 @@
+"""
+Unit tests for StatementContext and its use by the rule engines and analytics.
+"""
+
+import pytest
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.statement_context import StatementContext
+from src.indas_engine import IndASValidationEngine, FindingType
+from src.sebi_engine import SEBIComplianceEngine
+
+def statement(assets='5000', company='Example Ltd'):
+    return {
+        'metadata': {'company_name': company},
+        'balance_sheet': {
+            'assets': {'Cash': {'current': Decimal(assets)}},
+            'liabilities': {'Debt': {'current': Decimal('3000')}},
+            'equity': {'Share Capital': {'current': Decimal('2000')}}
+        }
+    }
+
+GOVERNANCE = {
+    'board_size': 8,
+    'independent_directors': 1,
+    'audit_committee_size': 2,
+    'audit_committee_independent': 1
+}
+
+def fair_presentation(findings):
+    return next(f for f in findings if f.rule_id == 'INDAS_1_002')
+
+class TestStatementContext:
+    """Test cases for memoized derived metrics."""
+
+    def test_derived_value_is_computed_once(self):
+        """Test that a second access reuses the total instead of summing again."""
+        context = StatementContext(statement())
+
+        assert context.total_assets == Decimal('5000')
+        assert context.total_assets == Decimal('5000')
+        # total_assets plus the assets section it summed
+        assert context.get_stats() == {'metrics_cached': 2, 'computed': 2, 'reused': 1}
+
+    def test_engines_share_one_context(self):
+        """Test computed and reused counts when IndAS and SEBI read the same context."""
+        data = statement(assets='6000')
+        context = StatementContext(data, GOVERNANCE)
+
+        IndASValidationEngine().validate_statement(data, context=context)
+        # combined_data, balance_difference and the three sections it sums
+        assert context.get_stats() == {'metrics_cached': 5, 'computed': 5, 'reused': 0}
+
+        SEBIComplianceEngine().validate_sebi_compliance(data, GOVERNANCE, context=context)
+        # Two board percentages are new; every other read hits combined_data
+        assert context.get_stats() == {'metrics_cached': 7, 'computed': 7, 'reused': 10}
+
+        IndASValidationEngine().validate_statement(data, context=context)
+        stats = context.get_stats()
+        assert stats['computed'] == 7
+        assert stats['reused'] == 12
+
+    def test_analytics_reuses_engine_totals(self):
+        """Test that the risk indicators reuse the sections the IndAS rules summed."""
+        pytest.importorskip('sklearn')
+        from src.analytics import AnalyticsEngine
+
+        data = statement()
+        context = StatementContext(data)
+        IndASValidationEngine().validate_statement(data, context=context)
+        before = context.get_stats()
+
+        AnalyticsEngine().calculate_risk_indicators(data, context=context)
+        after = context.get_stats()
+        # total_assets, total_liabilities and total_equity fall back to the cached sections
+        assert after['reused'] - before['reused'] >= 3
+
+        AnalyticsEngine().calculate_risk_indicators(data, context=context)
+        assert context.get_stats()['computed'] == after['computed']
+
+class TestEngineState:
+    """Test cases for engines reused across statements."""
+
+    def test_reused_engine_keeps_statements_apart(self):
+        """Test that one engine gives each statement its own derived values."""
+        engine = IndASValidationEngine()
+        unbalanced = engine.validate_statement(statement(assets='6000'))
+        balanced = engine.validate_statement(statement(assets='5000'))
+
+        assert fair_presentation(unbalanced).finding_type == FindingType.WARNING
+        assert fair_presentation(balanced).finding_type == FindingType.PASS
+
+    def test_concurrent_statements_do_not_clobber(self):
+        """Test that statements validated on several threads by one engine keep their own results."""
+        engine = IndASValidationEngine()
+        results = {}
+
+        def validate(i):
+            assets = '6000' if i % 2 else '5000'
+            results[i] = fair_presentation(engine.validate_statement(statement(assets, f"Company {i}")))
+
+        threads = [threading.Thread(target=validate, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i, finding in results.items():
+            assert finding.statement_id == f"Company {i}"
+            assert finding.finding_type == (FindingType.WARNING if i % 2 else FindingType.PASS)
+
+    def test_sebi_rules_use_the_given_governance(self):
+        """Test that a second statement's board data is not read from the first."""
+        engine = SEBIComplianceEngine()
+        data = statement()
+        engine.validate_sebi_compliance(data, GOVERNANCE)
+        compliant = engine.validate_sebi_compliance(data, {**GOVERNANCE, 'independent_directors': 4})
+
+        board = next(f for f in compliant if f.rule_id == 'SEBI_LODR_001')
+        assert board.finding_type == FindingType.PASS
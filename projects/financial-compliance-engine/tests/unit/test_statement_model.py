@@ -0,0 +1,93 @@
+"""
+Unit tests for the array-backed StatementModel and its dict converters.
+"""
+
+import pytest
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.statement_model import StatementModel, normalize_account_name, to_paise, from_paise
+
+FINANCIAL_DATA = {
+    'metadata': {'company_name': 'Example Ltd'},
+    'balance_sheet': {
+        'assets': {
+            'Trade Receivables': {'current': Decimal('1200.50'), 'prior': Decimal('1000')},
+            'Cash': {'current': Decimal('300.25')}
+        },
+        'Total Assets': {'current': Decimal('1500.75'), 'prior': Decimal('1000')}
+    },
+    'income_statement': {
+        'revenue': {'Revenue from Operations': Decimal('5000')}
+    }
+}
+
+class TestConverters:
+    """Test cases for the amount and name helpers."""
+
+    def test_paise_round_trip(self):
+        """Test that rupee amounts convert to exact paise and back."""
+        assert to_paise(Decimal('12.345')) == 1235
+        assert to_paise('0.1') == 10
+        assert to_paise('not a number') == 0
+        assert from_paise(1235) == Decimal('12.35')
+
+    def test_normalize_account_name(self):
+        """Test that punctuation, case and spacing do not affect account names."""
+        assert normalize_account_name('Trade  Receivables:') == 'trade receivables'
+
+class TestStatementModel:
+    """Test cases for StatementModel."""
+
+    @pytest.fixture
+    def model(self):
+        """Create a model from the parser's dict format."""
+        return StatementModel.from_dict(FINANCIAL_DATA)
+
+    def test_dict_round_trip(self, model):
+        """Test that to_dict rebuilds the parser output, keeping key order and extras."""
+        data = model.to_dict()
+
+        assert list(data) == list(FINANCIAL_DATA)
+        assert data['metadata'] == FINANCIAL_DATA['metadata']
+        assert data['balance_sheet']['assets']['Cash'] == {'current': Decimal('300.25')}
+        assert data['balance_sheet']['Total Assets'] == {'current': Decimal('1500.75'), 'prior': Decimal('1000')}
+        assert data['income_statement']['revenue']['Revenue from Operations'] == {'current': Decimal('5000')}
+
+    def test_find_and_get(self, model):
+        """Test lookups by normalized name, with and without a section."""
+        assert model.get('trade receivables:') == {'current': Decimal('1200.50'), 'prior': Decimal('1000')}
+        assert model.find('Cash', 'balance_sheet', 'assets') == 1
+        assert model.find('Cash', 'balance_sheet', 'liabilities') is None
+        assert model.get('Goodwill') is None
+
+    def test_section_total_is_exact(self, model):
+        """Test that section totals are exact sums in rupees."""
+        assert model.section_total('balance_sheet', 'assets') == Decimal('1500.75')
+        assert model.section_total('balance_sheet', 'assets', 'prior') == Decimal('1000')
+        assert model.section_total('cash_flow', 'operating') == Decimal('0')
+
+    def test_dataframe_columns(self, model):
+        """Test the DataFrame view of the line items."""
+        frame = model.to_dataframe()
+
+        assert list(frame['name']) == ['Trade Receivables', 'Cash', 'Total Assets', 'Revenue from Operations']
+        assert list(frame['current_paise']) == [120050, 30025, 150075, 500000]
+        assert list(frame['has_prior']) == [True, False, True, False]
+
+    def test_add_while_viewed_leaves_model_consistent(self, model):
+        """Test that a failed append while a view is alive changes nothing."""
+        frame = model.to_dataframe()
+        with pytest.raises(BufferError):
+            model.add_line_item('balance_sheet', 'assets', 'Inventory', Decimal('50'), Decimal('40'))
+
+        assert len(model.names) == len(model.section_codes) == len(model.current) == len(model.prior) == 4
+        assert model.find('Inventory') is None
+        del frame
+
+        model.add_line_item('balance_sheet', 'assets', 'Inventory', Decimal('50'), Decimal('40'))
+        assert model.section_total('balance_sheet', 'assets') == Decimal('1550.75')